@@ -33,6 +33,8 @@
 
 #include <stdio.h>
 #include <assert.h>
+#include <string.h>
+#include <chrono>
 
 // Convenience function for checking CUDA runtime API results
 // can be wrapped around any runtime API call. No-op in release builds.
@@ -95,6 +97,74 @@ void profileCopies(float *h_a,
     checkCuda(cudaEventDestroy(stopEvent));
 }
 
+// Host allocation flags compared for the pinned buffers
+struct HostAllocVariant
+{
+    const char *desc;
+    unsigned int flags;
+};
+
+const HostAllocVariant hostAllocVariants[] = {
+    {"Pinned (cudaHostAllocDefault)", cudaHostAllocDefault},
+    {"Pinned portable", cudaHostAllocPortable},
+    {"Pinned mapped", cudaHostAllocMapped},
+    {"Pinned write-combined", cudaHostAllocWriteCombined},
+    {"Pinned mapped write-combined", cudaHostAllocMapped | cudaHostAllocWriteCombined},
+};
+
+// Write-combined memory is fast to write from the CPU but very slow to read
+void profileHostAccess(float *h, const float *src, unsigned int n)
+{
+    unsigned int bytes = n * sizeof(float);
+
+    auto start = std::chrono::steady_clock::now();
+    memcpy(h, src, bytes);
+    auto stop = std::chrono::steady_clock::now();
+    double ms = std::chrono::duration<double, std::milli>(stop - start).count();
+    printf("  CPU write bandwidth (GB/s): %f\n", bytes * 1e-6 / ms);
+
+    float sum = 0.0f;
+    start = std::chrono::steady_clock::now();
+    for (unsigned int i = 0; i < n; ++i)
+        sum += h[i];
+    stop = std::chrono::steady_clock::now();
+    volatile float sink = sum; // keeps the reads
+    (void)sink;
+    ms = std::chrono::duration<double, std::milli>(stop - start).count();
+    printf("  CPU read bandwidth (GB/s): %f\n", bytes * 1e-6 / ms);
+}
+
+__global__ void readKernel(const float *in, float *out, unsigned int n)
+{
+    for (unsigned int i = blockIdx.x * blockDim.x + threadIdx.x; i < n; i += blockDim.x * gridDim.x)
+        out[i] = in[i];
+}
+
+// Mapped memory is read by kernels in place, without a copy
+void profileZeroCopy(float *h, float *d, unsigned int n)
+{
+    unsigned int bytes = n * sizeof(float);
+
+    float *d_mapped;
+    checkCuda(cudaHostGetDevicePointer((void **)&d_mapped, h, 0));
+
+    cudaEvent_t startEvent, stopEvent;
+    checkCuda(cudaEventCreate(&startEvent));
+    checkCuda(cudaEventCreate(&stopEvent));
+
+    checkCuda(cudaEventRecord(startEvent, 0));
+    readKernel<<<1024, 256>>>(d_mapped, d, n);
+    checkCuda(cudaEventRecord(stopEvent, 0));
+    checkCuda(cudaEventSynchronize(stopEvent));
+
+    float time;
+    checkCuda(cudaEventElapsedTime(&time, startEvent, stopEvent));
+    printf("  Zero-copy kernel read bandwidth (GB/s): %f\n", bytes * 1e-6 / time);
+
+    checkCuda(cudaEventDestroy(startEvent));
+    checkCuda(cudaEventDestroy(stopEvent));
+}
+
 int main()
 {
     unsigned int nElements = 4 * 1024 * 1024;
@@ -104,6 +174,9 @@ int main()
     float *h_aPageable, *h_bPageable;
     float *h_aPinned, *h_bPinned;
 
+    // mapped memory needs the flag before the context is created on old platforms
+    checkCuda(cudaSetDeviceFlags(cudaDeviceMapHost));
+
     // device array
     float *d_a;
 
@@ -131,6 +204,26 @@ int main()
     profileCopies(h_aPageable, h_bPageable, d_a, nElements, "Pageable");
     profileCopies(h_aPinned, h_bPinned, d_a, nElements, "Pinned");
 
+    // compare the flags of cudaHostAlloc
+    for (const HostAllocVariant &variant : hostAllocVariants)
+    {
+        float *h_aVariant, *h_bVariant;
+        checkCuda(cudaHostAlloc((void **)&h_aVariant, bytes, variant.flags));
+        checkCuda(cudaHostAlloc((void **)&h_bVariant, bytes, variant.flags));
+        memset(h_bVariant, 0, bytes);
+
+        // fills h_aVariant with the test data, before it is uploaded
+        printf("\n%s CPU access\n", variant.desc);
+        profileHostAccess(h_aVariant, h_aPageable, nElements);
+
+        profileCopies(h_aVariant, h_bVariant, d_a, nElements, (char *)variant.desc);
+        if (variant.flags & cudaHostAllocMapped)
+            profileZeroCopy(h_aVariant, d_a, nElements);
+
+        cudaFreeHost(h_aVariant);
+        cudaFreeHost(h_bVariant);
+    }
+
     printf("\n");
 
     // cleanup
@@ -0,0 +1,11 @@
+"""Benchmarks of the playground library.
+
+Run `python -m pgbench --help` from python/apps. Scenarios register themselves
+with `@scenario` in the modules of `pgbench.scenarios`, each yielding the
+cases to measure for a data size. Cases needing what the machine lacks (e.g.
+a GPU) are skipped, so the host-only scenarios run anywhere.
+"""
+
+from pgbench.registry import Case, SCENARIOS, Scenario, Skip, scenario
+
+__all__ = ["Case", "SCENARIOS", "Scenario", "Skip", "scenario"]
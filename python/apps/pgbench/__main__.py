@@ -0,0 +1,178 @@
+"""Command line of the benchmarks.
+
+    python -m pgbench list
+    python -m pgbench run [-s SCENARIO ...] [--sizes 1M,64M] [--json FILE] [--csv FILE]
+    python -m pgbench compare BASELINE CANDIDATE [--threshold 0.05]
+
+compare exits with 1 if a case regressed, for use in CI.
+"""
+
+import argparse
+import dataclasses
+import importlib
+import pkgutil
+import sys
+
+import pgbench.scenarios
+from pgbench import results as result_files
+from pgbench.registry import SCENARIOS, Skip
+from pgbench.requirements import missing
+from pgbench.stats import summarize
+from pgbench.timing import Options, measure
+
+UNITS = {"K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parse_size(text: str) -> int:
+    """1048576, 1M, 64M, 1G, ..."""
+    text = text.strip().upper().removesuffix("B")
+    if text and text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def format_size(num_bytes: int) -> str:
+    for unit in ["G", "M", "K"]:
+        if num_bytes >= UNITS[unit] and num_bytes % UNITS[unit] == 0:
+            return f"{num_bytes // UNITS[unit]} {unit}B"
+    return f"{num_bytes} B"
+
+
+def format_seconds(sec: float) -> str:
+    return f"{sec*1e3:>10.2f} ms" if sec > 10e-3 else f"{sec*1e6:>10.2f} us"
+
+
+def print_result(result: dict):
+    description = f"{result['case']:<40}"
+    duration = format_seconds(result["median"])
+    interval = f"[{format_seconds(result['ci_low']).strip()}, {format_seconds(result['ci_high']).strip()}]"
+    transfer_rate = f"{result['gbs']:>8.1f} GB/s" if result["gbs"] < 1e3 else " " * 13
+    print(f"    {description} {duration} {transfer_rate}  p95 {format_seconds(result['p95'])}  "
+          f"{interval:<24} n={result['n']}, warm-up {result['warmup_runs']}")
+
+
+def load_scenarios():
+    for module in pkgutil.iter_modules(pgbench.scenarios.__path__):
+        importlib.import_module(f"pgbench.scenarios.{module.name}")
+
+
+def run_scenario(name: str, scenario, num_bytes: int, options: Options, args, skipped):
+    results = []
+    for case in scenario.function(num_bytes):
+        reason = missing(case.requires, no_gpu=args.no_gpu)
+        if reason is not None:
+            print(f"    {case.name:<40} skipped, {reason}")
+            skipped.append({"scenario": name, "case": case.name, "nbytes": num_bytes, "reason": reason})
+            continue
+
+        warmup_runs, samples = measure(case, options)
+        result = {
+            "scenario": name,
+            "case": case.name,
+            "nbytes": case.nbytes,
+            "timer": case.timer,
+            "warmup_runs": warmup_runs,
+            **summarize(samples, args.confidence),
+        }
+        result["gbs"] = case.nbytes / 1024**3 / result["median"] if result["median"] > 0 else float("inf")
+        results.append(result)
+        print_result(result)
+    return results
+
+
+def run(args) -> int:
+    options = Options(
+        min_iters=args.min_iters,
+        max_iters=args.max_iters,
+        min_time=args.min_time,
+        max_warmup=args.max_warmup,
+    )
+    names = args.scenario or sorted(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+
+    results = []
+    skipped = []
+    for name in names:
+        scenario = SCENARIOS[name]
+        for num_bytes in sizes:
+            print(f"\n{name} ({scenario.description}), {format_size(num_bytes)}")
+            reason = missing(scenario.requires, no_gpu=args.no_gpu)
+            if reason is not None:
+                print(f"    skipped, {reason}")
+                skipped.append({"scenario": name, "case": None, "nbytes": num_bytes, "reason": reason})
+                continue
+            try:
+                results.extend(run_scenario(name, scenario, num_bytes, options, args, skipped))
+            except Skip as skip:
+                print(f"    skipped, {skip}")
+                skipped.append({"scenario": name, "case": None, "nbytes": num_bytes, "reason": str(skip)})
+
+
+    if args.json:
+        result_files.write_json(args.json, results, skipped, {**dataclasses.asdict(options), "sizes": sizes})
+    if args.csv:
+        result_files.write_csv(args.csv, results)
+    return 0
+
+
+def compare(args) -> int:
+    comparisons = result_files.compare(
+        result_files.load(args.baseline), result_files.load(args.candidate), args.threshold
+    )
+    regressions = 0
+    for old, new, change, verdict in comparisons:
+        if args.all or verdict != "unchanged":
+            description = f"{old['scenario']} / {old['case']} / {format_size(int(old['nbytes']))}"
+            print(f"{description:<56} {format_seconds(old['median'])} -> {format_seconds(new['median'])} "
+                  f"{change*100:>+7.1f} %  {verdict}")
+        regressions += verdict == "regression"
+    print(f"\n{len(comparisons)} cases compared, {regressions} regressed")
+    return 1 if regressions else 0
+
+
+def list_scenarios(args) -> int:
+    for name in sorted(SCENARIOS):
+        requires = f" (needs {', '.join(SCENARIOS[name].requires)})" if SCENARIOS[name].requires else ""
+        print(f"{name:<24} {SCENARIOS[name].description}{requires}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="pgbench", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("list", help="list the scenarios")
+    command.set_defaults(function=list_scenarios)
+
+    command = commands.add_parser("run", help="run scenarios")
+    command.add_argument("-s", "--scenario", action="append", help="scenario to run, all by default")
+    command.add_argument("--sizes", default="1M,64M", help="comma separated data sizes, e.g. 1M,64M,1G")
+    command.add_argument("--min-iters", type=int, default=Options.min_iters)
+    command.add_argument("--max-iters", type=int, default=Options.max_iters)
+    command.add_argument("--min-time", type=float, default=Options.min_time, help="seconds of sampling per case")
+    command.add_argument("--max-warmup", type=int, default=Options.max_warmup)
+    command.add_argument("--confidence", type=float, default=0.95, help="of the median's confidence interval")
+    command.add_argument("--no-gpu", action="store_true", help="skip the cases needing a GPU or pinned memory")
+    command.add_argument("--json", help="write the results to this JSON file")
+    command.add_argument("--csv", help="write the results to this CSV file")
+    command.set_defaults(function=run)
+
+    command = commands.add_parser("compare", help="flag regressions between two result files")
+    command.add_argument("baseline")
+    command.add_argument("candidate")
+    command.add_argument("--threshold", type=float, default=0.05, help="relative change of the median")
+    command.add_argument("--all", action="store_true", help="print unchanged cases too")
+    command.set_defaults(function=compare)
+
+    args = parser.parse_args(argv)
+    load_scenarios()
+    return args.function(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Scenarios and the cases they consist of."""
+
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional, Tuple
+
+
+@dataclass
+class Case:
+    """One measurement: run() is timed, before() runs untimed ahead of every
+    run(). nbytes is the data moved per run, for the transfer rate. timer is
+    "cpu" (perf_counter_ns) or "cuda" (CUDA events, for work on the GPU).
+    requires names what the case needs, see pgbench.requirements."""
+
+    name: str
+    run: Callable[[], None]
+    nbytes: int
+    before: Optional[Callable[[], None]] = None
+    timer: str = "cpu"
+    requires: Tuple[str, ...] = field(default_factory=tuple)
+
+
+@dataclass
+class Scenario:
+    """Yields the Cases for a size in bytes. It can be a generator cleaning up
+    after its last case. Nothing is created when requires is not met."""
+
+    function: Callable[[int], Iterator[Case]]
+    description: str
+    requires: Tuple[str, ...] = field(default_factory=tuple)
+
+
+class Skip(Exception):
+    """Raised by a scenario that cannot run a size, e.g. for lack of memory"""
+
+
+SCENARIOS = {}
+
+
+def scenario(name: str, description: str, requires: Tuple[str, ...] = ()):
+    """Registers a function as the scenario name"""
+
+    def register(function: Callable[[int], Iterator[Case]]):
+        SCENARIOS[name] = Scenario(function, description, tuple(requires))
+        return function
+
+    return register
@@ -0,0 +1,50 @@
+"""What the cases need from the machine."""
+
+import functools
+import importlib
+import os
+
+
+@functools.lru_cache(maxsize=None)
+def check(requirement: str):
+    """Returns None when requirement is met, the reason otherwise."""
+    if requirement == "torch":
+        try:
+            importlib.import_module("torch")
+        except ImportError:
+            return "PyTorch is not installed"
+        return None
+
+    if requirement == "cuda":
+        reason = check("torch")
+        if reason is not None:
+            return reason
+        import torch
+
+        return None if torch.cuda.is_available() else "no CUDA device"
+
+    if requirement == "pinned":
+        import pyplayground as pg
+
+        try:
+            pg.PinnedI8Vector(1)
+        except RuntimeError as error:
+            return f"no pinned memory ({error})"
+        return None
+
+    raise ValueError(f"Unknown requirement '{requirement}'.")
+
+
+def missing(requirements, no_gpu: bool = False):
+    """The first reason why requirements are not met, None if they are."""
+    for requirement in requirements:
+        if no_gpu and requirement in ("cuda", "pinned"):
+            return "GPU scenarios disabled"
+        reason = check(requirement)
+        if reason is not None:
+            return reason
+    return None
+
+
+def available_bytes() -> int:
+    return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
@@ -0,0 +1,103 @@
+"""Result files and the comparison of two of them."""
+
+import csv
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+# Columns of the CSV files, in order
+FIELDS = [
+    "scenario", "case", "nbytes", "timer", "warmup_runs", "n",
+    "median", "ci_low", "ci_high", "confidence", "mean", "stdev",
+    "min", "p5", "p25", "p75", "p95", "p99", "max", "gbs",
+]
+
+
+def environment() -> dict:
+    """Where the results come from, for telling runs apart"""
+    import numpy as np
+
+    info = {
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+    }
+    try:
+        info["commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    if "torch" in sys.modules:
+        torch = sys.modules["torch"]
+        info["torch"] = torch.__version__
+        if torch.cuda.is_available():
+            info["device"] = torch.cuda.get_device_name()
+    return info
+
+
+def write_json(path: str, results, skipped, options: dict):
+    with open(path, "w") as file:
+        json.dump(
+            {"environment": environment(), "options": options, "results": results, "skipped": skipped},
+            file, indent=2,
+        )
+
+
+def write_csv(path: str, results):
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow({field: result[field] for field in FIELDS})
+
+
+def load(path: str):
+    """Results of a JSON or CSV file"""
+    if path.endswith(".csv"):
+        with open(path, newline="") as file:
+            rows = list(csv.DictReader(file))
+        for row in rows:
+            for field in FIELDS:
+                if field in ("scenario", "case", "timer"):
+                    continue
+                row[field] = float(row[field]) if field not in ("nbytes", "warmup_runs", "n") else int(row[field])
+        return rows
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def key(result):
+    return result["scenario"], result["case"], int(result["nbytes"])
+
+
+def compare(baseline, candidate, threshold: float = 0.05):
+    """Matches the results of two runs by scenario, case and size. A case
+    regressed (improved) when its median got slower (faster) by more than
+    threshold and the confidence intervals of the medians do not overlap, so
+    noise alone does not flag it. Returns (baseline, candidate, change,
+    verdict) tuples, change being the relative change of the median time."""
+    by_key = {key(result): result for result in baseline}
+    comparisons = []
+    for new in candidate:
+        old = by_key.get(key(new))
+        if old is None:
+            continue
+        change = new["median"] / old["median"] - 1
+        if change > threshold and new["ci_low"] > old["ci_high"]:
+            verdict = "regression"
+        elif change < -threshold and new["ci_high"] < old["ci_low"]:
+            verdict = "improvement"
+        else:
+            verdict = "unchanged"
+        comparisons.append((old, new, change, verdict))
+    return comparisons
@@ -0,0 +1 @@
+"""Every module of this package registers its scenarios on import."""
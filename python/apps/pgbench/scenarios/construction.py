@@ -0,0 +1,55 @@
+"""Constructing the bound vectors with the different fill modes,
+single-threaded (like the former scalar `push_back` constructor) and with the
+whole thread pool. NumPy's own allocation is measured for reference."""
+
+import os
+
+import numpy as np
+
+import pyplayground as pg
+from pgbench import Case, Skip, scenario
+from pgbench.requirements import available_bytes
+
+
+def construct(vector_type, num_bytes: int, fill: str, num_threads: int):
+    """(before, run) constructing vector_type(num_bytes, fill) on num_threads"""
+    source = np.ones(num_bytes, dtype=np.int8) if fill == "copy" else None
+    vectors = []
+
+    def before():
+        pg.set_num_threads(num_threads)
+        vectors.clear()  # Destruction is not timed
+
+    def run():
+        vectors.append(vector_type(num_bytes, fill=fill, source=source))
+
+    return before, run
+
+
+@scenario("construction", "vector construction by fill mode and threads")
+def construction(num_bytes: int):
+    # Copying needs the source too
+    if 2 * num_bytes > available_bytes():
+        raise Skip("not enough memory")
+
+    threads = sorted({1, os.cpu_count()})
+    try:
+        for vector_type, abbr, requires in [
+            (pg.PageableI8Vector, "v", ()),
+            (pg.PinnedI8Vector, "vp", ("pinned",)),
+        ]:
+            for fill in ["uninitialized", "zeros", "iota", "copy"]:
+                for count in threads:
+                    before, run = construct(vector_type, num_bytes, fill, count)
+                    yield Case(f"{abbr}({fill}), {count} thread(s)", run, num_bytes, before, requires=requires)
+
+        arrays = []
+
+        def zeros():
+            array = np.zeros(num_bytes, dtype=np.int8)
+            array[::4096] = 0  # np.zeros() may not touch the pages
+            arrays.append(array)
+
+        yield Case("np.zeros()", zeros, num_bytes, before=arrays.clear)
+    finally:
+        pg.set_num_threads(os.cpu_count())
@@ -0,0 +1,57 @@
+"""Filling a pinned staging vector from a NumPy array: a NumPy copy through
+the `as_ndarray()` view (holding the GIL) against `copy_from()` (GIL released,
+thread pool, non-temporal stores for large buffers), from one and from
+several Python threads at once."""
+
+import threading
+
+import numpy as np
+
+import pyplayground as pg
+from pgbench import Case, Skip, scenario
+from pgbench.requirements import available_bytes
+
+NUM_CALLERS = 4
+
+
+def numpy_copy(vector, source):
+    vector.as_ndarray()[:] = source
+
+
+def copy_from(vector, source):
+    vector.copy_from(source)
+
+
+def concurrently(copy, vectors, sources):
+    """Runs copy(vector, source) from a Python thread per vector"""
+
+    def run():
+        if len(vectors) == 1:
+            copy(vectors[0], sources[0])
+            return
+        threads = [threading.Thread(target=copy, args=pair) for pair in zip(vectors, sources)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return run
+
+
+@scenario("copies", "bulk copies into pinned vectors")
+def copies(num_bytes: int):
+    # Every caller needs a vector and a source
+    if 2 * NUM_CALLERS * num_bytes > available_bytes():
+        raise Skip("not enough memory")
+
+    for callers in [1, NUM_CALLERS]:
+        vectors = []
+        sources = [np.ones(num_bytes, dtype=np.int8) for _ in range(callers)]
+        for descr, copy in [("as_ndarray()[:] = source", numpy_copy), ("copy_from(source)", copy_from)]:
+            run = concurrently(copy, vectors, sources)
+
+            def before(vectors=vectors, callers=callers):
+                if not vectors:  # Allocated once the requirements are known to be met
+                    vectors.extend(pg.PinnedI8Vector(num_bytes, fill="zeros") for _ in range(callers))
+
+            yield Case(f"{descr}, {callers} thread(s)", run, callers * num_bytes, before=before, requires=("pinned",))
@@ -0,0 +1,68 @@
+"""Getting compressed shards into pinned memory: `zlib.decompress` of each
+block into pageable bytes, then a copy into the `as_ndarray()` view of a
+pinned vector, against `pyplayground.decompress_into`, which decompresses the
+blocks on the thread pool straight into the pinned vector. The shard is made
+of independently compressed 4 MiB blocks of fairly compressible integers, the
+size is that of the decompressed data."""
+
+import os
+import zlib
+
+import numpy as np
+
+import pyplayground as pg
+from pgbench import Case, Skip, scenario
+from pgbench.requirements import available_bytes
+
+BLOCK_BYTES = 4 * 1024**2
+
+
+def zlib_route(frames: list, sizes: list, vector):
+    view = vector.as_ndarray()
+    offset = 0
+    for frame, size in zip(frames, sizes):
+        view[offset : offset + size] = np.frombuffer(zlib.decompress(frame), dtype=np.int8)
+        offset += size
+
+
+@scenario("decompression", "decompressing zlib blocks into a pinned vector")
+def decompression(num_bytes: int):
+    # The shard, its blocks and the vector
+    if 3 * num_bytes > available_bytes():
+        raise Skip("not enough memory")
+
+    data = (np.arange(num_bytes // 4 + 1, dtype=np.int32) % 1000).tobytes()[:num_bytes]
+    sizes = [min(BLOCK_BYTES, num_bytes - offset) for offset in range(0, num_bytes, BLOCK_BYTES)]
+    frames = [zlib.compress(data[offset : offset + BLOCK_BYTES], 1) for offset in range(0, num_bytes, BLOCK_BYTES)]
+    del data
+
+    threads = sorted({1, os.cpu_count()})
+    try:
+        vector = None
+
+        def before():
+            nonlocal vector
+            vector = pg.PinnedI8Vector(num_bytes, fill="zeros")
+
+        yield Case(
+            "zlib.decompress + copy",
+            lambda: zlib_route(frames, sizes, vector),
+            num_bytes,
+            before,
+            requires=("pinned",),
+        )
+        for count in threads:
+
+            def before_threads(count=count):
+                pg.set_num_threads(count)
+                before()
+
+            yield Case(
+                f"decompress_into, {count} thread(s)",
+                lambda: pg.decompress_into(frames, vector, sizes),
+                num_bytes,
+                before_threads,
+                requires=("pinned",),
+            )
+    finally:
+        pg.set_num_threads(os.cpu_count())
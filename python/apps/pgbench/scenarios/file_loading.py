@@ -0,0 +1,64 @@
+"""Getting a local file into pinned memory: the NumPy route (`np.fromfile`
+into a pageable array, then a copy into the `as_ndarray()` view of a pinned
+vector) against `pyplayground.read_file`, which reads straight into pinned
+vectors, with each of its read methods. Every case runs with the file in the
+page cache ("warm") and evicted from it with posix_fadvise ("cold", as far as
+the file system honours it)."""
+
+import os
+import tempfile
+
+import numpy as np
+
+import pyplayground as pg
+from pgbench import Case, Skip, scenario
+from pgbench.requirements import available_bytes
+
+CHUNK_BYTES = 64 * 1024**2
+
+
+def evict(path: str):
+    with open(path, "rb") as file:
+        os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def numpy_route(path: str, num_bytes: int):
+    for offset in range(0, num_bytes, CHUNK_BYTES):
+        count = min(CHUNK_BYTES, num_bytes - offset)
+        array = np.fromfile(path, dtype=np.int8, count=count, offset=offset)
+        vector = pg.PinnedI8Vector(count, fill="uninitialized")
+        vector.as_ndarray()[:] = array
+
+
+def read_file_route(method: str):
+    def load(path: str, num_bytes: int):
+        for _ in pg.read_file(path, chunk_bytes=CHUNK_BYTES, method=method):
+            pass
+
+    return load
+
+
+@scenario("file_loading", "loading a file into pinned vectors")
+def file_loading(num_bytes: int):
+    # The file, its page cache and the chunks in flight
+    if 2 * num_bytes + 2 * CHUNK_BYTES > available_bytes():
+        raise Skip("not enough memory")
+
+    routes = [("np.fromfile + copy", numpy_route)]
+    for method in ["mmap", "pread", "direct", "io_uring"]:
+        routes.append((f"read_file({method})", read_file_route(method)))
+
+    with tempfile.NamedTemporaryFile(dir=os.getcwd()) as file:
+        file.write(np.ones(num_bytes, dtype=np.int8).tobytes())
+        file.flush()
+        os.fsync(file.fileno())
+
+        for cold in [False, True]:
+            for descr, load in routes:
+                yield Case(
+                    f"{descr}, {'cold' if cold else 'warm'}",
+                    lambda load=load: load(file.name, num_bytes),
+                    num_bytes,
+                    before=(lambda: evict(file.name)) if cold else None,
+                    requires=("pinned",),
+                )
@@ -0,0 +1,53 @@
+"""Vectors with and without huge pages: allocating and faulting in the pages
+(pageable), allocating and page-locking them (pinned), and copying into them
+with copy_from(), where every base page costs a TLB miss."""
+
+import numpy as np
+
+import pyplayground as pg
+from pgbench import Case, Skip, scenario
+from pgbench.requirements import available_bytes
+
+HUGE_PAGES = [None, "transparent", "2M", "1G"]
+
+
+def allocate(vector_type, num_bytes: int, huge_pages):
+    vectors = []
+
+    def run():
+        vectors.append(vector_type(num_bytes, fill="uninitialized", huge_pages=huge_pages))
+
+    return vectors.clear, run  # Freeing is not timed
+
+
+def copy_into(vector_type, num_bytes: int, huge_pages):
+    state = {}
+
+    def before():
+        if not state:  # Created once the requirements are known to be met
+            state["vector"] = vector_type(num_bytes, fill="zeros", huge_pages=huge_pages)
+            state["source"] = np.ones(num_bytes, dtype=np.int8)
+
+    def run():
+        state["vector"].copy_from(state["source"])
+
+    return before, run
+
+
+@scenario("huge_pages", "allocation, first touch and copies with huge pages")
+def huge_pages(num_bytes: int):
+    # A vector and the source of the copy
+    if 2 * num_bytes > available_bytes():
+        raise Skip("not enough memory")
+
+    for pages in HUGE_PAGES:
+        name = pages or "base pages"
+        for vector_type, abbr, requires in [
+            (pg.PageableI8Vector, "v", ()),
+            (pg.PinnedI8Vector, "vp", ("pinned",)),
+        ]:
+            before, run = allocate(vector_type, num_bytes, pages)
+            yield Case(f"{abbr}(uninitialized), {name}", run, num_bytes, before, requires=requires)
+
+            before, run = copy_into(vector_type, num_bytes, pages)
+            yield Case(f"{abbr}.copy_from(), {name}", run, num_bytes, before, requires=requires)
@@ -0,0 +1,45 @@
+"""Starting a worker process: a new interpreter importing pyplayground, then
+creating its first vector or initializing CUDA. Each run is a whole process,
+so the bare interpreter and `import numpy` are measured for reference. The
+size is that of the first vector."""
+
+import os
+import subprocess
+import sys
+
+from pgbench import Case, scenario
+
+
+def interpreter(code: str):
+    """run() starting an interpreter that runs code, with the path of this one"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+
+    def run():
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+    return run
+
+
+@scenario("startup", "import time and the first allocation of a new process")
+def startup(num_bytes: int):
+    yield Case("python -c pass", interpreter("pass"), 0)
+    yield Case("import numpy", interpreter("import numpy"), 0)
+    yield Case("import pyplayground", interpreter("import pyplayground"), 0)
+    yield Case(
+        "import + first v",
+        interpreter(f"import pyplayground as pg; pg.PageableI8Vector({num_bytes}, fill='zeros')"),
+        num_bytes,
+    )
+    yield Case("import + init()", interpreter("import pyplayground as pg; pg.init()"), 0, requires=("pinned",))
+    yield Case(
+        "import + first vp",
+        interpreter(f"import pyplayground as pg; pg.PinnedI8Vector({num_bytes}, fill='zeros')"),
+        num_bytes,
+        requires=("pinned",),
+    )
+    yield Case(
+        "import + init() + first vp",
+        interpreter(f"import pyplayground as pg; pg.init(); pg.PinnedI8Vector({num_bytes}, fill='zeros')"),
+        num_bytes,
+        requires=("pinned",),
+    )
@@ -0,0 +1,78 @@
+"""PyTorch tensors copied between the host (CPU) and the device (GPU), from
+tensors PyTorch allocated and from tensors viewing bound vectors.
+Abbreviations: d-device, h-host, p-pinned, v-vector.
+
+tensor.to() does not allow the destination to be pinned, therefore cases such
+as "... to hp" do not exist."""
+
+import pyplayground as pg
+from pgbench import Case, scenario
+
+
+def to_device_dtype(source, device: str):
+    """tensor.to(device, dtype) creating a copy of source"""
+
+    def run():
+        source.to(device, source.dtype, copy=True)
+
+    return run
+
+
+def copy(source, destination):
+    """destination.copy_(source), destination may be of a different data type or
+    reside on a different device"""
+
+    def run():
+        destination.copy_(source)
+
+    return run
+
+
+def create_then_copy(source, pin_memory: bool):
+    """torch.zeros() in host memory, then tensor.copy_(source)"""
+    import torch
+
+    def run():
+        destination = torch.zeros(source.size(), dtype=source.dtype, device="cpu", pin_memory=pin_memory)
+        destination.copy_(source)
+
+    return run
+
+
+@scenario("tensor_transfer", "tensor copies between host and device", requires=("cuda", "pinned"))
+def tensor_transfer(num_bytes: int):
+    import torch
+
+    # Prepare all containers in advance
+    t_host = torch.ones(num_bytes, dtype=torch.int8)
+    t_host_pinned = torch.ones(num_bytes, dtype=torch.int8, pin_memory=True)
+    t_device = torch.ones(num_bytes, dtype=torch.int8, device="cuda")
+
+    def case(name, run):
+        return Case(name, run, num_bytes, timer="cuda")
+
+    yield case("to(): h to d", to_device_dtype(t_host, "cuda"))
+    yield case("to(): hp to d", to_device_dtype(t_host_pinned, "cuda"))
+    yield case("to(): d to h", to_device_dtype(t_device, "cpu"))
+
+    yield case("copy_(): h to d", copy(t_host, t_device))
+    yield case("copy_(): hp to d", copy(t_host_pinned, t_device))
+    yield case("copy_(): d to h", copy(t_device, t_host))
+    yield case("copy_(): d to hp", copy(t_device, t_host_pinned))
+
+    yield case("cpu(): d to h", t_device.cpu)
+    yield case("zeros() + copy_(): d to h", create_then_copy(t_device, pin_memory=False))
+    yield case("zeros() + copy_(): d to hp", create_then_copy(t_device, pin_memory=True))
+
+    v_host = pg.PageableI8Vector(num_bytes)
+    v_host_pinned = pg.PinnedI8Vector(num_bytes)
+    tv_host = torch.from_numpy(v_host.as_ndarray())
+    tv_host_pinned = torch.from_numpy(v_host_pinned.as_ndarray())
+
+    yield case("to(): v to d", to_device_dtype(tv_host, "cuda"))
+    yield case("to(): vp to d", to_device_dtype(tv_host_pinned, "cuda"))
+
+    yield case("copy_(): v to d", copy(tv_host, t_device))
+    yield case("copy_(): vp to d", copy(tv_host_pinned, t_device))
+    yield case("copy_(): d to v", copy(t_device, tv_host))
+    yield case("copy_(): d to vp", copy(t_device, tv_host_pinned))
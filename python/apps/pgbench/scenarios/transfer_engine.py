@@ -0,0 +1,39 @@
+"""Host to device transfers of the TransferEngine by chunk size and number of
+streams. The simulated backend, where streams are CPU threads and device
+memory is host memory, measures the scheduling without a GPU."""
+
+import pyplayground as pg
+from pgbench import Case, scenario
+
+CHUNK_BYTES = [1024**2, 4 * 1024**2, 16 * 1024**2]
+NUM_STREAMS = [1, 2, 4]
+
+
+def transfer(backend: str, num_streams: int, chunk_bytes: int, num_bytes: int):
+    state = {}
+
+    def before():
+        if not state:  # Created once the requirements are known to be met
+            state["engine"] = pg.TransferEngine(backend, num_streams, chunk_bytes)
+            state["src"] = pg.PinnedI8Vector(num_bytes, fill="zeros")
+            state["dst"] = state["engine"].device_buffer(num_bytes)
+
+    def run():
+        state["engine"].copy(state["dst"], state["src"]).wait()
+
+    return before, run
+
+
+@scenario("transfer_engine", "chunked asynchronous host to device copies")
+def transfer_engine(num_bytes: int):
+    for backend, requires in [("simulated", ("pinned",)), ("cuda", ("cuda", "pinned"))]:
+        for num_streams in NUM_STREAMS:
+            for chunk_bytes in CHUNK_BYTES:
+                before, run = transfer(backend, num_streams, chunk_bytes, num_bytes)
+                yield Case(
+                    f"{backend}, {num_streams} stream(s), {chunk_bytes // 1024**2} MB chunks",
+                    run,
+                    num_bytes,
+                    before,
+                    requires=requires,
+                )
@@ -0,0 +1,33 @@
+"""Viewing bound vectors as NumPy arrays and PyTorch tensors, which must not
+copy, so the time does not depend on the size."""
+
+import numpy as np
+
+import pyplayground as pg
+from pgbench import Case, scenario
+
+
+def torch_from_numpy(array):
+    import torch
+
+    return torch.from_numpy(array)
+
+
+@scenario("vector_casts", "views of vectors as arrays and tensors")
+def vector_casts(num_bytes: int):
+    vectors = {}
+
+    def vector(abbr):
+        if abbr not in vectors:
+            vectors[abbr] = (pg.PageableI8Vector if abbr == "v" else pg.PinnedI8Vector)(num_bytes, fill="zeros")
+        return vectors[abbr]
+
+    for abbr, requires in [("v", ()), ("vp", ("pinned",))]:
+        yield Case(f"{abbr} as ndarray", lambda abbr=abbr: vector(abbr).as_ndarray(), num_bytes, requires=requires)
+        yield Case(f"{abbr} as buffer", lambda abbr=abbr: np.asarray(vector(abbr)), num_bytes, requires=requires)
+        yield Case(
+            f"{abbr} as tensor",
+            lambda abbr=abbr: torch_from_numpy(vector(abbr).as_ndarray()),
+            num_bytes,
+            requires=requires + ("torch",),
+        )
@@ -0,0 +1,52 @@
+"""Summary statistics of timing samples."""
+
+import math
+import statistics
+from statistics import NormalDist
+
+
+def percentile(sorted_values, q: float) -> float:
+    """q-th percentile (0 to 100) with linear interpolation, like NumPy's
+    default."""
+    if not sorted_values:
+        return math.nan
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def median_ci(sorted_values, confidence: float = 0.95):
+    """Distribution-free confidence interval of the median from order
+    statistics. Timings are skewed and often multimodal, so no normality is
+    assumed."""
+    n = len(sorted_values)
+    if n == 0:
+        return math.nan, math.nan
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    lower = max(math.floor(n / 2 - z * math.sqrt(n) / 2), 0)
+    upper = min(math.ceil(n / 2 + z * math.sqrt(n) / 2), n - 1)
+    return sorted_values[lower], sorted_values[upper]
+
+
+def summarize(samples_ns, confidence: float = 0.95) -> dict:
+    """Statistics of timing samples in seconds."""
+    values = sorted(ns * 1e-9 for ns in samples_ns)
+    ci_low, ci_high = median_ci(values, confidence)
+    return {
+        "n": len(values),
+        "min": values[0],
+        "max": values[-1],
+        "mean": statistics.fmean(values),
+        "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "median": percentile(values, 50),
+        "p5": percentile(values, 5),
+        "p25": percentile(values, 25),
+        "p75": percentile(values, 75),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "confidence": confidence,
+    }
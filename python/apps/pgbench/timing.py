@@ -0,0 +1,91 @@
+"""Timers and the measurement loop."""
+
+import time
+from dataclasses import dataclass
+from statistics import median
+
+from pgbench.registry import Case
+
+
+class CpuTimer:
+    """Wall time of run() with perf_counter_ns"""
+
+    def time(self, run) -> int:
+        start = time.perf_counter_ns()
+        run()
+        return time.perf_counter_ns() - start
+
+
+class CudaTimer:
+    """Time of the GPU work run() enqueues on the current stream, measured with
+    CUDA events, so asynchronous work is timed correctly and host overhead is
+    not."""
+
+    def __init__(self):
+        import torch
+
+        self._torch = torch
+        self._start = torch.cuda.Event(enable_timing=True)
+        self._end = torch.cuda.Event(enable_timing=True)
+
+    def time(self, run) -> int:
+        self._start.record()
+        run()
+        self._end.record()
+        self._end.synchronize()
+        return int(self._start.elapsed_time(self._end) * 1e6)
+
+
+def make_timer(kind: str):
+    if kind == "cpu":
+        return CpuTimer()
+    if kind == "cuda":
+        return CudaTimer()
+    raise ValueError(f"Unknown timer '{kind}'.")
+
+
+@dataclass
+class Options:
+    min_iters: int = 10        # Samples at least
+    max_iters: int = 10000     # Samples at most
+    min_time: float = 0.5      # Seconds of sampling, unless max_iters is hit first
+    warmup_batch: int = 5      # Runs per batch when detecting the warm-up
+    warmup_tolerance: float = 0.05
+    max_warmup: int = 200      # Runs at most spent warming up
+
+
+def timed_run(timer, case: Case) -> int:
+    if case.before is not None:
+        case.before()
+    return timer.time(case.run)
+
+
+def warm_up(timer, case: Case, options: Options) -> int:
+    """Runs batches of the case until the medians of two consecutive batches
+    agree within the tolerance, i.e. caches, page tables, allocator pools and
+    clocks have settled. Returns the number of runs spent."""
+    previous = None
+    runs = 0
+    while runs < options.max_warmup:
+        batch = [timed_run(timer, case) for _ in range(options.warmup_batch)]
+        runs += len(batch)
+        current = median(batch)
+        if previous is not None and abs(current - previous) <= options.warmup_tolerance * max(previous, 1):
+            break
+        previous = current
+    return runs
+
+
+def measure(case: Case, options: Options):
+    """Warms the case up, then samples it. Returns the warm-up runs and the
+    samples in nanoseconds."""
+    timer = make_timer(case.timer)
+    warmup_runs = warm_up(timer, case, options)
+
+    samples = []
+    deadline = time.perf_counter() + options.min_time
+    while len(samples) < options.max_iters and (
+        len(samples) < options.min_iters or time.perf_counter() < deadline
+    ):
+        samples.append(timed_run(timer, case))
+    return warmup_runs, samples
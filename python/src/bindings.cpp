@@ -1,47 +1,1247 @@
+#include "dlpack_utils.h"
 #include "pyarray_utils.h"
 
+#include "playground/allocation_stats.h"
+#include "playground/autotune.h"
+#include "playground/copy.h"
+#include "playground/cuda_init.h"
+#include "playground/decompress.h"
+#include "playground/file_reader.h"
+#include "playground/fill.h"
+#include "playground/growable_vector.h"
+#include "playground/half.h"
+#include "playground/host_mapping.h"
+#include "playground/host_registry.h"
+#include "playground/pinned_arena.h"
+#include "playground/pinned_budget.h"
+#include "playground/ring_buffer.h"
+#include "playground/shared_memory.h"
+#include "playground/thread_pool.h"
+#include "playground/tracing.h"
+#include "playground/transfer_engine.h"
+#include "playground/warm_pool.h"
+
 #include "cuda_runtime.h"
+#include "pybind11/operators.h"
 #include "pybind11/pybind11.h"
 
+#include <algorithm>
+#include <chrono>
 #include <cstdint>
+#include <memory>
+#include <optional>
 #include <sstream>
+#include <string>
+#include <type_traits>
+#include <utility>
+#include <vector>
 
 namespace py = pybind11;
 
 namespace playground {
 
+/* The bound vectors skip value-initialization, their constructors fill them in
+ * parallel instead. Their memory can be placed on NUMA nodes and backed by
+ * huge pages, see mapped_backing. Pinned vectors stay within the pinned budget,
+ * see pinned_budget. */
+template <typename T>
+using py_pageable_vector = default_init_vector<T, pinned_alloc<T, mapped_backing<pageable_backing>>>;
+
+template <typename T>
+using py_pinned_vector = default_init_vector<T, pinned_alloc<T, mapped_backing<budgeted<cuda_host_alloc_backing>>>>;
+
+/* Backing of a bound vector, only pinned vectors take cudaHostAlloc() flags */
+template <typename Backing>
+Backing vector_backing(mapping_options options, host_alloc_flags flags)
+{
+    if constexpr (std::is_same_v<Backing, mapped_backing<pageable_backing>>) {
+        if (flags != host_alloc_flags{})
+            throw py::value_error("Pageable vectors take no host allocation flags.");
+        return Backing{options};
+    }
+    else {
+        // Placed or huge page memory is mapped first and then registered, which
+        // cudaHostRegister() cannot do write-combined
+        if (flags.write_combined && !(options == mapping_options{}))
+            throw py::value_error("Write-combined memory comes from cudaHostAlloc() and cannot be registered, "
+                                  "it takes neither numa nor huge_pages.");
+        return Backing{options, budgeted<cuda_host_alloc_backing>{cuda_host_alloc_backing{flags}}};
+    }
+}
+
+/* Shape and strides (in bytes) of a view, by default the whole vector */
+template <typename Vector>
+std::pair<std::vector<py::ssize_t>, std::vector<py::ssize_t>> view_layout(Vector const &my_vector,
+                                                                          py::object shape,
+                                                                          py::object strides)
+{
+    using T = typename Vector::value_type;
+
+    auto view_shape =
+        shape.is_none() ? std::vector<py::ssize_t>{static_cast<py::ssize_t>(my_vector.size())} : to_ssize_vector(shape);
+    auto view_strides = strides.is_none() ? c_strides(view_shape, sizeof(T)) : to_ssize_vector(strides);
+    check_view(view_shape, view_strides, sizeof(T), my_vector.size() * sizeof(T));
+    return {std::move(view_shape), std::move(view_strides)};
+}
+
+/* Zero-copy views: as_ndarray(), the buffer protocol, __array_interface__ and
+ * DLPack. All of them keep the vector alive while the view exists. DLPack
+ * tells the device type of each vector, see device_type_of. */
+template <typename Vector, typename DeviceTypeOf>
+void def_array_interfaces(py::class_<Vector> &cls, DeviceTypeOf device_type_of)
+{
+    using T = typename Vector::value_type;
+
+    cls.def_buffer([](Vector &my_vector) { return as_buffer_info(my_vector); })
+        .def(
+            "as_ndarray",
+            [](py::object self, py::object shape, py::object strides) {
+                auto &my_vector = self.cast<Vector &>();
+                auto layout = view_layout(my_vector, shape, strides);
+                return as_numpy(my_vector, self, std::move(layout.first), std::move(layout.second));
+            },
+            py::arg("shape") = py::none(), py::arg("strides") = py::none())
+        .def_property_readonly("__array_interface__", [](Vector &my_vector) { return as_array_interface(my_vector); })
+        .def(
+            "__dlpack__",
+            [device_type_of](py::object self, py::object stream, py::object max_version, py::object dl_device,
+                             py::object copy, py::object shape, py::object strides) {
+                auto &my_vector = self.cast<Vector &>();
+                const auto device_type = device_type_of(my_vector);
+                if (!copy.is_none() && copy.cast<bool>())
+                    throw py::buffer_error("Copying export via DLPack is not supported.");
+                if (!dl_device.is_none() && !dl_device.equal(py::make_tuple(static_cast<int>(device_type), 0)))
+                    throw py::buffer_error("Export via DLPack to another device is not supported.");
+
+                auto layout = view_layout(my_vector, shape, strides);
+                auto dl_shape = std::vector<int64_t>(layout.first.begin(), layout.first.end());
+                auto dl_strides = std::vector<int64_t>{};
+                for (auto stride : layout.second) {
+                    if (stride % sizeof(T) != 0)
+                        throw py::buffer_error("DLPack needs strides that are multiples of the item size.");
+                    dl_strides.push_back(stride / static_cast<py::ssize_t>(sizeof(T)));
+                }
+                return to_dlpack(my_vector.data(), dl_data_type<T>(), std::move(dl_shape), std::move(dl_strides),
+                                 {device_type, 0}, self);
+            },
+            py::arg("stream") = py::none(), py::arg("max_version") = py::none(), py::arg("dl_device") = py::none(),
+            py::arg("copy") = py::none(), py::arg("shape") = py::none(), py::arg("strides") = py::none())
+        .def("__dlpack_device__", [device_type_of](Vector &my_vector) {
+            return py::make_tuple(static_cast<int>(device_type_of(my_vector)), 0);
+        });
+}
+
+/* Constructor taking the number of elements, how to initialize them and how to
+ * map their memory. The fill runs on the thread pool with the GIL released. */
+template <typename Vector>
+void def_init(py::class_<Vector> &cls)
+{
+    using T = typename Vector::value_type;
+    using Backing = typename Vector::allocator_type::backing_type;
+
+    cls.def(py::init([](std::size_t count, fill_mode mode, compute_type_t<T> value, py::object source, numa_policy numa,
+                        huge_pages pages, host_alloc_flags flags) {
+                const auto alloc =
+                    typename Vector::allocator_type{vector_backing<Backing>(mapping_options{numa, pages}, flags)};
+                if (mode != fill_mode::copy) {
+                    py::gil_scoped_release release;
+                    return make_vector<Vector>(count, mode, static_cast<T>(value), nullptr, alloc);
+                }
+
+                if (source.is_none())
+                    throw py::value_error("The copy fill mode needs a source buffer.");
+                auto info = source.cast<py::buffer>().request();
+                auto data = contiguous_bytes(info);
+                if (data.second < count * sizeof(T))
+                    throw py::value_error("The source buffer is smaller than the vector.");
+
+                py::gil_scoped_release release;
+                return make_vector<Vector>(count, mode, T{}, static_cast<T const *>(data.first), alloc);
+            }),
+            py::arg("count"), py::arg("fill") = fill_mode::iota, py::arg("value") = compute_type_t<T>{},
+            py::arg("source") = py::none(), py::arg("numa") = numa_policy{}, py::arg("huge_pages") = huge_pages::none,
+            py::arg("alloc_flags") = host_alloc_flags{})
+        .def_property_readonly("numa_policy",
+                               [](Vector const &my_vector) { return my_vector.get_allocator().backing().policy(); })
+        .def_property_readonly(
+            "huge_pages", [](Vector const &my_vector) { return my_vector.get_allocator().backing().options().pages; });
+}
+
+/* Number of elements in nbytes, throws unless they fit into the vector from
+ * offset on */
+template <typename Vector>
+std::size_t checked_count(Vector const &my_vector, std::size_t offset, std::size_t nbytes)
+{
+    using T = typename Vector::value_type;
+
+    if (nbytes % sizeof(T) != 0)
+        throw py::value_error("The buffer size is not a multiple of the item size.");
+    const auto count = nbytes / sizeof(T);
+    if (offset > my_vector.size() || count > my_vector.size() - offset)
+        throw py::value_error("The buffer does not fit into the vector at the offset.");
+    return count;
+}
+
+/* Bulk copies between the vector and other buffers. The buffers are checked
+ * with the GIL held, the copies run on the thread pool with the GIL released,
+ * so several Python threads can fill vectors at the same time. Offsets count
+ * elements of the vector. */
+template <typename Vector>
+void def_copies(py::class_<Vector> &cls)
+{
+    using T = typename Vector::value_type;
+
+    cls.def(
+           "copy_from",
+           [](Vector &my_vector, py::buffer source, std::size_t offset) {
+               auto info = source.request();
+               auto bytes = contiguous_bytes(info);
+               checked_count(my_vector, offset, bytes.second);
+
+               py::gil_scoped_release release;
+               parallel_memcpy(my_vector.data() + offset, bytes.first, bytes.second);
+           },
+           "Copies the raw bytes of a C-contiguous buffer into the vector.", py::arg("source"), py::arg("offset") = 0)
+        .def(
+            "copy_to",
+            [](Vector &my_vector, py::buffer out, std::size_t offset) {
+                auto info = out.request(true);
+                auto bytes = contiguous_bytes(info);
+                checked_count(my_vector, offset, bytes.second);
+
+                py::gil_scoped_release release;
+                parallel_memcpy(bytes.first, my_vector.data() + offset, bytes.second);
+            },
+            "Fills a writable C-contiguous buffer with the raw bytes of the vector.", py::arg("out"),
+            py::arg("offset") = 0)
+        .def(
+            "gather",
+            [](Vector &my_vector, py::array_t<int64_t, py::array::c_style | py::array::forcecast> indices,
+               py::buffer out, std::size_t row_size) {
+                if (row_size == 0)
+                    throw py::value_error("The row size must be positive.");
+                auto info = out.request(true);
+                auto bytes = contiguous_bytes(info);
+                const auto count = static_cast<std::size_t>(indices.size());
+                if (bytes.second != count * row_size * sizeof(T))
+                    throw py::value_error("The output buffer does not match the number of indices.");
+
+                py::gil_scoped_release release;
+                parallel_gather(my_vector.data(), my_vector.size() / row_size, indices.data(), count, row_size,
+                                static_cast<T *>(bytes.first));
+            },
+            "Copies the rows of row_size elements at indices into a writable C-contiguous buffer.", py::arg("indices"),
+            py::arg("out"), py::arg("row_size") = 1)
+        .def(
+            "convert_from",
+            [](Vector &my_vector, py::object source, std::size_t offset) {
+                auto array = py::array::ensure(source, py::array::c_style);
+                if (!array)
+                    throw py::error_already_set();
+                visit_dtype(array.dtype(), [&](auto tag) {
+                    using From = decltype(tag);
+                    const auto count = static_cast<std::size_t>(array.size());
+                    checked_count(my_vector, offset, count * sizeof(T));
+
+                    py::gil_scoped_release release;
+                    parallel_convert(static_cast<From const *>(array.data()), count, my_vector.data() + offset);
+                });
+            },
+            "Copies an array of any supported dtype into the vector, converting the elements.", py::arg("source"),
+            py::arg("offset") = 0)
+        .def(
+            "convert_to",
+            [](Vector &my_vector, py::array out, std::size_t offset) {
+                if (!(out.flags() & py::array::c_style) || !out.writeable())
+                    throw py::value_error("Expected a writable C-contiguous array.");
+                visit_dtype(out.dtype(), [&](auto tag) {
+                    using To = decltype(tag);
+                    const auto count = static_cast<std::size_t>(out.size());
+                    checked_count(my_vector, offset, count * sizeof(T));
+
+                    auto *data = static_cast<To *>(out.mutable_data());
+                    py::gil_scoped_release release;
+                    parallel_convert(my_vector.data() + offset, count, data);
+                });
+            },
+            "Fills a writable C-contiguous array of any supported dtype from the vector, converting the elements.",
+            py::arg("out"), py::arg("offset") = 0);
+}
+
+/* Pickling. Protocol 5 hands the memory to the pickler as a PickleBuffer,
+ * which is written in-band or passed out-of-band without copies, older
+ * protocols copy it into bytes. Unpickling copies the data into a new vector
+ * with the same options through the copy fill mode. */
+template <typename Vector, typename FlagsOf>
+void def_pickle(py::class_<Vector> &cls, FlagsOf flags_of)
+{
+    using T = typename Vector::value_type;
+
+    cls.def("__reduce_ex__", [flags_of](py::object self, int protocol) {
+        auto const &my_vector = self.cast<Vector const &>();
+        const auto alloc = my_vector.get_allocator();
+        auto data = protocol >= 5
+                        ? py::module_::import("pickle").attr("PickleBuffer")(self)
+                        : py::bytes(reinterpret_cast<char const *>(my_vector.data()), my_vector.size() * sizeof(T));
+        auto args = py::make_tuple(my_vector.size(), fill_mode::copy, compute_type_t<T>{}, data,
+                                   alloc.backing().policy(), alloc.backing().options().pages, flags_of(my_vector));
+        return py::make_tuple(self.attr("__class__"), args);
+    });
+}
+
+/* Future of a background job, waiting releases the GIL */
+template <typename T>
+void def_future(py::handle scope, char const *py_class_name)
+{
+    using Future = async_result<T>;
+
+    py::class_<Future>(scope, py_class_name)
+        .def("done", &Future::ready)
+        .def("running", [](Future const &future) { return future.status() == async_status::running; })
+        .def("cancelled", [](Future const &future) { return future.status() == async_status::cancelled; })
+        .def("cancel", &Future::cancel)
+        .def(
+            "wait",
+            [](Future const &future, py::object timeout) {
+                if (timeout.is_none()) {
+                    py::gil_scoped_release release;
+                    future.wait();
+                    return true;
+                }
+                const auto duration = std::chrono::duration<double>{timeout.cast<double>()};
+                py::gil_scoped_release release;
+                return future.wait_for(duration);
+            },
+            "Waits until done or cancelled, False on timeout (in seconds).", py::arg("timeout") = py::none())
+        .def("result", &Future::get, py::call_guard<py::gil_scoped_release>());
+}
+
+/* Allocation off the critical path: allocate_async() creates a vector on the
+ * background queue, <Vector>.WarmPool keeps vectors allocated and faulted in */
+template <typename Vector>
+void def_async(py::class_<Vector> &cls)
+{
+    using T = typename Vector::value_type;
+    using Backing = typename Vector::allocator_type::backing_type;
+    using Pool = warm_pool<Vector>;
+
+    auto allocator = [](numa_policy numa, huge_pages pages, host_alloc_flags flags) {
+        return typename Vector::allocator_type{vector_backing<Backing>(mapping_options{numa, pages}, flags)};
+    };
+
+    def_future<std::unique_ptr<Vector>>(cls, "Future");
+    cls.def_static(
+        "allocate_async",
+        [allocator](std::size_t count, fill_mode mode, compute_type_t<T> value, numa_policy numa, huge_pages pages,
+                    host_alloc_flags flags) {
+            return allocate_async<Vector>(count, mode, static_cast<T>(value), allocator(numa, pages, flags));
+        },
+        py::arg("count"), py::arg("fill") = fill_mode::uninitialized, py::arg("value") = compute_type_t<T>{},
+        py::arg("numa") = numa_policy{}, py::arg("huge_pages") = huge_pages::none,
+        py::arg("alloc_flags") = host_alloc_flags{});
+
+    py::class_<Pool>(cls, "WarmPool")
+        .def(py::init([allocator](std::size_t depth, numa_policy numa, huge_pages pages, host_alloc_flags flags) {
+                 return std::make_unique<Pool>(depth, allocator(numa, pages, flags));
+             }),
+             py::arg("depth") = 1, py::arg("numa") = numa_policy{}, py::arg("huge_pages") = huge_pages::none,
+             py::arg("alloc_flags") = host_alloc_flags{})
+        .def_property_readonly("depth", &Pool::depth)
+        .def("reserve_async", &Pool::reserve, py::arg("count"))
+        .def("acquire", &Pool::acquire, py::call_guard<py::gil_scoped_release>(), py::arg("count"))
+        .def("stats", [](Pool const &pool) {
+            auto stats = pool.stats();
+            py::dict result;
+            result["hits"] = stats.hits;
+            result["waits"] = stats.waits;
+            result["misses"] = stats.misses;
+            result["wait_seconds"] = stats.wait_seconds;
+            result["warm_vectors"] = stats.warm_vectors;
+            result["warm_bytes"] = stats.warm_bytes;
+            return result;
+        });
+}
+
 template <typename T>
 void init_pageable_vector(py::module &m, const std::string py_class_name)
 {
-    py::class_<std::vector<T>>(m, py_class_name.c_str())
-        .def(py::init([](int count) {
-            std::unique_ptr<std::vector<T>> vec = std::make_unique<std::vector<T>>();
-            vec->reserve(count);
-            for (int i = 0; i < count; ++i)
-                vec->push_back(static_cast<T>(i)); // Do not care about overflow
-            return vec;
-        }))
-        .def("as_ndarray", [](std::vector<T> &my_vector) { return as_numpy(my_vector); });
+    py::class_<py_pageable_vector<T>> cls(m, py_class_name.c_str(), py::buffer_protocol());
+    def_init(cls);
+    def_array_interfaces(cls, [](auto const &) { return dlpack::kDLCPU; });
+    def_copies(cls);
+    def_pickle(cls, [](auto const &) { return host_alloc_flags{}; });
+    def_async(cls);
 };
 
 template <typename T>
 void init_pinned_vector(py::module &m, const std::string py_class_name)
 {
-    py::class_<pinned_vector<T>>(m, py_class_name.c_str())
-        .def(py::init([](int count) {
-            std::unique_ptr<pinned_vector<T>> vec = std::make_unique<pinned_vector<T>>();
-            vec->reserve(count);
-            for (int i = 0; i < count; ++i)
-                vec->push_back(static_cast<T>(i)); // Do not care about overflow
-            return vec;
-        }))
-        .def("as_ndarray", [](pinned_vector<T> &my_vector) { return as_numpy(my_vector); });
+    py::class_<py_pinned_vector<T>> cls(m, py_class_name.c_str(), py::buffer_protocol());
+    def_init(cls);
+    // Pageable fallbacks of the pinned budget are no CUDA host memory
+    def_array_interfaces(
+        cls, [](auto const &my_vector) { return is_pinned(my_vector.data()) ? dlpack::kDLCUDAHost : dlpack::kDLCPU; });
+    def_copies(cls);
+    def_pickle(cls,
+               [](auto const &my_vector) { return my_vector.get_allocator().backing().backing().backing().flags(); });
+    def_async(cls);
+    cls.def_property_readonly("is_pinned",
+                              [](py_pinned_vector<T> const &my_vector) { return is_pinned(my_vector.data()); })
+        .def_property_readonly("alloc_flags",
+                               [](py_pinned_vector<T> const &my_vector) {
+                                   return my_vector.get_allocator().backing().backing().backing().flags();
+                               })
+        .def_property_readonly("device_pointer", [](py_pinned_vector<T> &my_vector) -> py::object {
+            // Mapped memory only, the pinned budget may have fallen back to pageable memory
+            const auto backing = my_vector.get_allocator().backing().backing().backing();
+            if (!backing.flags().mapped || !is_pinned(my_vector.data()) || my_vector.empty())
+                return py::none();
+            return py::int_(reinterpret_cast<std::uintptr_t>(backing.device_pointer(my_vector.data())));
+        });
+};
+
+/* Binds Pageable<suffix>Vector and Pinned<suffix>Vector */
+template <typename T>
+void init_vectors(py::module &m, const std::string suffix)
+{
+    init_pageable_vector<T>(m, "Pageable" + suffix + "Vector");
+    init_pinned_vector<T>(m, "Pinned" + suffix + "Vector");
+}
+
+/* Slot index, or None once closed or when no slot became available. Waiting
+ * happens with the GIL released, timeout is in seconds. */
+template <typename Ring>
+py::object acquire_slot(Ring &ring, bool for_write, bool block, py::object timeout)
+{
+    auto slot = std::optional<std::size_t>{};
+    {
+        py::gil_scoped_release release;
+        if (!block)
+            slot = for_write ? ring.try_acquire_write() : ring.try_acquire_read();
+        else if (!timeout.is_none()) {
+            auto duration = std::chrono::duration<double>(timeout.cast<double>());
+            slot = for_write ? ring.acquire_write_for(duration) : ring.acquire_read_for(duration);
+        }
+        else
+            slot = for_write ? ring.acquire_write() : ring.acquire_read();
+    }
+    if (!slot)
+        return py::none();
+    return py::int_(*slot);
+}
+
+template <typename Backing>
+void init_ring_buffer(py::module &m, const std::string py_class_name)
+{
+    using Ring = pinned_ring_buffer<Backing>;
+
+    py::class_<Ring>(m, py_class_name.c_str())
+        .def(py::init<std::size_t, std::size_t>(), py::arg("num_slots"), py::arg("slot_bytes"))
+        .def_property_readonly("num_slots", &Ring::num_slots)
+        .def_property_readonly("slot_bytes", &Ring::slot_bytes)
+        .def(
+            "acquire_write",
+            [](Ring &ring, bool block, py::object timeout) { return acquire_slot(ring, true, block, timeout); },
+            py::arg("block") = true, py::arg("timeout") = py::none())
+        .def("commit", &Ring::commit, py::arg("slot"), py::arg("nbytes"))
+        .def(
+            "acquire_read",
+            [](Ring &ring, bool block, py::object timeout) { return acquire_slot(ring, false, block, timeout); },
+            py::arg("block") = true, py::arg("timeout") = py::none())
+        .def("release", &Ring::release, py::arg("slot"))
+        .def("close", &Ring::close, py::call_guard<py::gil_scoped_release>())
+        .def_property_readonly("closed", &Ring::closed)
+        .def("filled_bytes", &Ring::filled_bytes, py::arg("slot"))
+        .def(
+            "slot",
+            [](py::object self, std::size_t slot) {
+                auto &ring = self.cast<Ring &>();
+                return py::array(py::dtype("B"), {static_cast<py::ssize_t>(ring.slot_bytes())}, {1}, ring.data(slot),
+                                 self);
+            },
+            py::arg("slot"))
+        .def("stats", [](Ring &ring) {
+            auto stats = ring.stats();
+            py::dict result;
+            result["committed"] = stats.committed;
+            result["released"] = stats.released;
+            result["filled"] = stats.filled;
+            result["max_filled"] = stats.max_filled;
+            result["producer_stalls"] = stats.producer_stalls;
+            result["consumer_stalls"] = stats.consumer_stalls;
+            result["producer_wait_seconds"] = stats.producer_wait_seconds;
+            result["consumer_wait_seconds"] = stats.consumer_wait_seconds;
+            return result;
+        });
+}
+
+/* Pointer and size of a device buffer or of a C-contiguous host buffer */
+inline std::pair<void *, std::size_t> transfer_bytes(py::object obj, bool writable)
+{
+    if (py::isinstance<device_buffer>(obj)) {
+        auto &buffer = obj.cast<device_buffer &>();
+        return {buffer.data(), buffer.size()};
+    }
+    auto info = obj.cast<py::buffer>().request(writable);
+    return contiguous_bytes(info);
+}
+
+void init_transfer_engine(py::module &m)
+{
+    py::class_<transfer_backend, std::shared_ptr<transfer_backend>>(m, "TransferBackend")
+        .def_property_readonly("num_streams", &transfer_backend::num_streams);
+    py::class_<cuda_transfer_backend, transfer_backend, std::shared_ptr<cuda_transfer_backend>>(m,
+                                                                                                "CudaTransferBackend")
+        .def(py::init<std::size_t>(), py::arg("num_streams") = 2);
+    py::class_<simulated_transfer_backend, transfer_backend, std::shared_ptr<simulated_transfer_backend>>(
+        m, "SimulatedTransferBackend")
+        .def(py::init<std::size_t>(), py::arg("num_streams") = 2);
+
+    py::class_<device_buffer>(m, "DeviceBuffer")
+        .def(py::init<std::shared_ptr<transfer_backend>, std::size_t>(), py::arg("backend"), py::arg("nbytes"))
+        .def_property_readonly("nbytes", &device_buffer::size)
+        .def_property_readonly("ptr",
+                               [](device_buffer &buffer) { return reinterpret_cast<std::uintptr_t>(buffer.data()); });
+
+    py::class_<transfer_handle>(m, "TransferHandle")
+        .def("done", &transfer_handle::done)
+        .def("wait", &transfer_handle::wait, py::call_guard<py::gil_scoped_release>())
+        .def_property_readonly("nbytes", &transfer_handle::bytes)
+        .def_property_readonly("num_chunks", &transfer_handle::num_chunks);
+
+    py::class_<transfer_engine>(m, "TransferEngine")
+        .def(py::init<std::shared_ptr<transfer_backend>, std::size_t>(), py::arg("backend"),
+             py::arg("chunk_bytes") = default_chunk_bytes)
+        .def_property_readonly("backend", &transfer_engine::backend)
+        .def_property_readonly("chunk_bytes", &transfer_engine::chunk_bytes)
+        .def(
+            "copy",
+            [](transfer_engine &engine, py::object dst, py::object src, py::object nbytes) {
+                auto dst_bytes = transfer_bytes(dst, true);
+                auto src_bytes = transfer_bytes(src, false);
+                const auto bytes = nbytes.is_none() ? src_bytes.second : nbytes.cast<std::size_t>();
+                if (bytes > src_bytes.second || bytes > dst_bytes.second)
+                    throw py::value_error("The transfer does not fit into the buffers.");
+
+                py::gil_scoped_release release;
+                return engine.copy(dst_bytes.first, src_bytes.first, bytes);
+            },
+            py::arg("dst"), py::arg("src"), py::arg("nbytes") = py::none())
+        .def("synchronize", &transfer_engine::synchronize, py::call_guard<py::gil_scoped_release>());
+}
+
+/* Registration of the memory of a Python buffer. The buffer is held while
+ * registered, so e.g. a bytearray cannot be resized under it. */
+template <typename Backing>
+struct py_pinned_view {
+    explicit py_pinned_view(py::object buffer_owner) : owner{std::move(buffer_owner)}
+    {
+        // Read-only buffers such as bytes or mappings of files can be locked
+        // too
+        try {
+            info = owner.cast<py::buffer>().request(true);
+        }
+        catch (py::error_already_set &) {
+            info = owner.cast<py::buffer>().request(false);
+        }
+        auto bytes = contiguous_bytes(info);
+        view = std::make_unique<pinned_view<Backing>>(bytes.first, bytes.second);
+    }
+
+    auto release() -> void
+    {
+        view.reset();
+        info = py::buffer_info{};
+        owner = py::none();
+    }
+
+    py::object owner;
+    py::buffer_info info;
+    std::unique_ptr<pinned_view<Backing>> view;
 };
 
+template <typename Backing>
+void init_pinned_view(py::module &m, const std::string prefix)
+{
+    using View = py_pinned_view<Backing>;
+
+    py::class_<View>(m, (prefix + "PinnedView").c_str())
+        .def(py::init<py::object>(), py::arg("obj"))
+        .def_property_readonly("obj", [](View &view) { return view.owner; })
+        .def_property_readonly("nbytes", [](View &view) { return view.view ? view.view->size() : 0; })
+        .def_property_readonly(
+            "ptr", [](View &view) { return reinterpret_cast<std::uintptr_t>(view.view ? view.view->data() : nullptr); })
+        .def_property_readonly("released", [](View &view) { return !view.view; })
+        .def("release", &View::release)
+        .def_static("registry_stats", [] {
+            auto stats = host_registry<Backing>::instance().stats();
+            py::dict result;
+            result["registrations"] = stats.registrations;
+            result["regions"] = stats.regions;
+            result["registered_bytes"] = stats.registered_bytes;
+            return result;
+        });
+}
+
+/* Shared memory buffers, exported as bytes through the buffer protocol. The
+ * owner pins them within the pinned budget, see pinned_budget. */
+template <typename Backing>
+void init_shared_buffer(py::module &m, const std::string prefix)
+{
+    using Buffer = shared_pinned_buffer<Backing>;
+
+    py::class_<Buffer>(m, (prefix + "SharedBuffer").c_str(), py::buffer_protocol())
+        .def_static(
+            "create", [](std::size_t nbytes, shared_memory_kind kind) { return Buffer::create(nbytes, kind); },
+            py::arg("nbytes"), py::arg("kind"))
+        .def_static("attach", &Buffer::attach, py::arg("handle"))
+        .def_buffer([](Buffer &buffer) {
+            return py::buffer_info(buffer.data(), 1, py::format_descriptor<uint8_t>::format(), 1,
+                                   {static_cast<py::ssize_t>(buffer.size())}, {py::ssize_t{1}});
+        })
+        .def_property_readonly("handle", &Buffer::handle)
+        .def_property_readonly("nbytes", &Buffer::size)
+        .def_property_readonly("ptr", [](Buffer &buffer) { return reinterpret_cast<std::uintptr_t>(buffer.data()); })
+        .def_property_readonly("is_owner", &Buffer::is_owner)
+        .def_property_readonly("is_pinned",
+                               [](Buffer &buffer) { return buffer.is_pinned() && is_pinned(buffer.data()); })
+        .def("unlink", [](Buffer &buffer) { buffer.segment().unlink(); });
+}
+
+/* Growable buffers, exported as bytes through the buffer protocol. They
+ * never move, so views stay valid while they grow. Appends copy with the GIL
+ * released. */
+template <typename Backing>
+void init_growable_buffer(py::module &m, const std::string prefix)
+{
+    using Buffer = growable_pinned_vector<uint8_t, Backing>;
+
+    py::class_<Buffer>(m, (prefix + "GrowableBuffer").c_str(), py::buffer_protocol())
+        .def(py::init<std::size_t>(), py::arg("max_nbytes") = Buffer::default_max_bytes)
+        .def_buffer([](Buffer &buffer) {
+            return py::buffer_info(buffer.data(), 1, py::format_descriptor<uint8_t>::format(), 1,
+                                   {static_cast<py::ssize_t>(buffer.size())}, {py::ssize_t{1}});
+        })
+        .def(
+            "extend",
+            [](Buffer &buffer, py::buffer source) {
+                auto info = source.request();
+                auto bytes = contiguous_bytes(info);
+
+                py::gil_scoped_release release;
+                buffer.append(static_cast<uint8_t const *>(bytes.first), bytes.second);
+            },
+            "Appends the raw bytes of a C-contiguous buffer.", py::arg("source"))
+        .def("reserve", &Buffer::reserve, py::call_guard<py::gil_scoped_release>(), py::arg("nbytes"))
+        .def("resize", &Buffer::resize, py::call_guard<py::gil_scoped_release>(), py::arg("nbytes"))
+        .def("clear", &Buffer::clear)
+        .def_property_readonly("nbytes", &Buffer::size)
+        .def_property_readonly("capacity", &Buffer::capacity)
+        .def_property_readonly("max_nbytes", &Buffer::max_size)
+        .def_property_readonly("num_chunks", &Buffer::num_chunks)
+        .def_property_readonly("ptr", [](Buffer &buffer) { return reinterpret_cast<std::uintptr_t>(buffer.data()); })
+        // Chunks the pinned budget fell back to pageable memory for are not pinned
+        .def_property_readonly("is_pinned", [](Buffer const &buffer) {
+            auto begin = std::size_t{0};
+            for (auto end : buffer.chunk_ends()) {
+                if (!is_pinned(buffer.data() + begin))
+                    return false;
+                begin = end;
+            }
+            return true;
+        });
+}
+
+/* Block of an arena, exported as bytes through the buffer protocol. It keeps
+ * the arena alive and frees itself when collected, unless the arena was reset
+ * since it was handed out. */
+template <typename Backing>
+struct py_arena_block {
+    py_arena_block(std::shared_ptr<pinned_arena<Backing>> owner, std::size_t size, std::size_t alignment)
+        : arena{std::move(owner)}, data{arena->allocate(size, alignment)}, nbytes{size}, generation{arena->generation()}
+    {
+    }
+
+    py_arena_block(py_arena_block const &) = delete;
+    auto operator=(py_arena_block const &) -> py_arena_block & = delete;
+
+    ~py_arena_block()
+    {
+        if (is_live())
+            arena->deallocate(data, nbytes);
+    }
+
+    auto is_live() const -> bool { return arena->generation() == generation; }
+
+    std::shared_ptr<pinned_arena<Backing>> arena;
+    void *data;
+    std::size_t nbytes;
+    std::size_t generation;
+};
+
+/* Arenas, exported through the buffer protocol as the bytes in use, the
+ * prefix to transfer at once. The arena is pinned within the pinned budget,
+ * see pinned_budget. */
+template <typename Backing>
+void init_arena(py::module &m, const std::string prefix)
+{
+    using Arena = pinned_arena<Backing>;
+    using Block = py_arena_block<Backing>;
+
+    py::class_<Block>(m, (prefix + "ArenaBlock").c_str(), py::buffer_protocol())
+        .def_buffer([](Block &block) {
+            if (!block.is_live())
+                throw std::runtime_error{"The arena was reset since the block was allocated."};
+            return py::buffer_info(block.data, 1, py::format_descriptor<uint8_t>::format(), 1,
+                                   {static_cast<py::ssize_t>(block.nbytes)}, {py::ssize_t{1}});
+        })
+        .def_property_readonly("nbytes", [](Block &block) { return block.nbytes; })
+        .def_property_readonly("offset", [](Block &block) { return block.arena->offset_of(block.data); })
+        .def_property_readonly("ptr", [](Block &block) { return reinterpret_cast<std::uintptr_t>(block.data); })
+        .def_property_readonly("is_live", &Block::is_live);
+
+    py::class_<Arena, std::shared_ptr<Arena>>(m, (prefix + "Arena").c_str(), py::buffer_protocol())
+        .def(py::init<std::size_t, std::size_t>(), py::arg("nbytes"), py::arg("alignment") = 256)
+        .def_buffer([](Arena &arena) {
+            return py::buffer_info(arena.data(), 1, py::format_descriptor<uint8_t>::format(), 1,
+                                   {static_cast<py::ssize_t>(arena.used_bytes())}, {py::ssize_t{1}});
+        })
+        .def(
+            "allocate",
+            [](std::shared_ptr<Arena> arena, std::size_t nbytes, std::size_t alignment) {
+                return std::make_unique<Block>(std::move(arena), nbytes, alignment);
+            },
+            "A block of nbytes aligned to alignment, the arena's when 0. Raises MemoryError when full.",
+            py::arg("nbytes"), py::arg("alignment") = 0)
+        .def("reset", &Arena::reset)
+        .def(
+            "offset_of", [](Arena &arena, py::buffer buffer) { return arena.offset_of(buffer.request().ptr); },
+            "Offset of the first byte of the buffer from the start of the arena.", py::arg("buffer"))
+        .def_property_readonly("nbytes", &Arena::capacity)
+        .def_property_readonly("used_nbytes", &Arena::used_bytes)
+        .def_property_readonly("alignment", &Arena::alignment)
+        .def_property_readonly("generation", &Arena::generation)
+        .def_property_readonly("ptr", [](Arena &arena) { return reinterpret_cast<std::uintptr_t>(arena.data()); })
+        // The pinned budget may have fallen back to pageable memory
+        .def_property_readonly("is_pinned", [](Arena &arena) { return is_pinned(arena.data()); })
+        .def("stats", [](Arena &arena) {
+            auto stats = arena.stats();
+            py::dict result;
+            result["capacity"] = stats.capacity;
+            result["used_bytes"] = stats.used_bytes;
+            result["peak_bytes"] = stats.peak_bytes;
+            result["live_bytes"] = stats.live_bytes;
+            result["allocations"] = stats.allocations;
+            result["resets"] = stats.resets;
+            return result;
+        });
+}
+
+void init_file_reader(py::module &m)
+{
+    py::enum_<read_method>(m, "ReadMethod")
+        .value("mmap", read_method::mmap)
+        .value("pread", read_method::pread)
+        .value("direct", read_method::direct)
+        .value("io_uring", read_method::io_uring);
+
+    py::class_<file_reader>(m, "FileReader")
+        .def(py::init<std::string const &, read_method>(), py::arg("path"), py::arg("method") = read_method::pread)
+        .def_property_readonly("size", &file_reader::size)
+        .def_property_readonly("method", &file_reader::method)
+        .def(
+            "read_into",
+            [](file_reader &reader, py::buffer out, std::size_t offset) {
+                auto info = out.request(true);
+                auto bytes = contiguous_bytes(info);
+
+                py::gil_scoped_release release;
+                return reader.read(offset, bytes.first, bytes.second);
+            },
+            "Reads into a writable C-contiguous buffer, returns the number of bytes read.", py::arg("out"),
+            py::arg("offset") = 0)
+        .def(
+            "read_pinned",
+            [](file_reader &reader, std::size_t offset, std::size_t nbytes) {
+                const auto count = offset < reader.size() ? std::min(nbytes, reader.size() - offset) : 0;
+
+                // Allocated uninitialized, the read is the first touch
+                py::gil_scoped_release release;
+                auto vec = std::make_unique<py_pinned_vector<int8_t>>();
+                vec->resize(count);
+                reader.read(offset, vec->data(), count);
+                return vec;
+            },
+            "Reads up to nbytes into a new PinnedI8Vector.", py::arg("offset"), py::arg("nbytes"));
+}
+
+void init_host_mapping(py::module &m)
+{
+    py::enum_<huge_pages>(m, "HugePages")
+        .value("none", huge_pages::none)
+        .value("transparent", huge_pages::transparent)
+        .value("explicit_2m", huge_pages::explicit_2m)
+        .value("explicit_1g", huge_pages::explicit_1g);
+
+    m.def(
+        "huge_pages_of",
+        [](py::buffer buffer) {
+            auto info = buffer.request();
+            return huge_pages_of(info.ptr);
+        },
+        "Huge pages actually backing the buffer.", py::arg("buffer"));
+
+    py::enum_<numa_mode>(m, "NumaMode")
+        .value("local", numa_mode::local)
+        .value("bind", numa_mode::bind)
+        .value("preferred", numa_mode::preferred)
+        .value("interleave", numa_mode::interleave);
+
+    py::class_<numa_policy>(m, "NumaPolicy")
+        .def(py::init<>())
+        .def_readonly("mode", &numa_policy::mode)
+        .def_readonly("node", &numa_policy::node)
+        .def_static("bind", &numa_policy::bind, py::arg("node"))
+        .def_static("preferred", &numa_policy::preferred, py::arg("node"))
+        .def_static("interleave", &numa_policy::interleave)
+        .def_static("local_to_device", &numa_policy::local_to_device, py::arg("device"))
+        .def(py::self == py::self)
+        .def(py::self != py::self)
+        .def(py::pickle([](numa_policy const &policy) { return py::make_tuple(policy.mode, policy.node); },
+                        [](py::tuple state) { return numa_policy{state[0].cast<numa_mode>(), state[1].cast<int>()}; }))
+        .def("__repr__", [](numa_policy const &policy) {
+            auto mode = py::cast(policy.mode).attr("name").cast<std::string>();
+            auto repr = std::ostringstream{};
+            repr << "NumaPolicy(" << mode;
+            if (policy.node >= 0)
+                repr << ", node=" << policy.node;
+            repr << ")";
+            return repr.str();
+        });
+
+    m.def("numa_nodes", [] {
+        auto const &nodes = numa_nodes();
+        py::tuple result(nodes.size());
+        for (std::size_t i = 0; i < nodes.size(); ++i)
+            result[i] = nodes[i];
+        return result;
+    });
+    m.def("numa_node_of_device", &numa_node_of_device, py::arg("device"));
+    m.def(
+        "numa_node_of",
+        [](py::buffer buffer) {
+            auto info = buffer.request();
+            return numa_node_of(info.ptr);
+        },
+        "Node holding the first page of the buffer, -1 if not known.", py::arg("buffer"));
+}
+
+auto allocation_stats_dict(allocation_stats const &stats) -> py::dict
+{
+    py::dict result;
+    result["live_bytes"] = stats.live_bytes;
+    result["peak_bytes"] = stats.peak_bytes;
+    result["allocations"] = stats.allocations;
+    result["frees"] = stats.frees;
+    result["allocated_bytes"] = stats.allocated_bytes;
+    result["freed_bytes"] = stats.freed_bytes;
+    result["allocate_seconds"] = stats.allocate_seconds;
+    result["free_seconds"] = stats.free_seconds;
+    // Allocations of up to size bytes by size, empty buckets left out
+    py::dict histogram;
+    for (std::size_t bucket = 0; bucket < stats.histogram.size(); ++bucket) {
+        if (stats.histogram[bucket])
+            histogram[py::int_(std::size_t{1} << bucket)] = stats.histogram[bucket];
+    }
+    result["histogram"] = histogram;
+    return result;
+}
+
+void init_host_alloc_flags(py::module &m)
+{
+    py::class_<host_alloc_flags>(m, "HostAllocFlags")
+        .def(py::init([](bool portable, bool mapped, bool write_combined) {
+                 return host_alloc_flags{portable, mapped, write_combined};
+             }),
+             py::arg("portable") = false, py::arg("mapped") = false, py::arg("write_combined") = false)
+        .def_readonly("portable", &host_alloc_flags::portable)
+        .def_readonly("mapped", &host_alloc_flags::mapped)
+        .def_readonly("write_combined", &host_alloc_flags::write_combined)
+        .def(py::self == py::self)
+        .def(py::self != py::self)
+        .def(py::pickle(
+            [](host_alloc_flags const &flags) {
+                return py::make_tuple(flags.portable, flags.mapped, flags.write_combined);
+            },
+            [](py::tuple state) {
+                return host_alloc_flags{state[0].cast<bool>(), state[1].cast<bool>(), state[2].cast<bool>()};
+            }));
+}
+
+void init_pinned_budget(py::module &m)
+{
+    py::enum_<budget_policy>(m, "BudgetPolicy")
+        .value("fail", budget_policy::fail)
+        .value("block", budget_policy::block)
+        .value("pageable", budget_policy::pageable);
+
+    m.def(
+        "set_pinned_budget",
+        [](std::size_t limit_bytes, budget_policy policy, double timeout_seconds) {
+            const auto timeout = std::chrono::duration<double>{timeout_seconds};
+            pinned_budget::instance().configure(
+                {limit_bytes, policy, std::chrono::duration_cast<std::chrono::milliseconds>(timeout)});
+        },
+        py::arg("limit_bytes"), py::arg("policy"), py::arg("timeout_seconds"));
+    m.def("get_pinned_budget", [] {
+        auto options = pinned_budget::instance().options();
+        py::dict result;
+        result["limit_bytes"] = options.limit_bytes;
+        result["policy"] = options.policy;
+        result["timeout_seconds"] = std::chrono::duration<double>{options.timeout}.count();
+        return result;
+    });
+    m.def("pinned_budget_stats", [] {
+        auto stats = pinned_budget::instance().stats();
+        py::dict result;
+        result["pinned_bytes"] = stats.pinned_bytes;
+        result["fallbacks"] = stats.fallbacks;
+        result["fallback_bytes"] = stats.fallback_bytes;
+        result["waits"] = stats.waits;
+        result["failures"] = stats.failures;
+        return result;
+    });
+}
+
+void init_allocation_stats(py::module &m)
+{
+    m.def(
+        "memory_stats",
+        [](std::string const &kind) {
+            auto result = allocation_stats_dict(memory_stats(kind));
+            py::dict tags;
+            for (auto const &[tag, stats] : memory_stats_by_tag(kind))
+                tags[py::str(tag)] = allocation_stats_dict(stats);
+            result["tags"] = tags;
+            return result;
+        },
+        py::arg("kind"));
+    m.def("reset_peak_stats", &reset_peak_stats);
+
+    // Python has no scopes, the tag lives from __enter__ to __exit__
+    struct tag_scope {
+        std::string tag;
+        std::unique_ptr<allocation_tag> scope;
+    };
+    py::class_<tag_scope>(m, "AllocationTag")
+        .def(py::init([](std::string tag) { return tag_scope{std::move(tag), nullptr}; }), py::arg("tag"))
+        .def_readonly("tag", &tag_scope::tag)
+        .def("__enter__",
+             [](tag_scope &self) -> tag_scope & {
+                 if (self.scope)
+                     throw std::logic_error{"AllocationTag: already entered."};
+                 self.scope = std::make_unique<allocation_tag>(self.tag);
+                 return self;
+             })
+        .def("__exit__", [](tag_scope &self, py::args) { self.scope.reset(); });
+    m.def("current_allocation_tag", &allocation_tag::current);
+}
+
+/* Gathers many small buffers into one, see parallel_collate. Offsets are in
+ * bytes, the buffers are checked with the GIL held and copied without it. */
+void init_collate(py::module &m)
+{
+    m.def(
+        "collate_into",
+        [](py::sequence sources, py::array_t<int64_t, py::array::c_style | py::array::forcecast> offsets,
+           py::buffer out, py::bytes pad) {
+            const auto count = static_cast<std::size_t>(py::len(sources));
+            if (static_cast<std::size_t>(offsets.size()) != count + 1)
+                throw py::value_error("Expected one offset more than sources.");
+
+            auto infos = std::vector<py::buffer_info>{};
+            auto spans = std::vector<byte_span>{};
+            infos.reserve(count);
+            for (std::size_t i = 0; i < count; ++i) {
+                infos.push_back(sources[i].cast<py::buffer>().request());
+                auto bytes = contiguous_bytes(infos.back());
+                spans.push_back({bytes.first, bytes.second});
+            }
+            auto byte_offsets = std::vector<std::size_t>{};
+            for (std::size_t i = 0; i <= count; ++i) {
+                if (offsets.data()[i] < 0)
+                    throw py::value_error("Offsets must not be negative.");
+                byte_offsets.push_back(static_cast<std::size_t>(offsets.data()[i]));
+            }
+            auto out_info = out.request(true);
+            auto out_bytes = contiguous_bytes(out_info);
+            if (byte_offsets.back() > out_bytes.second)
+                throw py::value_error("The output buffer is smaller than the slots.");
+            const auto pattern = std::string{pad};
+
+            py::gil_scoped_release release;
+            parallel_collate(spans.data(), count, byte_offsets.data(), out_bytes.first, pattern.data(), pattern.size());
+        },
+        "Copies the C-contiguous sources into out at the byte offsets, padding the rest of each slot with pad.",
+        py::arg("sources"), py::arg("offsets"), py::arg("out"), py::arg("pad") = py::bytes());
+}
+
+/* Decompresses independent frames into one buffer, see parallel_decompress.
+ * Offsets are in bytes, the buffers are checked with the GIL held and
+ * decompressed without it. */
+void init_decompress(py::module &m)
+{
+    m.def(
+        "decompress_into",
+        [](py::sequence frames, py::array_t<int64_t, py::array::c_style | py::array::forcecast> offsets, py::buffer out,
+           std::string const &codec_name) {
+            const auto decoder = find_codec(codec_name);
+            const auto count = static_cast<std::size_t>(py::len(frames));
+            if (static_cast<std::size_t>(offsets.size()) != count + 1)
+                throw py::value_error("Expected one offset more than frames.");
+
+            auto infos = std::vector<py::buffer_info>{};
+            auto spans = std::vector<byte_span>{};
+            infos.reserve(count);
+            for (std::size_t i = 0; i < count; ++i) {
+                infos.push_back(frames[i].cast<py::buffer>().request());
+                auto bytes = contiguous_bytes(infos.back());
+                spans.push_back({bytes.first, bytes.second});
+            }
+            auto byte_offsets = std::vector<std::size_t>{};
+            for (std::size_t i = 0; i <= count; ++i) {
+                if (offsets.data()[i] < 0)
+                    throw py::value_error("Offsets must not be negative.");
+                byte_offsets.push_back(static_cast<std::size_t>(offsets.data()[i]));
+            }
+            auto out_info = out.request(true);
+            auto out_bytes = contiguous_bytes(out_info);
+            if (byte_offsets.back() > out_bytes.second)
+                throw py::value_error("The output buffer is smaller than the slots.");
+
+            py::gil_scoped_release release;
+            parallel_decompress(*decoder, spans.data(), count, byte_offsets.data(), out_bytes.first);
+        },
+        "Decompresses the frames into out at the byte offsets, each frame filling its slot exactly.", py::arg("frames"),
+        py::arg("offsets"), py::arg("out"), py::arg("codec"));
+    m.def(
+        "decompressed_size",
+        [](py::buffer frame, std::string const &codec_name) -> py::object {
+            auto info = frame.request();
+            auto bytes = contiguous_bytes(info);
+            auto size = find_codec(codec_name)->decompressed_size(bytes.first, bytes.second);
+            return size ? py::object(py::int_(*size)) : py::object(py::none());
+        },
+        "Decompressed size recorded in the frame, None for formats not recording it.", py::arg("frame"),
+        py::arg("codec"));
+    m.def("codec_names", [] {
+        py::list names;
+        for (auto const &name : codec_names())
+            names.append(name);
+        return names;
+    });
+}
+
+/* Explicit CUDA initialization, nothing of the module touches CUDA before the
+ * first pinned allocation otherwise */
+void init_cuda(py::module &m)
+{
+    m.def("cuda_init", &cuda_init, py::call_guard<py::gil_scoped_release>(), py::arg("device") = -1);
+    m.def(
+        "cuda_init_async",
+        [](int device) {
+            return async_result<double>::run(background_queue::instance(), [device] {
+                cuda_init(device);
+                return get_cuda_init_stats().seconds;
+            });
+        },
+        "cuda_init() on the background queue, the result is the time it took.", py::arg("device") = -1);
+    def_future<double>(m, "CudaInitFuture");
+    m.def("cuda_initialized", &cuda_initialized);
+    m.def("cuda_init_stats", [] {
+        auto stats = get_cuda_init_stats();
+        py::dict result;
+        result["initialized"] = stats.initialized;
+        result["implicit"] = stats.implicit;
+        result["device"] = stats.device;
+        result["seconds"] = stats.seconds;
+        return result;
+    });
+}
+
+/* Range of Python code in the trace, entered and exited on one thread */
+struct py_trace_range {
+    py_trace_range(std::string const &name, std::size_t nbytes) : name{intern_trace_name(name)}, bytes{nbytes} {}
+
+    char const *name;
+    std::size_t bytes;
+    std::optional<trace_scope> scope;
+};
+
+void init_tracing(py::module &m)
+{
+    m.def("start_tracing", &start_tracing, py::arg("max_events_per_thread") = std::size_t{1} << 16);
+    m.def("stop_tracing", &stop_tracing);
+    m.def("tracing_enabled", &tracing_enabled);
+    m.def("dropped_trace_events", &dropped_trace_events);
+    m.def(
+        "collect_trace",
+        [] {
+            auto events = collect_trace();
+            py::list result;
+            for (auto const &event : events) {
+                result.append(py::make_tuple(event.name, event.category,
+                                             event.tag ? py::object(py::str(event.tag)) : py::object(py::none()),
+                                             event.bytes, event.begin_ns, event.end_ns, event.thread));
+            }
+            return result;
+        },
+        "Events as (name, category, tag, bytes, begin_ns, end_ns, thread) tuples ordered by begin.");
+
+    py::class_<py_trace_range>(m, "TraceRange")
+        .def(py::init<std::string const &, std::size_t>(), py::arg("name"), py::arg("nbytes") = 0)
+        .def("__enter__",
+             [](py_trace_range &range) -> py_trace_range & {
+                 range.scope.emplace(range.name, "python", range.bytes);
+                 return range;
+             })
+        .def("__exit__", [](py_trace_range &range, py::args) { range.scope.reset(); });
+}
+
+auto copy_tuning_dict(copy_tuning const &tuning) -> py::dict
+{
+    py::dict result;
+    result["num_threads"] = tuning.num_threads;
+    result["grain_bytes"] = tuning.grain_bytes;
+    result["nontemporal_threshold"] = tuning.nontemporal_threshold;
+    return result;
+}
+
+auto size_vector(py::object sizes) -> std::vector<std::size_t>
+{
+    auto result = std::vector<std::size_t>{};
+    for (auto size : sizes)
+        result.push_back(size.cast<std::size_t>());
+    return result;
+}
+
+/* Sweeps of the copy parameters, the per-host profiles are kept in Python */
+void init_autotune(py::module &m)
+{
+    m.def(
+        "autotune_copies",
+        [](std::size_t buffer_bytes, py::object thread_counts, py::object grains, py::object alignments,
+           std::size_t repeats, bool pinned) {
+            auto options = tuning_options{};
+            options.buffer_bytes = buffer_bytes;
+            if (!thread_counts.is_none())
+                options.thread_counts = size_vector(thread_counts);
+            if (!grains.is_none())
+                options.grains = size_vector(grains);
+            if (!alignments.is_none())
+                options.alignments = size_vector(alignments);
+            options.repeats = repeats;
+            options.pinned = pinned;
+
+            auto tuned = [&] {
+                py::gil_scoped_release release;
+                return autotune_copies(options);
+            }();
+
+            py::list trials;
+            for (auto const &trial : tuned.trials) {
+                py::dict entry;
+                entry["step"] = trial.step;
+                entry["num_threads"] = trial.num_threads;
+                entry["grain_bytes"] = trial.grain_bytes;
+                entry["nbytes"] = trial.bytes;
+                entry["alignment"] = trial.alignment;
+                entry["streaming"] = trial.streaming;
+                entry["seconds"] = trial.seconds;
+                trials.append(entry);
+            }
+            py::dict result;
+            result["best"] = copy_tuning_dict(tuned.best);
+            result["trials"] = trials;
+            return result;
+        },
+        "Times the parallel copies and fills, see autotune_copies(). The tuning is not applied.",
+        py::arg("buffer_bytes") = tuning_options{}.buffer_bytes, py::arg("thread_counts") = py::none(),
+        py::arg("grains") = py::none(), py::arg("alignments") = py::none(),
+        py::arg("repeats") = tuning_options{}.repeats, py::arg("pinned") = false);
+    m.def("get_copy_tuning", [] { return copy_tuning_dict(get_copy_tuning()); });
+    m.def(
+        "set_copy_tuning",
+        [](std::size_t num_threads, std::size_t grain_bytes, std::size_t nontemporal_threshold) {
+            set_copy_tuning({num_threads, grain_bytes, nontemporal_threshold});
+        },
+        py::arg("num_threads"), py::arg("grain_bytes"), py::arg("nontemporal_threshold"));
+    m.def("host_key", &host_key);
+}
+
 PYBIND11_MODULE(playground_bindings, m)
 {
-    init_pageable_vector<int8_t>(m, "PageableI8Vector");
-    init_pinned_vector<int8_t>(m, "PinnedI8Vector");
+    py::enum_<fill_mode>(m, "FillMode")
+        .value("uninitialized", fill_mode::uninitialized)
+        .value("zeros", fill_mode::zeros)
+        .value("constant", fill_mode::constant)
+        .value("iota", fill_mode::iota)
+        .value("copy", fill_mode::copy);
+
+    m.def("set_num_threads", &set_num_threads, py::arg("num_threads"));
+    m.def("get_num_threads", &get_num_threads);
+    m.def("set_nontemporal_threshold", &set_nontemporal_threshold, py::arg("num_bytes"));
+    m.def("get_nontemporal_threshold", &get_nontemporal_threshold);
+    m.def("set_parallel_grain", &set_parallel_grain, py::arg("num_bytes"));
+    m.def("get_parallel_grain", &get_parallel_grain);
+
+    init_allocation_stats(m);
+    init_tracing(m);
+    init_cuda(m);
+    init_autotune(m);
+    init_pinned_budget(m);
+    init_host_alloc_flags(m);
+    init_host_mapping(m);
+    // Result of WarmPool.reserve_async(), the number of warm vectors
+    def_future<std::size_t>(m, "ReserveFuture");
+
+    init_vectors<int8_t>(m, "I8");
+    init_vectors<uint8_t>(m, "U8");
+    init_vectors<int16_t>(m, "I16");
+    init_vectors<uint16_t>(m, "U16");
+    init_vectors<int32_t>(m, "I32");
+    init_vectors<uint32_t>(m, "U32");
+    init_vectors<int64_t>(m, "I64");
+    init_vectors<uint64_t>(m, "U64");
+    init_vectors<float16>(m, "F16");
+    init_vectors<bfloat16>(m, "BF16");
+    init_vectors<float>(m, "F32");
+    init_vectors<double>(m, "F64");
+
+    init_ring_buffer<budgeted<cuda_host_backing>>(m, "CudaHostRingBuffer");
+    init_ring_buffer<host_backing>(m, "HostRingBuffer");
+
+    init_collate(m);
+    init_decompress(m);
+
+    init_transfer_engine(m);
+
+    init_file_reader(m);
+
+    init_pinned_view<budgeted<cuda_host_backing>>(m, "CudaHost");
+    init_pinned_view<host_backing>(m, "Host");
+
+    py::enum_<shared_memory_kind>(m, "SharedMemoryKind")
+        .value("memfd", shared_memory_kind::memfd)
+        .value("posix", shared_memory_kind::posix);
+    init_shared_buffer<budgeted<cuda_host_backing>>(m, "CudaHost");
+    init_shared_buffer<host_backing>(m, "Host");
+
+    init_growable_buffer<budgeted<cuda_host_backing>>(m, "CudaHost");
+    init_growable_buffer<host_backing>(m, "Host");
+
+    init_arena<budgeted<cuda_host_backing>>(m, "CudaHost");
+    init_arena<host_backing>(m, "Host");
 }
 
 } // namespace playground
@@ -0,0 +1,137 @@
+#ifndef THATSZUCS_PLAYGROUND_DLPACK_UTILS_H
+#define THATSZUCS_PLAYGROUND_DLPACK_UTILS_H
+
+#include "playground/half.h"
+
+#include <pybind11/pybind11.h>
+
+#include <cstdint>
+#include <type_traits>
+#include <vector>
+
+namespace py = pybind11;
+
+namespace playground {
+
+/* The parts of the DLPack ABI (https://github.com/dmlc/dlpack, v0.8) needed to
+ * export a host buffer. Layouts must match dlpack.h exactly. */
+namespace dlpack {
+
+enum DLDeviceType : int32_t {
+    kDLCPU = 1,
+    kDLCUDA = 2,
+    kDLCUDAHost = 3, // Page-locked host memory, called kDLCPUPinned before v0.6
+};
+
+enum DLDataTypeCode : uint8_t {
+    kDLInt = 0,
+    kDLUInt = 1,
+    kDLFloat = 2,
+    kDLBfloat = 4,
+};
+
+struct DLDevice {
+    DLDeviceType device_type;
+    int32_t device_id;
+};
+
+struct DLDataType {
+    uint8_t code;
+    uint8_t bits;
+    uint16_t lanes;
+};
+
+struct DLTensor {
+    void *data;
+    DLDevice device;
+    int32_t ndim;
+    DLDataType dtype;
+    int64_t *shape;
+    int64_t *strides; // In elements, not bytes
+    uint64_t byte_offset;
+};
+
+struct DLManagedTensor {
+    DLTensor dl_tensor;
+    void *manager_ctx;
+    void (*deleter)(DLManagedTensor *self);
+};
+
+} // namespace dlpack
+
+template <typename T>
+auto dl_data_type() -> dlpack::DLDataType
+{
+    static_assert(std::is_arithmetic<T>::value, "DLPack export needs an arithmetic type.");
+    const auto code = std::is_floating_point<T>::value ? dlpack::kDLFloat
+                      : std::is_signed<T>::value       ? dlpack::kDLInt
+                                                       : dlpack::kDLUInt;
+    return {static_cast<uint8_t>(code), static_cast<uint8_t>(sizeof(T) * 8), 1};
+}
+
+template <>
+inline auto dl_data_type<float16>() -> dlpack::DLDataType
+{
+    return {dlpack::kDLFloat, 16, 1};
+}
+
+template <>
+inline auto dl_data_type<bfloat16>() -> dlpack::DLDataType
+{
+    return {dlpack::kDLBfloat, 16, 1};
+}
+
+/* Keeps the owner of the memory alive for as long as the consumer holds the
+ * tensor */
+struct dl_context {
+    py::object owner;
+    std::vector<int64_t> shape;
+    std::vector<int64_t> strides;
+    dlpack::DLManagedTensor tensor;
+};
+
+/* Wraps memory owned by owner into a "dltensor" capsule, see
+ * https://dmlc.github.io/dlpack/latest/python_spec.html */
+inline py::capsule to_dlpack(void *data,
+                             dlpack::DLDataType dtype,
+                             std::vector<int64_t> shape,
+                             std::vector<int64_t> strides,
+                             dlpack::DLDevice device,
+                             py::object owner)
+{
+    auto *ctx = new dl_context{std::move(owner), std::move(shape), std::move(strides), {}};
+    ctx->tensor.dl_tensor.data = data;
+    ctx->tensor.dl_tensor.device = device;
+    ctx->tensor.dl_tensor.ndim = static_cast<int32_t>(ctx->shape.size());
+    ctx->tensor.dl_tensor.dtype = dtype;
+    ctx->tensor.dl_tensor.shape = ctx->shape.data();
+    ctx->tensor.dl_tensor.strides = ctx->strides.data();
+    ctx->tensor.dl_tensor.byte_offset = 0;
+    ctx->tensor.manager_ctx = ctx;
+    ctx->tensor.deleter = [](dlpack::DLManagedTensor *self) {
+        // Consumers may call the deleter from any thread
+        py::gil_scoped_acquire gil;
+        delete static_cast<dl_context *>(self->manager_ctx);
+    };
+
+    return py::capsule(&ctx->tensor, "dltensor", [](PyObject *capsule) {
+        // A consumer renames the capsule to "used_dltensor" and takes over
+        // ownership, otherwise it is ours to delete.
+        if (PyCapsule_IsValid(capsule, "dltensor")) {
+            auto *tensor = static_cast<dlpack::DLManagedTensor *>(PyCapsule_GetPointer(capsule, "dltensor"));
+            tensor->deleter(tensor);
+        }
+    });
+}
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
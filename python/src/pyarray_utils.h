@@ -1,33 +1,194 @@
 #ifndef THATSZUCS_PLAYGROUND_PYARRAY_UTILS_H
 #define THATSZUCS_PLAYGROUND_PYARRAY_UTILS_H
 
+#include "playground/half.h"
 #include "playground/pinned_vector.h"
 
 #include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <utility>
 #include <vector>
 
 namespace py = pybind11;
 
 namespace playground {
 
+/* Buffer protocol format of the element types. The protocol has no bfloat16,
+ * its raw bits are exposed as uint16. */
 template <typename T>
-py::array_t<T> as_numpy(const std::vector<T> &myvec)
+std::string format_of()
 {
-    return py::array_t<T>({myvec.size()}, // Shape
-                          {sizeof(T)},    // Stride
-                          myvec.data(),   // Data pointer
-                          py::none());
+    return py::format_descriptor<T>::format();
 }
 
+template <>
+inline std::string format_of<float16>()
+{
+    return "e";
+}
+
+template <>
+inline std::string format_of<bfloat16>()
+{
+    return "H";
+}
+
+/* NumPy dtype of the element types. NumPy has no bfloat16 either, it is taken
+ * from ml_dtypes when installed, uint16 otherwise. */
 template <typename T>
-py::array_t<T> as_numpy(const std::vector<T, pinned_alloc<T>> &myvec)
+py::dtype numpy_dtype()
+{
+    return py::dtype(format_of<T>());
+}
+
+template <>
+inline py::dtype numpy_dtype<bfloat16>()
+{
+    try {
+        return py::dtype::from_args(py::module::import("ml_dtypes").attr("bfloat16"));
+    }
+    catch (py::error_already_set &) {
+        return py::dtype(format_of<bfloat16>());
+    }
+}
+
+/* Converts a shape or strides sequence. pybind11/stl.h is not used, because
+ * its std::vector caster would take over the bound vector classes. */
+inline std::vector<py::ssize_t> to_ssize_vector(py::handle sequence)
+{
+    auto result = std::vector<py::ssize_t>{};
+    for (auto item : sequence)
+        result.push_back(item.cast<py::ssize_t>());
+    return result;
+}
+
+/* Strides in bytes of a C-contiguous array */
+inline std::vector<py::ssize_t> c_strides(std::vector<py::ssize_t> const &shape, std::size_t itemsize)
+{
+    auto strides = std::vector<py::ssize_t>(shape.size());
+    auto stride = static_cast<py::ssize_t>(itemsize);
+    for (auto dim = shape.size(); dim-- > 0;) {
+        strides[dim] = stride;
+        stride *= shape[dim];
+    }
+    return strides;
+}
+
+/* Throws unless an array of shape and strides (in bytes) fits into nbytes */
+inline void check_view(std::vector<py::ssize_t> const &shape,
+                       std::vector<py::ssize_t> const &strides,
+                       std::size_t itemsize,
+                       std::size_t nbytes)
+{
+    if (shape.size() != strides.size())
+        throw py::value_error("Shape and strides must have the same length.");
+
+    auto extent = static_cast<py::ssize_t>(itemsize);
+    for (std::size_t dim = 0; dim < shape.size(); ++dim) {
+        if (shape[dim] < 0 || strides[dim] < 0)
+            throw py::value_error("Shape and strides must not be negative.");
+        if (shape[dim] == 0)
+            return;
+        extent += (shape[dim] - 1) * strides[dim];
+    }
+    if (static_cast<std::size_t>(extent) > nbytes)
+        throw py::value_error("The array does not fit into the vector.");
+}
+
+/* View of the vector as a NumPy array without copying. The array keeps base
+ * (the Python object owning the vector) alive. */
+template <typename T, typename Alloc>
+py::array as_numpy(const std::vector<T, Alloc> &myvec,
+                   py::handle base,
+                   std::vector<py::ssize_t> shape,
+                   std::vector<py::ssize_t> strides)
+{
+    check_view(shape, strides, sizeof(T), myvec.size() * sizeof(T));
+    return py::array(numpy_dtype<T>(), // Data type
+                     shape,            // Shape
+                     strides,          // Stride
+                     myvec.data(),     // Data pointer
+                     base);
+}
+
+template <typename T, typename Alloc>
+py::array as_numpy(const std::vector<T, Alloc> &myvec, py::handle base)
+{
+    return as_numpy(myvec, base, {static_cast<py::ssize_t>(myvec.size())}, {sizeof(T)});
+}
+
+template <typename T, typename Alloc>
+py::buffer_info as_buffer_info(std::vector<T, Alloc> &myvec)
+{
+    return py::buffer_info(myvec.data(),                             // Data pointer
+                           sizeof(T),                                // Item size
+                           format_of<T>(),                           // Format
+                           1,                                        // Dimensions
+                           {static_cast<py::ssize_t>(myvec.size())}, // Shape
+                           {static_cast<py::ssize_t>(sizeof(T))});   // Stride
+}
+
+/* NumPy array interface, version 3 */
+template <typename T, typename Alloc>
+py::dict as_array_interface(const std::vector<T, Alloc> &myvec)
+{
+    py::dict interface;
+    interface["shape"] = py::make_tuple(myvec.size());
+    interface["typestr"] = py::dtype(format_of<T>()).attr("str");
+    interface["data"] = py::make_tuple(reinterpret_cast<std::uintptr_t>(myvec.data()), false);
+    interface["version"] = 3;
+    return interface;
+}
+
+/* Calls fn(T{}) with the element type T of dtype, raises TypeError for
+ * dtypes without one */
+template <typename Fn>
+void visit_dtype(py::dtype const &dtype, Fn &&fn)
+{
+    if (py::str(dtype.attr("name")).cast<std::string>() == "bfloat16")
+        return fn(bfloat16{});
+
+    const auto kind = py::str(dtype.attr("kind")).cast<std::string>();
+    const auto itemsize = dtype.attr("itemsize").cast<py::ssize_t>();
+    if (kind == "i" && itemsize == 1)
+        return fn(int8_t{});
+    if (kind == "i" && itemsize == 2)
+        return fn(int16_t{});
+    if (kind == "i" && itemsize == 4)
+        return fn(int32_t{});
+    if (kind == "i" && itemsize == 8)
+        return fn(int64_t{});
+    if (kind == "u" && itemsize == 1)
+        return fn(uint8_t{});
+    if (kind == "u" && itemsize == 2)
+        return fn(uint16_t{});
+    if (kind == "u" && itemsize == 4)
+        return fn(uint32_t{});
+    if (kind == "u" && itemsize == 8)
+        return fn(uint64_t{});
+    if (kind == "f" && itemsize == 2)
+        return fn(float16{});
+    if (kind == "f" && itemsize == 4)
+        return fn(float{});
+    if (kind == "f" && itemsize == 8)
+        return fn(double{});
+    throw py::type_error("Unsupported dtype " + py::str(dtype.attr("name")).cast<std::string>() + ".");
+}
+
+/* Data pointer and size in bytes of a C-contiguous buffer */
+inline std::pair<void *, std::size_t> contiguous_bytes(py::buffer_info const &info)
 {
-    return py::array_t<T>({myvec.size()}, // Shape
-                          {sizeof(T)},    // Stride
-                          myvec.data(),   // Data pointer
-                          py::none());
+    py::ssize_t expected_stride = info.itemsize;
+    for (auto dim = info.ndim; dim-- > 0;) {
+        if (info.shape[dim] != 1 && info.strides[dim] != expected_stride)
+            throw py::value_error("Expected a C-contiguous buffer.");
+        expected_stride *= info.shape[dim];
+    }
+    return {info.ptr, static_cast<std::size_t>(info.size * info.itemsize)};
 }
 
 } // namespace playground
@@ -1,22 +1,1577 @@
+import contextlib
+import math
+import os
+import warnings
+import weakref
+
 import numpy as np
 import playground_bindings as cpp
 
+# Modules slow to import (asyncio, concurrent.futures, ...) are imported where
+# they are needed, so processes that never use them start faster
+
+# NumPy dtype names and the suffixes of the bound classes. NumPy has no
+# bfloat16, its arrays use ml_dtypes.bfloat16 when installed, uint16 otherwise.
+_DTYPES = {
+    "int8": "I8",
+    "uint8": "U8",
+    "int16": "I16",
+    "uint16": "U16",
+    "int32": "I32",
+    "uint32": "U32",
+    "int64": "I64",
+    "uint64": "U64",
+    "float16": "F16",
+    "bfloat16": "BF16",
+    "float32": "F32",
+    "float64": "F64",
+}
+
+
+def set_num_threads(num_threads: int) -> None:
+    """Sets the number of threads used for filling and copying, 0 means one per
+    hardware thread."""
+    cpp.set_num_threads(num_threads)
+
+
+def get_num_threads() -> int:
+    return cpp.get_num_threads()
+
+
+def set_nontemporal_threshold(num_bytes: int) -> None:
+    """Sets the size from which copies bypass the caches with non-temporal
+    stores, 0 disables them."""
+    cpp.set_nontemporal_threshold(num_bytes)
+
+
+def get_nontemporal_threshold() -> int:
+    return cpp.get_nontemporal_threshold()
+
+
+def set_parallel_grain(num_bytes: int) -> None:
+    """Sets the minimum number of bytes the copies and fills hand to a separate
+    thread, 0 restores the default of 1 MiB."""
+    cpp.set_parallel_grain(num_bytes)
+
+
+def get_parallel_grain() -> int:
+    return cpp.get_parallel_grain()
+
+
+def host_key() -> str:
+    """The CPU model, numbers of hardware threads and NUMA nodes and memory
+    size of this machine, which the copy profiles are keyed by."""
+    return cpp.host_key()
+
+
+def copy_tuning() -> dict:
+    """The number of threads, parallel grain and non-temporal threshold in use"""
+    return cpp.get_copy_tuning()
+
+
+def _profile_path(path=None):
+    """Path of the copy profiles, None when disabled by an empty
+    PYPLAYGROUND_PROFILE."""
+    if path is not None:
+        return os.fspath(path)
+    path = os.environ.get("PYPLAYGROUND_PROFILE")
+    if path is not None:
+        return path or None
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "pyplayground", "copy_profiles.json")
+
+
+def _read_profiles(path) -> dict:
+    import json
+
+    try:
+        with open(path) as f:
+            profiles = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if not isinstance(profiles, dict):
+        raise ValueError(f"{path} does not hold copy profiles.")
+    return profiles
+
+
+def autotune(
+    buffer_bytes: int = 64 * 1024**2,
+    pinned: bool = False,
+    repeats: int = 3,
+    thread_counts=None,
+    grains=None,
+    alignments=None,
+    save: bool = True,
+    apply: bool = True,
+    path=None,
+) -> dict:
+    """Times the copies and fills of buffer_bytes for thread counts, parallel
+    grains and buffer alignments, and the non-temporal stores from 1 MiB up,
+    which takes seconds. The fastest tuning is applied, and saved as the
+    profile of this host, which is loaded on import from then on. Copies go
+    into pageable memory unless pinned, so the sweep needs no GPU. Returns the
+    tuning as "best" and every timing as "trials"."""
+    result = cpp.autotune_copies(buffer_bytes, thread_counts, grains, alignments, repeats, pinned)
+    if apply:
+        best = result["best"]
+        cpp.set_copy_tuning(best["num_threads"], best["grain_bytes"], best["nontemporal_threshold"])
+    path = _profile_path(path)
+    if save and path is not None:
+        import json
+        import time
+
+        profiles = _read_profiles(path)
+        profiles[host_key()] = dict(result["best"], buffer_bytes=buffer_bytes, pinned=pinned, created=time.time())
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Replaced in one step, concurrent imports read the old or new file
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(profiles, f, indent=2)
+        os.replace(temporary, path)
+    return result
+
+
+def load_host_profile(path=None):
+    """Applies the copy profile autotune() saved for this host, returns it or
+    None when there is none. Called on import with the default path, see
+    PYPLAYGROUND_PROFILE."""
+    path = _profile_path(path)
+    if path is None or not os.path.exists(path):
+        return None
+    profile = _read_profiles(path).get(host_key())
+    if profile is None:
+        return None
+    cpp.set_copy_tuning(profile["num_threads"], profile["grain_bytes"], profile["nontemporal_threshold"])
+    return profile
+
+
+try:
+    load_host_profile()
+except (OSError, ValueError, KeyError, TypeError) as error:
+    warnings.warn(f"Ignoring the copy profile: {error}")
+
+
+_MEMORY_KINDS = ("pinned", "pageable")
+
+
+def memory_stats(kind: str = "pinned") -> dict:
+    """Live and peak bytes of the vectors and ring buffers of a kind of memory,
+    their allocations and frees, the time spent allocating and freeing (e.g. in
+    cudaMallocHost and cudaFreeHost), a histogram of allocations of up to so
+    many bytes and the same per tag, see memory_tag."""
+    if kind not in _MEMORY_KINDS:
+        kinds = ", ".join(_MEMORY_KINDS)
+        raise ValueError(f"Unknown memory kind '{kind}', expected one of {kinds}.")
+    return cpp.memory_stats(kind)
+
+
+def reset_peak_stats() -> None:
+    """Restarts the peak bytes of every kind and tag from their live bytes."""
+    cpp.reset_peak_stats()
+
+
+def set_pinned_budget(limit_bytes: int = 0, policy: str = "fail", timeout: float = None) -> None:
+    """Limits the pinned memory of all pinned vectors to limit_bytes, 0 for no
+    limit besides what cudaMallocHost manages. policy says what happens to
+    allocations beyond the budget, or that cudaMallocHost fails: "fail"
+    (raise RuntimeError), "block" (wait until pinned memory is released,
+    raise after timeout seconds unless it is None) or "pageable" (allocate
+    pageable memory instead, see the is_pinned property of the vectors)."""
+    try:
+        budget_policy = cpp.BudgetPolicy.__members__[policy]
+    except KeyError:
+        policies = ", ".join(cpp.BudgetPolicy.__members__)
+        raise ValueError(f"Unknown budget policy '{policy}', expected one of {policies}.") from None
+    if timeout is not None and timeout <= 0:
+        raise ValueError("The timeout must be positive.")
+    cpp.set_pinned_budget(limit_bytes, budget_policy, timeout or 0.0)
+
+
+def get_pinned_budget() -> dict:
+    budget = cpp.get_pinned_budget()
+    return {
+        "limit_bytes": budget["limit_bytes"],
+        "policy": budget["policy"].name,
+        "timeout": budget["timeout_seconds"] or None,
+    }
+
+
+def pinned_budget_stats() -> dict:
+    """Pinned bytes held within the budget, the number of allocations that
+    fell back to pageable memory and the bytes of those alive, how often
+    allocations blocked and how many of them failed."""
+    return cpp.pinned_budget_stats()
+
+
+def memory_tag(tag: str) -> cpp.AllocationTag:
+    """Context manager attributing the vectors created by this thread inside it
+    to tag, e.g. ``with memory_tag("loader"): ...``. Tags nest."""
+    return cpp.AllocationTag(tag)
+
+
+def start_tracing(max_events_per_thread: int = 1 << 16) -> None:
+    """Starts recording the allocations, frees, fills and copies of every
+    thread, dropping the events of the previous trace. Events beyond
+    max_events_per_thread of a thread are dropped and counted. When built
+    with CUDA, the events also show up as NVTX ranges in Nsight Systems."""
+    cpp.start_tracing(max_events_per_thread)
+
+
+def stop_tracing() -> None:
+    cpp.stop_tracing()
+
+
+def trace_events() -> list:
+    """Events of the current (or last) trace ordered by their start, times in
+    nanoseconds since start_tracing()."""
+    keys = ("name", "category", "tag", "nbytes", "begin_ns", "end_ns", "thread")
+    return [dict(zip(keys, event)) for event in cpp.collect_trace()]
+
+
+def dump_trace(path) -> None:
+    """Writes the events in the Chrome trace event format, for chrome://tracing
+    or ui.perfetto.dev."""
+    pid = os.getpid()
+    events = []
+    for event in trace_events():
+        args = {"nbytes": event["nbytes"]}
+        if event["tag"] is not None:
+            args["tag"] = event["tag"]
+        events.append({
+            "name": event["name"],
+            "cat": event["category"],
+            "ph": "X",
+            "ts": event["begin_ns"] / 1000,
+            "dur": (event["end_ns"] - event["begin_ns"]) / 1000,
+            "pid": pid,
+            "tid": event["thread"],
+            "args": args,
+        })
+    trace = {
+        "traceEvents": events,
+        "displayTimeUnit": "ns",
+        "otherData": {"dropped_events": cpp.dropped_trace_events()},
+    }
+    import json
+
+    with open(path, "w") as f:
+        json.dump(trace, f)
+
+
+@contextlib.contextmanager
+def tracing(path=None, max_events_per_thread: int = 1 << 16):
+    """Context manager tracing its body, the trace is written to path if
+    given, e.g. ``with tracing("step.json"): ...``"""
+    start_tracing(max_events_per_thread)
+    try:
+        yield
+    finally:
+        stop_tracing()
+        if path is not None:
+            dump_trace(path)
+
+
+def trace_range(name: str, nbytes: int = 0) -> cpp.TraceRange:
+    """Context manager adding its body to the trace as an event of the
+    "python" category, e.g. around a copy through as_ndarray(). Meant for a
+    few distinct names, they are kept until the end of the process."""
+    return cpp.TraceRange(name, nbytes)
+
+
+def init(device: int = None) -> float:
+    """Loads the CUDA driver and creates the context of device (by default the
+    current one) now rather than in the first pinned allocation, which can
+    take up to seconds. Does nothing once done, returns the time it took.
+    Pageable vectors never need it."""
+    cpp.cuda_init(-1 if device is None else device)
+    return cpp.cuda_init_stats()["seconds"]
+
+
+def warmup(device: int = None) -> "AllocationFuture":
+    """init() on the background thread, e.g. while the rest of the process
+    starts up. The result of the future is the time it took. Allocations
+    submitted to the background thread later run after it."""
+    return AllocationFuture(cpp.cuda_init_async(-1 if device is None else device))
+
+
+def cuda_initialized() -> bool:
+    """Whether init(), warmup() or a pinned allocation initialized CUDA"""
+    return cpp.cuda_initialized()
+
+
+def cuda_init_stats() -> dict:
+    """Whether CUDA is initialized, whether a pinned allocation rather than
+    init() did it (implicit), the device and the time it took in seconds."""
+    return cpp.cuda_init_stats()
+
+
+def _fill_mode(fill: str) -> cpp.FillMode:
+    try:
+        return cpp.FillMode.__members__[fill]
+    except KeyError:
+        modes = ", ".join(cpp.FillMode.__members__)
+        raise ValueError(f"Unknown fill mode '{fill}', expected one of {modes}.") from None
+
+
+def numa_nodes() -> tuple:
+    """Online NUMA nodes, just (0,) on machines without NUMA."""
+    return cpp.numa_nodes()
+
+
+def numa_node_of(obj) -> int:
+    """NUMA node holding the first page of the buffer obj, -1 if not known."""
+    return cpp.numa_node_of(_buffer_of(obj))
+
+
+def numa_node_of_device(device: int) -> int:
+    """NUMA node the PCIe root of the CUDA device is attached to, -1 if not
+    known."""
+    return cpp.numa_node_of_device(device)
+
+
+def _numa_policy(numa) -> cpp.NumaPolicy:
+    """Policy for the numa argument of the vectors: None (pages go to the node
+    touching them first), a node (bound to it), "interleave" (round-robin over
+    all nodes), "bind:<node>", "preferred:<node>" or "device:<device>" (bound to
+    the node of the CUDA device, local if not known)."""
+    if numa is None:
+        return cpp.NumaPolicy()
+    if isinstance(numa, int):
+        return cpp.NumaPolicy.bind(numa)
+    if isinstance(numa, cpp.NumaPolicy):
+        return numa
+
+    mode, _, argument = str(numa).partition(":")
+    if mode == "interleave" and not argument:
+        return cpp.NumaPolicy.interleave()
+    if mode in ("bind", "preferred", "device") and argument.isdigit():
+        factory = cpp.NumaPolicy.local_to_device if mode == "device" else getattr(cpp.NumaPolicy, mode)
+        return factory(int(argument))
+    raise ValueError(
+        f"Unknown NUMA policy '{numa}', expected a node, 'interleave', 'bind:<node>', "
+        "'preferred:<node>' or 'device:<device>'."
+    )
+
+
+def _numa_name(policy: cpp.NumaPolicy):
+    if policy.mode == cpp.NumaMode.local:
+        return None
+    if policy.mode == cpp.NumaMode.interleave:
+        return "interleave"
+    return f"{policy.mode.name}:{policy.node}"
+
+
+# Names of the huge page options
+_HUGE_PAGES = {
+    None: cpp.HugePages.none,
+    "transparent": cpp.HugePages.transparent,
+    "2M": cpp.HugePages.explicit_2m,
+    "1G": cpp.HugePages.explicit_1g,
+}
+
+
+def _huge_pages(huge_pages) -> cpp.HugePages:
+    try:
+        return _HUGE_PAGES[huge_pages]
+    except KeyError:
+        options = ", ".join(str(option) for option in _HUGE_PAGES)
+        raise ValueError(f"Unknown huge pages '{huge_pages}', expected one of {options}.") from None
+
+
+def _huge_pages_name(pages: cpp.HugePages):
+    return next(name for name, value in _HUGE_PAGES.items() if value == pages)
+
+
+def huge_pages_of(obj):
+    """Huge pages actually backing the buffer obj: "2M" or "1G" (explicit),
+    "transparent" where the kernel assembled some, None otherwise."""
+    return _huge_pages_name(cpp.huge_pages_of(_buffer_of(obj)))
+
+
+_ALLOC_FLAGS = ("portable", "mapped", "write_combined")
+
+
+def _flag_names(alloc_flags) -> tuple:
+    if alloc_flags is None:
+        return ()
+    return (alloc_flags,) if isinstance(alloc_flags, str) else tuple(alloc_flags)
+
+
+def _alloc_flags(alloc_flags) -> cpp.HostAllocFlags:
+    """cudaHostAlloc() flags of pinned vectors: None, one of "portable",
+    "mapped" and "write_combined", or several of them"""
+    names = _flag_names(alloc_flags)
+    unknown = [name for name in names if name not in _ALLOC_FLAGS]
+    if unknown:
+        raise ValueError(f"Unknown allocation flag '{unknown[0]}', expected one of {', '.join(_ALLOC_FLAGS)}.")
+    return cpp.HostAllocFlags(**{name: True for name in names})
+
+
+class WriteCombinedReadWarning(UserWarning):
+    """Reading write-combined memory from the CPU bypasses the caches and is
+    an order of magnitude slower than reading ordinary memory."""
 
-class PageableI8Vector:
-    def __init__(self, count: int) -> None:
-        self._cpp = cpp.PageableI8Vector(count)
-        return
+
+def _by_backing(classes: dict, backing: str):
+    """The class of classes for backing, "cuda" or "host" """
+    if backing not in classes:
+        raise ValueError(f"Unknown backing '{backing}', expected one of {', '.join(classes)}.")
+    return classes[backing]
+
+
+def _dtype_name(dtype) -> str:
+    name = dtype if dtype == "bfloat16" else np.dtype(dtype).name
+    if name not in _DTYPES:
+        raise TypeError(f"Unsupported dtype '{name}', expected one of {', '.join(_DTYPES)}.")
+    return name
+
+
+def _buffer_of(obj):
+    """The object providing the buffer behind the wrappers of this module"""
+    if isinstance(obj, PinnedView):
+        return _buffer_of(obj.obj)
+    return getattr(obj, "_cpp", obj)
+
+
+class _BufferProtocol:
+    """Buffer protocol of the wrappers of this module, Python 3.12+"""
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return memoryview(_buffer_of(self))
+
+
+class _VectorInterfaces(_BufferProtocol):
+    """Zero-copy views shared by the vector wrappers.
+
+    NumPy (`np.asarray`, `np.from_dlpack`), torch and other consumers read the
+    memory in place, and every view keeps the underlying vector alive.
+    Vectors pickle their memory as a pickle.PickleBuffer with protocol 5, so
+    multiprocessing and other transports passing buffers out-of-band send them
+    without copies, and unpickle into a new vector with the same options.
+    """
 
     def as_ndarray(self) -> np.ndarray:
         array = self._cpp.as_ndarray()
         return array
 
+    @property
+    def __array_interface__(self) -> dict:
+        return self._cpp.__array_interface__
+
+    def __dlpack__(self, stream=None, max_version=None, dl_device=None, copy=None):
+        return self._cpp.__dlpack__(stream, max_version, dl_device, copy)
+
+    def __dlpack_device__(self) -> tuple:
+        return self._cpp.__dlpack_device__()
+
+    @property
+    def numa(self):
+        """NUMA policy the vector was allocated with, None for the default"""
+        return _numa_name(self._cpp.numa_policy)
+
+    @property
+    def huge_pages(self):
+        """Huge pages the vector was allocated with, see huge_pages_of() for
+        the ones actually used"""
+        return _huge_pages_name(self._cpp.huge_pages)
+
+    @property
+    def is_pinned(self) -> bool:
+        """False for pageable vectors, and for pinned ones the pinned budget
+        fell back to pageable memory for"""
+        return getattr(self._cpp, "is_pinned", False)
+
+    @property
+    def alloc_flags(self) -> tuple:
+        """cudaHostAlloc() flags the vector was allocated with"""
+        flags = getattr(self._cpp, "alloc_flags", None)
+        return tuple(name for name in _ALLOC_FLAGS if flags is not None and getattr(flags, name))
+
+    @property
+    def device_pointer(self):
+        """Address of mapped vectors in the device address space, None for
+        others"""
+        return getattr(self._cpp, "device_pointer", None)
+
+    @property
+    def __cuda_array_interface__(self) -> dict:
+        # Kernels (CuPy, Numba, torch) read mapped vectors in place
+        device_pointer = self.device_pointer
+        if device_pointer is None:
+            raise AttributeError("Only mapped pinned vectors are accessible from the device.")
+        interface = self.__array_interface__
+        return {
+            "shape": interface["shape"],
+            "typestr": interface["typestr"],
+            "strides": interface.get("strides"),
+            "data": (device_pointer, False),
+            "stream": None,
+            "version": 3,
+        }
+
+    def __reduce_ex__(self, protocol: int):
+        self._warn_on_read()
+        return super().__reduce_ex__(protocol)
+
+    def _warn_on_read(self) -> None:
+        if "write_combined" in self.alloc_flags:
+            warnings.warn(
+                "Reading a write-combined vector from the CPU is very slow, use it for uploads only.",
+                WriteCombinedReadWarning,
+                stacklevel=3,
+            )
+
+
+class _VectorCopies:
+    """Bulk copies shared by the vector wrappers.
+
+    They release the GIL and run on the thread pool, so several Python threads
+    can fill vectors at memory bandwidth. Offsets count elements of the vector,
+    the other buffers must be C-contiguous.
+    """
+
+    def copy_from(self, source, offset: int = 0) -> None:
+        """Copies the raw bytes of source into the vector."""
+        self._cpp.copy_from(source, offset)
+
+    def copy_to(self, out, offset: int = 0) -> None:
+        """Fills the writable buffer out with the raw bytes of the vector."""
+        self._warn_on_read()
+        self._cpp.copy_to(out, offset)
+
+    def gather(self, indices, out, row_size: int = 1):
+        """Copies the rows of row_size elements at indices into out, like
+        np.take() of the vector reshaped to (-1, row_size)."""
+        self._warn_on_read()
+        self._cpp.gather(indices, out, row_size)
+        return out
+
+    def convert_from(self, source, offset: int = 0) -> None:
+        """Copies an array of any supported dtype into the vector, converting
+        the elements like NumPy's unsafe casting."""
+        self._cpp.convert_from(source, offset)
+
+    def convert_to(self, out: np.ndarray, offset: int = 0) -> np.ndarray:
+        """Fills the writable array out of any supported dtype from the vector,
+        converting the elements like NumPy's unsafe casting."""
+        self._warn_on_read()
+        self._cpp.convert_to(out, offset)
+        return out
+
+
+class _Vector(_VectorInterfaces, _VectorCopies):
+    """Vector of count elements.
+
+    fill is one of "uninitialized", "zeros", "constant" (every element is
+    value), "iota" (value, value + 1, ...) or "copy" (from the source buffer).
+    numa places the pages on NUMA nodes: None (on the node touching them
+    first), a node (bound to it), "interleave", "bind:<node>",
+    "preferred:<node>" or "device:<device>" (bound to the node of the CUDA
+    device). Single node machines treat all of them alike. huge_pages is None,
+    "transparent" (2 MiB aligned and advised to the kernel), "2M" or "1G"
+    (explicit pages of the reserved pool, transparent once it is exhausted).
+    alloc_flags of pinned vectors are None or any of "portable" (pinned for
+    every CUDA context), "mapped" (kernels access it in place, see
+    device_pointer) and "write_combined" (faster uploads and CPU writes, very
+    slow CPU reads).
+    """
+
+    _cpp_type = None
+
+    def __init__(
+        self,
+        count: int,
+        fill: str = "iota",
+        value=0,
+        source=None,
+        numa=None,
+        huge_pages=None,
+        alloc_flags=None,
+    ) -> None:
+        self._cpp = self._cpp_type(
+            count,
+            _fill_mode(fill),
+            value,
+            source,
+            _numa_policy(numa),
+            _huge_pages(huge_pages),
+            _alloc_flags(alloc_flags),
+        )
+        return
+
+    @classmethod
+    def _from_cpp(cls, cpp_vector):
+        """Wraps a vector created by the bindings"""
+        vector = cls.__new__(cls)
+        vector._cpp = cpp_vector
+        return vector
+
+    @classmethod
+    def allocate_async(
+        cls,
+        count: int,
+        fill: str = "uninitialized",
+        value=0,
+        numa=None,
+        huge_pages=None,
+        alloc_flags=None,
+    ) -> "AllocationFuture":
+        """Allocates a vector on the background thread, by default with its
+        pages faulted in. fill is any mode but "copy"."""
+        future = cls._cpp_type.allocate_async(
+            count,
+            _fill_mode(fill),
+            value,
+            _numa_policy(numa),
+            _huge_pages(huge_pages),
+            _alloc_flags(alloc_flags),
+        )
+        return AllocationFuture(future, cls._from_cpp)
+
+
+class PageableI8Vector(_Vector):
+    _cpp_type = cpp.PageableI8Vector
+
+
+class PageableU8Vector(_Vector):
+    _cpp_type = cpp.PageableU8Vector
+
+
+class PageableI16Vector(_Vector):
+    _cpp_type = cpp.PageableI16Vector
+
+
+class PageableU16Vector(_Vector):
+    _cpp_type = cpp.PageableU16Vector
+
+
+class PageableI32Vector(_Vector):
+    _cpp_type = cpp.PageableI32Vector
 
-class PinnedI8Vector:
-    def __init__(self, count: int) -> None:
-        self._cpp = cpp.PinnedI8Vector(count)
+
+class PageableU32Vector(_Vector):
+    _cpp_type = cpp.PageableU32Vector
+
+
+class PageableI64Vector(_Vector):
+    _cpp_type = cpp.PageableI64Vector
+
+
+class PageableU64Vector(_Vector):
+    _cpp_type = cpp.PageableU64Vector
+
+
+class PageableF16Vector(_Vector):
+    _cpp_type = cpp.PageableF16Vector
+
+
+class PageableBF16Vector(_Vector):
+    _cpp_type = cpp.PageableBF16Vector
+
+
+class PageableF32Vector(_Vector):
+    _cpp_type = cpp.PageableF32Vector
+
+
+class PageableF64Vector(_Vector):
+    _cpp_type = cpp.PageableF64Vector
+
+
+class PinnedI8Vector(_Vector):
+    _cpp_type = cpp.PinnedI8Vector
+
+
+class PinnedU8Vector(_Vector):
+    _cpp_type = cpp.PinnedU8Vector
+
+
+class PinnedI16Vector(_Vector):
+    _cpp_type = cpp.PinnedI16Vector
+
+
+class PinnedU16Vector(_Vector):
+    _cpp_type = cpp.PinnedU16Vector
+
+
+class PinnedI32Vector(_Vector):
+    _cpp_type = cpp.PinnedI32Vector
+
+
+class PinnedU32Vector(_Vector):
+    _cpp_type = cpp.PinnedU32Vector
+
+
+class PinnedI64Vector(_Vector):
+    _cpp_type = cpp.PinnedI64Vector
+
+
+class PinnedU64Vector(_Vector):
+    _cpp_type = cpp.PinnedU64Vector
+
+
+class PinnedF16Vector(_Vector):
+    _cpp_type = cpp.PinnedF16Vector
+
+
+class PinnedBF16Vector(_Vector):
+    _cpp_type = cpp.PinnedBF16Vector
+
+
+class PinnedF32Vector(_Vector):
+    _cpp_type = cpp.PinnedF32Vector
+
+
+class PinnedF64Vector(_Vector):
+    _cpp_type = cpp.PinnedF64Vector
+
+
+class _ShapedVector(_VectorInterfaces, _VectorCopies):
+    """Buffer for an array of dtype and shape.
+
+    strides are in bytes like NumPy's, C-contiguous when omitted, and allow
+    e.g. padded rows. fill, value, source, numa, huge_pages and alloc_flags are
+    as for the vector classes, with the memory zeroed by default.
+    """
+
+    _prefix = None
+    _implied_alloc_flags = ()
+
+    def __init__(
+        self,
+        dtype,
+        shape,
+        strides=None,
+        fill: str = "zeros",
+        value=0,
+        source=None,
+        numa=None,
+        huge_pages=None,
+        alloc_flags=None,
+    ) -> None:
+        name = _dtype_name(dtype)
+        itemsize = 2 if name == "bfloat16" else np.dtype(name).itemsize
+
+        self.shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        self.strides = None if strides is None else tuple(strides)
+        if self.strides is None:
+            count = math.prod(self.shape)
+        elif 0 in self.shape:
+            count = 0
+        else:
+            extent = itemsize + sum((n - 1) * s for n, s in zip(self.shape, self.strides))
+            count = -(-extent // itemsize)
+
+        self._cpp = self._cpp_type_of(name)(
+            count,
+            _fill_mode(fill),
+            value,
+            source,
+            _numa_policy(numa),
+            _huge_pages(huge_pages),
+            _alloc_flags(self._implied_alloc_flags + _flag_names(alloc_flags)),
+        )
         return
 
+    @classmethod
+    def _cpp_type_of(cls, name: str):
+        return getattr(cpp, f"{cls._prefix}{_DTYPES[name]}Vector")
+
+    @classmethod
+    def allocate_async(
+        cls,
+        dtype,
+        shape,
+        fill: str = "zeros",
+        value=0,
+        numa=None,
+        huge_pages=None,
+        alloc_flags=None,
+    ) -> "AllocationFuture":
+        """Allocates a C-contiguous buffer on the background thread. fill is
+        any mode but "copy"."""
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        future = cls._cpp_type_of(_dtype_name(dtype)).allocate_async(
+            math.prod(shape),
+            _fill_mode(fill),
+            value,
+            _numa_policy(numa),
+            _huge_pages(huge_pages),
+            _alloc_flags(cls._implied_alloc_flags + _flag_names(alloc_flags)),
+        )
+
+        def wrap(cpp_vector):
+            vector = cls.__new__(cls)
+            vector._cpp = cpp_vector
+            vector.shape = shape
+            vector.strides = None
+            return vector
+
+        return AllocationFuture(future, wrap)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.as_ndarray().dtype
+
     def as_ndarray(self) -> np.ndarray:
-        array = self._cpp.as_ndarray()
+        array = self._cpp.as_ndarray(self.shape, self.strides)
+        return array
+
+    @property
+    def __array_interface__(self) -> dict:
+        return self.as_ndarray().__array_interface__
+
+    def __dlpack__(self, stream=None, max_version=None, dl_device=None, copy=None):
+        return self._cpp.__dlpack__(
+            stream, max_version, dl_device, copy, self.shape, self.strides
+        )
+
+
+class PageableVector(_ShapedVector):
+    _prefix = "Pageable"
+
+
+class PinnedVector(_ShapedVector):
+    _prefix = "Pinned"
+
+
+class WriteCombinedVector(_ShapedVector):
+    """Pinned write-combined buffer for data only uploaded to the device:
+    host-to-device copies and CPU writes are faster, CPU reads are very slow
+    and warn, see WriteCombinedReadWarning."""
+
+    _prefix = "Pinned"
+    _implied_alloc_flags = ("write_combined",)
+
+
+class MappedVector(_ShapedVector):
+    """Pinned buffer mapped into the device address space, which kernels
+    access in place through __cuda_array_interface__ or device_pointer."""
+
+    _prefix = "Pinned"
+    _implied_alloc_flags = ("mapped",)
+
+
+_COLLATE_MODES = ("ragged", "pad", "bucket")
+
+
+def _as_array(obj) -> np.ndarray:
+    array = obj if isinstance(obj, np.ndarray) else np.asarray(memoryview(obj))
+    if array.ndim == 0:
+        raise ValueError("Cannot collate scalars, expected arrays of at least one dimension.")
+    return np.ascontiguousarray(array)
+
+
+def collate(arrays, mode: str = "ragged", pad_value=0, buckets=None, pinned: bool = True):
+    """Gathers buffers of one dtype and the same trailing dimensions, e.g. the
+    samples of a batch, into one PinnedVector (PageableVector unless pinned)
+    on the thread pool with the GIL released. Non-contiguous arrays are copied
+    first.
+
+    mode "ragged" packs them along their first dimension into a vector of shape
+    (total, *trailing) and returns (vector, offsets), array i being rows
+    offsets[i]:offsets[i + 1]. "pad" pads every array with pad_value to the
+    length of the longest one, "bucket" to the smallest of the lengths in
+    buckets fitting the longest one, so consumers see few distinct shapes.
+    Both return (vector, lengths) with a vector of shape
+    (len(arrays), length, *trailing). offsets and lengths are int64 arrays.
+    """
+    if mode not in _COLLATE_MODES:
+        raise ValueError(f"Unknown collate mode '{mode}', expected one of {', '.join(_COLLATE_MODES)}.")
+    arrays = [_as_array(obj) for obj in arrays]
+    if not arrays:
+        raise ValueError("Nothing to collate.")
+    dtype, trailing = arrays[0].dtype, arrays[0].shape[1:]
+    for array in arrays:
+        if array.dtype != dtype or array.shape[1:] != trailing:
+            raise ValueError(
+                f"Cannot collate a {array.dtype} array of shape {array.shape} with {dtype} arrays of "
+                f"trailing shape {trailing}, expected one dtype and the same trailing dimensions."
+            )
+
+    row_bytes = math.prod(trailing) * dtype.itemsize
+    lengths = np.array([len(array) for array in arrays], dtype=np.int64)
+    vector_type = PinnedVector if pinned else PageableVector
+    if mode == "ragged":
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        vector = vector_type(dtype, (int(offsets[-1]), *trailing), fill="uninitialized")
+        cpp.collate_into(arrays, offsets * row_bytes, vector._cpp)
+        return vector, offsets
+
+    length = int(lengths.max())
+    if mode == "bucket":
+        fitting = [bucket for bucket in sorted(buckets or ()) if bucket >= length]
+        if not fitting:
+            raise ValueError(f"No bucket fits arrays of length {length}.")
+        length = fitting[0]
+    vector = vector_type(dtype, (len(arrays), length, *trailing), fill="uninitialized")
+    offsets = np.arange(len(arrays) + 1, dtype=np.int64) * length * row_bytes
+    cpp.collate_into(arrays, offsets, vector._cpp, np.array(pad_value, dtype=dtype).tobytes())
+    return vector, lengths
+
+
+def codecs() -> tuple:
+    """Names of the codecs of decompress_into(): "zlib" and "gzip" always,
+    "lz4" (raw blocks) and "zstd" when built with their libraries."""
+    return tuple(cpp.codec_names())
+
+
+def _frame_sizes(frames: list, sizes, codec: str) -> list:
+    if sizes is not None:
+        return list(sizes)
+    sizes = [cpp.decompressed_size(frame, codec) for frame in frames]
+    if None in sizes:
+        raise ValueError(f"The {codec} frames do not record their decompressed sizes, pass sizes.")
+    return sizes
+
+
+def decompress_into(frames, out, sizes=None, codec: str = "zlib", offset: int = 0) -> int:
+    """Decompresses independently compressed frames (e.g. the 4 MiB blocks of
+    a shard) back to back into out from byte offset on, in parallel on the
+    thread pool with the GIL released, and returns the number of bytes
+    written. out is any writable buffer: a vector, an array of an arena, a
+    ring buffer slot(), ... sizes are the decompressed sizes of the frames,
+    read from the frames when None, which gzip (single members only) and zstd
+    frames record. A frame not decompressing to exactly its size raises
+    RuntimeError."""
+    frames = list(frames)
+    sizes = _frame_sizes(frames, sizes, codec)
+    offsets = np.zeros(len(frames) + 1, dtype=np.int64)
+    np.cumsum(np.asarray(sizes, dtype=np.int64), out=offsets[1:])
+    cpp.decompress_into(frames, offsets + offset, _buffer_of(out), codec)
+    return int(offsets[-1])
+
+
+def decompress(frames, sizes=None, codec: str = "zlib", dtype=np.uint8, pinned: bool = True):
+    """decompress_into() a new 1-D PinnedVector of dtype (PageableVector
+    unless pinned)."""
+    frames = list(frames)
+    sizes = _frame_sizes(frames, sizes, codec)
+    dtype = np.dtype(dtype)
+    nbytes = sum(sizes)
+    if nbytes % dtype.itemsize:
+        raise ValueError(f"{nbytes} bytes are not a whole number of {dtype} elements.")
+    vector_type = PinnedVector if pinned else PageableVector
+    vector = vector_type(dtype, (nbytes // dtype.itemsize,), fill="uninitialized")
+    decompress_into(frames, vector, sizes, codec)
+    return vector
+
+
+class AllocationFuture:
+    """Future of an allocation on the background thread, see allocate_async()
+    and WarmPool.reserve_async(), or of warmup().
+
+    Like concurrent.futures.Future it can be polled with done(), waited for
+    with result() (releasing the GIL) and cancelled, and it can be awaited in a
+    coroutine. Cancelled allocations that already started free their memory as
+    soon as they finish.
+    """
+
+    _PENDING = object()
+
+    def __init__(self, cpp_future, wrap=None) -> None:
+        self._cpp = cpp_future
+        self._wrap = wrap
+        self._result = self._PENDING
+        return
+
+    def done(self) -> bool:
+        return self._cpp.done()
+
+    def running(self) -> bool:
+        return self._cpp.running()
+
+    def cancelled(self) -> bool:
+        return self._cpp.cancelled()
+
+    def cancel(self) -> bool:
+        """False once the allocation finished"""
+        return self._cpp.cancel()
+
+    def result(self, timeout: float = None):
+        if self._result is self._PENDING:
+            finished = self._cpp.wait(timeout)
+            if not finished or self._cpp.cancelled():
+                import concurrent.futures
+
+                raise concurrent.futures.TimeoutError() if not finished else concurrent.futures.CancelledError()
+            result = self._cpp.result()
+            self._result = result if self._wrap is None else self._wrap(result)
+        return self._result
+
+    def __await__(self):
+        if not self.done():
+            # Waits on a worker thread, so the event loop keeps running
+            import asyncio
+
+            loop = asyncio.get_running_loop()
+            yield from loop.run_in_executor(None, self._cpp.wait).__await__()
+        return self.result()
+
+
+class WarmPool:
+    """Keeps depth vectors of vector_type allocated and faulted in for each
+    reserved count, refilled on the background thread as they are taken.
+
+    acquire() hands out a vector of the smallest reserved count that fits,
+    shrunk to the requested count and with its contents left uninitialized. It
+    waits while the vectors of that count are being warmed and allocates on
+    the spot for counts larger than every reserved one. stats() counts how
+    often each happened. numa, huge_pages and alloc_flags are as for the vector
+    classes.
+    """
+
+    def __init__(
+        self,
+        vector_type,
+        counts=(),
+        depth: int = 1,
+        numa=None,
+        huge_pages=None,
+        alloc_flags=None,
+    ) -> None:
+        if not (isinstance(vector_type, type) and issubclass(vector_type, _Vector)):
+            raise TypeError(f"Expected a vector class like PinnedU8Vector, got {vector_type!r}.")
+        self._vector_type = vector_type
+        self._cpp = vector_type._cpp_type.WarmPool(
+            depth,
+            _numa_policy(numa),
+            _huge_pages(huge_pages),
+            _alloc_flags(alloc_flags),
+        )
+        for count in counts:
+            self.reserve_async(count)
+        return
+
+    @property
+    def depth(self) -> int:
+        return self._cpp.depth
+
+    def reserve_async(self, count: int) -> AllocationFuture:
+        """Adds count to the reserved counts. The future is done once the
+        vectors of the count are warm, with their number as result."""
+        return AllocationFuture(self._cpp.reserve_async(count))
+
+    def acquire(self, count: int):
+        return self._vector_type._from_cpp(self._cpp.acquire(count))
+
+    def stats(self) -> dict:
+        """Requests served right away (hits), after waiting for vectors being
+        warmed (waits) or by allocating on the spot (misses), and the vectors
+        kept warm"""
+        return self._cpp.stats()
+
+
+_RING_BUFFERS = {
+    "cuda": cpp.CudaHostRingBuffer,
+    "host": cpp.HostRingBuffer,
+}
+
+
+class PinnedRingBuffer:
+    """num_slots pinned slots of slot_bytes each for streaming batches from
+    producer to consumer threads without allocating per batch.
+
+    Producers acquire_write() a free slot, fill slot(index) and commit() it,
+    consumers acquire_read() the oldest committed slot and release() it when
+    done. Acquisition returns None after close() (consumers first drain the
+    committed slots), when block is False and no slot is available, or when
+    timeout seconds pass. Waiting releases the GIL.
+
+    backing is "cuda" for cudaMallocHost memory (within the pinned budget) or
+    "host" for locked host memory, which works without a GPU.
+    """
+
+    def __init__(self, num_slots: int, slot_bytes: int, backing: str = "cuda") -> None:
+        self._cpp = _by_backing(_RING_BUFFERS, backing)(num_slots, slot_bytes)
+        return
+
+    @property
+    def num_slots(self) -> int:
+        return self._cpp.num_slots
+
+    @property
+    def slot_bytes(self) -> int:
+        return self._cpp.slot_bytes
+
+    @property
+    def closed(self) -> bool:
+        return self._cpp.closed
+
+    def acquire_write(self, block: bool = True, timeout: float = None):
+        return self._cpp.acquire_write(block, timeout)
+
+    def commit(self, slot: int, nbytes: int) -> None:
+        self._cpp.commit(slot, nbytes)
+
+    def acquire_read(self, block: bool = True, timeout: float = None):
+        return self._cpp.acquire_read(block, timeout)
+
+    def release(self, slot: int) -> None:
+        self._cpp.release(slot)
+
+    def close(self) -> None:
+        self._cpp.close()
+
+    def filled_bytes(self, slot: int) -> int:
+        return self._cpp.filled_bytes(slot)
+
+    def slot(self, slot: int, dtype="uint8") -> np.ndarray:
+        """The whole slot as a 1-D array of dtype, without copying"""
+        return self._cpp.slot(slot).view(dtype)
+
+    def stats(self) -> dict:
+        return self._cpp.stats()
+
+
+_TRANSFER_BACKENDS = {
+    "cuda": cpp.CudaTransferBackend,
+    "simulated": cpp.SimulatedTransferBackend,
+}
+
+
+class TransferHandle:
+    """Future-like handle of an asynchronous transfer.
+
+    It can be polled with done(), waited for with wait() (releasing the GIL)
+    or awaited in a coroutine.
+    """
+
+    def __init__(self, cpp_handle, buffers: tuple) -> None:
+        self._cpp = cpp_handle
+        self._buffers = buffers  # Kept alive until the transfer is done
+        return
+
+    @property
+    def nbytes(self) -> int:
+        return self._cpp.nbytes
+
+    def done(self) -> bool:
+        if self._cpp.done():
+            self._buffers = ()
+            return True
+        return False
+
+    def wait(self) -> None:
+        self._cpp.wait()
+        self._buffers = ()
+
+    def __await__(self):
+        if not self.done():
+            # Waits on a worker thread, so the event loop keeps running
+            import asyncio
+
+            loop = asyncio.get_running_loop()
+            yield from loop.run_in_executor(None, self._cpp.wait).__await__()
+            self._buffers = ()
+        return None
+
+
+class TransferEngine:
+    """Issues asynchronous copies between host buffers and DeviceBuffers.
+
+    Transfers are split into chunks of chunk_bytes, spread over num_streams
+    streams, so they overlap. backend is "cuda" (cudaMemcpyAsync) or
+    "simulated", where every stream is a CPU thread doing memcpy and device
+    memory is host memory, which works without a GPU. Transfers issued one
+    after the other may overlap too: wait for a handle before issuing a
+    transfer depending on it. The engine keeps the buffers alive until their
+    transfers are done.
+    """
+
+    def __init__(
+        self, backend: str = "cuda", num_streams: int = 2, chunk_bytes: int = 4 * 1024**2
+    ) -> None:
+        if backend not in _TRANSFER_BACKENDS:
+            raise ValueError(
+                f"Unknown backend '{backend}', expected one of {', '.join(_TRANSFER_BACKENDS)}."
+            )
+        self._cpp = cpp.TransferEngine(_TRANSFER_BACKENDS[backend](num_streams), chunk_bytes)
+        self._in_flight = []
+        return
+
+    def __del__(self) -> None:
+        if hasattr(self, "_cpp"):
+            self._cpp.synchronize()
+
+    @property
+    def num_streams(self) -> int:
+        return self._cpp.backend.num_streams
+
+    @property
+    def chunk_bytes(self) -> int:
+        return self._cpp.chunk_bytes
+
+    def device_buffer(self, nbytes: int) -> cpp.DeviceBuffer:
+        return cpp.DeviceBuffer(self._cpp.backend, nbytes)
+
+    def copy(self, dst, src, nbytes: int = None) -> TransferHandle:
+        """Copies nbytes (all of src by default) from src to dst. Both are
+        DeviceBuffers or C-contiguous host buffers, e.g. the vectors of this
+        module, pinned ones for truly asynchronous copies."""
+        handle = TransferHandle(self._cpp.copy(_buffer_of(dst), _buffer_of(src), nbytes), (dst, src))
+
+        self._in_flight = [h for h in self._in_flight if not h.done()]
+        self._in_flight.append(handle)
+        return handle
+
+    def synchronize(self) -> None:
+        """Waits for all transfers issued so far."""
+        self._cpp.synchronize()
+        self._in_flight = []
+
+
+class FileReader:
+    """Reads a file straight into pinned (or any writable) memory, without a
+    pageable copy in between.
+
+    method is "mmap" (sequential mapping, prefetched with madvise), "pread"
+    (buffered, prefetched with posix_fadvise), "direct" (O_DIRECT, bypassing
+    the page cache for page aligned offsets and buffers) or "io_uring".
+    Methods the system does not support fall back to "pread", see the method
+    property. Reads run on the thread pool with the GIL released.
+    """
+
+    def __init__(self, path, method: str = "pread") -> None:
+        try:
+            cpp_method = cpp.ReadMethod.__members__[method]
+        except KeyError:
+            methods = ", ".join(cpp.ReadMethod.__members__)
+            raise ValueError(f"Unknown read method '{method}', expected one of {methods}.") from None
+        self._cpp = cpp.FileReader(os.fspath(path), cpp_method)
+        return
+
+    @property
+    def size(self) -> int:
+        return self._cpp.size
+
+    @property
+    def method(self) -> str:
+        return self._cpp.method.name
+
+    def read_into(self, out, offset: int = 0) -> int:
+        """Reads into the writable buffer out (e.g. a ring buffer slot),
+        returns the number of bytes read."""
+        return self._cpp.read_into(_buffer_of(out), offset)
+
+    def chunks(self, chunk_bytes: int = 64 * 1024**2):
+        """Yields the file as PinnedI8Vectors of chunk_bytes, the last one
+        holding the rest. Keep chunk_bytes a multiple of the page size for
+        "direct"."""
+        for offset in range(0, self.size, chunk_bytes):
+            yield PinnedI8Vector._from_cpp(self._cpp.read_pinned(offset, chunk_bytes))
+
+
+def read_file(path, chunk_bytes: int = 64 * 1024**2, method: str = "pread"):
+    """Yields the file at path as PinnedI8Vectors of chunk_bytes, see
+    FileReader."""
+    yield from FileReader(path, method).chunks(chunk_bytes)
+
+
+_PINNED_VIEWS = {
+    "cuda": cpp.CudaHostPinnedView,
+    "host": cpp.HostPinnedView,
+}
+
+
+class PinnedView(_BufferProtocol):
+    """Page-locks the memory of an existing buffer in place instead of copying
+    it into a pinned vector.
+
+    obj is any C-contiguous buffer, e.g. a NumPy array, a memory map or shared
+    memory. backing is "cuda" (cudaHostRegister, within the pinned budget) or
+    "host" (mlock). The registrations of overlapping buffers share the pages
+    they have in common.
+    The memory is unregistered by release(), at the end of a with block or
+    when the view is garbage collected, and obj is held until then.
+    """
+
+    def __init__(self, obj, backing: str = "cuda") -> None:
+        self._cpp = _by_backing(_PINNED_VIEWS, backing)(_buffer_of(obj))
+        self._obj = obj
+        return
+
+    @property
+    def obj(self):
+        return self._obj
+
+    @property
+    def nbytes(self) -> int:
+        return self._cpp.nbytes
+
+    @property
+    def released(self) -> bool:
+        return self._cpp.released
+
+    def release(self) -> None:
+        self._cpp.release()
+        self._obj = None
+
+    def __enter__(self) -> "PinnedView":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def register_host_memory(obj, backing: str = "cuda") -> PinnedView:
+    """Page-locks the memory of obj in place, see PinnedView."""
+    return PinnedView(obj, backing)
+
+
+def host_registry_stats(backing: str = "cuda") -> dict:
+    """Number of registered buffers, of the disjoint page ranges registered
+    for them and their bytes."""
+    return _by_backing(_PINNED_VIEWS, backing).registry_stats()
+
+
+_SHARED_BUFFERS = {
+    "cuda": cpp.CudaHostSharedBuffer,
+    "host": cpp.HostSharedBuffer,
+}
+
+
+class SharedPinnedVector(_BufferProtocol):
+    """Pinned buffer for an array of dtype and shape in shared memory, which
+    data-loader worker processes write batches into directly.
+
+    The creating process owns and pins the memory, with backing "cuda"
+    (within the pinned budget) or "host". Sending the vector to another
+    process, e.g. as an argument of a multiprocessing worker, pickles its
+    handle only, and the worker attaches to the same memory without pinning
+    it. kind is "memfd" (freed by the kernel once no process maps it) or
+    "posix" (named in /dev/shm, removed when the owner closes or collects the
+    vector, or exits normally). Workers can attach while the owner holds the
+    vector, their mappings stay valid after it is gone.
+    """
+
+    def __init__(self, dtype, shape, backing: str = "cuda", kind: str = "memfd") -> None:
+        if kind not in cpp.SharedMemoryKind.__members__:
+            kinds = ", ".join(cpp.SharedMemoryKind.__members__)
+            raise ValueError(f"Unknown shared memory kind '{kind}', expected one of {kinds}.")
+        self._dtype = np.dtype(dtype)
+        self.shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        self._backing = backing
+        nbytes = max(math.prod(self.shape) * self._dtype.itemsize, 1)
+        self._cpp = _by_backing(_SHARED_BUFFERS, backing).create(nbytes, cpp.SharedMemoryKind.__members__[kind])
+        self._finalizer = weakref.finalize(self, self._cpp.unlink)
+        return
+
+    @classmethod
+    def attach(cls, handle: tuple) -> "SharedPinnedVector":
+        """Maps the vector of another process by its handle."""
+        path, dtype, shape, backing = handle
+        vector = cls.__new__(cls)
+        vector._dtype = np.dtype(dtype)
+        vector.shape = tuple(shape)
+        vector._backing = backing
+        vector._cpp = _by_backing(_SHARED_BUFFERS, backing).attach(path)
+        vector._finalizer = None
+        return vector
+
+    @property
+    def handle(self) -> tuple:
+        """Picklable handle for attach()"""
+        return (self._cpp.handle, self._dtype.str, self.shape, self._backing)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    @property
+    def nbytes(self) -> int:
+        return math.prod(self.shape) * self._dtype.itemsize
+
+    @property
+    def is_owner(self) -> bool:
+        return self._cpp.is_owner
+
+    @property
+    def is_pinned(self) -> bool:
+        """Whether the memory is page-locked in this process, only ever by the
+        owner"""
+        return self._cpp.is_pinned
+
+    def as_ndarray(self) -> np.ndarray:
+        data = np.frombuffer(self._cpp, dtype=self._dtype, count=math.prod(self.shape))
+        return data.reshape(self.shape)
+
+    @property
+    def __array_interface__(self) -> dict:
+        return self.as_ndarray().__array_interface__
+
+    def close(self) -> None:
+        """Removes the name of a posix vector owned by this process, no process
+        can attach after. The memory stays mapped while views exist."""
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __enter__(self) -> "SharedPinnedVector":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __reduce__(self):
+        return (SharedPinnedVector.attach, (self.handle,))
+
+
+_GROWABLE_BUFFERS = {
+    "cuda": cpp.CudaHostGrowableBuffer,
+    "host": cpp.HostGrowableBuffer,
+}
+
+
+class GrowablePinnedVector(_BufferProtocol):
+    """Pinned vector of dtype, or of rows of row_shape, that grows without
+    reallocating.
+
+    It reserves max_bytes of address space (64 GiB by default, nothing is
+    committed before use) and page-locks memory in growing chunks at its end,
+    with backing "cuda" (within the pinned budget) or "host". Appending never
+    copies or locks the existing elements again, and the memory never moves,
+    so views from as_ndarray() stay valid while the vector grows; they cover
+    the elements present when they were taken. The vector never shrinks,
+    clear() keeps the memory for reuse.
+    """
+
+    def __init__(self, dtype, row_shape=(), backing: str = "cuda", max_bytes: int = None) -> None:
+        self._dtype = np.dtype(dtype)
+        self.row_shape = (row_shape,) if isinstance(row_shape, int) else tuple(row_shape)
+        buffer_type = _by_backing(_GROWABLE_BUFFERS, backing)
+        self._cpp = buffer_type() if max_bytes is None else buffer_type(max_bytes)
+        return
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    @property
+    def _row_bytes(self) -> int:
+        return math.prod(self.row_shape) * self._dtype.itemsize
+
+    def __len__(self) -> int:
+        return self._cpp.nbytes // self._row_bytes
+
+    @property
+    def capacity(self) -> int:
+        """Rows that fit into the memory locked so far"""
+        return self._cpp.capacity // self._row_bytes
+
+    @property
+    def nbytes(self) -> int:
+        return self._cpp.nbytes
+
+    @property
+    def is_pinned(self) -> bool:
+        """False where the pinned budget fell back to pageable memory"""
+        return self._cpp.is_pinned
+
+    def append(self, row) -> None:
+        self.extend(np.asarray(row, dtype=self._dtype).reshape(1, *self.row_shape))
+
+    def extend(self, rows) -> None:
+        """Appends an array, or any buffer, of rows, converted to the dtype.
+        Large ones are copied on the thread pool with the GIL released."""
+        if not isinstance(rows, np.ndarray):
+            try:
+                rows = np.asarray(memoryview(rows))
+            except TypeError:
+                rows = np.asarray(rows)
+        array = np.ascontiguousarray(rows, dtype=self._dtype).reshape(-1, *self.row_shape)
+        self._cpp.extend(array)
+
+    def reserve(self, count: int) -> None:
+        """Locks the memory of count rows ahead of time"""
+        self._cpp.reserve(count * self._row_bytes)
+
+    def clear(self) -> None:
+        self._cpp.clear()
+
+    def as_ndarray(self) -> np.ndarray:
+        data = np.frombuffer(self._cpp, dtype=self._dtype)
+        return data.reshape(-1, *self.row_shape)
+
+    @property
+    def __array_interface__(self) -> dict:
+        return self.as_ndarray().__array_interface__
+
+
+_ARENAS = {
+    "cuda": cpp.CudaHostArena,
+    "host": cpp.HostArena,
+}
+
+
+class PinnedArena(_BufferProtocol):
+    """One pinned slab of nbytes that many small arrays are carved out of.
+
+    Every array of a batch (labels, masks, indices, ...) would otherwise be a
+    pinned allocation and a transfer of its own. The arrays of an arena are
+    packed at the front of the slab, aligned to alignment bytes, so as_ndarray()
+    covers all of them and goes to the device in one copy; offset_of() tells
+    where each array starts in it. Arrays are freed when collected, reset()
+    frees all of them at once for the next batch. Arrays still referenced
+    after reset() share their memory with the arrays allocated after it.
+    backing is "cuda" (within the pinned budget) or "host".
+    """
+
+    def __init__(self, nbytes: int, alignment: int = 256, backing: str = "cuda") -> None:
+        self._cpp = _by_backing(_ARENAS, backing)(nbytes, alignment)
+        return
+
+    @property
+    def nbytes(self) -> int:
+        return self._cpp.nbytes
+
+    @property
+    def used_nbytes(self) -> int:
+        """Bytes up to the end of the last array, those of as_ndarray()"""
+        return self._cpp.used_nbytes
+
+    @property
+    def alignment(self) -> int:
+        return self._cpp.alignment
+
+    @property
+    def is_pinned(self) -> bool:
+        """False when the pinned budget fell back to pageable memory"""
+        return self._cpp.is_pinned
+
+    def empty(self, shape, dtype=np.uint8, alignment: int = None) -> np.ndarray:
+        """Uninitialized array in the arena, MemoryError when it does not fit"""
+        dtype = np.dtype(dtype)
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        count = math.prod(shape)
+        block = self._cpp.allocate(count * dtype.itemsize, max(alignment or self.alignment, dtype.alignment))
+        return np.frombuffer(block, dtype=dtype, count=count).reshape(shape)
+
+    def zeros(self, shape, dtype=np.uint8, alignment: int = None) -> np.ndarray:
+        array = self.empty(shape, dtype, alignment)
+        array.fill(0)
         return array
+
+    def array(self, obj, dtype=None, alignment: int = None) -> np.ndarray:
+        """Copy of an array, or anything np.asarray() takes, in the arena"""
+        source = np.asarray(obj, dtype=dtype)
+        array = self.empty(source.shape, source.dtype, alignment)
+        np.copyto(array, source)
+        return array
+
+    def reset(self) -> None:
+        self._cpp.reset()
+
+    def offset_of(self, array) -> int:
+        """Offset of the first element of an array of the arena from its start"""
+        return self._cpp.offset_of(_buffer_of(array))
+
+    def as_ndarray(self) -> np.ndarray:
+        """The used bytes of the slab, as one uint8 array"""
+        return np.frombuffer(self._cpp, dtype=np.uint8)
+
+    def stats(self) -> dict:
+        return self._cpp.stats()
+
+    @property
+    def __array_interface__(self) -> dict:
+        return self.as_ndarray().__array_interface__
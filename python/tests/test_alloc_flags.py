@@ -0,0 +1,81 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+@pytest.mark.parametrize(
+    "alloc_flags, expected",
+    [
+        (None, ()),
+        ("portable", ("portable",)),
+        (["mapped", "write_combined"], ("mapped", "write_combined")),
+        (("portable", "mapped", "write_combined"), ("portable", "mapped", "write_combined")),
+    ],
+)
+def test_alloc_flags(alloc_flags, expected):
+    vector = pyplayground.PinnedF32Vector(100, fill="constant", value=5, alloc_flags=alloc_flags)
+
+    assert vector.alloc_flags == expected
+    assert vector.is_pinned
+    assert np.all(vector.as_ndarray() == 5)
+
+
+def test_mapped_vector():
+    vector = pyplayground.MappedVector("int16", (8, 4), fill="iota")
+
+    interface = vector.__cuda_array_interface__
+    assert vector.alloc_flags == ("mapped",)
+    assert vector.device_pointer is not None
+    assert interface["data"] == (vector.device_pointer, False)
+    assert interface["shape"] == (8, 4)
+    assert interface["typestr"] == np.dtype("int16").str
+
+
+def test_no_device_pointer_unless_mapped():
+    vector = pyplayground.PinnedVector("float32", 16)
+
+    assert vector.device_pointer is None
+    assert not hasattr(vector, "__cuda_array_interface__")
+    assert pyplayground.PageableI8Vector(16).alloc_flags == ()
+
+
+def test_write_combined_reads_warn():
+    vector = pyplayground.WriteCombinedVector("uint8", 64, alloc_flags="portable")
+    out = np.empty(64, dtype=np.uint8)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        vector.copy_from(np.full(64, 9, dtype=np.uint8))
+    with pytest.warns(pyplayground.WriteCombinedReadWarning):
+        vector.copy_to(out)
+
+    assert vector.alloc_flags == ("portable", "write_combined")
+    assert np.all(out == 9)
+
+
+def test_invalid_alloc_flags():
+    with pytest.raises(ValueError):
+        pyplayground.PinnedI8Vector(16, alloc_flags="cached")
+    with pytest.raises(ValueError):
+        pyplayground.PageableI8Vector(16, alloc_flags="mapped")
+
+
+@pytest.mark.parametrize("placement", [dict(numa=0), dict(huge_pages="transparent")])
+def test_write_combined_memory_is_not_placed(placement):
+    before = pyplayground.pinned_budget_stats()["pinned_bytes"]
+
+    with pytest.raises(ValueError, match="cannot be registered"):
+        pyplayground.PinnedI8Vector(1 << 20, alloc_flags="write_combined", **placement)
+    with pytest.raises(ValueError, match="cannot be registered"):
+        pyplayground.PinnedI8Vector.allocate_async(1 << 20, alloc_flags="write_combined", **placement)
+
+    assert pyplayground.pinned_budget_stats()["pinned_bytes"] == before
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
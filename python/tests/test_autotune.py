@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pyplayground
+
+SMALL_SWEEP = dict(buffer_bytes=2 * 1024**2, repeats=1, thread_counts=[1, 2], grains=[1 << 20], alignments=[64])
+
+
+@pytest.fixture
+def restore_tuning():
+    tuning = pyplayground.copy_tuning()
+    yield
+    pyplayground.set_num_threads(tuning["num_threads"])
+    pyplayground.set_parallel_grain(tuning["grain_bytes"])
+    pyplayground.set_nontemporal_threshold(tuning["nontemporal_threshold"])
+
+
+def test_saves_and_applies_the_best_tuning(tmp_path, restore_tuning):
+    path = tmp_path / "profiles.json"
+
+    result = pyplayground.autotune(path=path, **SMALL_SWEEP)
+
+    best = result["best"]
+    assert pyplayground.copy_tuning() == best
+    assert best["num_threads"] in (1, 2)
+    assert best["grain_bytes"] == 1 << 20
+    assert {trial["step"] for trial in result["trials"]} == {"threads", "stores", "alignment"}
+    profile = json.loads(path.read_text())[pyplayground.host_key()]
+    assert profile["num_threads"] == best["num_threads"]
+    assert profile["buffer_bytes"] == 2 * 1024**2
+    assert not profile["pinned"]
+
+
+def test_loads_the_profile_of_this_host(tmp_path, restore_tuning):
+    path = tmp_path / "profiles.json"
+    profile = {"num_threads": 3, "grain_bytes": 1 << 18, "nontemporal_threshold": 0}
+    path.write_text(json.dumps({"some other host": {}, pyplayground.host_key(): profile}))
+
+    loaded = pyplayground.load_host_profile(path)
+
+    assert loaded == profile
+    assert pyplayground.copy_tuning() == profile
+
+
+def test_ignores_other_hosts(tmp_path, restore_tuning):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"some other host": {"num_threads": 3}}))
+    before = pyplayground.copy_tuning()
+
+    assert pyplayground.load_host_profile(path) is None
+    assert pyplayground.load_host_profile(tmp_path / "missing.json") is None
+    assert pyplayground.copy_tuning() == before
+
+
+def test_loads_the_profile_on_import(tmp_path):
+    path = tmp_path / "profiles.json"
+    profile = {"num_threads": 2, "grain_bytes": 1 << 19, "nontemporal_threshold": 1 << 22}
+    path.write_text(json.dumps({pyplayground.host_key(): profile}))
+
+    output = subprocess.run(
+        [sys.executable, "-c", "import pyplayground as pg; print(sorted(pg.copy_tuning().values()))"],
+        env={**os.environ, "PYPLAYGROUND_PROFILE": str(path)},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+    assert output == str(sorted(profile.values()))
+
+
+def test_empty_path_disables_profiles(monkeypatch, restore_tuning):
+    monkeypatch.setenv("PYPLAYGROUND_PROFILE", "")
+
+    assert pyplayground.load_host_profile() is None
+    pyplayground.autotune(**SMALL_SWEEP)  # Applied, nothing written
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
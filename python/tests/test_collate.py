@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+def _samples(rng, count, dtype="float32", trailing=()):
+    return [rng.standard_normal((rng.integers(0, 50), *trailing)).astype(dtype) for _ in range(count)]
+
+
+def test_ragged():
+    samples = _samples(np.random.default_rng(0), 200, trailing=(3,))
+
+    vector, offsets = pyplayground.collate(samples)
+
+    data = vector.as_ndarray()
+    assert type(vector) is pyplayground.PinnedVector
+    assert vector.is_pinned
+    assert data.shape == (sum(len(sample) for sample in samples), 3)
+    assert offsets.dtype == np.int64
+    assert offsets[0] == 0 and offsets[-1] == len(data)
+    assert np.array_equal(data, np.concatenate(samples))
+    for i, sample in enumerate(samples):
+        assert np.array_equal(data[offsets[i] : offsets[i + 1]], sample)
+
+
+def test_buffers_and_strided_arrays():
+    strided = np.arange(20, dtype=np.uint8)[::2]
+
+    vector, offsets = pyplayground.collate([b"abc", bytearray(b"de"), strided], pinned=False)
+
+    assert type(vector) is pyplayground.PageableVector
+    assert offsets.tolist() == [0, 3, 5, 15]
+    assert vector.as_ndarray().tobytes() == b"abcde" + strided.tobytes()
+
+
+def test_pad():
+    samples = [np.array([1, 2, 3], dtype=np.int16), np.array([4], dtype=np.int16), np.array([], dtype=np.int16)]
+
+    vector, lengths = pyplayground.collate(samples, mode="pad", pad_value=-1)
+
+    assert lengths.tolist() == [3, 1, 0]
+    assert vector.as_ndarray().tolist() == [[1, 2, 3], [4, -1, -1], [-1, -1, -1]]
+
+
+def test_bucket():
+    samples = _samples(np.random.default_rng(1), 10, dtype="float64", trailing=(2, 2))
+    longest = max(len(sample) for sample in samples)
+
+    vector, lengths = pyplayground.collate(samples, mode="bucket", pad_value=0.5, buckets=[128, 64, 32])
+
+    data = vector.as_ndarray()
+    expected_length = 32 if longest <= 32 else 64
+    assert data.shape == (10, expected_length, 2, 2)
+    for i, sample in enumerate(samples):
+        assert np.array_equal(data[i, : lengths[i]], sample)
+        assert np.all(data[i, lengths[i] :] == 0.5)
+
+
+def test_invalid_collations():
+    with pytest.raises(ValueError):
+        pyplayground.collate([np.zeros(3, dtype=np.int8), np.zeros(3, dtype=np.int16)])
+    with pytest.raises(ValueError):
+        pyplayground.collate([np.zeros((3, 2)), np.zeros((3, 4))])
+    with pytest.raises(ValueError):
+        pyplayground.collate([np.zeros(300)], mode="bucket", buckets=[128, 256])
+    with pytest.raises(ValueError):
+        pyplayground.collate([np.zeros(3)], mode="truncate")
+    with pytest.raises(ValueError):
+        pyplayground.collate([])
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
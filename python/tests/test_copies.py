@@ -0,0 +1,126 @@
+import threading
+
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+@pytest.mark.parametrize(
+    "vector_type", [pyplayground.PageableF32Vector, pyplayground.PinnedF32Vector]
+)
+def test_copy_from_and_to(vector_type):
+    vector = vector_type(10, fill="zeros")
+    source = np.arange(4, dtype=np.float32)
+    out = np.empty(6, dtype=np.float32)
+
+    vector.copy_from(source, offset=2)
+    vector.copy_to(out, offset=1)
+
+    np.testing.assert_array_equal(out, [0, 0, 1, 2, 3, 0])
+
+
+def test_copy_from_raw_bytes():
+    vector = pyplayground.PinnedU8Vector(8, fill="zeros")
+
+    vector.copy_from(np.array([1], dtype=np.uint32))
+    vector.copy_from(b"\x07", offset=7)
+
+    np.testing.assert_array_equal(vector.as_ndarray(), [1, 0, 0, 0, 0, 0, 0, 7])
+
+
+def test_copies_check_sizes():
+    vector = pyplayground.PinnedF32Vector(4)
+
+    with pytest.raises(ValueError):
+        vector.copy_from(np.zeros(4, dtype=np.float32), offset=1)
+    with pytest.raises(ValueError):
+        vector.copy_from(np.zeros(3, dtype=np.uint8))
+    with pytest.raises(ValueError):
+        vector.copy_to(np.zeros(8)[::2])
+    with pytest.raises(BufferError):
+        vector.copy_to(b"1234")
+
+
+def test_large_copy_with_non_temporal_stores():
+    threshold = pyplayground.get_nontemporal_threshold()
+    pyplayground.set_nontemporal_threshold(1)
+    try:
+        source = np.random.default_rng(0).integers(0, 100, 5_000_003, dtype=np.int8)
+        vector = pyplayground.PinnedI8Vector(source.size, fill="uninitialized")
+
+        vector.copy_from(source)
+
+        np.testing.assert_array_equal(vector.as_ndarray(), source)
+    finally:
+        pyplayground.set_nontemporal_threshold(threshold)
+
+
+def test_gather_rows():
+    vector = pyplayground.PageableI32Vector(12)
+    out = np.empty((3, 4), dtype=np.int32)
+
+    result = vector.gather([2, 0, 2], out, row_size=4)
+
+    assert result is out
+    np.testing.assert_array_equal(out, vector.as_ndarray().reshape(3, 4)[[2, 0, 2]])
+    with pytest.raises(IndexError):
+        vector.gather([3], out[:1], row_size=4)
+    with pytest.raises(ValueError):
+        vector.gather([0], out, row_size=4)
+
+
+@pytest.mark.parametrize("dtype", ["int8", "uint16", "int64", "float16", "float32", "float64"])
+def test_convert_from_and_to(dtype):
+    vector = pyplayground.PinnedF32Vector(5, fill="zeros")
+    source = np.arange(4).astype(dtype)
+    out = np.empty(5, dtype=dtype)
+
+    vector.convert_from(source, offset=1)
+    result = vector.convert_to(out)
+
+    assert result is out
+    np.testing.assert_array_equal(out, np.arange(-1, 4).clip(0).astype(dtype))
+
+
+def test_convert_to_half_rounds_like_numpy():
+    values = np.array([0.1, 1 / 3, 65504, 1e6, -2.5e-8], dtype=np.float32)
+    vector = pyplayground.PageableF32Vector(values.size, fill="copy", source=values)
+
+    out = vector.convert_to(np.empty(values.size, dtype=np.float16))
+
+    with np.errstate(over="ignore"):
+        expected = values.astype(np.float16)
+    np.testing.assert_array_equal(out, expected)
+
+
+def test_convert_rejects_unsupported_dtypes():
+    vector = pyplayground.PageableF64Vector(2)
+
+    with pytest.raises(TypeError):
+        vector.convert_from(np.zeros(2, dtype=np.complex64))
+    with pytest.raises(ValueError):
+        vector.convert_to(np.zeros(4)[::2])
+
+
+def test_copies_from_several_threads():
+    vectors = [pyplayground.PinnedI64Vector(100_000, fill="zeros") for _ in range(4)]
+    sources = [np.full(100_000, i, dtype=np.int64) for i in range(4)]
+
+    threads = [
+        threading.Thread(target=vector.copy_from, args=(source,))
+        for vector, source in zip(vectors, sources)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for i, vector in enumerate(vectors):
+        assert (vector.as_ndarray() == i).all()
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
@@ -0,0 +1,66 @@
+import subprocess
+import sys
+
+import pyplayground
+
+
+def run_fresh(code: str) -> str:
+    """Output of code run by a new interpreter, which starts without CUDA"""
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.strip()
+
+
+def test_pageable_vectors_do_not_initialize_cuda():
+    output = run_fresh(
+        "import sys, pyplayground as pg\n"
+        "vector = pg.PageableF32Vector(1000, fill='zeros')\n"
+        "print(pg.cuda_initialized(), 'asyncio' in sys.modules)"
+    )
+
+    assert output == "False False"
+
+
+def test_first_pinned_allocation_initializes_cuda():
+    output = run_fresh(
+        "import pyplayground as pg\n"
+        "pg.PinnedU8Vector(16)\n"
+        "stats = pg.cuda_init_stats()\n"
+        "print(stats['initialized'], stats['implicit'])"
+    )
+
+    assert output == "True True"
+
+
+def test_device_lookups_record_the_initialization():
+    output = run_fresh(
+        "import pyplayground as pg\n"
+        "pg.numa_node_of_device(0)\n"
+        "stats = pg.cuda_init_stats()\n"
+        "print(stats['initialized'], stats['implicit'])"
+    )
+
+    assert output == "True True"
+
+
+def test_warmup_in_the_background():
+    output = run_fresh(
+        "import pyplayground as pg\n"
+        "future = pg.warmup()\n"
+        "seconds = future.result(timeout=60)\n"
+        "stats = pg.cuda_init_stats()\n"
+        "print(pg.cuda_initialized(), stats['implicit'], seconds == stats['seconds'])"
+    )
+
+    assert output == "True False True"
+
+
+def test_init_is_idempotent():
+    first = pyplayground.init()
+    second = pyplayground.init()
+
+    assert pyplayground.cuda_initialized()
+    assert first == second >= 0
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
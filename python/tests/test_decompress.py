@@ -0,0 +1,73 @@
+import gzip
+import zlib
+
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+def make_blocks(data: bytes, block_bytes: int) -> list:
+    return [data[i : i + block_bytes] for i in range(0, len(data), block_bytes)]
+
+
+@pytest.fixture
+def data() -> bytes:
+    return np.arange(300_000, dtype=np.int32).tobytes()
+
+
+def test_decompresses_zlib_blocks_into_a_pinned_vector(data):
+    blocks = make_blocks(data, 100_000)
+    frames = [zlib.compress(block) for block in blocks]
+    vector = pyplayground.PinnedI8Vector(len(data))
+
+    nbytes = pyplayground.decompress_into(frames, vector, sizes=[len(block) for block in blocks])
+
+    assert nbytes == len(data)
+    assert vector.as_ndarray().tobytes() == data
+
+
+def test_reads_the_sizes_of_gzip_members(data):
+    frames = [gzip.compress(block) for block in make_blocks(data, 250_000)]
+
+    vector = pyplayground.decompress(frames, codec="gzip", dtype=np.int32, pinned=False)
+
+    np.testing.assert_array_equal(vector.as_ndarray(), np.arange(300_000, dtype=np.int32))
+
+
+def test_decompresses_into_a_ring_buffer_slot(data):
+    ring = pyplayground.PinnedRingBuffer(2, 2 << 20, backing="host")
+    blocks = make_blocks(data, 200_000)
+    frames = [zlib.compress(block) for block in blocks]
+
+    slot = ring.acquire_write()
+    nbytes = pyplayground.decompress_into(frames, ring.slot(slot), [len(block) for block in blocks], offset=16)
+    ring.commit(slot, nbytes + 16)
+
+    assert ring.acquire_read() == slot
+    assert ring.slot(slot)[16 : 16 + nbytes].tobytes() == data
+
+
+def test_rejects_bad_frames(data):
+    frame = zlib.compress(data)
+    out = np.empty(len(data) + 1, dtype=np.uint8)
+
+    with pytest.raises(ValueError, match="pass sizes"):
+        pyplayground.decompress_into([frame], out)
+    with pytest.raises(RuntimeError, match="frame 1"):
+        pyplayground.decompress_into([frame, frame[:100]], np.empty(2 * len(data), np.uint8), [len(data)] * 2)
+    with pytest.raises(RuntimeError):
+        pyplayground.decompress_into([frame], out, [len(data) + 1])
+    with pytest.raises(ValueError, match="smaller"):
+        pyplayground.decompress_into([frame], out, [len(data)], offset=2)
+    with pytest.raises(ValueError, match="unknown codec"):
+        pyplayground.decompress_into([frame], out, [len(data)], codec="lzma")
+
+
+def test_lists_the_codecs():
+    assert {"gzip", "zlib"} <= set(pyplayground.codecs())
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
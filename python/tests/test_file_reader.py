@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+@pytest.fixture
+def shard(tmp_path):
+    content = np.random.default_rng(0).integers(-128, 128, 3 * 1024**2 + 5, dtype=np.int8)
+    path = tmp_path / "shard.bin"
+    content.tofile(path)
+    return path, content
+
+
+@pytest.mark.parametrize("method", ["mmap", "pread", "direct", "io_uring"])
+def test_read_file_yields_pinned_chunks(shard, method):
+    path, content = shard
+
+    chunks = list(pyplayground.read_file(path, chunk_bytes=1024**2, method=method))
+
+    assert len(chunks) == 4
+    assert all(isinstance(chunk, pyplayground.PinnedI8Vector) for chunk in chunks)
+    assert chunks[-1].as_ndarray().size == 5
+    np.testing.assert_array_equal(np.concatenate([c.as_ndarray() for c in chunks]), content)
+
+
+def test_read_into_ring_slot(shard):
+    path, content = shard
+    reader = pyplayground.FileReader(path, method="mmap")
+    ring = pyplayground.PinnedRingBuffer(2, 4096, backing="host")
+
+    slot = ring.acquire_write()
+    nbytes = reader.read_into(ring.slot(slot), offset=100)
+
+    assert nbytes == 4096
+    assert reader.method == "mmap"
+    np.testing.assert_array_equal(ring.slot(slot, "int8"), content[100:4196])
+
+
+def test_reader_errors(tmp_path):
+    with pytest.raises(RuntimeError):
+        pyplayground.FileReader(tmp_path / "missing.bin")
+    with pytest.raises(ValueError):
+        pyplayground.FileReader(tmp_path / "missing.bin", method="unknown")
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+def test_append_and_extend():
+    vector = pyplayground.GrowablePinnedVector("int64")
+
+    for i in range(1000):
+        vector.append(i)
+    vector.extend(np.arange(1000, 5000))
+    vector.extend(range(5000, 5003))
+
+    assert len(vector) == 5003
+    assert vector.is_pinned
+    assert np.array_equal(vector.as_ndarray(), np.arange(5003))
+
+
+def test_views_stay_valid_while_growing():
+    vector = pyplayground.GrowablePinnedVector("float32", row_shape=(4,), backing="host")
+    vector.extend(np.ones((10, 4)))
+    view = vector.as_ndarray()
+    address = view.ctypes.data
+
+    vector.extend(np.zeros((200_000, 4)))
+    view[0, 0] = 5
+
+    assert vector.as_ndarray().ctypes.data == address
+    assert vector.as_ndarray()[0, 0] == 5
+    assert vector.as_ndarray().shape == (200_010, 4)
+    assert vector.capacity >= len(vector)
+
+
+def test_extend_from_buffers():
+    vector = pyplayground.GrowablePinnedVector("uint8")
+
+    vector.extend(b"abc")
+    vector.extend(bytearray(b"de"))
+    vector.extend(np.arange(10, dtype=np.uint8)[::2])
+
+    assert bytes(vector.as_ndarray()) == b"abcde" + bytes([0, 2, 4, 6, 8])
+
+
+def test_clear_keeps_memory():
+    vector = pyplayground.GrowablePinnedVector("int32", backing="host")
+    vector.reserve(1000)
+    capacity = vector.capacity
+
+    vector.extend(np.arange(1000))
+    vector.clear()
+
+    assert len(vector) == 0
+    assert vector.capacity == capacity >= 1000
+    assert vector.as_ndarray().shape == (0,)
+
+
+def test_address_space_limit():
+    vector = pyplayground.GrowablePinnedVector("int8", backing="host", max_bytes=1 << 16)
+
+    with pytest.raises(ValueError):
+        vector.extend(np.zeros(1 << 17, dtype=np.int8))
+    with pytest.raises(ValueError):
+        pyplayground.GrowablePinnedVector("int8", row_shape=(2,)).extend(np.zeros(3))
+    with pytest.raises(ValueError):
+        pyplayground.GrowablePinnedVector("int8", backing="disk")
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+@pytest.mark.parametrize("vector_type", [pyplayground.PageableI8Vector, pyplayground.PinnedI8Vector])
+@pytest.mark.parametrize("huge_pages", [None, "transparent", "2M", "1G"])
+def test_vectors_with_huge_pages(vector_type, huge_pages):
+    vector = vector_type(3 << 20, fill="constant", value=5, huge_pages=huge_pages)
+
+    assert vector.huge_pages == huge_pages
+    assert np.all(vector.as_ndarray() == 5)
+    # Explicit pages fall back to transparent ones, which the kernel may not
+    # assemble
+    assert pyplayground.huge_pages_of(vector) in (None, "transparent", huge_pages)
+    if huge_pages is not None:
+        assert vector.as_ndarray().ctypes.data % (2 << 20) == 0
+
+
+def test_huge_pages_with_numa_policy():
+    node = pyplayground.numa_nodes()[0]
+    vector = pyplayground.PageableVector("float32", (1024, 1024), numa=node, huge_pages="transparent")
+
+    assert vector.numa == f"bind:{node}"
+    assert vector.huge_pages == "transparent"
+    assert np.all(vector.as_ndarray() == 0)
+
+
+def test_invalid_huge_pages():
+    with pytest.raises(ValueError):
+        pyplayground.PageableI8Vector(16, huge_pages="4K")
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
@@ -1,4 +1,8 @@
+import gc
+
 import numpy as np
+import pytest
+
 import pyplayground
 
 
@@ -44,6 +48,184 @@ def test_pinned_i8_vector():
     )
 
 
+@pytest.mark.parametrize(
+    "vector_type", [pyplayground.PageableI8Vector, pyplayground.PinnedI8Vector]
+)
+def test_as_ndarray_keeps_vector_alive(vector_type):
+    # Arrange
+    count = 512
+    my_array = vector_type(count).as_ndarray()
+
+    # Act
+    gc.collect()
+
+    # Assert
+    assert my_array.base is not None
+    assert my_array[:100].tolist() == list(range(100))
+
+
+@pytest.mark.parametrize(
+    "vector_type", [pyplayground.PageableI8Vector, pyplayground.PinnedI8Vector]
+)
+def test_buffer_protocol(vector_type):
+    # Arrange
+    count = 512
+    my_vec = vector_type(count)
+
+    # Act
+    my_view = memoryview(my_vec._cpp)
+
+    # Assert
+    assert my_view.format == "b"
+    assert my_view.shape == (count,)
+    assert np.shares_memory(np.asarray(my_view), my_vec.as_ndarray())
+
+
+@pytest.mark.parametrize(
+    "make",
+    [
+        lambda: pyplayground.PinnedVector("int8", 512),
+        lambda: pyplayground.SharedPinnedVector("int8", 512, backing="host"),
+        lambda: pyplayground.PinnedArena(512, backing="host"),
+        lambda: pyplayground.PinnedView(np.zeros(512, dtype=np.int8), backing="host"),
+    ],
+)
+def test_wrappers_export_their_buffer(make):
+    # Arrange
+    wrapper = make()
+
+    # Act
+    my_view = wrapper.__buffer__(0)
+
+    # Assert
+    assert my_view.obj is pyplayground._buffer_of(wrapper)
+    assert my_view.nbytes == memoryview(my_view.obj).nbytes
+
+
+@pytest.mark.parametrize(
+    "vector_type", [pyplayground.PageableI8Vector, pyplayground.PinnedI8Vector]
+)
+def test_array_interface(vector_type):
+    # Arrange
+    count = 512
+    my_vec = vector_type(count)
+
+    # Act
+    my_array = np.asarray(my_vec)
+
+    # Assert
+    assert my_array.dtype == np.int8
+    assert my_array.shape == (count,)
+    assert np.shares_memory(my_array, my_vec.as_ndarray())
+
+
+@pytest.mark.parametrize(
+    "vector_type, device_type",
+    [(pyplayground.PageableI8Vector, 1), (pyplayground.PinnedI8Vector, 3)],
+)
+def test_dlpack(vector_type, device_type):
+    # Arrange
+    count = 512
+    my_vec = vector_type(count)
+
+    # Act
+    my_device = my_vec.__dlpack_device__()
+    my_array = np.from_dlpack(my_vec)
+    del my_vec
+    gc.collect()
+
+    # Assert
+    assert my_device == (device_type, 0)
+    assert my_array.dtype == np.int8
+    assert my_array.shape == (count,)
+    assert my_array[:100].tolist() == list(range(100))
+
+
+def test_dlpack_rejects_copy():
+    # Arrange
+    my_vec = pyplayground.PinnedI8Vector(16)
+
+    # Act & Assert
+    with pytest.raises(BufferError):
+        my_vec.__dlpack__(copy=True)
+
+
+@pytest.mark.parametrize(
+    "vector_type", [pyplayground.PageableI8Vector, pyplayground.PinnedI8Vector]
+)
+@pytest.mark.parametrize(
+    "fill, value, expected",
+    [
+        ("zeros", 0, [0] * 300),
+        ("constant", 7, [7] * 300),
+        ("iota", 10, [(i + 10 + 128) % 256 - 128 for i in range(300)]),
+    ],
+)
+def test_fill_modes(vector_type, fill, value, expected):
+    # Act
+    my_array = vector_type(300, fill=fill, value=value).as_ndarray()
+
+    # Assert
+    assert my_array.tolist() == expected
+
+
+@pytest.mark.parametrize(
+    "vector_type", [pyplayground.PageableI8Vector, pyplayground.PinnedI8Vector]
+)
+def test_fill_uninitialized(vector_type):
+    # Act
+    my_array = vector_type(3 * 1024**2, fill="uninitialized").as_ndarray()
+
+    # Assert
+    assert my_array.shape == (3 * 1024**2,)
+
+
+@pytest.mark.parametrize(
+    "vector_type", [pyplayground.PageableI8Vector, pyplayground.PinnedI8Vector]
+)
+def test_fill_copy(vector_type):
+    # Arrange
+    count = 3 * 1024**2 + 5
+    source = np.random.default_rng(0).integers(-128, 128, count, dtype=np.int8)
+
+    # Act
+    my_array = vector_type(count, fill="copy", source=source).as_ndarray()
+
+    # Assert
+    assert np.array_equal(my_array, source)
+
+
+def test_fill_copy_rejects_small_source():
+    with pytest.raises(ValueError):
+        pyplayground.PinnedI8Vector(16, fill="copy", source=bytes(8))
+
+
+def test_fill_copy_rejects_strided_source():
+    source = np.zeros(32, dtype=np.int8)[::2]
+    with pytest.raises(ValueError):
+        pyplayground.PinnedI8Vector(16, fill="copy", source=source)
+
+
+def test_unknown_fill_mode():
+    with pytest.raises(ValueError):
+        pyplayground.PinnedI8Vector(16, fill="ones")
+
+
+def test_num_threads():
+    # Arrange
+    num_threads = pyplayground.get_num_threads()
+
+    # Act
+    pyplayground.set_num_threads(3)
+    changed = pyplayground.get_num_threads()
+    my_array = pyplayground.PinnedI8Vector(5 * 1024**2, fill="constant", value=3)
+    pyplayground.set_num_threads(num_threads)
+
+    # Assert
+    assert changed == 3
+    assert (my_array.as_ndarray() == 3).all()
+
+
 # This code is part of the playgrounds project
 # Copyright (c) 2024 ThatSzucs
 # Distributed under the MIT license. See accompanying license file
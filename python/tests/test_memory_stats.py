@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+import pyplayground
+
+
+@pytest.mark.parametrize(
+    "vector_type, kind", [(pyplayground.PinnedI8Vector, "pinned"), (pyplayground.PageableI8Vector, "pageable")]
+)
+def test_live_bytes(vector_type, kind):
+    before = pyplayground.memory_stats(kind)
+    vector = vector_type(1000)
+    during = pyplayground.memory_stats(kind)
+    del vector
+    after = pyplayground.memory_stats(kind)
+
+    assert during["live_bytes"] == before["live_bytes"] + 1000
+    assert during["allocations"] == before["allocations"] + 1
+    assert during["peak_bytes"] >= during["live_bytes"]
+    assert during["histogram"][1024] == before["histogram"].get(1024, 0) + 1
+    assert after["live_bytes"] == before["live_bytes"]
+    assert after["frees"] == before["frees"] + 1
+    assert after["allocate_seconds"] >= before["allocate_seconds"]
+
+
+def test_reset_peak_stats():
+    vector = pyplayground.PinnedU8Vector(1 << 20)
+    del vector
+
+    pyplayground.reset_peak_stats()
+    stats = pyplayground.memory_stats()
+
+    assert stats["peak_bytes"] == stats["live_bytes"]
+
+
+def test_memory_tag():
+    with pyplayground.memory_tag("test_memory_tag"):
+        tagged = pyplayground.PinnedVector("float32", (16, 16))
+    untagged = pyplayground.PinnedF32Vector(10)
+
+    stats = pyplayground.memory_stats("pinned")["tags"]["test_memory_tag"]
+    assert stats["live_bytes"] == 16 * 16 * 4
+    assert stats["allocations"] == 1
+    del tagged, untagged
+    assert pyplayground.memory_stats("pinned")["tags"]["test_memory_tag"]["live_bytes"] == 0
+
+
+def test_memory_tag_is_per_thread():
+    def allocate():
+        vectors.append(pyplayground.PinnedI8Vector(64))
+
+    vectors = []
+    with pyplayground.memory_tag("test_memory_tag_is_per_thread"):
+        thread = threading.Thread(target=allocate)
+        thread.start()
+        thread.join()
+
+    assert "test_memory_tag_is_per_thread" not in pyplayground.memory_stats()["tags"]
+
+
+def test_invalid_kind():
+    with pytest.raises(ValueError):
+        pyplayground.memory_stats("device")
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
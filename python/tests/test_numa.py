@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+def test_numa_nodes():
+    nodes = pyplayground.numa_nodes()
+    assert len(nodes) >= 1
+    assert all(node >= 0 for node in nodes)
+
+
+@pytest.mark.parametrize("vector_type", [pyplayground.PageableI8Vector, pyplayground.PinnedI8Vector])
+def test_vectors_bound_to_node(vector_type):
+    node = pyplayground.numa_nodes()[0]
+    vector = vector_type(1 << 16, fill="constant", value=3, numa=node)
+
+    assert vector.numa == f"bind:{node}"
+    assert np.all(vector.as_ndarray() == 3)
+    assert pyplayground.numa_node_of(vector) in (-1, node)
+
+
+@pytest.mark.parametrize(
+    "numa, expected",
+    [(None, None), ("interleave", "interleave"), ("bind:0", "bind:0"), ("preferred:0", "preferred:0")],
+)
+def test_numa_policies(numa, expected):
+    vector = pyplayground.PageableVector("float32", (64, 64), numa=numa)
+
+    assert vector.numa == expected
+    assert np.all(vector.as_ndarray() == 0)
+
+
+def test_device_local_policy_without_device():
+    # The node of a device that does not exist is not known, so pages stay local
+    assert pyplayground.numa_node_of_device(1 << 20) == -1
+    assert pyplayground.PinnedI8Vector(16, numa=f"device:{1 << 20}").numa is None
+
+
+def test_invalid_numa_policies():
+    missing = pyplayground.numa_nodes()[-1] + 1
+    with pytest.raises(ValueError):
+        pyplayground.PinnedI8Vector(16, numa=missing)
+    with pytest.raises(ValueError):
+        pyplayground.PinnedI8Vector(16, numa="everywhere")
+    with pytest.raises(ValueError):
+        pyplayground.PinnedI8Vector(16, numa="bind")
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
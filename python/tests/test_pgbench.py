@@ -0,0 +1,97 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "apps"))
+
+from pgbench import Case, results, stats  # noqa: E402
+from pgbench.__main__ import main, parse_size  # noqa: E402
+from pgbench.timing import Options, measure, warm_up, CpuTimer  # noqa: E402
+
+
+def test_percentile_matches_numpy():
+    values = sorted(np.random.default_rng(0).exponential(size=101))
+    for q in [0, 5, 25, 50, 75, 95, 99, 100]:
+        assert stats.percentile(values, q) == pytest.approx(np.percentile(values, q))
+
+
+def test_median_ci():
+    values = list(range(100))
+    low, high = stats.median_ci(values, 0.95)
+    assert low < stats.percentile(values, 50) < high
+    assert (low, high) == (40, 60)
+    wider = stats.median_ci(values, 0.99)
+    assert wider[0] < low and wider[1] > high
+    assert stats.median_ci([7], 0.95) == (7, 7)
+
+
+def test_summarize():
+    summary = stats.summarize([1000, 2000, 3000], 0.95)
+    assert summary["n"] == 3
+    assert summary["median"] == pytest.approx(2e-6)
+    assert summary["min"] == pytest.approx(1e-6)
+    assert summary["max"] == pytest.approx(3e-6)
+    assert summary["ci_low"] <= summary["median"] <= summary["ci_high"]
+
+
+def test_warm_up_stops_once_settled():
+    durations = iter([100, 90, 80, 70, 60] + [10] * 1000)
+    case = Case("settling", lambda: None, 1)
+
+    class Timer:
+        def time(self, run):
+            return next(durations)
+
+    options = Options(warmup_batch=5, warmup_tolerance=0.05, max_warmup=100)
+    assert warm_up(Timer(), case, options) == 15
+    assert warm_up(CpuTimer(), case, Options(max_warmup=5)) == 5
+
+
+def test_measure_honours_iteration_limits():
+    calls = []
+    case = Case("count", lambda: calls.append("run"), 1, before=lambda: calls.append("before"))
+    warmup_runs, samples = measure(case, Options(min_iters=3, max_iters=7, min_time=10.0, max_warmup=5))
+    assert warmup_runs == 5
+    assert len(samples) == 7
+    assert calls == ["before", "run"] * 12
+
+
+def result(case, median, ci_low, ci_high):
+    return {"scenario": "s", "case": case, "nbytes": 1024, "median": median, "ci_low": ci_low, "ci_high": ci_high}
+
+
+def test_compare_needs_significant_changes():
+    baseline = [result("slower", 1.0, 0.9, 1.1), result("noisy", 1.0, 0.5, 1.5),
+                result("faster", 1.0, 0.9, 1.1), result("gone", 1.0, 0.9, 1.1)]
+    candidate = [result("slower", 1.5, 1.4, 1.6), result("noisy", 1.5, 1.0, 2.0),
+                 result("faster", 0.5, 0.4, 0.6), result("new", 1.0, 0.9, 1.1)]
+    verdicts = {old["case"]: verdict for old, _, _, verdict in results.compare(baseline, candidate, 0.05)}
+    assert verdicts == {"slower": "regression", "noisy": "unchanged", "faster": "improvement"}
+
+
+def test_parse_size():
+    assert parse_size("4096") == 4096
+    assert parse_size("1M") == 1024**2
+    assert parse_size("64mb") == 64 * 1024**2
+    assert parse_size("1.5G") == 3 * 1024**3 // 2
+
+
+def test_run_and_compare(tmp_path, capsys):
+    options = ["--sizes", "64K", "--min-iters", "3", "--max-iters", "3", "--min-time", "0", "--max-warmup", "5"]
+    first, second = tmp_path / "first.json", tmp_path / "second.csv"
+    assert main(["run", "-s", "vector_casts", "--no-gpu", "--json", str(first)] + options) == 0
+    assert main(["run", "-s", "vector_casts", "--no-gpu", "--csv", str(second)] + options) == 0
+    assert "skipped, GPU scenarios disabled" in capsys.readouterr().out
+
+    loaded = results.load(str(first))
+    assert [r["case"] for r in loaded] == ["v as ndarray", "v as buffer"]
+    assert results.load(str(second))[0]["nbytes"] == 64 * 1024
+    assert main(["compare", str(first), str(second), "--threshold", "100"]) == 0
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
@@ -0,0 +1,88 @@
+import concurrent.futures
+import multiprocessing
+import pickle
+
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+def double(vector):
+    vector.as_ndarray()[:] *= 2
+    return vector
+
+
+def test_out_of_band_without_copies():
+    vector = pyplayground.PinnedVector("float32", (64, 16), fill="iota")
+    buffers = []
+
+    data = pickle.dumps(vector, protocol=5, buffer_callback=buffers.append)
+    restored = pickle.loads(data, buffers=buffers)
+
+    assert len(buffers) == 1
+    assert len(data) < vector.as_ndarray().nbytes
+    assert np.frombuffer(buffers[0], dtype=np.uint8).ctypes.data == vector.as_ndarray().ctypes.data
+    assert type(restored) is pyplayground.PinnedVector
+    assert restored.is_pinned
+    assert restored.as_ndarray().ctypes.data != vector.as_ndarray().ctypes.data
+    assert np.array_equal(restored.as_ndarray(), vector.as_ndarray())
+
+
+@pytest.mark.parametrize("protocol", [2, 4, 5])
+@pytest.mark.parametrize(
+    "vector_type, fill",
+    [
+        (pyplayground.PinnedI16Vector, "iota"),
+        (pyplayground.PageableBF16Vector, "iota"),
+        (pyplayground.cpp.PinnedU8Vector, pyplayground.cpp.FillMode.iota),
+    ],
+)
+def test_in_band(vector_type, fill, protocol):
+    vector = vector_type(100, fill=fill, value=3)
+
+    restored = pickle.loads(pickle.dumps(vector, protocol=protocol))
+
+    assert type(restored) is vector_type
+    assert np.array_equal(np.asarray(restored), np.asarray(vector))
+
+
+def test_keeps_options():
+    vector = pyplayground.MappedVector("int16", (8, 4), strides=(16, 2), numa="interleave", fill="iota")
+
+    restored = pickle.loads(pickle.dumps(vector, protocol=5))
+
+    assert restored.alloc_flags == ("mapped",)
+    assert restored.numa == "interleave"
+    assert restored.strides == (16, 2)
+    assert np.array_equal(restored.as_ndarray(), vector.as_ndarray())
+
+
+def test_empty_vectors():
+    restored = pickle.loads(pickle.dumps(pyplayground.PageableVector("uint8", 0), protocol=5))
+
+    assert restored.as_ndarray().shape == (0,)
+
+
+def test_process_pool():
+    vector = pyplayground.PinnedF64Vector(1000, fill="iota")
+    context = multiprocessing.get_context("spawn")
+
+    with concurrent.futures.ProcessPoolExecutor(1, mp_context=context) as executor:
+        doubled = executor.submit(double, vector).result()
+
+    assert type(doubled) is pyplayground.PinnedF64Vector
+    assert np.array_equal(doubled.as_ndarray(), 2 * np.arange(1000))
+
+
+def test_write_combined_pickles_warn():
+    vector = pyplayground.WriteCombinedVector("uint8", 64)
+
+    with pytest.warns(pyplayground.WriteCombinedReadWarning):
+        pickle.dumps(vector, protocol=5)
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
@@ -0,0 +1,104 @@
+import gc
+
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+@pytest.mark.parametrize("backing", ["cuda", "host"])
+def test_arrays_share_the_slab(backing):
+    arena = pyplayground.PinnedArena(1 << 20, backing=backing)
+
+    labels = arena.array(np.arange(10, dtype=np.int64))
+    masks = arena.zeros((4, 8), dtype=bool)
+    features = arena.empty((16, 3), dtype=np.float32)
+    features[:] = 1.5
+
+    whole = arena.as_ndarray()
+    assert arena.is_pinned
+    assert arena.offset_of(labels) == 0
+    assert arena.offset_of(masks) == 256
+    assert arena.offset_of(features) == 512
+    assert arena.used_nbytes == 512 + features.nbytes == whole.nbytes
+    assert np.array_equal(whole[:80].view(np.int64), np.arange(10))
+    assert np.all(whole[512:].view(np.float32) == 1.5)
+
+
+def test_alignment():
+    arena = pyplayground.PinnedArena(1 << 16, alignment=8, backing="host")
+
+    first = arena.empty(3, dtype=np.uint8)
+    second = arena.empty(2, dtype=np.float64)
+    third = arena.empty(1, dtype=np.uint8, alignment=4096)
+
+    assert arena.offset_of(first) == 0
+    assert arena.offset_of(second) == 8
+    assert third.ctypes.data % 4096 == 0
+    assert second.flags.aligned
+
+
+def test_collected_arrays_are_reused():
+    arena = pyplayground.PinnedArena(1 << 16, backing="host")
+    first = arena.empty(1000, dtype=np.int32)
+    address = first.ctypes.data
+
+    del first
+    gc.collect()
+    second = arena.empty(500, dtype=np.int32)
+
+    assert second.ctypes.data == address
+    assert arena.stats()["live_bytes"] == 2000
+
+
+def test_reset_frees_every_array():
+    arena = pyplayground.PinnedArena(4096, backing="host")
+    arrays = [arena.empty(1000) for _ in range(4)]
+
+    with pytest.raises(MemoryError):
+        arena.empty(1000)
+    arena.reset()
+    again = arena.empty(4000)
+    del arrays
+    gc.collect()
+
+    assert arena.offset_of(again) == 0
+    # Arrays of the previous batch do not free memory of the next one
+    assert arena.stats()["live_bytes"] == 4000
+    assert arena.stats()["resets"] == 1
+
+
+def test_copies_in_one_transfer():
+    arena = pyplayground.PinnedArena(1 << 16)
+    arena.array(np.arange(100, dtype=np.int16))
+    arena.array(np.ones(50, dtype=np.float32))
+    out = pyplayground.PinnedU8Vector(arena.used_nbytes)
+
+    np.copyto(np.asarray(out), arena)
+
+    assert np.array_equal(np.asarray(out), arena.as_ndarray())
+
+
+def test_empty_arrays():
+    arena = pyplayground.PinnedArena(4096, backing="host")
+
+    array = arena.empty((0, 3), dtype=np.float32)
+
+    assert array.shape == (0, 3)
+
+
+def test_rejects_arrays_of_other_memory():
+    arena = pyplayground.PinnedArena(4096, backing="host")
+
+    with pytest.raises(IndexError):
+        arena.offset_of(np.zeros(4))
+
+
+def test_rejects_unknown_backings():
+    with pytest.raises(ValueError):
+        pyplayground.PinnedArena(4096, backing="device")
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
@@ -0,0 +1,100 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+@pytest.fixture
+def budget():
+    yield pyplayground.set_pinned_budget
+    pyplayground.set_pinned_budget()
+
+
+def test_unlimited_by_default():
+    vector = pyplayground.PinnedI8Vector(1000)
+
+    assert pyplayground.get_pinned_budget() == {"limit_bytes": 0, "policy": "fail", "timeout": None}
+    assert vector.is_pinned
+    assert not pyplayground.PageableI8Vector(1000).is_pinned
+
+
+def test_fail_beyond_budget(budget):
+    budget(1 << 16, "fail")
+
+    with pytest.raises(RuntimeError):
+        pyplayground.PinnedU8Vector((1 << 16) + 1)
+
+
+def test_pageable_fallback(budget):
+    budget(1 << 16, "pageable")
+    pinned = pyplayground.PinnedVector("float32", (64, 64))
+    fallbacks = pyplayground.pinned_budget_stats()["fallbacks"]
+
+    vector = pyplayground.PinnedVector("float32", (128, 128), fill="constant", value=2)
+
+    assert pinned.is_pinned
+    assert not vector.is_pinned
+    assert pyplayground.pinned_budget_stats()["fallbacks"] == fallbacks + 1
+    # Fallbacks are exported as CPU memory rather than CUDA host memory
+    assert pinned.__dlpack_device__() == (3, 0)
+    assert vector.__dlpack_device__() == (1, 0)
+    assert np.all(vector.as_ndarray() == 2)
+
+
+def test_block_until_released(budget):
+    budget(1 << 16, "block", timeout=10)
+    first = pyplayground.PinnedU8Vector(1 << 15)
+    vectors = []
+
+    thread = threading.Thread(target=lambda: vectors.append(pyplayground.PinnedU8Vector(1 << 16)))
+    thread.start()
+    time.sleep(0.05)
+    blocked = not vectors
+    del first
+    thread.join()
+
+    assert blocked
+    assert vectors[0].is_pinned
+
+
+def test_block_timeout(budget):
+    budget(1 << 16, "block", timeout=0.01)
+    first = pyplayground.PinnedU8Vector(1 << 15)
+
+    with pytest.raises(RuntimeError):
+        pyplayground.PinnedU8Vector(1 << 16)
+    del first
+
+
+def test_ring_buffers_and_views_within_budget(budget):
+    budget(1 << 20, "fail")
+    pinned = pyplayground.pinned_budget_stats()["pinned_bytes"]
+    array = np.zeros(1 << 16, dtype=np.uint8)
+
+    ring = pyplayground.PinnedRingBuffer(4, 1 << 16)
+    view = pyplayground.PinnedView(array)
+
+    assert pyplayground.pinned_budget_stats()["pinned_bytes"] >= pinned + (1 << 18) + array.nbytes
+    with pytest.raises(RuntimeError):
+        pyplayground.PinnedRingBuffer(4, 1 << 18)
+    with pytest.raises(RuntimeError):
+        pyplayground.PinnedView(np.zeros(1 << 20, dtype=np.uint8))
+    del ring
+    view.release()
+    assert pyplayground.pinned_budget_stats()["pinned_bytes"] == pinned
+
+
+def test_invalid_budgets():
+    with pytest.raises(ValueError):
+        pyplayground.set_pinned_budget(1 << 20, "wait")
+    with pytest.raises(ValueError):
+        pyplayground.set_pinned_budget(1 << 20, "block", timeout=0)
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
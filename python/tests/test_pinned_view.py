@@ -0,0 +1,80 @@
+import mmap
+
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+def test_register_numpy_array():
+    array = np.arange(10_000, dtype=np.float32)
+    before = pyplayground.host_registry_stats("host")
+
+    with pyplayground.register_host_memory(array, backing="host") as view:
+        stats = pyplayground.host_registry_stats("host")
+        assert view.obj is array
+        assert view.nbytes == array.nbytes
+
+    assert view.released
+    assert stats["registrations"] == before["registrations"] + 1
+    assert pyplayground.host_registry_stats("host") == before
+
+
+def test_overlapping_views_share_pages():
+    array = np.zeros(8 * 4096, dtype=np.uint8)
+    before = pyplayground.host_registry_stats("host")
+
+    first = pyplayground.PinnedView(array[: 4 * 4096], backing="host")
+    second = pyplayground.PinnedView(array[2 * 4096 :], backing="host")
+    stats = pyplayground.host_registry_stats("host")
+    first.release()
+    del second
+
+    assert stats["registrations"] == before["registrations"] + 2
+    assert stats["registered_bytes"] - before["registered_bytes"] <= array.nbytes + 4096
+    assert pyplayground.host_registry_stats("host") == before
+
+
+def test_register_vectors_and_read_only_buffers():
+    vector = pyplayground.PageableI8Vector(1000)
+    with mmap.mmap(-1, 4096) as mapping:
+        views = [
+            pyplayground.PinnedView(vector, backing="host"),
+            pyplayground.PinnedView(b"read-only bytes", backing="host"),
+            pyplayground.PinnedView(mapping, backing="host"),
+        ]
+        assert [view.nbytes for view in views] == [1000, 15, 4096]
+        for view in views:
+            view.release()
+
+
+def test_registered_buffer_cannot_be_resized():
+    buffer = bytearray(100)
+
+    with pyplayground.PinnedView(buffer, backing="host"):
+        with pytest.raises(BufferError):
+            buffer.extend(b"more")
+
+
+def test_pinned_view_as_transfer_source():
+    engine = pyplayground.TransferEngine("simulated")
+    source = np.arange(100, dtype=np.int64)
+    result = np.zeros_like(source)
+
+    with pyplayground.PinnedView(source, backing="host") as view:
+        engine.copy(result, view).wait()
+
+    np.testing.assert_array_equal(result, source)
+
+
+def test_non_contiguous_buffers_are_rejected():
+    with pytest.raises(ValueError):
+        pyplayground.PinnedView(np.zeros((4, 4))[:, 0], backing="host")
+    with pytest.raises(ValueError):
+        pyplayground.PinnedView(np.zeros(4), backing="unknown")
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
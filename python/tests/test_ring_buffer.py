@@ -0,0 +1,82 @@
+import threading
+
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+def test_slot_round_trip():
+    ring = pyplayground.PinnedRingBuffer(2, 64, backing="host")
+
+    slot = ring.acquire_write()
+    ring.slot(slot, "float32")[:4] = [1, 2, 3, 4]
+    ring.commit(slot, 16)
+    read = ring.acquire_read()
+
+    assert read == slot
+    assert ring.filled_bytes(read) == 16
+    np.testing.assert_array_equal(ring.slot(read, "float32")[:4], [1, 2, 3, 4])
+    ring.release(read)
+    assert ring.stats()["released"] == 1
+
+
+def test_slot_view_keeps_ring_alive():
+    ring = pyplayground.PinnedRingBuffer(1, 8, backing="host")
+    view = ring.slot(0)
+    del ring
+
+    view[:] = 5
+
+    assert view.sum() == 40
+
+
+def test_non_blocking_and_timeout():
+    ring = pyplayground.PinnedRingBuffer(1, 8, backing="host")
+
+    assert ring.acquire_read(block=False) is None
+    assert ring.acquire_write() == 0
+    assert ring.acquire_write(timeout=0.01) is None
+    assert ring.stats()["producer_stalls"] == 1
+
+
+def test_misuse_raises():
+    ring = pyplayground.PinnedRingBuffer(1, 8, backing="host")
+
+    with pytest.raises(RuntimeError):
+        ring.release(0)
+    with pytest.raises(ValueError):
+        pyplayground.PinnedRingBuffer(1, 8, backing="unknown")
+
+
+def test_streams_between_threads():
+    ring = pyplayground.PinnedRingBuffer(2, 8, backing="host")
+    received = []
+
+    def produce():
+        for i in range(100):
+            slot = ring.acquire_write()
+            ring.slot(slot, "int64")[0] = i
+            ring.commit(slot, 8)
+        ring.close()
+
+    def consume():
+        while (slot := ring.acquire_read()) is not None:
+            received.append(int(ring.slot(slot, "int64")[0]))
+            ring.release(slot)
+
+    threads = [threading.Thread(target=produce), threading.Thread(target=consume)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert received == list(range(100))
+    assert ring.closed
+    assert ring.stats()["committed"] == 100
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
@@ -0,0 +1,82 @@
+import multiprocessing
+import pickle
+
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+def fill_rows(vector, rows, value):
+    vector.as_ndarray()[rows] = value
+
+
+def fill_by_handle(handle, value):
+    vector = pyplayground.SharedPinnedVector.attach(handle)
+    vector.as_ndarray()[:] = value
+    return vector.is_owner or vector.is_pinned
+
+
+@pytest.mark.parametrize("kind", ["memfd", "posix"])
+def test_workers_write_into_shared_vector(kind):
+    vector = pyplayground.SharedPinnedVector("int32", (4, 256), backing="host", kind=kind)
+    context = multiprocessing.get_context("spawn")
+
+    with context.Pool(2) as pool:
+        pool.starmap(fill_rows, [(vector, row, row + 1) for row in range(4)])
+
+    assert vector.is_owner
+    assert vector.is_pinned
+    assert np.all(vector.as_ndarray() == np.arange(1, 5, dtype=np.int32)[:, None])
+
+
+def test_attach_by_handle():
+    vector = pyplayground.SharedPinnedVector("float64", 1000, backing="host")
+    context = multiprocessing.get_context("spawn")
+
+    with context.Pool(1) as pool:
+        attached_owns_or_pins = pool.apply(fill_by_handle, (vector.handle, 1.5))
+
+    assert not attached_owns_or_pins
+    assert np.all(vector.as_ndarray() == 1.5)
+
+
+def test_pickle_attaches():
+    vector = pyplayground.SharedPinnedVector("uint8", (16, 16), backing="host")
+
+    attached = pickle.loads(pickle.dumps(vector))
+    attached.as_ndarray()[3, 5] = 7
+
+    assert not attached.is_owner
+    assert attached.shape == (16, 16)
+    assert attached.dtype == np.uint8
+    assert vector.as_ndarray()[3, 5] == 7
+    assert np.asarray(vector).sum() == 7
+
+
+def test_closed_posix_vectors_cannot_be_attached():
+    with pyplayground.SharedPinnedVector("int8", 64, backing="host", kind="posix") as vector:
+        handle = vector.handle
+
+    with pytest.raises(RuntimeError):
+        pyplayground.SharedPinnedVector.attach(handle)
+
+
+def test_pinned_within_budget():
+    vector = pyplayground.SharedPinnedVector("float32", (32, 32))
+
+    assert vector.nbytes == 32 * 32 * 4
+    assert vector.is_pinned
+
+
+def test_invalid_shared_vectors():
+    with pytest.raises(ValueError):
+        pyplayground.SharedPinnedVector("int8", 64, kind="sysv")
+    with pytest.raises(ValueError):
+        pyplayground.SharedPinnedVector("int8", 64, backing="disk")
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
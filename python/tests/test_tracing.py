@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+
+import pyplayground
+
+
+def test_traces_allocations_fills_and_copies():
+    with pyplayground.tracing():
+        with pyplayground.memory_tag("loader"):
+            vector = pyplayground.PinnedU8Vector(1 << 16, fill="zeros")
+        vector.copy_from(np.ones(1 << 16, dtype=np.uint8))
+        del vector
+
+    events = pyplayground.trace_events()
+    names = [event["name"] for event in events]
+
+    assert names.count("allocate") == 1
+    assert names.count("zeros") == 1
+    assert names.count("memcpy") == 1
+    assert names.count("free") == 1
+    allocate = events[names.index("allocate")]
+    assert allocate["category"] == "pinned"
+    assert allocate["tag"] == "loader"
+    assert allocate["nbytes"] == 1 << 16
+    assert allocate["begin_ns"] <= allocate["end_ns"]
+
+
+def test_records_nothing_when_stopped():
+    pyplayground.start_tracing()
+    pyplayground.stop_tracing()
+
+    pyplayground.PageableU8Vector(1024)
+
+    assert pyplayground.trace_events() == []
+
+
+def test_trace_ranges():
+    with pyplayground.tracing():
+        with pyplayground.trace_range("stage", nbytes=64):
+            pyplayground.PageableU8Vector(64)
+
+    events = pyplayground.trace_events()
+
+    assert events[0]["name"] == "stage"
+    assert events[0]["category"] == "python"
+    assert events[0]["nbytes"] == 64
+    # The allocation happened within the range
+    allocate = next(event for event in events if event["name"] == "allocate")
+    assert events[0]["begin_ns"] <= allocate["begin_ns"]
+    assert allocate["end_ns"] <= events[0]["end_ns"]
+
+
+def test_dumps_chrome_traces(tmp_path):
+    path = tmp_path / "trace.json"
+
+    with pyplayground.tracing(path):
+        pyplayground.PinnedF32Vector(1000)
+
+    trace = json.loads(path.read_text())
+    events = trace["traceEvents"]
+    assert {event["name"] for event in events} >= {"allocate", "iota", "free"}
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    assert events[0]["args"]["nbytes"] == 4000
+    assert trace["otherData"]["dropped_events"] == 0
+
+
+def test_counts_dropped_events(tmp_path):
+    path = tmp_path / "trace.json"
+
+    with pyplayground.tracing(path, max_events_per_thread=2):
+        for _ in range(3):
+            pyplayground.PageableU8Vector(16)
+
+    trace = json.loads(path.read_text())
+    assert len(trace["traceEvents"]) == 2
+    assert trace["otherData"]["dropped_events"] == 7
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
@@ -0,0 +1,69 @@
+import asyncio
+import gc
+
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+def test_round_trip():
+    engine = pyplayground.TransferEngine("simulated", num_streams=3, chunk_bytes=1000)
+    source = pyplayground.PinnedI32Vector(10_000)
+    result = pyplayground.PinnedI32Vector(10_000, fill="zeros")
+    device = engine.device_buffer(40_000)
+
+    engine.copy(device, source).wait()
+    handle = engine.copy(result, device)
+    handle.wait()
+
+    assert handle.done()
+    assert handle.nbytes == 40_000
+    np.testing.assert_array_equal(result.as_ndarray(), source.as_ndarray())
+
+
+def test_partial_copy_between_host_buffers():
+    engine = pyplayground.TransferEngine("simulated")
+    source = np.arange(10, dtype=np.uint8)
+    result = np.zeros(10, dtype=np.uint8)
+
+    engine.copy(result, source, nbytes=4).wait()
+
+    np.testing.assert_array_equal(result, [0, 1, 2, 3, 0, 0, 0, 0, 0, 0])
+    with pytest.raises(ValueError):
+        engine.copy(result[:2], source)
+    with pytest.raises(ValueError):
+        pyplayground.TransferEngine("unknown")
+
+
+def test_engine_keeps_buffers_alive():
+    engine = pyplayground.TransferEngine("simulated", chunk_bytes=4096)
+    result = np.zeros(1_000_000, dtype=np.uint8)
+
+    engine.copy(result, np.ones(1_000_000, dtype=np.uint8))
+    gc.collect()
+    engine.synchronize()
+
+    assert result.sum() == 1_000_000
+
+
+def test_await_handles():
+    engine = pyplayground.TransferEngine("simulated", num_streams=2, chunk_bytes=4096)
+    sources = [np.full(100_000, i, dtype=np.int16) for i in range(8)]
+    results = [np.empty_like(source) for source in sources]
+
+    async def transfer_all():
+        await asyncio.gather(
+            *(engine.copy(result, source) for result, source in zip(results, sources))
+        )
+
+    asyncio.run(transfer_all())
+
+    for result, source in zip(results, sources):
+        np.testing.assert_array_equal(result, source)
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+import pyplayground
+
+NUMPY_DTYPES = [
+    "int8",
+    "uint8",
+    "int16",
+    "uint16",
+    "int32",
+    "uint32",
+    "int64",
+    "uint64",
+    "float16",
+    "float32",
+    "float64",
+]
+
+
+@pytest.mark.parametrize("dtype", NUMPY_DTYPES)
+@pytest.mark.parametrize("prefix", ["Pageable", "Pinned"])
+def test_typed_vector(prefix, dtype):
+    # Arrange
+    count = 100
+    vector_type = getattr(pyplayground, f"{prefix}{pyplayground._DTYPES[dtype]}Vector")
+
+    # Act
+    my_vec = vector_type(count)
+    my_array = my_vec.as_ndarray()
+
+    # Assert
+    assert my_array.dtype == np.dtype(dtype)
+    assert my_array.shape == (count,)
+    assert my_array.tolist() == list(range(count))
+    assert np.from_dlpack(my_vec).dtype == np.dtype(dtype)
+    assert np.asarray(my_vec).dtype == np.dtype(dtype)
+
+
+@pytest.mark.parametrize("dtype", NUMPY_DTYPES)
+@pytest.mark.parametrize(
+    "vector_type", [pyplayground.PageableVector, pyplayground.PinnedVector]
+)
+def test_shaped_vector(vector_type, dtype):
+    # Arrange
+    shape = (4, 3, 2)
+
+    # Act
+    my_vec = vector_type(dtype, shape)
+    my_array = my_vec.as_ndarray()
+
+    # Assert
+    assert my_vec.dtype == np.dtype(dtype)
+    assert my_array.dtype == np.dtype(dtype)
+    assert my_array.shape == shape
+    assert my_array.flags.c_contiguous
+    assert (my_array == 0).all()
+    assert my_array.ctypes.data % my_array.itemsize == 0
+
+
+def test_shaped_vector_strides():
+    # Arrange, rows padded to 16 floats
+    shape = (3, 10)
+    strides = (64, 4)
+
+    # Act
+    my_vec = pyplayground.PinnedVector(np.float32, shape, strides, fill="iota")
+    my_array = my_vec.as_ndarray()
+
+    # Assert
+    assert my_array.shape == shape
+    assert my_array.strides == strides
+    assert my_array[1, 0] == 16
+    assert my_array[2, 9] == 41
+    assert np.from_dlpack(my_vec).strides == strides
+
+
+def test_shaped_vector_views_share_memory():
+    # Arrange
+    my_vec = pyplayground.PinnedVector("float32", (8, 8))
+
+    # Act
+    my_vec.as_ndarray()[2, 3] = 5.0
+
+    # Assert
+    assert np.asarray(my_vec)[2, 3] == 5.0
+    assert np.from_dlpack(my_vec)[2, 3] == 5.0
+
+
+def test_as_ndarray_checks_bounds():
+    my_vec = pyplayground.PinnedF32Vector(10)
+    assert my_vec._cpp.as_ndarray((2, 5)).shape == (2, 5)
+    with pytest.raises(ValueError):
+        my_vec._cpp.as_ndarray((3, 4))
+    with pytest.raises(ValueError):
+        my_vec._cpp.as_ndarray((2, 5), (40, 8))
+
+
+def test_float16_fill():
+    # Act
+    my_array = pyplayground.PinnedF16Vector(5, fill="constant", value=1.5).as_ndarray()
+
+    # Assert
+    assert my_array.dtype == np.float16
+    assert my_array.tolist() == [1.5] * 5
+
+
+def test_bfloat16_vector():
+    # Act
+    my_vec = pyplayground.PinnedBF16Vector(4, fill="constant", value=1.5)
+    my_array = my_vec.as_ndarray()
+
+    # Assert
+    assert my_array.itemsize == 2
+    assert my_array.view(np.uint16).tolist() == [0x3FC0] * 4
+
+
+def test_unsupported_dtype():
+    with pytest.raises(TypeError):
+        pyplayground.PinnedVector(np.complex64, 4)
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
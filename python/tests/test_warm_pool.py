@@ -0,0 +1,99 @@
+import asyncio
+import concurrent.futures
+
+import numpy as np
+import pytest
+
+import pyplayground
+
+
+def test_allocate_async():
+    future = pyplayground.PinnedI32Vector.allocate_async(1000, fill="iota", value=5)
+
+    vector = future.result(timeout=10)
+
+    assert future.done()
+    assert not future.cancelled()
+    assert type(vector) is pyplayground.PinnedI32Vector
+    assert vector.is_pinned
+    assert np.array_equal(vector.as_ndarray(), np.arange(5, 1005))
+    assert future.result() is vector
+
+
+def test_allocate_shaped_async():
+    future = pyplayground.MappedVector.allocate_async("float32", (16, 8), fill="constant", value=2)
+
+    vector = asyncio.run(_awaited(future))
+
+    assert type(vector) is pyplayground.MappedVector
+    assert vector.alloc_flags == ("mapped",)
+    assert vector.as_ndarray().shape == (16, 8)
+    assert np.all(vector.as_ndarray() == 2)
+
+
+async def _awaited(future):
+    return await future
+
+
+def test_cancel():
+    # Queued behind a large allocation, so still pending when cancelled
+    first = pyplayground.PageableU8Vector.allocate_async(1 << 26)
+    second = pyplayground.PageableU8Vector.allocate_async(1 << 20)
+
+    cancelled = second.cancel()
+    first.result()
+
+    assert cancelled
+    assert second.cancelled()
+    assert not first.cancel()
+    with pytest.raises(concurrent.futures.CancelledError):
+        second.result()
+
+
+def test_warm_pool():
+    pool = pyplayground.WarmPool(pyplayground.PinnedF32Vector, depth=2)
+    assert pool.reserve_async(1000).result() == 2
+    assert pool.reserve_async(10_000).result() == 2
+
+    small = pool.acquire(1000)
+    large = pool.acquire(5000)
+    other = pool.acquire(20_000)
+    stats = pool.stats()
+
+    assert type(small) is pyplayground.PinnedF32Vector
+    assert small.is_pinned
+    assert len(small.as_ndarray()) == 1000
+    assert len(large.as_ndarray()) == 5000
+    assert len(other.as_ndarray()) == 20_000
+    assert stats["hits"] + stats["waits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_warm_pool_counts_waits():
+    # Keeps the background thread busy, the pool is warmed after it
+    busy = pyplayground.PageableU8Vector.allocate_async(1 << 27, fill="zeros")
+    pool = pyplayground.WarmPool(pyplayground.PageableU8Vector, counts=[1 << 20])
+
+    vectors = [pool.acquire(1 << 20) for _ in range(3)]
+    stats = pool.stats()
+
+    assert busy.done()
+    assert len(vectors) == 3
+    assert stats["hits"] + stats["waits"] == 3
+    assert stats["waits"] >= 1
+    assert stats["wait_seconds"] > 0
+
+
+def test_invalid_async_allocations():
+    with pytest.raises(ValueError):
+        pyplayground.PinnedU8Vector.allocate_async(16, fill="copy")
+    with pytest.raises(ValueError):
+        pyplayground.WarmPool(pyplayground.PinnedU8Vector, depth=0)
+    with pytest.raises(TypeError):
+        pyplayground.WarmPool(pyplayground.PinnedVector)
+
+
+# This code is part of the playgrounds project
+# Copyright (c) 2024 ThatSzucs
+# Distributed under the MIT license. See accompanying license file
+# copy at https://opensource.org/licenses/MIT.
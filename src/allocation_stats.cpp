@@ -0,0 +1,184 @@
+#include "playground/allocation_stats.h"
+
+#include <memory>
+#include <mutex>
+#include <utility>
+
+namespace playground {
+
+namespace {
+
+auto histogram_bucket(std::size_t bytes) noexcept -> std::size_t
+{
+    auto bucket = std::size_t{0};
+    for (auto size = std::size_t{1}; size < bytes && bucket + 1 < allocation_histogram_buckets; size <<= 1)
+        ++bucket;
+    return bucket;
+}
+
+struct kind_counters {
+    allocation_counters total;
+    std::map<std::string, std::unique_ptr<allocation_counters>> tags;
+};
+
+/* Kinds and tags are few and looked up once per allocator, not per allocation */
+class counters_registry {
+  public:
+    auto of(std::string const &kind) -> allocation_counters & { return kind_of(kind).total; }
+
+    auto of(std::string const &kind, std::string const &tag) -> allocation_counters &
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        auto &counters = kinds_[kind].tags[tag];
+        if (!counters)
+            counters = std::make_unique<allocation_counters>();
+        return *counters;
+    }
+
+    auto total(std::string const &kind) -> allocation_stats { return kind_of(kind).total.stats(); }
+
+    auto by_tag(std::string const &kind) -> std::map<std::string, allocation_stats>
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        auto result = std::map<std::string, allocation_stats>{};
+        for (auto const &[tag, counters] : kinds_[kind].tags)
+            result.emplace(tag, counters->stats());
+        return result;
+    }
+
+    auto reset_peaks() -> void
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        for (auto &[kind, counters] : kinds_) {
+            counters.total.reset_peak();
+            for (auto &[tag, tagged] : counters.tags)
+                tagged->reset_peak();
+        }
+    }
+
+  private:
+    auto kind_of(std::string const &kind) -> kind_counters &
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        return kinds_[kind]; // std::map never moves its elements
+    }
+
+    std::mutex mutex_;
+    std::map<std::string, kind_counters> kinds_;
+};
+
+auto registry() -> counters_registry &
+{
+    static auto *counters = new counters_registry{}; // Never destroyed, allocators may outlive main
+    return *counters;
+}
+
+thread_local std::string current_tag;
+
+} // namespace
+
+auto allocation_counters::record_allocate(std::size_t bytes, std::chrono::nanoseconds duration) noexcept -> void
+{
+    const auto live = live_bytes_.fetch_add(bytes, std::memory_order_relaxed) + bytes;
+    auto peak = peak_bytes_.load(std::memory_order_relaxed);
+    while (live > peak && !peak_bytes_.compare_exchange_weak(peak, live, std::memory_order_relaxed))
+        ;
+
+    auto &s = home_shard();
+    s.allocations.fetch_add(1, std::memory_order_relaxed);
+    s.allocated_bytes.fetch_add(bytes, std::memory_order_relaxed);
+    s.allocate_nanoseconds.fetch_add(duration.count(), std::memory_order_relaxed);
+    s.histogram[histogram_bucket(bytes)].fetch_add(1, std::memory_order_relaxed);
+}
+
+auto allocation_counters::record_deallocate(std::size_t bytes, std::chrono::nanoseconds duration) noexcept -> void
+{
+    live_bytes_.fetch_sub(bytes, std::memory_order_relaxed);
+
+    auto &s = home_shard();
+    s.frees.fetch_add(1, std::memory_order_relaxed);
+    s.freed_bytes.fetch_add(bytes, std::memory_order_relaxed);
+    s.free_nanoseconds.fetch_add(duration.count(), std::memory_order_relaxed);
+}
+
+auto allocation_counters::stats() const -> allocation_stats
+{
+    auto result = allocation_stats{};
+    result.live_bytes = live_bytes_.load();
+    result.peak_bytes = peak_bytes_.load();
+    auto allocate_nanoseconds = std::size_t{0};
+    auto free_nanoseconds = std::size_t{0};
+    for (auto const &s : shards_) {
+        result.allocations += s.allocations.load(std::memory_order_relaxed);
+        result.frees += s.frees.load(std::memory_order_relaxed);
+        result.allocated_bytes += s.allocated_bytes.load(std::memory_order_relaxed);
+        result.freed_bytes += s.freed_bytes.load(std::memory_order_relaxed);
+        allocate_nanoseconds += s.allocate_nanoseconds.load(std::memory_order_relaxed);
+        free_nanoseconds += s.free_nanoseconds.load(std::memory_order_relaxed);
+        for (std::size_t bucket = 0; bucket < allocation_histogram_buckets; ++bucket)
+            result.histogram[bucket] += s.histogram[bucket].load(std::memory_order_relaxed);
+    }
+    result.allocate_seconds = static_cast<double>(allocate_nanoseconds) * 1e-9;
+    result.free_seconds = static_cast<double>(free_nanoseconds) * 1e-9;
+    return result;
+}
+
+auto allocation_counters::home_shard() noexcept -> shard &
+{
+    static std::atomic<std::size_t> next_thread{0};
+    thread_local const auto thread_index = next_thread++;
+    return shards_[thread_index % num_shards];
+}
+
+auto allocation_counters_of(std::string const &kind) -> allocation_counters &
+{
+    return registry().of(kind);
+}
+
+auto allocation_counters_of(std::string const &kind, std::string const &tag) -> allocation_counters &
+{
+    return registry().of(kind, tag);
+}
+
+auto memory_stats(std::string const &kind) -> allocation_stats
+{
+    return registry().total(kind);
+}
+
+auto memory_stats_by_tag(std::string const &kind) -> std::map<std::string, allocation_stats>
+{
+    return registry().by_tag(kind);
+}
+
+auto reset_peak_stats() -> void
+{
+    registry().reset_peaks();
+}
+
+allocation_tag::allocation_tag(std::string tag) : previous_{std::exchange(current_tag, std::move(tag))} {}
+
+allocation_tag::~allocation_tag()
+{
+    current_tag = std::move(previous_);
+}
+
+auto allocation_tag::current() -> std::string const &
+{
+    return current_tag;
+}
+
+allocation_recorder::allocation_recorder(char const *kind, allocation_counters &total)
+    : kind_{kind}, tag_{current_tag.empty() ? nullptr : intern_trace_name(current_tag)}, total_{&total},
+      tagged_{current_tag.empty() ? nullptr : &allocation_counters_of(kind, current_tag)}
+{
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,220 @@
+#include "playground/autotune.h"
+#include "playground/copy.h"
+#include "playground/fill.h"
+#include "playground/numa.h"
+#include "playground/pinned_budget.h"
+
+#include <unistd.h>
+
+#include <algorithm>
+#include <chrono>
+#include <cstdint>
+#include <fstream>
+#include <limits>
+#include <stdexcept>
+#include <string>
+#include <thread>
+
+namespace playground {
+
+namespace {
+
+constexpr std::size_t page_size = 4096;
+
+/* Buffer whose data is aligned to alignment but not to any larger power of
+ * two below a page, page aligned for alignments of a page or more */
+class tuning_buffer {
+  public:
+    tuning_buffer(std::size_t bytes, std::size_t max_alignment, bool pinned)
+        : pinned_{pinned}, size_{bytes + 2 * std::max(max_alignment, page_size)}
+    {
+        raw_ = pinned_ ? budgeted<cuda_host_backing>{}.allocate(size_) : pageable_backing{}.allocate(size_);
+        auto *p = static_cast<char *>(raw_);
+        base_ = p + (page_size - reinterpret_cast<std::uintptr_t>(p) % page_size) % page_size;
+        parallel_fill(static_cast<unsigned char *>(raw_), size_, static_cast<unsigned char>(1));
+    }
+
+    ~tuning_buffer()
+    {
+        if (pinned_)
+            budgeted<cuda_host_backing>{}.deallocate(raw_, size_);
+        else
+            pageable_backing{}.deallocate(raw_, size_);
+    }
+
+    tuning_buffer(tuning_buffer const &) = delete;
+    auto operator=(tuning_buffer const &) -> tuning_buffer & = delete;
+
+    auto data(std::size_t alignment) const -> char * { return base_ + alignment % page_size; }
+
+  private:
+    bool pinned_;
+    std::size_t size_;
+    void *raw_;
+    char *base_;
+};
+
+/* Restores the parameters in use on destruction */
+class tuning_guard {
+  public:
+    tuning_guard() : saved_{get_copy_tuning()} {}
+    ~tuning_guard() { set_copy_tuning(saved_); }
+
+    tuning_guard(tuning_guard const &) = delete;
+    auto operator=(tuning_guard const &) -> tuning_guard & = delete;
+
+  private:
+    copy_tuning saved_;
+};
+
+/* Best of repeats runs of fn, in seconds */
+template <typename Fn>
+auto best_time(std::size_t repeats, Fn &&fn) -> double
+{
+    fn(); // Warm up the pool and the caches
+    auto best = std::numeric_limits<double>::infinity();
+    for (std::size_t i = 0; i < std::max<std::size_t>(repeats, 1); ++i) {
+        const auto start = std::chrono::steady_clock::now();
+        fn();
+        best = std::min(best, std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count());
+    }
+    return best;
+}
+
+auto default_thread_counts() -> std::vector<std::size_t>
+{
+    const auto hardware = std::max<std::size_t>(1, std::thread::hardware_concurrency());
+    auto counts = std::vector<std::size_t>{};
+    for (std::size_t n = 1; n < hardware; n *= 2)
+        counts.push_back(n);
+    counts.push_back(hardware);
+    return counts;
+}
+
+auto cpu_model() -> std::string
+{
+    auto file = std::ifstream{"/proc/cpuinfo"};
+    auto line = std::string{};
+    while (std::getline(file, line)) {
+        // "model name" on x86, "Model" or "CPU part" elsewhere
+        if (line.rfind("model name", 0) == 0 || line.rfind("Model", 0) == 0) {
+            const auto colon = line.find(':');
+            if (colon != std::string::npos)
+                return line.substr(line.find_first_not_of(" \t", colon + 1));
+        }
+    }
+    return "unknown";
+}
+
+} // namespace
+
+auto get_copy_tuning() -> copy_tuning
+{
+    return {get_num_threads(), get_parallel_grain(), get_nontemporal_threshold()};
+}
+
+auto set_copy_tuning(copy_tuning const &tuning) -> void
+{
+    set_num_threads(tuning.num_threads);
+    set_parallel_grain(tuning.grain_bytes);
+    set_nontemporal_threshold(tuning.nontemporal_threshold);
+}
+
+auto host_key() -> std::string
+{
+    const auto memory_bytes =
+        static_cast<std::size_t>(sysconf(_SC_PHYS_PAGES)) * static_cast<std::size_t>(sysconf(_SC_PAGESIZE));
+    return cpu_model() + " | " + std::to_string(std::thread::hardware_concurrency()) + " threads | " +
+           std::to_string(numa_nodes().size()) + " nodes | " + std::to_string((memory_bytes + (1u << 29)) >> 30) +
+           " GiB";
+}
+
+auto autotune_copies(tuning_options const &options) -> tuning_result
+{
+    if (options.buffer_bytes == 0)
+        throw std::invalid_argument{"autotune_copies: buffer_bytes must be positive."};
+    if (options.grains.empty() || options.alignments.empty())
+        throw std::invalid_argument{"autotune_copies: nothing to sweep."};
+
+    const auto bytes = options.buffer_bytes;
+    const auto thread_counts = options.thread_counts.empty() ? default_thread_counts() : options.thread_counts;
+    const auto max_alignment = *std::max_element(options.alignments.begin(), options.alignments.end());
+    const auto src = tuning_buffer{bytes, max_alignment, false};
+    const auto dst = tuning_buffer{bytes, max_alignment, options.pinned};
+    const auto guard = tuning_guard{};
+
+    auto result = tuning_result{};
+    auto best_seconds = std::numeric_limits<double>::infinity();
+
+    // Threads and grains, on whatever stores the current threshold picks
+    for (auto num_threads : thread_counts) {
+        set_num_threads(num_threads);
+        for (auto grain : options.grains) {
+            set_parallel_grain(grain);
+            auto seconds = 0.0;
+            for (auto alignment : options.alignments) {
+                auto *d = dst.data(alignment);
+                auto *s = src.data(alignment);
+                seconds += best_time(options.repeats, [&] { parallel_memcpy(d, s, bytes); });
+                seconds += best_time(options.repeats, [&] {
+                    parallel_fill(reinterpret_cast<unsigned char *>(d), bytes, static_cast<unsigned char>(0));
+                });
+            }
+            seconds /= static_cast<double>(options.alignments.size());
+            const auto streaming = get_nontemporal_threshold() != 0 && bytes >= get_nontemporal_threshold();
+            result.trials.push_back({"threads", get_num_threads(), grain, bytes, 0, streaming, seconds});
+            if (seconds < best_seconds) {
+                best_seconds = seconds;
+                result.best.num_threads = get_num_threads();
+                result.best.grain_bytes = grain;
+            }
+        }
+    }
+    set_num_threads(result.best.num_threads);
+    set_parallel_grain(result.best.grain_bytes);
+
+    // Streaming against regular stores, from the largest size down
+    auto sizes = std::vector<std::size_t>{};
+    for (auto size = std::min(bytes, std::size_t{1} << 20); size < bytes; size *= 2)
+        sizes.push_back(size);
+    sizes.push_back(bytes);
+    result.best.nontemporal_threshold = 0;
+    for (auto i = sizes.size(); i-- > 0;) {
+        auto *d = dst.data(page_size);
+        auto *s = src.data(page_size);
+        auto seconds = [&](bool streaming) {
+            set_nontemporal_threshold(streaming ? 1 : 0);
+            const auto t = best_time(options.repeats, [&] { parallel_memcpy(d, s, sizes[i]); });
+            result.trials.push_back(
+                {"stores", result.best.num_threads, result.best.grain_bytes, sizes[i], page_size, streaming, t});
+            return t;
+        };
+        const auto regular = seconds(false);
+        if (seconds(true) >= regular)
+            break;
+        result.best.nontemporal_threshold = sizes[i];
+    }
+    set_nontemporal_threshold(result.best.nontemporal_threshold);
+
+    // Alignments with the best parameters, nothing to set for them
+    for (auto alignment : options.alignments) {
+        auto *d = dst.data(alignment);
+        auto *s = src.data(alignment);
+        const auto streaming = result.best.nontemporal_threshold != 0 && bytes >= result.best.nontemporal_threshold;
+        const auto seconds = best_time(options.repeats, [&] { parallel_memcpy(d, s, bytes); });
+        result.trials.push_back(
+            {"alignment", result.best.num_threads, result.best.grain_bytes, bytes, alignment, streaming, seconds});
+    }
+
+    return result;
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
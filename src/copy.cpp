@@ -0,0 +1,138 @@
+#include "playground/copy.h"
+
+#if defined(__SSE2__)
+#include <emmintrin.h>
+#endif
+
+#include <algorithm>
+#include <atomic>
+#include <cstdint>
+#include <stdexcept>
+
+namespace playground {
+
+namespace {
+
+// Roughly where a copy stops fitting into the last level cache
+std::atomic<std::size_t> nontemporal_threshold{std::size_t{8} << 20};
+
+} // namespace
+
+auto set_nontemporal_threshold(std::size_t bytes) -> void
+{
+    nontemporal_threshold = bytes;
+}
+
+auto get_nontemporal_threshold() -> std::size_t
+{
+    return nontemporal_threshold;
+}
+
+auto stream_memcpy(void *dst, void const *src, std::size_t bytes) -> void
+{
+#if defined(__SSE2__)
+    auto *d = static_cast<char *>(dst);
+    auto *s = static_cast<char const *>(src);
+
+    // Streaming stores need a 16 byte aligned destination
+    const auto head = std::min<std::size_t>((16 - reinterpret_cast<std::uintptr_t>(d) % 16) % 16, bytes);
+    std::memcpy(d, s, head);
+    d += head;
+    s += head;
+    bytes -= head;
+
+    const auto body = bytes / 64 * 64;
+    for (std::size_t i = 0; i < body; i += 64) {
+        const auto a = _mm_loadu_si128(reinterpret_cast<__m128i const *>(s + i));
+        const auto b = _mm_loadu_si128(reinterpret_cast<__m128i const *>(s + i + 16));
+        const auto c = _mm_loadu_si128(reinterpret_cast<__m128i const *>(s + i + 32));
+        const auto e = _mm_loadu_si128(reinterpret_cast<__m128i const *>(s + i + 48));
+        _mm_stream_si128(reinterpret_cast<__m128i *>(d + i), a);
+        _mm_stream_si128(reinterpret_cast<__m128i *>(d + i + 16), b);
+        _mm_stream_si128(reinterpret_cast<__m128i *>(d + i + 32), c);
+        _mm_stream_si128(reinterpret_cast<__m128i *>(d + i + 48), e);
+    }
+    _mm_sfence();
+    std::memcpy(d + body, s + body, bytes - body);
+#else
+    std::memcpy(dst, src, bytes);
+#endif
+}
+
+auto parallel_memcpy(void *dst, void const *src, std::size_t bytes) -> void
+{
+    const auto scope = trace_scope{"memcpy", "copy", bytes};
+    const auto threshold = get_nontemporal_threshold();
+    const auto streaming = threshold != 0 && bytes >= threshold;
+    auto *d = static_cast<char *>(dst);
+    auto *s = static_cast<char const *>(src);
+    parallel_for(bytes, get_parallel_grain(), [=](std::size_t begin, std::size_t end) {
+        if (streaming)
+            stream_memcpy(d + begin, s + begin, end - begin);
+        else
+            std::memcpy(d + begin, s + begin, end - begin);
+    });
+}
+
+auto parallel_collate(byte_span const *sources,
+                      std::size_t count,
+                      std::size_t const *offsets,
+                      void *dst,
+                      void const *pad,
+                      std::size_t pad_size) -> void
+{
+    auto const *pattern = static_cast<unsigned char const *>(pad);
+    // Padding with zeros (or any repeated byte) is a memset
+    const auto uniform_pad =
+        std::all_of(pattern, pattern + pad_size, [pattern](unsigned char byte) { return byte == pattern[0]; });
+    for (std::size_t i = 0; i < count; ++i) {
+        if (offsets[i + 1] < offsets[i] || sources[i].size > offsets[i + 1] - offsets[i])
+            throw std::invalid_argument{"parallel_collate: source larger than its slot."};
+        const auto padding = offsets[i + 1] - offsets[i] - sources[i].size;
+        if (padding && (pad_size == 0 || padding % pad_size != 0))
+            throw std::invalid_argument{"parallel_collate: padding is not a multiple of the pad size."};
+    }
+    if (count == 0)
+        return;
+
+    const auto scope = trace_scope{"collate", "copy", offsets[count] - offsets[0]};
+    const auto threshold = get_nontemporal_threshold();
+    const auto streaming = threshold != 0 && offsets[count] - offsets[0] >= threshold;
+    auto *d = static_cast<unsigned char *>(dst);
+    parallel_for(offsets[count] - offsets[0], get_parallel_grain(), [=](std::size_t begin, std::size_t end) {
+        begin += offsets[0];
+        end += offsets[0];
+        // First slot overlapping the chunk
+        auto i = static_cast<std::size_t>(std::upper_bound(offsets, offsets + count + 1, begin) - offsets - 1);
+        for (; i < count && offsets[i] < end; ++i) {
+            const auto data_end = offsets[i] + sources[i].size;
+            const auto copy_begin = std::max(begin, offsets[i]);
+            const auto copy_end = std::min(end, data_end);
+            if (copy_begin < copy_end) {
+                auto const *s = static_cast<unsigned char const *>(sources[i].data) + (copy_begin - offsets[i]);
+                if (streaming)
+                    stream_memcpy(d + copy_begin, s, copy_end - copy_begin);
+                else
+                    std::memcpy(d + copy_begin, s, copy_end - copy_begin);
+            }
+            const auto pad_begin = std::max(begin, data_end);
+            const auto pad_end = std::min(end, offsets[i + 1]);
+            if (pad_begin < pad_end && uniform_pad)
+                std::memset(d + pad_begin, pattern[0], pad_end - pad_begin);
+            else {
+                for (auto j = pad_begin; j < pad_end; ++j)
+                    d[j] = pattern[(j - data_end) % pad_size];
+            }
+        }
+    });
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,76 @@
+#include "playground/cuda_init.h"
+#include "playground/tracing.h"
+
+#include "cuda_runtime.h"
+
+#include <chrono>
+#include <mutex>
+#include <stdexcept>
+
+namespace playground {
+
+namespace {
+
+std::mutex init_mutex;
+cuda_init_stats init_stats;
+
+auto initialize(int device, bool implicit) -> void
+{
+    std::lock_guard<std::mutex> lock{init_mutex};
+    if (cuda_initialized())
+        return;
+
+    const auto scope = trace_scope{"cuda_init", "cuda"};
+    const auto start = std::chrono::steady_clock::now();
+    if (device >= 0) {
+        auto error = cudaSetDevice(device);
+        if (error != cudaSuccess) {
+            cudaGetLastError();
+            throw std::runtime_error{cudaGetErrorString(error)};
+        }
+    }
+    // Creates the primary context of the device
+    auto error = cudaFree(nullptr);
+    if (error != cudaSuccess) {
+        cudaGetLastError();
+        throw std::runtime_error{cudaGetErrorString(error)};
+    }
+    if (device < 0 && cudaGetDevice(&device) != cudaSuccess) {
+        cudaGetLastError();
+        device = -1;
+    }
+
+    init_stats.initialized = true;
+    init_stats.implicit = implicit;
+    init_stats.device = device;
+    init_stats.seconds = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+    detail::cuda_ready.store(true, std::memory_order_release);
+}
+
+} // namespace
+
+auto cuda_init(int device) -> void
+{
+    initialize(device, false);
+}
+
+auto get_cuda_init_stats() -> cuda_init_stats
+{
+    std::lock_guard<std::mutex> lock{init_mutex};
+    return init_stats;
+}
+
+auto detail::cuda_init_implicitly() -> void
+{
+    initialize(-1, true);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
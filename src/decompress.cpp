@@ -0,0 +1,232 @@
+#include "playground/decompress.h"
+
+#include "playground/thread_pool.h"
+#include "playground/tracing.h"
+
+#include <zlib.h>
+
+#ifdef PLAYGROUND_HAS_LZ4
+#include <lz4.h>
+#endif
+#ifdef PLAYGROUND_HAS_ZSTD
+#include <zstd.h>
+#endif
+
+#include <algorithm>
+#include <atomic>
+#include <climits>
+#include <map>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <utility>
+
+namespace playground {
+
+namespace {
+
+/* zlib streams (window_bits 15) or gzip members (15 + 16) of the system zlib.
+ * Concatenated gzip members, as written by appending to a .gz file, decode to
+ * the concatenation of their data. */
+class zlib_codec : public codec {
+  public:
+    zlib_codec(std::string name, int window_bits) : name_{std::move(name)}, window_bits_{window_bits} {}
+
+    auto name() const -> std::string override { return name_; }
+
+    auto decompress(void const *src, std::size_t src_bytes, void *dst, std::size_t dst_bytes) const
+        -> std::size_t override
+    {
+        auto stream = z_stream{};
+        if (inflateInit2(&stream, window_bits_) != Z_OK)
+            throw std::runtime_error{name_ + ": out of memory."};
+        stream.next_in = const_cast<Bytef *>(static_cast<Bytef const *>(src));
+        stream.next_out = static_cast<Bytef *>(dst);
+
+        // The counts of z_stream are 32-bit, larger buffers go in pieces
+        auto in_left = src_bytes;
+        auto out_left = dst_bytes;
+        auto status = Z_OK;
+        while (status == Z_OK) {
+            const auto in_chunk = static_cast<uInt>(std::min<std::size_t>(in_left, UINT_MAX));
+            const auto out_chunk = static_cast<uInt>(std::min<std::size_t>(out_left, UINT_MAX));
+            stream.avail_in = in_chunk;
+            stream.avail_out = out_chunk;
+            status = inflate(&stream, Z_NO_FLUSH);
+            in_left -= in_chunk - stream.avail_in;
+            out_left -= out_chunk - stream.avail_out;
+            if (status == Z_STREAM_END && in_left > 0 && window_bits_ > MAX_WBITS)
+                status = inflateReset(&stream);
+        }
+        const auto message = std::string{stream.msg ? stream.msg : zError(status)};
+        inflateEnd(&stream);
+
+        if (status == Z_STREAM_END)
+            return dst_bytes - out_left;
+        if (status == Z_BUF_ERROR && out_left == 0)
+            throw std::runtime_error{name_ + ": the frame decompresses to more than its destination."};
+        if (status == Z_BUF_ERROR)
+            throw std::runtime_error{name_ + ": the frame is truncated."};
+        throw std::runtime_error{name_ + ": " + message};
+    }
+
+    auto decompressed_size(void const *src, std::size_t src_bytes) const -> std::optional<std::size_t> override
+    {
+        // The trailer of a gzip member ends with its size modulo 2^32
+        if (window_bits_ <= MAX_WBITS || src_bytes < 18)
+            return std::nullopt;
+        auto const *trailer = static_cast<unsigned char const *>(src) + src_bytes - 4;
+        return std::size_t{trailer[0]} | std::size_t{trailer[1]} << 8 | std::size_t{trailer[2]} << 16 |
+               std::size_t{trailer[3]} << 24;
+    }
+
+  private:
+    std::string name_;
+    int window_bits_;
+};
+
+#ifdef PLAYGROUND_HAS_LZ4
+
+/* Raw LZ4 blocks, as of LZ4_compress_default(), without the frame format */
+class lz4_codec : public codec {
+  public:
+    auto name() const -> std::string override { return "lz4"; }
+
+    auto decompress(void const *src, std::size_t src_bytes, void *dst, std::size_t dst_bytes) const
+        -> std::size_t override
+    {
+        if (src_bytes > INT_MAX || dst_bytes > INT_MAX)
+            throw std::runtime_error{"lz4: blocks are limited to 2 GiB."};
+        const auto written = LZ4_decompress_safe(static_cast<char const *>(src), static_cast<char *>(dst),
+                                                 static_cast<int>(src_bytes), static_cast<int>(dst_bytes));
+        if (written < 0)
+            throw std::runtime_error{"lz4: corrupt block, or larger than its destination."};
+        return static_cast<std::size_t>(written);
+    }
+};
+
+#endif
+
+#ifdef PLAYGROUND_HAS_ZSTD
+
+class zstd_codec : public codec {
+  public:
+    auto name() const -> std::string override { return "zstd"; }
+
+    auto decompress(void const *src, std::size_t src_bytes, void *dst, std::size_t dst_bytes) const
+        -> std::size_t override
+    {
+        const auto written = ZSTD_decompress(dst, dst_bytes, src, src_bytes);
+        if (ZSTD_isError(written))
+            throw std::runtime_error{std::string{"zstd: "} + ZSTD_getErrorName(written)};
+        return written;
+    }
+
+    auto decompressed_size(void const *src, std::size_t src_bytes) const -> std::optional<std::size_t> override
+    {
+        const auto size = ZSTD_getFrameContentSize(src, src_bytes);
+        if (size == ZSTD_CONTENTSIZE_UNKNOWN || size == ZSTD_CONTENTSIZE_ERROR)
+            return std::nullopt;
+        return static_cast<std::size_t>(size);
+    }
+};
+
+#endif
+
+struct codec_registry {
+    std::mutex mutex;
+    std::map<std::string, std::shared_ptr<codec const>> codecs;
+};
+
+auto registry() -> codec_registry &
+{
+    static auto *instance = [] {
+        auto *result = new codec_registry{};
+        result->codecs["zlib"] = std::make_shared<zlib_codec>("zlib", MAX_WBITS);
+        result->codecs["gzip"] = std::make_shared<zlib_codec>("gzip", MAX_WBITS + 16);
+#ifdef PLAYGROUND_HAS_LZ4
+        result->codecs["lz4"] = std::make_shared<lz4_codec>();
+#endif
+#ifdef PLAYGROUND_HAS_ZSTD
+        result->codecs["zstd"] = std::make_shared<zstd_codec>();
+#endif
+        return result;
+    }();
+    return *instance;
+}
+
+} // namespace
+
+auto register_codec(std::shared_ptr<codec const> decoder) -> void
+{
+    if (!decoder)
+        throw std::invalid_argument{"register_codec: no codec."};
+    auto &codecs = registry();
+    std::lock_guard<std::mutex> lock{codecs.mutex};
+    codecs.codecs[decoder->name()] = std::move(decoder);
+}
+
+auto find_codec(std::string const &name) -> std::shared_ptr<codec const>
+{
+    auto &codecs = registry();
+    std::lock_guard<std::mutex> lock{codecs.mutex};
+    auto it = codecs.codecs.find(name);
+    if (it == codecs.codecs.end())
+        throw std::invalid_argument{"find_codec: unknown codec " + name + "."};
+    return it->second;
+}
+
+auto codec_names() -> std::vector<std::string>
+{
+    auto &codecs = registry();
+    std::lock_guard<std::mutex> lock{codecs.mutex};
+    auto names = std::vector<std::string>{};
+    for (auto const &entry : codecs.codecs)
+        names.push_back(entry.first);
+    return names;
+}
+
+auto parallel_decompress(
+    codec const &decoder, byte_span const *frames, std::size_t count, std::size_t const *offsets, void *dst) -> void
+{
+    for (std::size_t i = 0; i < count; ++i) {
+        if (offsets[i + 1] < offsets[i])
+            throw std::invalid_argument{"parallel_decompress: offsets must not decrease."};
+    }
+    if (count == 0)
+        return;
+
+    const auto scope = trace_scope{"decompress", "copy", offsets[count] - offsets[0]};
+    auto *d = static_cast<char *>(dst);
+    auto next = std::atomic<std::size_t>{0};
+    auto pool = default_thread_pool();
+    pool->run(std::min(pool->num_threads(), count), [&](std::size_t) {
+        for (auto i = next++; i < count; i = next++) {
+            const auto slot_bytes = offsets[i + 1] - offsets[i];
+            auto written = std::size_t{0};
+            try {
+                written = decoder.decompress(frames[i].data, frames[i].size, d + offsets[i], slot_bytes);
+            }
+            catch (std::runtime_error const &error) {
+                next = count; // The other threads stop after their current frame
+                throw std::runtime_error{"parallel_decompress: frame " + std::to_string(i) + ": " + error.what()};
+            }
+            if (written != slot_bytes) {
+                next = count;
+                throw std::runtime_error{"parallel_decompress: frame " + std::to_string(i) + " decompressed to " +
+                                         std::to_string(written) + " bytes, its slot has " +
+                                         std::to_string(slot_bytes) + "."};
+            }
+        }
+    });
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
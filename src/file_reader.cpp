@@ -0,0 +1,340 @@
+#include "playground/file_reader.h"
+
+#include "playground/copy.h"
+#include "playground/thread_pool.h"
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <sys/uio.h>
+#include <unistd.h>
+
+#if __has_include(<linux/io_uring.h>)
+#include <linux/io_uring.h>
+#include <sys/syscall.h>
+#define PLAYGROUND_HAS_IO_URING
+#endif
+
+#include <algorithm>
+#include <cerrno>
+#include <cstdint>
+#include <cstring>
+#include <exception>
+#include <mutex>
+#include <stdexcept>
+#include <vector>
+
+namespace playground {
+
+namespace {
+
+// O_DIRECT transfers must be aligned to the logical block size, which a page
+// is a multiple of on every common device
+constexpr std::size_t direct_alignment = 4096;
+
+auto io_error(std::string const &path, int error) -> std::runtime_error
+{
+    return std::runtime_error{"file_reader: " + path + ": " + std::strerror(error)};
+}
+
+auto pread_all(int fd, std::size_t offset, char *data, std::size_t bytes, std::string const &path) -> void
+{
+    while (bytes > 0) {
+        auto n = ::pread(fd, data, bytes, static_cast<off_t>(offset));
+        if (n < 0 && errno == EINTR)
+            continue;
+        if (n < 0)
+            throw io_error(path, errno);
+        if (n == 0)
+            throw std::runtime_error{"file_reader: " + path + ": the file was truncated."};
+        data += n;
+        offset += static_cast<std::size_t>(n);
+        bytes -= static_cast<std::size_t>(n);
+    }
+}
+
+} // namespace
+
+#ifdef PLAYGROUND_HAS_IO_URING
+
+/* Minimal io_uring on the raw system calls, so it needs no liburing. Reads
+ * are submitted in batches of up to depth blocks and reaped before the next
+ * batch. */
+struct file_reader::uring {
+    static constexpr unsigned depth = 32;
+    static constexpr std::size_t block_bytes = std::size_t{1} << 20;
+
+    uring()
+    {
+        io_uring_params params{};
+        fd = static_cast<int>(syscall(__NR_io_uring_setup, depth, &params));
+        if (fd < 0)
+            throw std::runtime_error{std::strerror(errno)};
+
+        sq_size = params.sq_off.array + params.sq_entries * sizeof(unsigned);
+        cq_size = params.cq_off.cqes + params.cq_entries * sizeof(io_uring_cqe);
+        const auto single_mmap = (params.features & IORING_FEAT_SINGLE_MMAP) != 0;
+        if (single_mmap)
+            sq_size = cq_size = std::max(sq_size, cq_size);
+        sqes_size = params.sq_entries * sizeof(io_uring_sqe);
+
+        sq_ptr = map(sq_size, IORING_OFF_SQ_RING);
+        cq_ptr = single_mmap ? sq_ptr : map(cq_size, IORING_OFF_CQ_RING);
+        sqes = static_cast<io_uring_sqe *>(map(sqes_size, IORING_OFF_SQES));
+        if (!sq_ptr || !cq_ptr || !sqes) {
+            const auto error = errno;
+            release();
+            throw std::runtime_error{std::strerror(error)};
+        }
+
+        auto *sq = static_cast<char *>(sq_ptr);
+        sq_tail = reinterpret_cast<unsigned *>(sq + params.sq_off.tail);
+        sq_mask = reinterpret_cast<unsigned *>(sq + params.sq_off.ring_mask);
+        sq_array = reinterpret_cast<unsigned *>(sq + params.sq_off.array);
+        auto *cq = static_cast<char *>(cq_ptr);
+        cq_head = reinterpret_cast<unsigned *>(cq + params.cq_off.head);
+        cq_tail = reinterpret_cast<unsigned *>(cq + params.cq_off.tail);
+        cq_mask = reinterpret_cast<unsigned *>(cq + params.cq_off.ring_mask);
+        cqes = reinterpret_cast<io_uring_cqe *>(cq + params.cq_off.cqes);
+    }
+
+    ~uring() { release(); }
+
+    auto map(std::size_t bytes, off_t what) -> void *
+    {
+        auto *p = ::mmap(nullptr, bytes, PROT_READ | PROT_WRITE, MAP_SHARED | MAP_POPULATE, fd, what);
+        return p == MAP_FAILED ? nullptr : p;
+    }
+
+    auto release() -> void
+    {
+        if (sqes)
+            ::munmap(sqes, sqes_size);
+        if (cq_ptr && cq_ptr != sq_ptr)
+            ::munmap(cq_ptr, cq_size);
+        if (sq_ptr)
+            ::munmap(sq_ptr, sq_size);
+        ::close(fd);
+    }
+
+    auto enter(unsigned to_submit, unsigned min_complete) -> unsigned
+    {
+        for (;;) {
+            auto n = syscall(__NR_io_uring_enter, fd, to_submit, min_complete, IORING_ENTER_GETEVENTS, nullptr, 0);
+            if (n >= 0)
+                return static_cast<unsigned>(n);
+            if (errno != EINTR)
+                throw std::runtime_error{std::strerror(errno)};
+        }
+    }
+
+    auto read(int file_fd, std::size_t offset, char *data, std::size_t bytes, std::string const &path) -> void
+    {
+        std::lock_guard<std::mutex> lock{mutex};
+        auto iovecs = std::vector<iovec>(depth);
+        auto offsets = std::vector<std::size_t>(depth);
+
+        for (std::size_t next = 0; next < bytes;) {
+            unsigned batch = 0;
+            for (; batch < depth && next < bytes; ++batch) {
+                const auto len = std::min(block_bytes, bytes - next);
+                iovecs[batch] = {data + next, len};
+                offsets[batch] = offset + next;
+
+                const auto tail = *sq_tail;
+                const auto index = tail & *sq_mask;
+                auto &sqe = sqes[index];
+                std::memset(&sqe, 0, sizeof(sqe));
+                sqe.opcode = IORING_OP_READV;
+                sqe.fd = file_fd;
+                sqe.addr = reinterpret_cast<std::uint64_t>(&iovecs[batch]);
+                sqe.len = 1;
+                sqe.off = offsets[batch];
+                sqe.user_data = batch;
+                sq_array[index] = index;
+                __atomic_store_n(sq_tail, tail + 1, __ATOMIC_RELEASE);
+                next += len;
+            }
+
+            for (unsigned submitted = 0; submitted < batch;)
+                submitted += enter(batch - submitted, 0);
+
+            // Every read of the batch is reaped before throwing, the kernel
+            // writes into data until then and later reads share the ring
+            auto error = std::exception_ptr{};
+            for (unsigned reaped = 0; reaped < batch;) {
+                const auto head = *cq_head;
+                if (head == __atomic_load_n(cq_tail, __ATOMIC_ACQUIRE)) {
+                    enter(0, 1);
+                    continue;
+                }
+                const auto cqe = cqes[head & *cq_mask];
+                __atomic_store_n(cq_head, head + 1, __ATOMIC_RELEASE);
+                ++reaped;
+                if (error)
+                    continue;
+
+                try {
+                    if (cqe.res < 0)
+                        throw io_error(path, -cqe.res);
+                    // Short reads are finished synchronously
+                    auto const &iov = iovecs[cqe.user_data];
+                    const auto done = static_cast<std::size_t>(cqe.res);
+                    if (done < iov.iov_len)
+                        pread_all(file_fd, offsets[cqe.user_data] + done, static_cast<char *>(iov.iov_base) + done,
+                                  iov.iov_len - done, path);
+                }
+                catch (...) {
+                    error = std::current_exception();
+                }
+            }
+            if (error)
+                std::rethrow_exception(error);
+        }
+    }
+
+    std::mutex mutex;
+    int fd = -1;
+    void *sq_ptr = nullptr;
+    void *cq_ptr = nullptr;
+    io_uring_sqe *sqes = nullptr;
+    std::size_t sq_size = 0;
+    std::size_t cq_size = 0;
+    std::size_t sqes_size = 0;
+    unsigned *sq_tail = nullptr;
+    unsigned *sq_mask = nullptr;
+    unsigned *sq_array = nullptr;
+    unsigned *cq_head = nullptr;
+    unsigned *cq_tail = nullptr;
+    unsigned *cq_mask = nullptr;
+    io_uring_cqe *cqes = nullptr;
+};
+
+#else
+
+struct file_reader::uring {
+    uring() { throw std::runtime_error{"io_uring is not available."}; }
+
+    auto read(int, std::size_t, char *, std::size_t, std::string const &) -> void {}
+};
+
+#endif
+
+file_reader::file_reader(std::string const &path, read_method method) : path_{path}, method_{method}
+{
+    fd_ = ::open(path.c_str(), O_RDONLY | O_CLOEXEC);
+    if (fd_ < 0)
+        throw io_error(path, errno);
+
+    struct stat info;
+    if (::fstat(fd_, &info) != 0) {
+        const auto error = errno;
+        ::close(fd_);
+        throw io_error(path, error);
+    }
+    size_ = static_cast<std::size_t>(info.st_size);
+
+    // Methods the system or the file system does not support fall back to
+    // pread
+    if (method_ == read_method::mmap && size_ > 0) {
+        auto *p = ::mmap(nullptr, size_, PROT_READ, MAP_PRIVATE, fd_, 0);
+        if (p == MAP_FAILED) {
+            method_ = read_method::pread;
+        }
+        else {
+            map_ = static_cast<char *>(p);
+            ::madvise(map_, size_, MADV_SEQUENTIAL);
+        }
+    }
+    if (method_ == read_method::direct) {
+        direct_fd_ = ::open(path.c_str(), O_RDONLY | O_CLOEXEC | O_DIRECT);
+        if (direct_fd_ < 0)
+            method_ = read_method::pread;
+    }
+    if (method_ == read_method::io_uring) {
+        try {
+            uring_ = std::make_unique<uring>();
+        }
+        catch (std::runtime_error &) {
+            method_ = read_method::pread;
+        }
+    }
+    if (method_ != read_method::direct && method_ != read_method::mmap)
+        ::posix_fadvise(fd_, 0, 0, POSIX_FADV_SEQUENTIAL);
+}
+
+file_reader::~file_reader()
+{
+    uring_.reset();
+    if (map_)
+        ::munmap(map_, size_);
+    if (direct_fd_ >= 0)
+        ::close(direct_fd_);
+    ::close(fd_);
+}
+
+auto file_reader::read(std::size_t offset, void *data, std::size_t bytes) -> std::size_t
+{
+    if (offset >= size_)
+        return 0;
+    bytes = std::min(bytes, size_ - offset);
+    auto *d = static_cast<char *>(data);
+
+    auto parallel_pread = [this, offset, d](int fd, std::size_t count, std::size_t grain) {
+        parallel_for(count, grain, [this, fd, offset, d](std::size_t begin, std::size_t end) {
+            pread_all(fd, offset + begin, d + begin, end - begin, path_);
+        });
+    };
+
+    switch (method_) {
+    case read_method::mmap:
+        parallel_memcpy(d, map_ + offset, bytes);
+        break;
+    case read_method::pread:
+        parallel_pread(fd_, bytes, get_parallel_grain());
+        break;
+    case read_method::direct: {
+        // The aligned part bypasses the page cache, the tail is read buffered
+        const auto aligned =
+            reinterpret_cast<std::uintptr_t>(d) % direct_alignment == 0 && offset % direct_alignment == 0;
+        const auto body = aligned ? bytes / direct_alignment * direct_alignment : 0;
+        // Every chunk has to start at an aligned offset too, whatever the grain
+        const auto grain = (get_parallel_grain() + direct_alignment - 1) / direct_alignment * direct_alignment;
+        parallel_pread(direct_fd_, body, grain);
+        pread_all(fd_, offset + body, d + body, bytes - body, path_);
+        break;
+    }
+    case read_method::io_uring:
+        uring_->read(fd_, offset, d, bytes, path_);
+        break;
+    }
+
+    prefetch(offset + bytes, bytes);
+    return bytes;
+}
+
+auto file_reader::prefetch(std::size_t offset, std::size_t bytes) -> void
+{
+    if (offset >= size_)
+        return;
+    bytes = std::min(bytes, size_ - offset);
+
+    if (method_ == read_method::mmap) {
+        static const auto page_size = static_cast<std::size_t>(sysconf(_SC_PAGESIZE));
+        const auto begin = offset / page_size * page_size;
+        ::madvise(map_ + begin, offset + bytes - begin, MADV_WILLNEED);
+    }
+    else if (method_ != read_method::direct) {
+        ::posix_fadvise(fd_, static_cast<off_t>(offset), static_cast<off_t>(bytes), POSIX_FADV_WILLNEED);
+    }
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
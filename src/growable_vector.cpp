@@ -0,0 +1,69 @@
+#include "playground/growable_vector.h"
+
+#include <sys/mman.h>
+#include <unistd.h>
+
+#include <new>
+
+namespace playground {
+
+namespace {
+
+auto round_up_to_pages(std::size_t bytes) -> std::size_t
+{
+    static const auto page_bytes = static_cast<std::size_t>(sysconf(_SC_PAGESIZE));
+    return (bytes + page_bytes - 1) / page_bytes * page_bytes;
+}
+
+} // namespace
+
+address_reservation::address_reservation(std::size_t bytes) : reserved_{round_up_to_pages(bytes)}
+{
+    // Inaccessible and not accounted for, only commit() asks for memory
+    data_ = mmap(nullptr, reserved_, PROT_NONE, MAP_PRIVATE | MAP_ANONYMOUS | MAP_NORESERVE, -1, 0);
+    if (data_ == MAP_FAILED) {
+        data_ = nullptr;
+        throw std::bad_alloc{};
+    }
+}
+
+address_reservation::~address_reservation()
+{
+    if (data_)
+        munmap(data_, reserved_);
+}
+
+auto address_reservation::commit(std::size_t bytes) -> void
+{
+    bytes = round_up_to_pages(bytes);
+    if (bytes > reserved_)
+        throw std::length_error{"address_reservation: cannot commit more than reserved."};
+    if (bytes <= committed_)
+        return;
+    if (mprotect(static_cast<char *>(data_) + committed_, bytes - committed_, PROT_READ | PROT_WRITE) != 0)
+        throw std::bad_alloc{};
+    committed_ = bytes;
+}
+
+auto address_reservation::decommit(std::size_t bytes) -> void
+{
+    bytes = round_up_to_pages(bytes);
+    if (bytes >= committed_)
+        return;
+    // Fresh inaccessible pages in place, the old ones go back to the kernel
+    auto *p = mmap(static_cast<char *>(data_) + bytes, committed_ - bytes, PROT_NONE,
+                   MAP_PRIVATE | MAP_ANONYMOUS | MAP_NORESERVE | MAP_FIXED, -1, 0);
+    if (p == MAP_FAILED)
+        throw std::runtime_error{"address_reservation: cannot decommit."};
+    committed_ = bytes;
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,147 @@
+#include "playground/host_mapping.h"
+
+#include <sys/mman.h>
+#include <unistd.h>
+
+#include <cstdint>
+#include <cstdio>
+#include <fstream>
+#include <new>
+#include <sstream>
+#include <string>
+
+#ifndef MAP_HUGE_SHIFT
+#define MAP_HUGE_SHIFT 26
+#endif
+
+namespace playground {
+
+namespace {
+
+constexpr std::size_t transparent_page_bytes = std::size_t{2} << 20;
+
+auto round_up(std::size_t bytes, std::size_t multiple) -> std::size_t
+{
+    return (std::max<std::size_t>(bytes, 1) + multiple - 1) / multiple * multiple;
+}
+
+/* Private anonymous mapping of length bytes starting at a multiple of
+ * alignment, trimmed out of a larger one */
+auto map_aligned(std::size_t length, std::size_t alignment) -> void *
+{
+    const auto padded = length + alignment;
+    auto *p = mmap(nullptr, padded, PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+    if (p == MAP_FAILED)
+        throw std::bad_alloc{};
+
+    const auto begin = reinterpret_cast<std::uintptr_t>(p);
+    const auto aligned = (begin + alignment - 1) / alignment * alignment;
+    if (aligned > begin)
+        munmap(p, aligned - begin);
+    const auto end = begin + padded;
+    if (end > aligned + length)
+        munmap(reinterpret_cast<void *>(aligned + length), end - aligned - length);
+    return reinterpret_cast<void *>(aligned);
+}
+
+/* MAP_HUGETLB mapping, nullptr when the pool cannot serve it */
+auto map_explicit(std::size_t length, std::size_t page_bytes) -> void *
+{
+    const auto log2 = static_cast<int>(__builtin_ctzll(page_bytes));
+    const auto flags = MAP_PRIVATE | MAP_ANONYMOUS | MAP_HUGETLB | (log2 << MAP_HUGE_SHIFT);
+    auto *p = mmap(nullptr, length, PROT_READ | PROT_WRITE, flags, -1, 0);
+    return p == MAP_FAILED ? nullptr : p;
+}
+
+} // namespace
+
+auto huge_page_bytes(huge_pages pages) -> std::size_t
+{
+    switch (pages) {
+    case huge_pages::transparent:
+    case huge_pages::explicit_2m:
+        return std::size_t{2} << 20;
+    case huge_pages::explicit_1g:
+        return std::size_t{1} << 30;
+    default:
+        return static_cast<std::size_t>(sysconf(_SC_PAGESIZE));
+    }
+}
+
+auto map_host(std::size_t bytes, mapping_options const &options) -> void *
+{
+    const auto page_bytes = huge_page_bytes(options.pages);
+    const auto length = round_up(bytes, page_bytes);
+
+    void *p = nullptr;
+    if (options.pages == huge_pages::explicit_2m || options.pages == huge_pages::explicit_1g)
+        p = map_explicit(length, page_bytes);
+    if (!p && options.pages != huge_pages::none) {
+        // MADV_HUGEPAGE only helps 2 MiB aligned ranges
+        p = map_aligned(length, transparent_page_bytes);
+#ifdef MADV_HUGEPAGE
+        madvise(p, length, MADV_HUGEPAGE); // Fails only where THP is compiled out
+#endif
+    }
+    if (!p) {
+        p = mmap(nullptr, length, PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+        if (p == MAP_FAILED)
+            throw std::bad_alloc{};
+    }
+
+    try {
+        numa_bind(p, length, options.numa);
+    }
+    catch (...) {
+        munmap(p, length);
+        throw;
+    }
+    return p;
+}
+
+auto unmap_host(void *p, std::size_t bytes, mapping_options const &options) -> void
+{
+    if (p)
+        munmap(p, round_up(bytes, huge_page_bytes(options.pages)));
+}
+
+auto huge_pages_of(void const *p) -> huge_pages
+{
+    const auto address = reinterpret_cast<std::uintptr_t>(p);
+    auto smaps = std::ifstream{"/proc/self/smaps"};
+    auto line = std::string{};
+    auto inside = false;
+    while (std::getline(smaps, line)) {
+        unsigned long begin = 0, end = 0;
+        if (std::sscanf(line.c_str(), "%lx-%lx ", &begin, &end) == 2) {
+            if (inside)
+                break;
+            inside = begin <= address && address < end;
+            continue;
+        }
+        if (!inside)
+            continue;
+
+        auto field = std::istringstream{line};
+        auto name = std::string{};
+        auto kilobytes = std::size_t{0};
+        field >> name >> kilobytes;
+        if (name == "KernelPageSize:" && kilobytes == 2048)
+            return huge_pages::explicit_2m;
+        if (name == "KernelPageSize:" && kilobytes == 1024 * 1024)
+            return huge_pages::explicit_1g;
+        if (name == "AnonHugePages:" && kilobytes > 0)
+            return huge_pages::transparent;
+    }
+    return huge_pages::none;
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
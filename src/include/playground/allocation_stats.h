@@ -0,0 +1,161 @@
+#ifndef THATSZUCS_PLAYGROUND_ALLOCATION_STATS_H
+#define THATSZUCS_PLAYGROUND_ALLOCATION_STATS_H
+
+#include "playground/tracing.h"
+
+#include <array>
+#include <atomic>
+#include <chrono>
+#include <cstddef>
+#include <map>
+#include <string>
+
+namespace playground {
+
+/* Allocations of up to 2^i bytes and more than 2^(i-1) bytes are counted in
+ * bucket i */
+constexpr std::size_t allocation_histogram_buckets = 48;
+
+struct allocation_stats {
+    std::size_t live_bytes = 0;      // Allocated and not freed yet
+    std::size_t peak_bytes = 0;      // Maximum of live_bytes since the last reset
+    std::size_t allocations = 0;     // Number of allocations
+    std::size_t frees = 0;           // Number of deallocations
+    std::size_t allocated_bytes = 0; // Sum of all allocations
+    std::size_t freed_bytes = 0;     // Sum of all deallocations
+    double allocate_seconds = 0.0;   // Time spent in the backings allocating, e.g. cudaMallocHost
+    double free_seconds = 0.0;       // Time spent in the backings freeing, e.g. cudaFreeHost
+    std::array<std::size_t, allocation_histogram_buckets> histogram = {};
+};
+
+/* Counters of a kind of memory or of a tag. Cheap enough to stay on: the
+ * live bytes are one atomic, everything else goes to per-thread shards
+ * updated with relaxed atomics. */
+class allocation_counters {
+  public:
+    auto record_allocate(std::size_t bytes, std::chrono::nanoseconds duration) noexcept -> void;
+    auto record_deallocate(std::size_t bytes, std::chrono::nanoseconds duration) noexcept -> void;
+
+    auto stats() const -> allocation_stats;
+
+    /* Peak bytes restart from the live bytes */
+    auto reset_peak() noexcept -> void { peak_bytes_.store(live_bytes_.load()); }
+
+  private:
+    static constexpr std::size_t num_shards = 16;
+
+    struct alignas(64) shard {
+        std::atomic<std::size_t> allocations{0};
+        std::atomic<std::size_t> frees{0};
+        std::atomic<std::size_t> allocated_bytes{0};
+        std::atomic<std::size_t> freed_bytes{0};
+        std::atomic<std::size_t> allocate_nanoseconds{0};
+        std::atomic<std::size_t> free_nanoseconds{0};
+        std::array<std::atomic<std::size_t>, allocation_histogram_buckets> histogram{};
+    };
+
+    auto home_shard() noexcept -> shard &;
+
+    std::atomic<std::size_t> live_bytes_{0};
+    std::atomic<std::size_t> peak_bytes_{0};
+    std::array<shard, num_shards> shards_;
+};
+
+/* Counters of a kind of memory, e.g. "pinned", and of its tags. Created on
+ * first use and never destroyed, like the pools. */
+auto allocation_counters_of(std::string const &kind) -> allocation_counters &;
+auto allocation_counters_of(std::string const &kind, std::string const &tag) -> allocation_counters &;
+
+/* Totals of the kind, and the stats of each of its tags */
+auto memory_stats(std::string const &kind) -> allocation_stats;
+auto memory_stats_by_tag(std::string const &kind) -> std::map<std::string, allocation_stats>;
+
+/* Resets the peaks of every kind and tag */
+auto reset_peak_stats() -> void;
+
+/* Attributes the allocators created by this thread while the tag is alive to
+ * it, on top of the totals of their kind. Tags nest, the innermost counts. */
+class allocation_tag {
+  public:
+    explicit allocation_tag(std::string tag);
+    ~allocation_tag();
+
+    allocation_tag(allocation_tag const &) = delete;
+    auto operator=(allocation_tag const &) -> allocation_tag & = delete;
+
+    /* Innermost tag of this thread, empty when there is none */
+    static auto current() -> std::string const &;
+
+  private:
+    std::string previous_;
+};
+
+/* Times the allocations of an allocator and counts them for its kind and for
+ * the tag current when the recorder was created. Copies share the counters,
+ * so the memory must be freed through the recorder (or a copy) that
+ * allocated it. While tracing is on, the allocations are traced too, see
+ * tracing.h. */
+class allocation_recorder {
+  public:
+    /* kind outlives the recorder, e.g. a literal */
+    allocation_recorder(char const *kind, allocation_counters &total);
+
+    template <typename Allocate>
+    auto allocate(std::size_t bytes, Allocate &&allocate) -> void *
+    {
+        const auto scope = trace_scope{"allocate", kind_, bytes, tag_};
+        const auto start = clock::now();
+        auto *p = allocate(bytes);
+        const auto duration = clock::now() - start;
+        total_->record_allocate(bytes, duration);
+        if (tagged_)
+            tagged_->record_allocate(bytes, duration);
+        return p;
+    }
+
+    template <typename Deallocate>
+    auto deallocate(void *p, std::size_t bytes, Deallocate &&deallocate) -> void
+    {
+        const auto scope = trace_scope{"free", kind_, bytes, tag_};
+        const auto start = clock::now();
+        deallocate(p, bytes);
+        const auto duration = clock::now() - start;
+        total_->record_deallocate(bytes, duration);
+        if (tagged_)
+            tagged_->record_deallocate(bytes, duration);
+    }
+
+  private:
+    using clock = std::chrono::steady_clock;
+
+    char const *kind_;
+    char const *tag_ = nullptr; // Interned for tracing
+    allocation_counters *total_;
+    allocation_counters *tagged_ = nullptr;
+};
+
+/* Kind of memory a backing hands out, "pinned" unless specialised */
+template <typename Backing>
+struct backing_kind {
+    static constexpr char const *name = "pinned";
+};
+
+/* Recorder of the kind of Backing, the totals are looked up once per kind */
+template <typename Backing>
+auto recorder_of() -> allocation_recorder
+{
+    static auto &total = allocation_counters_of(backing_kind<Backing>::name);
+    return allocation_recorder{backing_kind<Backing>::name, total};
+}
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,72 @@
+#ifndef THATSZUCS_PLAYGROUND_AUTOTUNE_H
+#define THATSZUCS_PLAYGROUND_AUTOTUNE_H
+
+#include "playground/thread_pool.h"
+
+#include <cstddef>
+#include <string>
+#include <vector>
+
+namespace playground {
+
+/* Parameters of the parallel copies and fills of the library */
+struct copy_tuning {
+    std::size_t num_threads = 0;                              // Of the default pool, 0 for one per hardware thread
+    std::size_t grain_bytes = parallel_grain_bytes;           // See set_parallel_grain()
+    std::size_t nontemporal_threshold = std::size_t{8} << 20; // See set_nontemporal_threshold()
+};
+
+/* The parameters in use */
+auto get_copy_tuning() -> copy_tuning;
+auto set_copy_tuning(copy_tuning const &tuning) -> void;
+
+/* Identifies the machine a tuning is valid for: the CPU model, the numbers
+ * of hardware threads and NUMA nodes, and the memory size */
+auto host_key() -> std::string;
+
+struct tuning_options {
+    std::size_t buffer_bytes = std::size_t{64} << 20;
+    std::vector<std::size_t> thread_counts; // Empty for 1, 2, 4, ... up to every hardware thread
+    std::vector<std::size_t> grains = {std::size_t{256} << 10, std::size_t{1} << 20, std::size_t{4} << 20};
+    std::vector<std::size_t> alignments = {16, 64, 4096}; // Of the buffers, the score is averaged over them
+    std::size_t repeats = 3;                              // Each timing is the best of
+    bool pinned = false;                                  // Copy into pinned memory, which needs CUDA
+};
+
+/* One configuration timed */
+struct tuning_trial {
+    char const *step; // "threads", "stores" or "alignment"
+    std::size_t num_threads;
+    std::size_t grain_bytes;
+    std::size_t bytes;
+    std::size_t alignment;
+    bool streaming; // Non-temporal stores
+    double seconds;
+};
+
+struct tuning_result {
+    copy_tuning best;
+    std::vector<tuning_trial> trials;
+};
+
+/* Times parallel_memcpy() and parallel_init() on this machine and returns
+ * the fastest parameters, without applying them. First the thread counts and
+ * grains are swept on copies and fills of buffer_bytes, at each of the
+ * alignments. Then, with the best of them, streaming and regular stores are
+ * compared from 1 MiB up to buffer_bytes: the non-temporal threshold is the
+ * size from which streaming wins, 0 when it never does. Finally the copy is
+ * timed at each alignment, for reference. Takes seconds, the parameters in
+ * use are restored afterwards. */
+auto autotune_copies(tuning_options const &options = {}) -> tuning_result;
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,311 @@
+#ifndef THATSZUCS_PLAYGROUND_CACHING_POOL_H
+#define THATSZUCS_PLAYGROUND_CACHING_POOL_H
+
+#include "playground/memory_backing.h"
+#include "playground/pinned_vector.h"
+
+#include <algorithm>
+#include <atomic>
+#include <cstddef>
+#include <limits>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <thread>
+#include <vector>
+
+namespace playground {
+
+struct pool_options {
+    /* Bin sizes in bytes, sorted ascending. Requests are rounded up to the
+     * smallest bin that fits them. When empty, power-of-two bins from
+     * min_block_size to max_block_size are used. */
+    std::vector<std::size_t> bin_sizes = {};
+    std::size_t min_block_size = 512;
+    std::size_t max_block_size = std::size_t{256} << 20;
+
+    /* High-water mark of the cache: freed blocks that would push the cached
+     * bytes above it go straight back to the backing. */
+    std::size_t max_cached_bytes = std::numeric_limits<std::size_t>::max();
+
+    /* Number of free-list shards, threads are spread over them. 0 means one
+     * per hardware thread. */
+    std::size_t num_shards = 0;
+};
+
+struct pool_stats {
+    std::size_t in_use_bytes = 0;        // Handed out, rounded up to bin size
+    std::size_t cached_bytes = 0;        // Free, waiting for reuse
+    std::size_t reserved_bytes = 0;      // Held from the backing, in use or cached
+    std::size_t peak_reserved_bytes = 0; // Maximum of reserved_bytes
+    std::size_t hits = 0;                // Allocations served from the cache
+    std::size_t misses = 0;              // Allocations that went to the backing
+};
+
+/* Size-class caching pool in front of a backing
+ *
+ * Freed blocks are kept in per-bin free lists and handed out again to requests
+ * of the same bin, so building and dropping buffers of recurring sizes does not
+ * go to the backing (e.g. cudaMallocHost / cudaFreeHost) every time. The free
+ * lists are sharded and each thread has a home shard, so threads allocating
+ * concurrently rarely touch the same mutex. A miss looks into one more shard,
+ * then into the shards whose mutex is free, before going to the backing.
+ * Requests larger than the largest bin bypass the cache.
+ */
+template <typename Backing>
+class caching_pool {
+  public:
+    explicit caching_pool(pool_options options = {}, Backing backing = {}) : backing_{backing}
+    {
+        set_options(std::move(options));
+    }
+
+    caching_pool(caching_pool const &) = delete;
+    auto operator=(caching_pool const &) -> caching_pool & = delete;
+
+    ~caching_pool() { release(); }
+
+    /* Process-wide pool of the backing. It is never destroyed, because freeing
+     * pinned memory during static destruction races with the CUDA runtime
+     * shutting down. */
+    static auto instance() -> caching_pool &
+    {
+        static auto *pool = new caching_pool{};
+        return *pool;
+    }
+
+    /* Replaces the options. Only allowed while no block is in use, and must not
+     * run concurrently with allocations. */
+    auto configure(pool_options options) -> void
+    {
+        if (in_use_bytes_.load() != 0)
+            throw std::logic_error{"caching_pool: cannot configure while blocks are in use."};
+        release();
+        set_options(std::move(options));
+    }
+
+    auto allocate(std::size_t bytes) -> void *
+    {
+        const auto bin = bin_index(bytes);
+        if (bin == npos) {
+            auto p = allocate_from_backing(bytes);
+            in_use_bytes_ += bytes;
+            return p;
+        }
+
+        // The home shard and its neighbour first, then the other shards without
+        // waiting for their mutexes. Blocks are cached in the shard of the
+        // thread freeing them, which often is not the one allocating them.
+        const auto block_size = bin_sizes_[bin];
+        const auto home = home_shard();
+        for (std::size_t i = 0; i < num_shards_; ++i) {
+            auto &s = shards_[(home + i) % num_shards_];
+            std::unique_lock<std::mutex> lock{s.mutex, std::defer_lock};
+            if (i < 2)
+                lock.lock();
+            else if (!lock.try_lock())
+                continue;
+            auto &free_list = s.bins[bin];
+            if (!free_list.empty()) {
+                auto p = free_list.back();
+                free_list.pop_back();
+                cached_bytes_ -= block_size;
+                in_use_bytes_ += block_size;
+                ++hits_;
+                return p;
+            }
+        }
+
+        auto p = allocate_from_backing(block_size);
+        in_use_bytes_ += block_size;
+        return p;
+    }
+
+    auto deallocate(void *p, std::size_t bytes) -> void
+    {
+        if (!p)
+            return;
+
+        const auto bin = bin_index(bytes);
+        const auto block_size = bin == npos ? bytes : bin_sizes_[bin];
+        in_use_bytes_ -= block_size;
+
+        if (bin == npos || cached_bytes_.fetch_add(block_size) + block_size > max_cached_bytes_) {
+            if (bin != npos)
+                cached_bytes_ -= block_size;
+            deallocate_to_backing(p, block_size);
+            return;
+        }
+
+        auto &s = shards_[home_shard()];
+        std::lock_guard<std::mutex> lock{s.mutex};
+        s.bins[bin].push_back(p);
+    }
+
+    /* Returns cached blocks to the backing, largest first, until at most
+     * keep_bytes remain cached. */
+    auto trim(std::size_t keep_bytes = 0) -> void
+    {
+        std::vector<std::pair<void *, std::size_t>> to_free;
+        for (std::size_t bin = bin_sizes_.size(); bin-- > 0;) {
+            for (std::size_t i = 0; i < num_shards_; ++i) {
+                auto &s = shards_[i];
+                std::lock_guard<std::mutex> lock{s.mutex};
+                auto &free_list = s.bins[bin];
+                while (!free_list.empty() && cached_bytes_.load() > keep_bytes) {
+                    to_free.emplace_back(free_list.back(), bin_sizes_[bin]);
+                    free_list.pop_back();
+                    cached_bytes_ -= bin_sizes_[bin];
+                }
+            }
+        }
+        for (auto [p, size] : to_free)
+            deallocate_to_backing(p, size);
+    }
+
+    /* Returns every cached block to the backing */
+    auto release() -> void { trim(0); }
+
+    auto stats() const -> pool_stats
+    {
+        pool_stats result;
+        result.in_use_bytes = in_use_bytes_.load();
+        result.cached_bytes = cached_bytes_.load();
+        result.reserved_bytes = reserved_bytes_.load();
+        result.peak_reserved_bytes = peak_reserved_bytes_.load();
+        result.hits = hits_.load();
+        result.misses = misses_.load();
+        return result;
+    }
+
+    auto reset_peak_stats() -> void { peak_reserved_bytes_ = reserved_bytes_.load(); }
+
+    /* Number of bytes a request of the given size occupies in the pool */
+    auto block_size(std::size_t bytes) const -> std::size_t
+    {
+        const auto bin = bin_index(bytes);
+        return bin == npos ? bytes : bin_sizes_[bin];
+    }
+
+  private:
+    static constexpr auto npos = std::numeric_limits<std::size_t>::max();
+
+    struct shard {
+        std::mutex mutex;
+        std::vector<std::vector<void *>> bins;
+    };
+
+    auto set_options(pool_options options) -> void
+    {
+        bin_sizes_ = std::move(options.bin_sizes);
+        if (bin_sizes_.empty()) {
+            if (options.min_block_size == 0 || options.min_block_size > options.max_block_size)
+                throw std::invalid_argument{"caching_pool: invalid min/max block size."};
+            for (auto size = options.min_block_size; size <= options.max_block_size; size *= 2)
+                bin_sizes_.push_back(size);
+        }
+        if (!std::is_sorted(bin_sizes_.begin(), bin_sizes_.end()) || bin_sizes_.front() == 0)
+            throw std::invalid_argument{"caching_pool: bin sizes must be positive and sorted."};
+
+        max_cached_bytes_ = options.max_cached_bytes;
+        num_shards_ = options.num_shards ? options.num_shards : std::max(1u, std::thread::hardware_concurrency());
+        shards_ = std::make_unique<shard[]>(num_shards_);
+        for (std::size_t i = 0; i < num_shards_; ++i)
+            shards_[i].bins.resize(bin_sizes_.size());
+    }
+
+    auto bin_index(std::size_t bytes) const -> std::size_t
+    {
+        auto it = std::lower_bound(bin_sizes_.begin(), bin_sizes_.end(), bytes);
+        return it == bin_sizes_.end() ? npos : static_cast<std::size_t>(it - bin_sizes_.begin());
+    }
+
+    auto home_shard() const -> std::size_t
+    {
+        static std::atomic<std::size_t> next_thread{0};
+        thread_local const auto thread_index = next_thread++;
+        return thread_index % num_shards_;
+    }
+
+    auto allocate_from_backing(std::size_t bytes) -> void *
+    {
+        void *p;
+        try {
+            p = backing_.allocate(bytes);
+        }
+        catch (std::exception const &) {
+            // The cache may hold what the backing is missing, retry once without it
+            if (cached_bytes_.load() == 0)
+                throw;
+            release();
+            p = backing_.allocate(bytes);
+        }
+        ++misses_;
+        const auto reserved = reserved_bytes_ += bytes;
+        auto peak = peak_reserved_bytes_.load();
+        while (reserved > peak && !peak_reserved_bytes_.compare_exchange_weak(peak, reserved)) {
+        }
+        return p;
+    }
+
+    auto deallocate_to_backing(void *p, std::size_t bytes) -> void
+    {
+        reserved_bytes_ -= bytes;
+        backing_.deallocate(p, bytes);
+    }
+
+    Backing backing_;
+    std::vector<std::size_t> bin_sizes_;
+    std::size_t max_cached_bytes_ = 0;
+    std::size_t num_shards_ = 0;
+    std::unique_ptr<shard[]> shards_;
+
+    std::atomic<std::size_t> in_use_bytes_{0};
+    std::atomic<std::size_t> cached_bytes_{0};
+    std::atomic<std::size_t> reserved_bytes_{0};
+    std::atomic<std::size_t> peak_reserved_bytes_{0};
+    std::atomic<std::size_t> hits_{0};
+    std::atomic<std::size_t> misses_{0};
+};
+
+/* Backing that serves allocations from caching_pool<Backing>::instance() */
+template <typename Backing>
+class pooled {
+  public:
+    auto allocate(std::size_t bytes) -> void * { return caching_pool<Backing>::instance().allocate(bytes); }
+
+    auto deallocate(void *p, std::size_t bytes) -> void { caching_pool<Backing>::instance().deallocate(p, bytes); }
+};
+
+template <typename Backing>
+struct backing_kind<pooled<Backing>> : backing_kind<Backing> {};
+
+/* Equality operators */
+template <typename Backing>
+auto operator==(pooled<Backing> const &, pooled<Backing> const &) -> bool
+{
+    return true;
+}
+
+template <typename Backing>
+auto operator!=(pooled<Backing> const &, pooled<Backing> const &) -> bool
+{
+    return false;
+}
+
+/* Template alias for a vector backed by pinned memory from the process-wide pool
+ */
+template <typename T, typename Backing = cuda_host_backing>
+using pooled_pinned_vector = std::vector<T, pinned_alloc<T, pooled<Backing>>>;
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,101 @@
+#ifndef THATSZUCS_PLAYGROUND_COPY_H
+#define THATSZUCS_PLAYGROUND_COPY_H
+
+#include "playground/half.h"
+#include "playground/thread_pool.h"
+#include "playground/tracing.h"
+
+#include <cstddef>
+#include <cstring>
+#include <stdexcept>
+
+namespace playground {
+
+/* Bulk copies for filling staging buffers at memory bandwidth. Like the fills
+ * they split the buffer with parallel_for(), so they are meant to be called
+ * with the GIL released. */
+
+/* Copies of at least this many bytes use non-temporal stores, which write
+ * around the caches instead of evicting everything else for data that is not
+ * read again soon. 0 disables them. */
+auto set_nontemporal_threshold(std::size_t bytes) -> void;
+auto get_nontemporal_threshold() -> std::size_t;
+
+/* memcpy with non-temporal stores where the CPU has them, plain memcpy
+ * otherwise. The stores are fenced before returning. */
+auto stream_memcpy(void *dst, void const *src, std::size_t bytes) -> void;
+
+/* memcpy split between the threads of the default pool */
+auto parallel_memcpy(void *dst, void const *src, std::size_t bytes) -> void;
+
+/* Element type conversion like NumPy's unsafe casting: through the compute
+ * types, so the 16-bit floats round to nearest even and out of range values
+ * behave like static_cast. */
+template <typename To, typename From>
+auto convert_value(From value) -> To
+{
+    return static_cast<To>(static_cast<compute_type_t<To>>(static_cast<compute_type_t<From>>(value)));
+}
+
+template <typename To, typename From>
+auto parallel_convert(From const *source, std::size_t count, To *data) -> void
+{
+    const auto scope = trace_scope{"convert", "copy", count * sizeof(To)};
+    parallel_for(count, get_parallel_grain() / sizeof(To), [source, data](std::size_t begin, std::size_t end) {
+        for (auto i = begin; i < end; ++i)
+            data[i] = convert_value<To>(source[i]);
+    });
+}
+
+/* Copies rows source[indices[i] * row_size, (indices[i] + 1) * row_size) to
+ * data[i * row_size, ...] for i in [0, count). The indices are checked against
+ * num_rows before anything is copied. */
+template <typename T, typename Index>
+auto parallel_gather(
+    T const *source, std::size_t num_rows, Index const *indices, std::size_t count, std::size_t row_size, T *data)
+    -> void
+{
+    for (std::size_t i = 0; i < count; ++i) {
+        if (indices[i] < 0 || static_cast<std::size_t>(indices[i]) >= num_rows)
+            throw std::out_of_range{"parallel_gather: index out of range."};
+    }
+
+    const auto row_bytes = row_size * sizeof(T);
+    const auto scope = trace_scope{"gather", "copy", count * row_bytes};
+    const auto grain = get_parallel_grain() / (row_bytes ? row_bytes : 1);
+    parallel_for(count, grain, [=](std::size_t begin, std::size_t end) {
+        for (auto i = begin; i < end; ++i)
+            std::memcpy(data + i * row_size, source + static_cast<std::size_t>(indices[i]) * row_size, row_bytes);
+    });
+}
+
+/* Source of parallel_collate() */
+struct byte_span {
+    void const *data = nullptr;
+    std::size_t size = 0;
+};
+
+/* Copies count sources into one buffer: source i goes to dst + offsets[i]
+ * and the rest of its slot, up to offsets[i + 1], is filled with repetitions
+ * of the pad_size bytes at pad. Contiguous slots give a ragged batch, equal
+ * ones a padded batch. The work is split by destination bytes rather than by
+ * source, so a few large sources among many small ones still spread over the
+ * threads. The slots are checked before anything is copied. */
+auto parallel_collate(byte_span const *sources,
+                      std::size_t count,
+                      std::size_t const *offsets,
+                      void *dst,
+                      void const *pad = nullptr,
+                      std::size_t pad_size = 0) -> void;
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
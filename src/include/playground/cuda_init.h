@@ -0,0 +1,62 @@
+#ifndef THATSZUCS_PLAYGROUND_CUDA_INIT_H
+#define THATSZUCS_PLAYGROUND_CUDA_INIT_H
+
+#include <atomic>
+
+namespace playground {
+
+/* The CUDA runtime loads the driver and creates the context of a device on
+ * the first call that needs them, e.g. the first cudaMallocHost(), which
+ * takes from tens of milliseconds to seconds. cuda_init() does it at a time
+ * of the caller's choosing, e.g. on a background thread during startup. The
+ * CUDA backings call ensure_cuda_init() first, so an initialization they
+ * trigger is still timed and traced on its own, see get_cuda_init_stats().
+ * Pageable memory never initializes CUDA. */
+
+struct cuda_init_stats {
+    bool initialized = false;
+    bool implicit = false; // By the first allocation rather than by cuda_init()
+    int device = -1;       // Whose context was created
+    double seconds = 0.0;  // Time loading the driver and creating the context
+};
+
+namespace detail {
+
+inline std::atomic<bool> cuda_ready{false};
+
+auto cuda_init_implicitly() -> void;
+
+} // namespace detail
+
+/* Creates the primary context of device, by default the current device of
+ * the calling thread. A device is made the current one of the calling thread
+ * only, the context serves every thread. Does
+ * nothing once CUDA is initialized, throws std::runtime_error when it cannot
+ * be, and then tries again on the next call. */
+auto cuda_init(int device = -1) -> void;
+
+inline auto cuda_initialized() noexcept -> bool
+{
+    return detail::cuda_ready.load(std::memory_order_acquire);
+}
+
+auto get_cuda_init_stats() -> cuda_init_stats;
+
+/* cuda_init() on the first call, a single load after it */
+inline auto ensure_cuda_init() -> void
+{
+    if (!cuda_initialized())
+        detail::cuda_init_implicitly();
+}
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,66 @@
+#ifndef THATSZUCS_PLAYGROUND_DECOMPRESS_H
+#define THATSZUCS_PLAYGROUND_DECOMPRESS_H
+
+#include "playground/copy.h"
+
+#include <cstddef>
+#include <memory>
+#include <optional>
+#include <string>
+#include <vector>
+
+namespace playground {
+
+/* Decoder of one compressed format. A stream cannot be split between
+ * threads, so parallel_decompress() decodes independent frames (blocks
+ * compressed on their own, e.g. gzip members of a few MiB each) in parallel.
+ * Codecs are shared by the threads of the pool. */
+class codec {
+  public:
+    virtual ~codec() = default;
+
+    virtual auto name() const -> std::string = 0;
+
+    /* Decompresses the frame src into dst, returns the number of bytes
+     * written. Throws std::runtime_error for corrupt or truncated frames and
+     * for frames decompressing to more than dst_bytes. */
+    virtual auto decompress(void const *src, std::size_t src_bytes, void *dst, std::size_t dst_bytes) const
+        -> std::size_t = 0;
+
+    /* Decompressed size recorded in the frame, for formats recording it */
+    virtual auto decompressed_size(void const *, std::size_t) const -> std::optional<std::size_t>
+    {
+        return std::nullopt;
+    }
+};
+
+/* Makes a codec available by its name, replacing one of the same name. Built
+ * in are "zlib" and "gzip" (of the system zlib), "lz4" (raw blocks) and "zstd"
+ * when the library is built with liblz4 and libzstd. */
+auto register_codec(std::shared_ptr<codec const> decoder) -> void;
+
+/* Throws std::invalid_argument for names that are not registered */
+auto find_codec(std::string const &name) -> std::shared_ptr<codec const>;
+
+auto codec_names() -> std::vector<std::string>;
+
+/* Decompresses count frames into one buffer: frame i goes to dst + offsets[i]
+ * and must fill its slot up to offsets[i + 1] exactly, or std::runtime_error
+ * is thrown. The frames are handed to the threads of the default pool one by
+ * one as they finish the previous ones, so frames of uneven sizes keep every
+ * thread busy. Typically dst is pinned, e.g. a vector or a ring buffer slot,
+ * which saves the copy from a pageable staging buffer. */
+auto parallel_decompress(
+    codec const &decoder, byte_span const *frames, std::size_t count, std::size_t const *offsets, void *dst) -> void;
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,63 @@
+#ifndef THATSZUCS_PLAYGROUND_FILE_READER_H
+#define THATSZUCS_PLAYGROUND_FILE_READER_H
+
+#include <cstddef>
+#include <memory>
+#include <string>
+
+namespace playground {
+
+enum class read_method {
+    mmap,     // memcpy from a sequential mapping, prefetched with madvise()
+    pread,    // Buffered pread() calls, prefetched with posix_fadvise()
+    direct,   // pread() with O_DIRECT, bypassing the page cache
+    io_uring, // Batches of reads submitted to an io_uring
+};
+
+/* Reads a file straight into caller provided (e.g. pinned) memory, in
+ * parallel on the default thread pool where the method allows. Methods the
+ * system does not support fall back to pread, see method(). O_DIRECT needs
+ * page aligned destinations and offsets, anything else is read buffered. */
+class file_reader {
+  public:
+    explicit file_reader(std::string const &path, read_method method = read_method::pread);
+    ~file_reader();
+
+    file_reader(file_reader const &) = delete;
+    auto operator=(file_reader const &) -> file_reader & = delete;
+
+    auto size() const noexcept -> std::size_t { return size_; }
+
+    /* The method actually used */
+    auto method() const noexcept -> read_method { return method_; }
+
+    /* Reads up to bytes at offset into data, returns the number of bytes read,
+     * less than bytes only at the end of the file. The range following it is
+     * prefetched. */
+    auto read(std::size_t offset, void *data, std::size_t bytes) -> std::size_t;
+
+  private:
+    struct uring;
+
+    auto prefetch(std::size_t offset, std::size_t bytes) -> void;
+
+    std::string path_;
+    read_method method_;
+    std::size_t size_ = 0;
+    int fd_ = -1;
+    int direct_fd_ = -1;
+    char *map_ = nullptr;
+    std::unique_ptr<uring> uring_;
+};
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
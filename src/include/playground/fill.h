@@ -0,0 +1,168 @@
+#ifndef THATSZUCS_PLAYGROUND_FILL_H
+#define THATSZUCS_PLAYGROUND_FILL_H
+
+#include "playground/copy.h"
+#include "playground/half.h"
+#include "playground/thread_pool.h"
+
+#include <unistd.h>
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <memory>
+#include <new>
+#include <stdexcept>
+#include <type_traits>
+#include <utility>
+#include <vector>
+
+namespace playground {
+
+/* Allocator adaptor that default-initializes instead of value-initializing, so
+ * resize() leaves trivial elements untouched and the pages unfaulted. This
+ * lets the parallel fills below be the first to touch the memory. */
+template <typename Alloc>
+class default_init_alloc : public Alloc {
+    using traits = std::allocator_traits<Alloc>;
+
+  public:
+    template <typename U>
+    struct rebind {
+        using other = default_init_alloc<typename traits::template rebind_alloc<U>>;
+    };
+
+    using Alloc::Alloc;
+
+    default_init_alloc() = default;
+
+    template <typename A>
+    default_init_alloc(default_init_alloc<A> const &other) noexcept : Alloc(static_cast<A const &>(other))
+    {
+    }
+
+    template <typename U>
+    auto construct(U *p) noexcept(std::is_nothrow_default_constructible<U>::value) -> void
+    {
+        ::new (static_cast<void *>(p)) U;
+    }
+
+    template <typename U, typename... Args>
+    auto construct(U *p, Args &&...args) -> void
+    {
+        traits::construct(static_cast<Alloc &>(*this), p, std::forward<Args>(args)...);
+    }
+};
+
+/* Template alias for a vector whose resize() does not initialize */
+template <typename T, typename Alloc = std::allocator<T>>
+using default_init_vector = std::vector<T, default_init_alloc<Alloc>>;
+
+enum class fill_mode {
+    uninitialized, // Pages are only faulted in
+    zeros,
+    constant, // Every element is value
+    iota,     // value, value + 1, ... (wrapping like static_cast)
+    copy,     // Copied from a source buffer
+};
+
+/* The fills below split the buffer with parallel_for(), the chunks being
+ * handled by std::fill_n / std::memcpy or loops simple enough for the compiler
+ * to vectorize. */
+
+/* Writes one byte per page, so the pages are faulted in by the threads that
+ * will later fill them */
+template <typename T>
+auto parallel_touch(T *data, std::size_t count) -> void
+{
+    static const auto page_size = static_cast<std::uintptr_t>(sysconf(_SC_PAGESIZE));
+    auto *bytes = reinterpret_cast<unsigned char *>(data);
+    parallel_for(count * sizeof(T), get_parallel_grain(), [bytes](std::size_t begin, std::size_t end) {
+        // The first byte, the first byte of every page after it and the last
+        // byte, chunks need not start or end at page boundaries
+        bytes[begin] = 0;
+        const auto address = reinterpret_cast<std::uintptr_t>(bytes + begin);
+        for (auto i = begin + (page_size - address % page_size) % page_size; i < end; i += page_size)
+            bytes[i] = 0;
+        bytes[end - 1] = 0;
+    });
+}
+
+template <typename T>
+auto parallel_fill(T *data, std::size_t count, T value) -> void
+{
+    parallel_for(count, get_parallel_grain() / sizeof(T),
+                 [data, value](std::size_t begin, std::size_t end) { std::fill_n(data + begin, end - begin, value); });
+}
+
+template <typename T>
+auto parallel_iota(T *data, std::size_t count, T start) -> void
+{
+    using C = compute_type_t<T>;
+    parallel_for(count, get_parallel_grain() / sizeof(T), [data, start](std::size_t begin, std::size_t end) {
+        for (auto i = begin; i < end; ++i)
+            data[i] =
+                static_cast<T>(static_cast<C>(start) + static_cast<C>(static_cast<T>(i))); // Do not care about overflow
+    });
+}
+
+template <typename T>
+auto parallel_copy(T const *source, std::size_t count, T *data) -> void
+{
+    parallel_memcpy(data, source, count * sizeof(T));
+}
+
+/* Initializes count elements at data according to mode */
+template <typename T>
+auto parallel_init(T *data, std::size_t count, fill_mode mode, T value = T{}, T const *source = nullptr) -> void
+{
+    static constexpr char const *names[] = {"touch", "zeros", "constant", "iota", "copy"};
+    const auto scope = trace_scope{names[static_cast<int>(mode)], "fill", count * sizeof(T)};
+    switch (mode) {
+    case fill_mode::uninitialized:
+        parallel_touch(data, count);
+        break;
+    case fill_mode::zeros:
+        parallel_fill(data, count, T{});
+        break;
+    case fill_mode::constant:
+        parallel_fill(data, count, value);
+        break;
+    case fill_mode::iota:
+        parallel_iota(data, count, value);
+        break;
+    case fill_mode::copy:
+        if (!source && count)
+            throw std::invalid_argument{"parallel_init: copy mode needs a source."};
+        parallel_copy(source, count, data);
+        break;
+    }
+}
+
+/* Creates a vector of count elements, initialized in parallel. Use it with
+ * default_init_vector, other vectors are value-initialized by resize() first. */
+template <typename Vector>
+auto make_vector(std::size_t count,
+                 fill_mode mode,
+                 typename Vector::value_type value = {},
+                 typename Vector::value_type const *source = nullptr,
+                 typename Vector::allocator_type const &alloc = {}) -> std::unique_ptr<Vector>
+{
+    auto vec = std::make_unique<Vector>(alloc);
+    vec->resize(count);
+    parallel_init(vec->data(), count, mode, value, source);
+    return vec;
+}
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
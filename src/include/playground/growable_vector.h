@@ -0,0 +1,214 @@
+#ifndef THATSZUCS_PLAYGROUND_GROWABLE_VECTOR_H
+#define THATSZUCS_PLAYGROUND_GROWABLE_VECTOR_H
+
+#include "playground/copy.h"
+#include "playground/memory_backing.h"
+
+#include <algorithm>
+#include <cstddef>
+#include <stdexcept>
+#include <type_traits>
+#include <utility>
+#include <vector>
+
+namespace playground {
+
+/* Range of virtual addresses without memory behind it, committed from the
+ * front on demand. The range never moves, so pointers into committed memory
+ * stay valid while it grows. Move-only, unmapped on destruction. */
+class address_reservation {
+  public:
+    /* Rounded up to the page size */
+    explicit address_reservation(std::size_t bytes);
+
+    address_reservation(address_reservation &&other) noexcept { swap(other); }
+    auto operator=(address_reservation &&other) noexcept -> address_reservation &
+    {
+        auto tmp = std::move(other);
+        swap(tmp);
+        return *this;
+    }
+    ~address_reservation();
+
+    auto data() const noexcept -> void * { return data_; }
+    auto reserved() const noexcept -> std::size_t { return reserved_; }
+    auto committed() const noexcept -> std::size_t { return committed_; }
+
+    /* Makes the first bytes, rounded up to pages, readable and writable.
+     * Throws std::length_error beyond the reservation. */
+    auto commit(std::size_t bytes) -> void;
+
+    /* Gives the pages from bytes on, rounded up, back to the kernel */
+    auto decommit(std::size_t bytes) -> void;
+
+  private:
+    auto swap(address_reservation &other) noexcept -> void
+    {
+        std::swap(data_, other.data_);
+        std::swap(reserved_, other.reserved_);
+        std::swap(committed_, other.committed_);
+    }
+
+    void *data_ = nullptr;
+    std::size_t reserved_ = 0;
+    std::size_t committed_ = 0;
+};
+
+/* Vector of trivially copyable elements that grows without reallocating
+ *
+ * A std::vector with pinned_alloc grows by allocating a larger pinned block,
+ * copying everything and freeing the old block, and page-locking is the most
+ * expensive part of all three. This one reserves max_count elements of address
+ * space up front and commits and page-locks it in chunks at its end with the
+ * host_register() of Backing, each chunk at least as large as everything
+ * before it. Appends are amortised O(1), existing elements are neither copied
+ * nor locked again, and pointers into the vector stay valid until it shrinks.
+ * New elements are left uninitialized, like default_init_vector. Copies
+ * spanning chunks span several CUDA registrations.
+ */
+template <typename T, typename Backing = cuda_host_backing>
+class growable_pinned_vector {
+    static_assert(std::is_trivially_copyable_v<T>, "growable_pinned_vector: T must be trivially copyable.");
+
+  public:
+    using value_type = T;
+    using size_type = std::size_t;
+    using iterator = T *;
+    using const_iterator = T const *;
+
+    /* Address space reserved by default, nothing is committed before use */
+    static constexpr std::size_t default_max_bytes = std::size_t{64} << 30;
+
+    /* Smallest chunk committed and locked at once */
+    static constexpr std::size_t min_chunk_bytes = std::size_t{2} << 20;
+
+    explicit growable_pinned_vector(std::size_t max_count = default_max_bytes / sizeof(T), Backing backing = {})
+        : reservation_{std::max<std::size_t>(max_count, 1) * sizeof(T)}, backing_{std::move(backing)}
+    {
+    }
+
+    growable_pinned_vector(growable_pinned_vector &&other) noexcept
+        : reservation_{std::move(other.reservation_)}, backing_{std::move(other.backing_)},
+          chunks_{std::move(other.chunks_)}, size_{std::exchange(other.size_, 0)}
+    {
+        other.chunks_.clear();
+    }
+
+    auto operator=(growable_pinned_vector &&) -> growable_pinned_vector & = delete;
+
+    ~growable_pinned_vector() { release_chunks(0); }
+
+    auto data() noexcept -> T * { return static_cast<T *>(reservation_.data()); }
+    auto data() const noexcept -> T const * { return static_cast<T const *>(reservation_.data()); }
+    auto size() const noexcept -> std::size_t { return size_; }
+    auto empty() const noexcept -> bool { return size_ == 0; }
+
+    /* Elements committed and page-locked */
+    auto capacity() const noexcept -> std::size_t { return locked_bytes() / sizeof(T); }
+    auto max_size() const noexcept -> std::size_t { return reservation_.reserved() / sizeof(T); }
+
+    auto operator[](std::size_t i) noexcept -> T & { return data()[i]; }
+    auto operator[](std::size_t i) const noexcept -> T const & { return data()[i]; }
+    auto begin() noexcept -> iterator { return data(); }
+    auto end() noexcept -> iterator { return data() + size_; }
+    auto begin() const noexcept -> const_iterator { return data(); }
+    auto end() const noexcept -> const_iterator { return data() + size_; }
+
+    /* Number of host_register() calls the memory is split between */
+    auto num_chunks() const noexcept -> std::size_t { return chunks_.size(); }
+
+    /* Ends of the chunks in bytes, the first one beginning at data() */
+    auto chunk_ends() const noexcept -> std::vector<std::size_t> const & { return chunks_; }
+
+    auto get_backing() const -> Backing const & { return backing_; }
+
+    /* Commits and locks chunks until count elements fit, throws
+     * std::length_error beyond max_size() */
+    auto reserve(std::size_t count) -> void
+    {
+        if (count > max_size())
+            throw std::length_error{"growable_pinned_vector: the address space reserved is exhausted."};
+        while (capacity() < count) {
+            const auto begin = locked_bytes();
+            const auto wanted = std::max({count * sizeof(T) - begin, begin, min_chunk_bytes});
+            const auto bytes = std::min(wanted, reservation_.reserved() - begin);
+            reservation_.commit(begin + bytes);
+            // The reservation commits whole pages, lock all of them
+            const auto end = reservation_.committed();
+            auto *p = static_cast<char *>(reservation_.data()) + begin;
+            try {
+                backing_.host_register(p, end - begin);
+            }
+            catch (...) {
+                reservation_.decommit(begin);
+                throw;
+            }
+            chunks_.push_back(end);
+        }
+    }
+
+    /* New elements are uninitialized */
+    auto resize(std::size_t count) -> void
+    {
+        reserve(count);
+        size_ = count;
+    }
+
+    auto push_back(T const &value) -> void
+    {
+        if (size_ == capacity())
+            reserve(size_ + 1);
+        data()[size_++] = value;
+    }
+
+    /* Appends count elements from source, in parallel when large */
+    auto append(T const *source, std::size_t count) -> void
+    {
+        reserve(size_ + count);
+        parallel_memcpy(data() + size_, source, count * sizeof(T));
+        size_ += count;
+    }
+
+    /* Keeps the memory */
+    auto clear() noexcept -> void { size_ = 0; }
+
+    /* Unlocks and decommits the chunks past the end */
+    auto shrink_to_fit() -> void
+    {
+        auto keep = std::size_t{0};
+        while (keep < chunks_.size() && (keep == 0 ? 0 : chunks_[keep - 1]) < size_ * sizeof(T))
+            ++keep;
+        release_chunks(keep);
+    }
+
+  private:
+    auto locked_bytes() const noexcept -> std::size_t { return chunks_.empty() ? 0 : chunks_.back(); }
+
+    auto release_chunks(std::size_t keep) -> void
+    {
+        while (chunks_.size() > keep) {
+            const auto end = chunks_.back();
+            chunks_.pop_back();
+            const auto begin = locked_bytes();
+            backing_.host_unregister(static_cast<char *>(reservation_.data()) + begin, end - begin);
+            reservation_.decommit(begin);
+        }
+    }
+
+    address_reservation reservation_;
+    Backing backing_;
+    std::vector<std::size_t> chunks_; // End of each chunk in bytes
+    std::size_t size_ = 0;
+};
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,157 @@
+#ifndef THATSZUCS_PLAYGROUND_HALF_H
+#define THATSZUCS_PLAYGROUND_HALF_H
+
+#include <cstdint>
+#include <cstring>
+
+namespace playground {
+
+/* 16-bit floating point types for staging data. They only store values and
+ * convert to and from float, rounding to nearest even. Arithmetic is done in
+ * float. */
+
+/* IEEE 754 binary16 */
+struct float16 {
+    std::uint16_t bits = 0;
+
+    float16() = default;
+
+    explicit float16(float value) noexcept : bits{from_float(value)} {}
+
+    explicit operator float() const noexcept { return to_float(bits); }
+
+    /* Conversions following NumPy's npy_floatbits_to_halfbits and
+     * npy_halfbits_to_floatbits */
+    static auto from_float(float value) noexcept -> std::uint16_t
+    {
+        std::uint32_t f;
+        std::memcpy(&f, &value, sizeof(f));
+
+        const auto h_sgn = static_cast<std::uint16_t>((f & 0x80000000u) >> 16);
+        auto f_exp = f & 0x7f800000u;
+        auto f_sig = f & 0x007fffffu;
+
+        // Infinity, NaN or overflow to infinity
+        if (f_exp >= 0x47800000u) {
+            if (f_exp == 0x7f800000u && f_sig != 0) {
+                auto ret = static_cast<std::uint16_t>(0x7c00u + (f_sig >> 13));
+                if (ret == 0x7c00u)
+                    ++ret; // Keep it a NaN
+                return static_cast<std::uint16_t>(h_sgn + ret);
+            }
+            return static_cast<std::uint16_t>(h_sgn + 0x7c00u);
+        }
+
+        // Subnormal or underflow to zero
+        if (f_exp <= 0x38000000u) {
+            if (f_exp < 0x33000000u)
+                return h_sgn;
+            f_exp >>= 23;
+            f_sig += 0x00800000u;
+            f_sig >>= (113 - f_exp);
+            if ((f_sig & 0x00003fffu) != 0x00001000u || (f & 0x000007ffu))
+                f_sig += 0x00001000u;
+            return static_cast<std::uint16_t>(h_sgn + (f_sig >> 13));
+        }
+
+        // Normal, a carry of the rounding correctly increments the exponent
+        const auto h_exp = static_cast<std::uint16_t>((f_exp - 0x38000000u) >> 13);
+        if ((f_sig & 0x00003fffu) != 0x00001000u)
+            f_sig += 0x00001000u;
+        return static_cast<std::uint16_t>(h_sgn + h_exp + (f_sig >> 13));
+    }
+
+    static auto to_float(std::uint16_t h) noexcept -> float
+    {
+        auto h_exp = static_cast<std::uint32_t>(h & 0x7c00u);
+        const auto f_sgn = static_cast<std::uint32_t>(h & 0x8000u) << 16;
+        std::uint32_t f;
+
+        if (h_exp == 0) {
+            // Zero or subnormal
+            auto h_sig = static_cast<std::uint32_t>(h & 0x03ffu);
+            if (h_sig == 0) {
+                f = f_sgn;
+            }
+            else {
+                h_sig <<= 1;
+                while ((h_sig & 0x0400u) == 0) {
+                    h_sig <<= 1;
+                    ++h_exp;
+                }
+                f = f_sgn + ((127 - 15 - h_exp) << 23) + ((h_sig & 0x03ffu) << 13);
+            }
+        }
+        else if (h_exp == 0x7c00u) {
+            // Infinity or NaN
+            f = f_sgn + 0x7f800000u + (static_cast<std::uint32_t>(h & 0x03ffu) << 13);
+        }
+        else {
+            f = f_sgn + ((static_cast<std::uint32_t>(h & 0x7fffu) + 0x1c000u) << 13);
+        }
+
+        float value;
+        std::memcpy(&value, &f, sizeof(value));
+        return value;
+    }
+};
+
+/* The upper half of an IEEE 754 binary32 */
+struct bfloat16 {
+    std::uint16_t bits = 0;
+
+    bfloat16() = default;
+
+    explicit bfloat16(float value) noexcept : bits{from_float(value)} {}
+
+    explicit operator float() const noexcept { return to_float(bits); }
+
+    static auto from_float(float value) noexcept -> std::uint16_t
+    {
+        std::uint32_t f;
+        std::memcpy(&f, &value, sizeof(f));
+        if ((f & 0x7f800000u) == 0x7f800000u && (f & 0x007fffffu))
+            return static_cast<std::uint16_t>((f >> 16) | 0x0040u); // Quiet NaN
+        f += 0x00007fffu + ((f >> 16) & 1);
+        return static_cast<std::uint16_t>(f >> 16);
+    }
+
+    static auto to_float(std::uint16_t h) noexcept -> float
+    {
+        const auto f = static_cast<std::uint32_t>(h) << 16;
+        float value;
+        std::memcpy(&value, &f, sizeof(value));
+        return value;
+    }
+};
+
+/* Type to do arithmetic in for an element type */
+template <typename T>
+struct compute_type {
+    using type = T;
+};
+
+template <>
+struct compute_type<float16> {
+    using type = float;
+};
+
+template <>
+struct compute_type<bfloat16> {
+    using type = float;
+};
+
+template <typename T>
+using compute_type_t = typename compute_type<T>::type;
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,213 @@
+#ifndef THATSZUCS_PLAYGROUND_HOST_MAPPING_H
+#define THATSZUCS_PLAYGROUND_HOST_MAPPING_H
+
+#include "playground/caching_pool.h"
+#include "playground/memory_backing.h"
+#include "playground/numa.h"
+
+#include <algorithm>
+#include <cstddef>
+#include <map>
+#include <mutex>
+#include <stdexcept>
+
+namespace playground {
+
+enum class huge_pages {
+    none,        // Base pages (4 KiB)
+    transparent, // 2 MiB aligned with madvise(MADV_HUGEPAGE), the kernel backs it with huge pages where it can
+    explicit_2m, // MAP_HUGETLB 2 MiB pages from the reserved pool, transparent when the pool has none left
+    explicit_1g, // MAP_HUGETLB 1 GiB pages, likewise
+};
+
+/* How anonymous host memory is mapped. Huge pages cut the page table work of
+ * faulting in and page-locking multi-GiB buffers and the TLB misses of filling
+ * and copying them. */
+struct mapping_options {
+    numa_policy numa = {};
+    huge_pages pages = huge_pages::none;
+};
+
+inline auto operator==(mapping_options const &lhs, mapping_options const &rhs) -> bool
+{
+    return lhs.numa == rhs.numa && lhs.pages == rhs.pages;
+}
+
+inline auto operator!=(mapping_options const &lhs, mapping_options const &rhs) -> bool
+{
+    return !(lhs == rhs);
+}
+
+/* Size of the pages, the base page size for none */
+auto huge_page_bytes(huge_pages pages) -> std::size_t;
+
+/* Anonymous mapping of at least one page, rounded up to the page size of the
+ * options, with the NUMA policy set before any page is touched. Explicit huge
+ * pages fall back to transparent ones, so the length is always that of the
+ * requested page size and unmap_host() needs no record of what was used. */
+auto map_host(std::size_t bytes, mapping_options const &options) -> void *;
+auto unmap_host(void *p, std::size_t bytes, mapping_options const &options) -> void;
+
+/* Pages actually backing the mapping at p: explicit ones, transparent ones
+ * where the kernel assembled at least one, none otherwise */
+auto huge_pages_of(void const *p) -> huge_pages;
+
+/* Backing getting its memory from map_host().
+ *
+ * The default options are the plain Backing. cudaMallocHost() and friends
+ * place and size the pages themselves, so other options map the memory with
+ * map_host() and page-lock it in place with the host_register() of Backing
+ * instead, which throws when the memory cannot be locked. pageable_backing
+ * gives mapped pageable memory.
+ */
+template <typename Backing = cuda_host_backing>
+class mapped_backing {
+  public:
+    mapped_backing() = default;
+
+    explicit mapped_backing(mapping_options options, Backing backing = {}) : options_{options}, backing_{backing} {}
+
+    explicit mapped_backing(numa_policy policy, Backing backing = {}) : options_{policy}, backing_{backing} {}
+
+    auto allocate(std::size_t bytes) -> void *
+    {
+        if (options_ == mapping_options{})
+            return backing_.allocate(bytes);
+
+        auto p = map_host(bytes, options_);
+        try {
+            backing_.host_register(p, bytes ? bytes : 1);
+        }
+        catch (...) {
+            unmap_host(p, bytes, options_);
+            throw;
+        }
+        return p;
+    }
+
+    auto deallocate(void *p, std::size_t bytes) -> void
+    {
+        if (!p)
+            return;
+        if (options_ == mapping_options{}) {
+            backing_.deallocate(p, bytes);
+            return;
+        }
+        backing_.host_unregister(p, bytes ? bytes : 1);
+        unmap_host(p, bytes, options_);
+    }
+
+    auto options() const noexcept -> mapping_options const & { return options_; }
+    auto policy() const noexcept -> numa_policy const & { return options_.numa; }
+    auto backing() const noexcept -> Backing const & { return backing_; }
+
+  private:
+    mapping_options options_;
+    Backing backing_;
+};
+
+template <typename Backing>
+struct backing_kind<mapped_backing<Backing>> : backing_kind<Backing> {};
+
+/* Equality operators */
+template <typename Backing>
+auto operator==(mapped_backing<Backing> const &lhs, mapped_backing<Backing> const &rhs) -> bool
+{
+    return lhs.options() == rhs.options() && lhs.backing() == rhs.backing();
+}
+
+template <typename Backing>
+auto operator!=(mapped_backing<Backing> const &lhs, mapped_backing<Backing> const &rhs) -> bool
+{
+    return !(lhs == rhs);
+}
+
+/* Process-wide caching pools, one per node, bound to their node. Node -1 is
+ * the pool of the local policy. Never destroyed, see caching_pool::instance().
+ */
+template <typename Backing = cuda_host_backing>
+class numa_pools {
+  public:
+    using pool_type = caching_pool<mapped_backing<Backing>>;
+
+    static auto pool(int node) -> pool_type &
+    {
+        static auto *mutex = new std::mutex{};
+        static auto *pools = new std::map<int, pool_type *>{};
+
+        std::lock_guard<std::mutex> lock{*mutex};
+        auto it = pools->find(node);
+        if (it == pools->end()) {
+            const auto policy = node < 0 ? numa_policy{} : numa_policy::bind(node);
+            if (policy.mode == numa_mode::bind)
+                check_node(node);
+            it = pools->emplace(node, new pool_type{pool_options{}, mapped_backing<Backing>{policy}}).first;
+        }
+        return *it->second;
+    }
+
+  private:
+    static auto check_node(int node) -> void
+    {
+        auto const &nodes = numa_nodes();
+        if (std::find(nodes.begin(), nodes.end(), node) == nodes.end())
+            throw std::invalid_argument{"numa_pools: node is not online."};
+    }
+};
+
+/* Backing that serves allocations from the pool of a node */
+template <typename Backing = cuda_host_backing>
+class numa_pooled {
+  public:
+    numa_pooled() = default;
+
+    explicit numa_pooled(int node) : node_{node} {}
+
+    auto allocate(std::size_t bytes) -> void * { return numa_pools<Backing>::pool(node_).allocate(bytes); }
+
+    auto deallocate(void *p, std::size_t bytes) -> void { numa_pools<Backing>::pool(node_).deallocate(p, bytes); }
+
+    auto node() const noexcept -> int { return node_; }
+
+  private:
+    int node_ = -1;
+};
+
+template <typename Backing>
+struct backing_kind<numa_pooled<Backing>> : backing_kind<Backing> {};
+
+/* Equality operators */
+template <typename Backing>
+auto operator==(numa_pooled<Backing> const &lhs, numa_pooled<Backing> const &rhs) -> bool
+{
+    return lhs.node() == rhs.node();
+}
+
+template <typename Backing>
+auto operator!=(numa_pooled<Backing> const &lhs, numa_pooled<Backing> const &rhs) -> bool
+{
+    return !(lhs == rhs);
+}
+
+/* Template alias for a vector backed by pinned memory from the pool of a node
+ */
+template <typename T, typename Backing = cuda_host_backing>
+using numa_pinned_vector = std::vector<T, pinned_alloc<T, numa_pooled<Backing>>>;
+
+/* Template alias for a vector mapped by the options of its allocator, e.g.
+ * mapped_vector<float>(n, pinned_alloc<float, mapped_backing<>>{
+ *     mapped_backing<>{mapping_options{{}, huge_pages::explicit_2m}}}) */
+template <typename T, typename Backing = cuda_host_backing>
+using mapped_vector = std::vector<T, pinned_alloc<T, mapped_backing<Backing>>>;
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
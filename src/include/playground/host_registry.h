@@ -0,0 +1,241 @@
+#ifndef THATSZUCS_PLAYGROUND_HOST_REGISTRY_H
+#define THATSZUCS_PLAYGROUND_HOST_REGISTRY_H
+
+#include "playground/memory_backing.h"
+
+#include <unistd.h>
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <iterator>
+#include <map>
+#include <mutex>
+#include <stdexcept>
+#include <utility>
+#include <vector>
+
+namespace playground {
+
+struct registry_stats {
+    std::size_t registrations = 0;    // Ranges acquired and not yet released
+    std::size_t regions = 0;          // Ranges registered with the backing
+    std::size_t registered_bytes = 0; // Sum of the regions
+};
+
+/* Page-locks memory allocated elsewhere (NumPy arrays, mappings of files,
+ * shared memory) in place with the host_register() of a backing, e.g.
+ * cudaHostRegister, instead of copying it into a pinned allocation.
+ *
+ * The backing registers whole pages and refuses ranges overlapping one it
+ * already registered, so the registry keeps page aligned, disjoint regions
+ * with a reference count each. A range overlapping registered regions only
+ * registers the pages not covered yet and references the others. A region is
+ * unregistered when the last range referencing it is released.
+ */
+template <typename Backing = cuda_host_backing>
+class host_registry {
+  public:
+    explicit host_registry(Backing backing = {}) : backing_{backing} {}
+
+    host_registry(host_registry const &) = delete;
+    auto operator=(host_registry const &) -> host_registry & = delete;
+
+    ~host_registry()
+    {
+        for (auto const &region : regions_) {
+            try {
+                backing_.host_unregister(reinterpret_cast<void *>(region.first), region.second.end - region.first);
+            }
+            catch (std::runtime_error &) {
+                // Nothing left to do about it
+            }
+        }
+    }
+
+    /* Process-wide registry of the backing, never destroyed for the same
+     * reason as caching_pool::instance() */
+    static auto instance() -> host_registry &
+    {
+        static auto *registry = new host_registry{};
+        return *registry;
+    }
+
+    /* Registers [p, p + bytes). Throws, registering nothing, when the backing
+     * fails. */
+    auto acquire(void *p, std::size_t bytes) -> void
+    {
+        if (bytes == 0)
+            return;
+        const auto range = page_range(p, bytes);
+
+        std::lock_guard<std::mutex> lock{mutex_};
+        auto covered = std::vector<iterator>{};
+        auto gaps = std::vector<std::pair<std::uintptr_t, std::uintptr_t>>{};
+        auto cursor = range.first;
+        for (auto it = first_overlap(range.first); it != regions_.end() && it->first < range.second; ++it) {
+            if (it->first > cursor)
+                gaps.emplace_back(cursor, it->first);
+            covered.push_back(it);
+            cursor = it->second.end;
+        }
+        if (cursor < range.second)
+            gaps.emplace_back(cursor, range.second);
+
+        for (std::size_t i = 0; i < gaps.size(); ++i) {
+            try {
+                backing_.host_register(reinterpret_cast<void *>(gaps[i].first), gaps[i].second - gaps[i].first);
+            }
+            catch (...) {
+                while (i-- > 0) {
+                    backing_.host_unregister(reinterpret_cast<void *>(gaps[i].first), gaps[i].second - gaps[i].first);
+                    regions_.erase(gaps[i].first);
+                }
+                throw;
+            }
+            regions_.emplace(gaps[i].first, region{gaps[i].second, 1});
+        }
+        for (auto it : covered)
+            ++it->second.refs;
+        ++registrations_;
+    }
+
+    /* Releases a range acquired before */
+    auto release(void *p, std::size_t bytes) -> void
+    {
+        if (bytes == 0)
+            return;
+        const auto range = page_range(p, bytes);
+
+        std::lock_guard<std::mutex> lock{mutex_};
+        auto covered = std::vector<iterator>{};
+        auto cursor = range.first;
+        for (auto it = first_overlap(range.first); it != regions_.end() && it->first < range.second; ++it) {
+            if (it->first > cursor)
+                break;
+            covered.push_back(it);
+            cursor = it->second.end;
+        }
+        if (cursor < range.second)
+            throw std::logic_error{"host_registry: releasing a range that is not registered."};
+
+        for (auto it : covered) {
+            if (--it->second.refs == 0) {
+                backing_.host_unregister(reinterpret_cast<void *>(it->first), it->second.end - it->first);
+                regions_.erase(it);
+            }
+        }
+        --registrations_;
+    }
+
+    auto stats() const -> registry_stats
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        auto result = registry_stats{};
+        result.registrations = registrations_;
+        result.regions = regions_.size();
+        for (auto const &region : regions_)
+            result.registered_bytes += region.second.end - region.first;
+        return result;
+    }
+
+  private:
+    struct region {
+        std::uintptr_t end;
+        std::size_t refs;
+    };
+
+    using iterator = typename std::map<std::uintptr_t, region>::iterator;
+
+    static auto page_range(void *p, std::size_t bytes) -> std::pair<std::uintptr_t, std::uintptr_t>
+    {
+        static const auto page_size = static_cast<std::uintptr_t>(sysconf(_SC_PAGESIZE));
+        const auto begin = reinterpret_cast<std::uintptr_t>(p);
+        return {begin / page_size * page_size, (begin + bytes + page_size - 1) / page_size * page_size};
+    }
+
+    /* First region ending after address */
+    auto first_overlap(std::uintptr_t address) -> iterator
+    {
+        auto it = regions_.upper_bound(address);
+        if (it != regions_.begin() && std::prev(it)->second.end > address)
+            --it;
+        return it;
+    }
+
+    Backing backing_;
+    mutable std::mutex mutex_;
+    std::map<std::uintptr_t, region> regions_; // By first address
+    std::size_t registrations_ = 0;
+};
+
+/* Keeps memory owned by somebody else page-locked for as long as it lives.
+ * The memory must outlive the view. */
+template <typename Backing = cuda_host_backing>
+class pinned_view {
+  public:
+    pinned_view(void *data, std::size_t bytes, host_registry<Backing> &registry = host_registry<Backing>::instance())
+        : registry_{&registry}, data_{data}, bytes_{bytes}
+    {
+        registry_->acquire(data_, bytes_);
+    }
+
+    pinned_view(pinned_view &&other) noexcept
+        : registry_{other.registry_}, data_{std::exchange(other.data_, nullptr)}, bytes_{std::exchange(other.bytes_, 0)}
+    {
+    }
+
+    auto operator=(pinned_view &&other) -> pinned_view &
+    {
+        if (this != &other) {
+            reset();
+            registry_ = other.registry_;
+            data_ = std::exchange(other.data_, nullptr);
+            bytes_ = std::exchange(other.bytes_, 0);
+        }
+        return *this;
+    }
+
+    ~pinned_view() { reset(); }
+
+    auto data() const noexcept -> void * { return data_; }
+    auto size() const noexcept -> std::size_t { return bytes_; }
+
+    /* Unregisters before the view goes away */
+    auto reset() -> void
+    {
+        if (data_)
+            registry_->release(data_, bytes_);
+        data_ = nullptr;
+        bytes_ = 0;
+    }
+
+  private:
+    host_registry<Backing> *registry_;
+    void *data_;
+    std::size_t bytes_;
+};
+
+template <typename Backing = cuda_host_backing>
+auto register_host_memory(void *data, std::size_t bytes) -> pinned_view<Backing>
+{
+    return pinned_view<Backing>{data, bytes};
+}
+
+template <typename Backing = cuda_host_backing, typename T, typename Alloc>
+auto register_host_memory(std::vector<T, Alloc> &vec) -> pinned_view<Backing>
+{
+    return pinned_view<Backing>{vec.data(), vec.size() * sizeof(T)};
+}
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
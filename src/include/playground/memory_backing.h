@@ -0,0 +1,249 @@
+#ifndef THATSZUCS_PLAYGROUND_MEMORY_BACKING_H
+#define THATSZUCS_PLAYGROUND_MEMORY_BACKING_H
+
+#include "cuda_runtime.h" // "cuda_runtime_api.h" is C header
+
+#include "playground/allocation_stats.h"
+#include "playground/cuda_init.h"
+
+#include <cstddef>
+#include <stdexcept>
+
+namespace playground {
+
+/* A backing is where the allocators of this library get their bytes from.
+ * It provides
+ *
+ *     auto allocate(std::size_t bytes) -> void *;
+ *     auto deallocate(void *p, std::size_t bytes) -> void;
+ *
+ * and equality operators, where equal backings can free each other's memory.
+ * Backings that can page-lock memory allocated elsewhere also provide
+ *
+ *     auto host_register(void *p, std::size_t bytes) -> void;
+ *     auto host_unregister(void *p, std::size_t bytes) -> void;
+ *
+ * for page aligned, non-overlapping ranges, see host_registry. Backings of
+ * memory that is not page-locked specialise backing_kind, so their
+ * allocations are not counted as pinned. The CUDA backings initialize CUDA
+ * on first use, see cuda_init.h.
+ */
+
+/* Page-locked host memory of the CUDA runtime */
+class cuda_host_backing {
+  public:
+    auto allocate(std::size_t bytes) -> void *
+    {
+        ensure_cuda_init();
+        void *tmp;
+        auto error = cudaMallocHost(&tmp, bytes);
+        if (error != cudaSuccess) {
+            throw std::runtime_error{cudaGetErrorString(error)};
+        }
+        return tmp;
+    }
+
+    auto deallocate(void *p, std::size_t) -> void
+    {
+        if (p) {
+            auto error = cudaFreeHost(p);
+            if (error != cudaSuccess) {
+                throw std::runtime_error{cudaGetErrorString(error)};
+            }
+        }
+    }
+
+    auto host_register(void *p, std::size_t bytes) -> void
+    {
+        ensure_cuda_init();
+        auto error = cudaHostRegister(p, bytes, cudaHostRegisterDefault);
+#ifdef cudaHostRegisterReadOnly
+        // Read-only mappings (e.g. of files) need the flag since CUDA 11.1
+        if (error == cudaErrorInvalidValue) {
+            cudaGetLastError();
+            error = cudaHostRegister(p, bytes, cudaHostRegisterReadOnly);
+        }
+#endif
+        if (error != cudaSuccess) {
+            throw std::runtime_error{cudaGetErrorString(error)};
+        }
+    }
+
+    auto host_unregister(void *p, std::size_t) -> void
+    {
+        auto error = cudaHostUnregister(p);
+        if (error != cudaSuccess) {
+            throw std::runtime_error{cudaGetErrorString(error)};
+        }
+    }
+};
+
+/* Flags of cudaHostAlloc() */
+struct host_alloc_flags {
+    bool portable = false;       // Pinned for every CUDA context, not only the current one
+    bool mapped = false;         // Mapped into the device address space, kernels access it in place
+    bool write_combined = false; // Faster to copy to the device and to write from the CPU, very slow to read
+
+    auto alloc_flags() const noexcept -> unsigned
+    {
+        return (portable ? cudaHostAllocPortable : 0u) | (mapped ? cudaHostAllocMapped : 0u) |
+               (write_combined ? cudaHostAllocWriteCombined : 0u);
+    }
+};
+
+inline auto operator==(host_alloc_flags const &lhs, host_alloc_flags const &rhs) -> bool
+{
+    return lhs.alloc_flags() == rhs.alloc_flags();
+}
+
+inline auto operator!=(host_alloc_flags const &lhs, host_alloc_flags const &rhs) -> bool
+{
+    return !(lhs == rhs);
+}
+
+/* Page-locked host memory of cudaHostAlloc() with flags, e.g. write-combined
+ * memory for upload-only staging buffers, or mapped memory kernels read
+ * without a copy. Without flags it is the same as cuda_host_backing. Memory
+ * registered by host_register() gets the portable and mapped flags, there is
+ * no write-combined registration.
+ */
+class cuda_host_alloc_backing {
+  public:
+    cuda_host_alloc_backing() = default;
+
+    explicit cuda_host_alloc_backing(host_alloc_flags flags) : flags_{flags} {}
+
+    auto allocate(std::size_t bytes) -> void *
+    {
+        ensure_cuda_init();
+        void *tmp;
+        auto error = cudaHostAlloc(&tmp, bytes, flags_.alloc_flags());
+        if (error != cudaSuccess) {
+            throw std::runtime_error{cudaGetErrorString(error)};
+        }
+        return tmp;
+    }
+
+    auto deallocate(void *p, std::size_t bytes) -> void { cuda_host_backing{}.deallocate(p, bytes); }
+
+    auto host_register(void *p, std::size_t bytes) -> void
+    {
+        if (flags_.write_combined)
+            throw std::invalid_argument{"cuda_host_alloc_backing: write-combined memory cannot be registered."};
+
+        ensure_cuda_init();
+        const auto flags =
+            (flags_.portable ? cudaHostRegisterPortable : 0u) | (flags_.mapped ? cudaHostRegisterMapped : 0u);
+        auto error = cudaHostRegister(p, bytes, flags);
+        if (error != cudaSuccess) {
+            throw std::runtime_error{cudaGetErrorString(error)};
+        }
+    }
+
+    auto host_unregister(void *p, std::size_t bytes) -> void { cuda_host_backing{}.host_unregister(p, bytes); }
+
+    /* Address of mapped memory p in the device address space. With unified
+     * addressing (any 64 bit platform) it is p itself. */
+    auto device_pointer(void *p) const -> void *
+    {
+        if (!flags_.mapped)
+            throw std::logic_error{"cuda_host_alloc_backing: the memory is not mapped."};
+        void *device_p;
+        auto error = cudaHostGetDevicePointer(&device_p, p, 0);
+        if (error != cudaSuccess) {
+            throw std::runtime_error{cudaGetErrorString(error)};
+        }
+        return device_p;
+    }
+
+    auto flags() const noexcept -> host_alloc_flags const & { return flags_; }
+
+  private:
+    host_alloc_flags flags_;
+};
+
+/* Host-only backing: page aligned memory locked with mlock(). It needs no GPU,
+ * so everything built on top of it can be tested on any machine. Locking is
+ * best effort: once RLIMIT_MEMLOCK is exhausted the memory is returned
+ * unlocked instead of failing the allocation.
+ */
+class host_backing {
+  public:
+    auto allocate(std::size_t bytes) -> void *;
+    auto deallocate(void *p, std::size_t bytes) -> void;
+
+    /* mlock() / munlock(), unlike allocate() these throw when the memory
+     * cannot be locked */
+    auto host_register(void *p, std::size_t bytes) -> void;
+    auto host_unregister(void *p, std::size_t bytes) -> void;
+};
+
+/* Plain pageable memory from malloc(). There is nothing to lock, so its
+ * host_register() does nothing, which makes numa_backing<pageable_backing>
+ * NUMA placed pageable memory. */
+class pageable_backing {
+  public:
+    auto allocate(std::size_t bytes) -> void *;
+    auto deallocate(void *p, std::size_t bytes) -> void;
+
+    auto host_register(void *, std::size_t) -> void {}
+    auto host_unregister(void *, std::size_t) -> void {}
+};
+
+template <>
+struct backing_kind<pageable_backing> {
+    static constexpr char const *name = "pageable";
+};
+
+/* Equality operators */
+inline auto operator==(cuda_host_backing const &, cuda_host_backing const &) -> bool
+{
+    return true;
+}
+
+inline auto operator!=(cuda_host_backing const &, cuda_host_backing const &) -> bool
+{
+    return false;
+}
+
+inline auto operator==(cuda_host_alloc_backing const &lhs, cuda_host_alloc_backing const &rhs) -> bool
+{
+    return lhs.flags() == rhs.flags();
+}
+
+inline auto operator!=(cuda_host_alloc_backing const &lhs, cuda_host_alloc_backing const &rhs) -> bool
+{
+    return !(lhs == rhs);
+}
+
+inline auto operator==(host_backing const &, host_backing const &) -> bool
+{
+    return true;
+}
+
+inline auto operator!=(host_backing const &, host_backing const &) -> bool
+{
+    return false;
+}
+
+inline auto operator==(pageable_backing const &, pageable_backing const &) -> bool
+{
+    return true;
+}
+
+inline auto operator!=(pageable_backing const &, pageable_backing const &) -> bool
+{
+    return false;
+}
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,66 @@
+#ifndef THATSZUCS_PLAYGROUND_NUMA_H
+#define THATSZUCS_PLAYGROUND_NUMA_H
+
+#include <cstddef>
+#include <vector>
+
+namespace playground {
+
+enum class numa_mode {
+    local,      // Pages go to the node of the thread touching them first
+    bind,       // Pages go to node only
+    preferred,  // Pages go to node while it has free memory, elsewhere after
+    interleave, // Pages go round-robin to all nodes
+};
+
+/* Where the pages of an allocation are placed on machines with several NUMA
+ * nodes, e.g. on the socket whose PCIe root the GPU hangs off, so host-side
+ * copies into staging buffers do not cross the interconnect. */
+struct numa_policy {
+    numa_mode mode = numa_mode::local;
+    int node = -1; // For bind and preferred
+
+    static auto bind(int node) -> numa_policy { return {numa_mode::bind, node}; }
+    static auto preferred(int node) -> numa_policy { return {numa_mode::preferred, node}; }
+    static auto interleave() -> numa_policy { return {numa_mode::interleave, -1}; }
+
+    /* Binds to the node of the CUDA device, local when the node is not known */
+    static auto local_to_device(int device) -> numa_policy;
+};
+
+inline auto operator==(numa_policy const &lhs, numa_policy const &rhs) -> bool
+{
+    return lhs.mode == rhs.mode && lhs.node == rhs.node;
+}
+
+inline auto operator!=(numa_policy const &lhs, numa_policy const &rhs) -> bool
+{
+    return !(lhs == rhs);
+}
+
+/* Online nodes, just node 0 on machines (or kernels) without NUMA */
+auto numa_nodes() -> std::vector<int> const &;
+
+/* Node the PCIe root of the CUDA device is attached to, -1 if not known */
+auto numa_node_of_device(int device) -> int;
+
+/* Node holding the page at p, -1 if not known, e.g. when not faulted in yet */
+auto numa_node_of(void const *p) -> int;
+
+/* Sets the policy of the page aligned range [p, p + bytes) of an anonymous
+ * mapping, before any page is touched. Throws std::invalid_argument for nodes
+ * that are not online. Kernels without NUMA support (or not allowing mbind())
+ * leave the range without a policy, as do single node machines in effect. */
+auto numa_bind(void *p, std::size_t bytes, numa_policy const &policy) -> void;
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
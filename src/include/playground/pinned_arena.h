@@ -0,0 +1,258 @@
+#ifndef THATSZUCS_PLAYGROUND_PINNED_ARENA_H
+#define THATSZUCS_PLAYGROUND_PINNED_ARENA_H
+
+#include "playground/memory_backing.h"
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <iterator>
+#include <map>
+#include <mutex>
+#include <new>
+#include <stdexcept>
+
+namespace playground {
+
+struct arena_stats {
+    std::size_t capacity = 0;
+    std::size_t used_bytes = 0;  // Up to the end of the last block, the prefix to transfer
+    std::size_t peak_bytes = 0;  // Maximum of used_bytes since the last reset
+    std::size_t live_bytes = 0;  // Handed out and not freed
+    std::size_t allocations = 0; // Since the last reset
+    std::size_t resets = 0;
+};
+
+/* One block of Backing carved into many buffers
+ *
+ * A batch of dozens of small inputs would otherwise be dozens of pinned
+ * allocations and dozens of small copies. The arena hands out aligned blocks
+ * from one allocation by bumping an offset, so the blocks of a batch are
+ * packed at the front and copy to the device as one transfer of
+ * used_bytes(). Freed blocks at the end lower the offset, others go to a
+ * free list that later requests are served from first, coalesced with their
+ * neighbours. reset() frees everything at once, the usual way to recycle the
+ * arena for the next batch; it starts a new generation, so owners of blocks
+ * handed out before can tell their blocks are gone. data() has the alignment
+ * of the arena, so blocks keep theirs at the same offsets in a copy of it.
+ */
+template <typename Backing = cuda_host_backing>
+class pinned_arena {
+  public:
+    explicit pinned_arena(std::size_t capacity, std::size_t alignment = 256, Backing backing = {})
+        : backing_{backing}, capacity_{capacity}, alignment_{alignment}
+    {
+        if (alignment == 0 || (alignment & (alignment - 1)) != 0)
+            throw std::invalid_argument{"pinned_arena: the alignment must be a power of two."};
+        if (capacity == 0)
+            throw std::invalid_argument{"pinned_arena: needs at least one byte."};
+        // Aligns the start, so offsets keep the alignment in copies of the arena
+        raw_ = static_cast<unsigned char *>(backing_.allocate(capacity + alignment - 1));
+        data_ = raw_ + (alignment - reinterpret_cast<std::uintptr_t>(raw_) % alignment) % alignment;
+    }
+
+    pinned_arena(pinned_arena const &) = delete;
+    auto operator=(pinned_arena const &) -> pinned_arena & = delete;
+
+    ~pinned_arena() { backing_.deallocate(raw_, capacity_ + alignment_ - 1); }
+
+    auto data() const noexcept -> void * { return data_; }
+    auto capacity() const noexcept -> std::size_t { return capacity_; }
+    auto alignment() const noexcept -> std::size_t { return alignment_; }
+    auto get_backing() const noexcept -> Backing const & { return backing_; }
+
+    auto used_bytes() const -> std::size_t
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        return top_;
+    }
+
+    auto generation() const -> std::size_t
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        return stats_.resets;
+    }
+
+    /* Block of bytes aligned to alignment, the arena's when 0. Throws
+     * std::bad_alloc when no free block nor the rest of the arena fits it. */
+    auto allocate(std::size_t bytes, std::size_t alignment = 0) -> void *
+    {
+        alignment = alignment ? alignment : alignment_;
+        if ((alignment & (alignment - 1)) != 0)
+            throw std::invalid_argument{"pinned_arena: the alignment must be a power of two."};
+        bytes = bytes ? bytes : 1; // Distinct addresses for empty blocks
+
+        std::lock_guard<std::mutex> lock{mutex_};
+        auto offset = take_free(bytes, alignment);
+        if (offset == npos) {
+            offset = align_up(top_, alignment);
+            if (offset > capacity_ || bytes > capacity_ - offset)
+                throw std::bad_alloc{};
+            if (offset > top_)
+                add_free(top_, offset - top_); // Alignment gap
+            top_ = offset + bytes;
+            stats_.peak_bytes = std::max(stats_.peak_bytes, top_);
+        }
+        stats_.live_bytes += bytes;
+        ++stats_.allocations;
+        return data_ + offset;
+    }
+
+    /* bytes as passed to allocate() */
+    auto deallocate(void *p, std::size_t bytes) -> void
+    {
+        if (!p)
+            return;
+        bytes = bytes ? bytes : 1;
+        std::lock_guard<std::mutex> lock{mutex_};
+        stats_.live_bytes -= bytes;
+        add_free(static_cast<std::size_t>(static_cast<unsigned char *>(p) - data_), bytes);
+    }
+
+    /* Frees every block */
+    auto reset() -> void
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        free_.clear();
+        top_ = 0;
+        ++stats_.resets;
+        stats_.live_bytes = 0;
+        stats_.allocations = 0;
+        stats_.peak_bytes = 0;
+    }
+
+    /* Offset of p from data() */
+    auto offset_of(void const *p) const -> std::size_t
+    {
+        auto const *bytes = static_cast<unsigned char const *>(p);
+        if (bytes < data_ || bytes > data_ + capacity_)
+            throw std::out_of_range{"pinned_arena: pointer outside of the arena."};
+        return static_cast<std::size_t>(bytes - data_);
+    }
+
+    auto stats() const -> arena_stats
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        auto result = stats_;
+        result.capacity = capacity_;
+        result.used_bytes = top_;
+        return result;
+    }
+
+  private:
+    static constexpr auto npos = static_cast<std::size_t>(-1);
+
+    auto align_up(std::size_t offset, std::size_t alignment) const -> std::size_t
+    {
+        // Aligns the address, data_ only has the alignment of the arena
+        const auto address = reinterpret_cast<std::uintptr_t>(data_) + offset;
+        return offset + ((alignment - address % alignment) % alignment);
+    }
+
+    /* First fit from the free list, npos if none fits */
+    auto take_free(std::size_t bytes, std::size_t alignment) -> std::size_t
+    {
+        for (auto it = free_.begin(); it != free_.end(); ++it) {
+            const auto [begin, size] = *it;
+            const auto offset = align_up(begin, alignment);
+            if (offset - begin >= size || size - (offset - begin) < bytes)
+                continue;
+            free_.erase(it);
+            if (offset > begin)
+                free_.emplace(begin, offset - begin);
+            if (offset + bytes < begin + size)
+                free_.emplace(offset + bytes, begin + size - offset - bytes);
+            return offset;
+        }
+        return npos;
+    }
+
+    /* Returns a range, merged with its free neighbours or the top */
+    auto add_free(std::size_t begin, std::size_t size) -> void
+    {
+        auto next = free_.lower_bound(begin);
+        if (next != free_.end() && begin + size == next->first) {
+            size += next->second;
+            next = free_.erase(next);
+        }
+        if (next != free_.begin()) {
+            auto previous = std::prev(next);
+            if (previous->first + previous->second == begin) {
+                begin = previous->first;
+                size += previous->second;
+                free_.erase(previous);
+            }
+        }
+        if (begin + size == top_)
+            top_ = begin;
+        else
+            free_.emplace(begin, size);
+    }
+
+    Backing backing_;
+    unsigned char *raw_ = nullptr;
+    unsigned char *data_ = nullptr; // raw_ aligned
+    std::size_t capacity_;
+    std::size_t alignment_;
+
+    mutable std::mutex mutex_;
+    std::size_t top_ = 0;
+    std::map<std::size_t, std::size_t> free_; // Offset to size, below top_
+    arena_stats stats_;
+};
+
+/* Backing carving allocations out of an arena that outlives them, e.g.
+ * std::vector<T, pinned_alloc<T, arena_backing<>>> */
+template <typename Backing = cuda_host_backing>
+class arena_backing {
+  public:
+    arena_backing() = default;
+
+    explicit arena_backing(pinned_arena<Backing> &arena) : arena_{&arena} {}
+
+    auto allocate(std::size_t bytes) -> void *
+    {
+        if (!arena_)
+            throw std::logic_error{"arena_backing: no arena."};
+        return arena_->allocate(bytes);
+    }
+
+    auto deallocate(void *p, std::size_t bytes) -> void
+    {
+        if (arena_)
+            arena_->deallocate(p, bytes);
+    }
+
+    auto arena() const noexcept -> pinned_arena<Backing> * { return arena_; }
+
+  private:
+    pinned_arena<Backing> *arena_ = nullptr;
+};
+
+template <typename Backing>
+struct backing_kind<arena_backing<Backing>> : backing_kind<Backing> {};
+
+/* Equality operators */
+template <typename Backing>
+auto operator==(arena_backing<Backing> const &lhs, arena_backing<Backing> const &rhs) -> bool
+{
+    return lhs.arena() == rhs.arena();
+}
+
+template <typename Backing>
+auto operator!=(arena_backing<Backing> const &lhs, arena_backing<Backing> const &rhs) -> bool
+{
+    return !(lhs == rhs);
+}
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,244 @@
+#ifndef THATSZUCS_PLAYGROUND_PINNED_BUDGET_H
+#define THATSZUCS_PLAYGROUND_PINNED_BUDGET_H
+
+#include "playground/memory_backing.h"
+#include "playground/pinned_vector.h"
+
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+namespace playground {
+
+/* What happens to allocations that do not fit into the budget, or that the
+ * backing fails */
+enum class budget_policy {
+    fail,     // Throw std::runtime_error
+    block,    // Wait until pinned memory is released, throw after the timeout
+    pageable, // Hand out pageable memory instead
+};
+
+struct budget_options {
+    std::size_t limit_bytes = 0; // 0 for no limit besides the backing's
+    budget_policy policy = budget_policy::fail;
+    std::chrono::milliseconds timeout{0}; // How long to block, 0 for as long as it takes
+};
+
+struct budget_stats {
+    std::size_t pinned_bytes = 0;   // Held by budgeted allocations
+    std::size_t fallbacks = 0;      // Allocations served with pageable memory
+    std::size_t fallback_bytes = 0; // Pageable bytes of live fallbacks
+    std::size_t waits = 0;          // Times allocations blocked
+    std::size_t failures = 0;       // Allocations that threw
+};
+
+/* Process-wide budget of the pinned memory of budgeted backings. Pinning too
+ * much starves the rest of the system, and cudaMallocHost failing should slow
+ * a loader down rather than kill it. */
+class pinned_budget {
+  public:
+    /* Never destroyed, see caching_pool::instance() */
+    static auto instance() -> pinned_budget &;
+
+    auto configure(budget_options const &options) -> void;
+    auto options() const -> budget_options;
+    auto stats() const -> budget_stats;
+
+    /* Calls pin() once the bytes fit into the budget. Returns false for the
+     * caller to fall back to pageable memory, or throws, as the policy says */
+    template <typename Pin>
+    auto pin(std::size_t bytes, Pin &&pin) -> bool
+    {
+        auto lock = std::unique_lock<std::mutex>{mutex_};
+        const auto deadline = std::chrono::steady_clock::now() + options_.timeout;
+        for (;;) {
+            const auto generation = releases_;
+            const auto fits = options_.limit_bytes == 0 || pinned_bytes_ + bytes <= options_.limit_bytes;
+            if (fits) {
+                pinned_bytes_ += bytes;
+                lock.unlock();
+                try {
+                    pin();
+                    return true;
+                }
+                catch (std::runtime_error const &) {
+                    lock.lock();
+                    cancel_pin(bytes);
+                    // Blocking is hopeless while the budget holds nothing
+                    if (options_.policy == budget_policy::fail ||
+                        (options_.policy == budget_policy::block && pinned_bytes_ == 0)) {
+                        ++failures_;
+                        throw;
+                    }
+                }
+                catch (...) {
+                    // Not a lack of pinned memory, e.g. invalid arguments
+                    lock.lock();
+                    cancel_pin(bytes);
+                    ++failures_;
+                    throw;
+                }
+            }
+            else if (options_.policy == budget_policy::fail ||
+                     (options_.policy == budget_policy::block && bytes > options_.limit_bytes)) {
+                ++failures_;
+                throw std::runtime_error{"pinned_budget: " + std::to_string(bytes) + " bytes do not fit into the " +
+                                         std::to_string(options_.limit_bytes) + " bytes budget."};
+            }
+
+            if (options_.policy == budget_policy::pageable) {
+                ++fallbacks_;
+                return false;
+            }
+
+            // Blocking: try again once anything was released
+            ++waits_;
+            ++waiters_;
+            auto released = [&] { return releases_ != generation; };
+            if (options_.timeout.count() == 0)
+                released_.wait(lock, released);
+            else
+                released_.wait_until(lock, deadline, released);
+            --waiters_;
+            if (!released()) {
+                ++failures_;
+                throw std::runtime_error{"pinned_budget: timed out waiting for pinned memory."};
+            }
+        }
+    }
+
+    /* Returns bytes of pin() to the budget */
+    auto unpin(std::size_t bytes) -> void;
+
+    /* Pageable memory handed out by budgeted backings instead of pinned */
+    auto add_fallback(void const *p, std::size_t bytes) -> void;
+    auto remove_fallback(void const *p) -> bool;
+    auto is_fallback(void const *p) const -> bool;
+
+  private:
+    /* Returns the bytes of a failed pin(), with the mutex held */
+    auto cancel_pin(std::size_t bytes) -> void
+    {
+        pinned_bytes_ -= bytes;
+        // Waiters may have seen the bytes as taken
+        ++releases_;
+        if (waiters_ > 0)
+            released_.notify_all();
+    }
+
+    mutable std::mutex mutex_;
+    std::condition_variable released_;
+    budget_options options_;
+    std::size_t pinned_bytes_ = 0;
+    std::size_t releases_ = 0;
+    std::size_t waiters_ = 0;
+    std::size_t fallbacks_ = 0;
+    std::size_t waits_ = 0;
+    std::size_t failures_ = 0;
+
+    std::unordered_map<void const *, std::size_t> fallback_blocks_;
+    std::atomic<std::size_t> num_fallback_blocks_{0}; // Spares frees the lock while there are none
+};
+
+/* Backing taking its memory from Backing within the pinned budget, or pageable
+ * memory where the policy falls back to it. Tell the two apart with
+ * is_pinned(). The stats of allocation_stats.h count both as pinned, the
+ * budget's stats count the fallbacks. */
+template <typename Backing = cuda_host_backing>
+class budgeted {
+  public:
+    budgeted() = default;
+
+    explicit budgeted(Backing backing) : backing_{backing} {}
+
+    auto allocate(std::size_t bytes) -> void *
+    {
+        auto &budget = pinned_budget::instance();
+        void *p = nullptr;
+        if (budget.pin(bytes, [&] { p = backing_.allocate(bytes); }))
+            return p;
+
+        p = pageable_backing{}.allocate(bytes);
+        budget.add_fallback(p, bytes);
+        return p;
+    }
+
+    auto deallocate(void *p, std::size_t bytes) -> void
+    {
+        if (!p)
+            return;
+        auto &budget = pinned_budget::instance();
+        if (budget.remove_fallback(p)) {
+            pageable_backing{}.deallocate(p, bytes);
+            return;
+        }
+        backing_.deallocate(p, bytes);
+        budget.unpin(bytes);
+    }
+
+    /* Falling back leaves the memory pageable */
+    auto host_register(void *p, std::size_t bytes) -> void
+    {
+        auto &budget = pinned_budget::instance();
+        if (!budget.pin(bytes, [&] { backing_.host_register(p, bytes); }))
+            budget.add_fallback(p, bytes);
+    }
+
+    auto host_unregister(void *p, std::size_t bytes) -> void
+    {
+        auto &budget = pinned_budget::instance();
+        if (budget.remove_fallback(p))
+            return;
+        backing_.host_unregister(p, bytes);
+        budget.unpin(bytes);
+    }
+
+    auto backing() const noexcept -> Backing const & { return backing_; }
+
+  private:
+    Backing backing_;
+};
+
+template <typename Backing>
+struct backing_kind<budgeted<Backing>> : backing_kind<Backing> {};
+
+/* Equality operators */
+template <typename Backing>
+auto operator==(budgeted<Backing> const &lhs, budgeted<Backing> const &rhs) -> bool
+{
+    return lhs.backing() == rhs.backing();
+}
+
+template <typename Backing>
+auto operator!=(budgeted<Backing> const &lhs, budgeted<Backing> const &rhs) -> bool
+{
+    return !(lhs == rhs);
+}
+
+/* Whether memory of a budgeted backing got pinned, or is a pageable fallback */
+inline auto is_pinned(void const *p) -> bool
+{
+    return !pinned_budget::instance().is_fallback(p);
+}
+
+/* Template alias for a vector of pinned memory within the budget */
+template <typename T, typename Backing = cuda_host_backing>
+using budgeted_pinned_vector = std::vector<T, pinned_alloc<T, budgeted<Backing>>>;
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
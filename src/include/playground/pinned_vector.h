@@ -1,60 +1,77 @@
 #ifndef THATSZUCS_PLAYGROUND_PINNED_VECTOR_H
 #define THATSZUCS_PLAYGROUND_PINNED_VECTOR_H
 
-#include "cuda_runtime.h" // "cuda_runtime_api.h" is C header
+#include "playground/allocation_stats.h"
+#include "playground/memory_backing.h"
 
-#include <stdexcept>
+#include <type_traits>
 #include <vector>
 
 namespace playground {
 
-/* The allocator class */
-template <typename T>
+/* The allocator class
+ *
+ * Gets its memory from Backing, by default straight from cudaMallocHost and
+ * cudaFreeHost. See memory_backing.h and caching_pool.h for alternatives.
+ *
+ * Allocations are counted in the stats of the kind of memory of Backing, and
+ * of the allocation_tag current when the allocator was created, see
+ * allocation_stats.h. Allocators move along with the memory, so the memory is
+ * always freed into the stats it was allocated from.
+ */
+template <typename T, typename Backing = cuda_host_backing>
 class pinned_alloc {
   public:
     using value_type = T;
     using pointer = value_type *;
     using size_type = std::size_t;
+    using backing_type = Backing;
+    using propagate_on_container_move_assignment = std::true_type;
+    using propagate_on_container_swap = std::true_type;
+
+    pinned_alloc() : recorder_{recorder_of<Backing>()} {}
 
-    pinned_alloc() noexcept = default;
+    explicit pinned_alloc(Backing const &backing) : backing_{backing}, recorder_{recorder_of<Backing>()} {}
 
     template <typename U>
-    pinned_alloc(pinned_alloc<U> const &) noexcept
+    pinned_alloc(pinned_alloc<U, Backing> const &other) noexcept
+        : backing_{other.backing()}, recorder_{other.recorder()}
     {
     }
 
     auto allocate(size_type n, const void * = 0) -> value_type *
     {
-        value_type *tmp;
-        auto error = cudaMallocHost((void **)&tmp, n * sizeof(T));
-        if (error != cudaSuccess) {
-            throw std::runtime_error{cudaGetErrorString(error)};
-        }
-        return tmp;
+        return static_cast<value_type *>(
+            recorder_.allocate(n * sizeof(T), [this](std::size_t bytes) { return backing_.allocate(bytes); }));
     }
 
     auto deallocate(pointer p, size_type n) -> void
     {
         if (p) {
-            auto error = cudaFreeHost(p);
-            if (error != cudaSuccess) {
-                throw std::runtime_error{cudaGetErrorString(error)};
-            }
+            recorder_.deallocate(p, n * sizeof(T),
+                                 [this](void *q, std::size_t bytes) { backing_.deallocate(q, bytes); });
         }
     }
+
+    auto backing() const noexcept -> Backing const & { return backing_; }
+    auto recorder() const noexcept -> allocation_recorder const & { return recorder_; }
+
+  private:
+    Backing backing_;
+    allocation_recorder recorder_;
 };
 
 /* Equality operators */
-template <class T, class U>
-auto operator==(pinned_alloc<T> const &, pinned_alloc<U> const &) -> bool
+template <class T, class U, class Backing>
+auto operator==(pinned_alloc<T, Backing> const &lhs, pinned_alloc<U, Backing> const &rhs) -> bool
 {
-    return true;
+    return lhs.backing() == rhs.backing();
 }
 
-template <class T, class U>
-auto operator!=(pinned_alloc<T> const &, pinned_alloc<U> const &) -> bool
+template <class T, class U, class Backing>
+auto operator!=(pinned_alloc<T, Backing> const &lhs, pinned_alloc<U, Backing> const &rhs) -> bool
 {
-    return false;
+    return !(lhs == rhs);
 }
 
 /* Template alias for convenient creating of a vector backed by pinned memory
@@ -62,6 +79,12 @@ auto operator!=(pinned_alloc<T> const &, pinned_alloc<U> const &) -> bool
 template <typename T>
 using pinned_vector = std::vector<T, pinned_alloc<T>>;
 
+/* Template alias for a vector of cudaHostAlloc() memory, pass the flags with
+ * its allocator, e.g. pinned_alloc<T, cuda_host_alloc_backing>{
+ * cuda_host_alloc_backing{{false, true, false}}} for mapped memory */
+template <typename T>
+using host_alloc_vector = std::vector<T, pinned_alloc<T, cuda_host_alloc_backing>>;
+
 } // namespace playground
 
 #endif
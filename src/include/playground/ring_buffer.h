@@ -0,0 +1,244 @@
+#ifndef THATSZUCS_PLAYGROUND_RING_BUFFER_H
+#define THATSZUCS_PLAYGROUND_RING_BUFFER_H
+
+#include "playground/memory_backing.h"
+
+#include <algorithm>
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <deque>
+#include <mutex>
+#include <optional>
+#include <stdexcept>
+#include <vector>
+
+namespace playground {
+
+struct ring_stats {
+    std::size_t committed = 0;          // Slots filled by producers
+    std::size_t released = 0;           // Slots drained by consumers
+    std::size_t filled = 0;             // Slots waiting for a consumer right now
+    std::size_t max_filled = 0;         // Maximum of filled
+    std::size_t producer_stalls = 0;    // Producer acquisitions that found no free slot
+    std::size_t consumer_stalls = 0;    // Consumer acquisitions that found no filled slot
+    double producer_wait_seconds = 0.0; // Time producers spent blocked
+    double consumer_wait_seconds = 0.0; // Time consumers spent blocked
+};
+
+/* Fixed number of equally sized pinned slots for streaming batches from
+ * producers (e.g. loader threads) to consumers (e.g. the thread issuing the
+ * device copies) without allocating per batch.
+ *
+ * A producer acquires a free slot, writes it and commits it. A consumer
+ * acquires the oldest committed slot, reads it and releases it, after which
+ * the slot is free again. Acquisition comes in blocking, non-blocking and
+ * timed variants, any number of producers and consumers may be used. After
+ * close() producers get no more slots and consumers drain what is left.
+ */
+template <typename Backing = cuda_host_backing>
+class pinned_ring_buffer {
+  public:
+    using clock = std::chrono::steady_clock;
+
+    /* Slots start at multiples of this many bytes */
+    static constexpr std::size_t slot_alignment = 256;
+
+    pinned_ring_buffer(std::size_t num_slots, std::size_t slot_bytes, Backing backing = {})
+        : backing_{backing}, recorder_{recorder_of<Backing>()}, num_slots_{num_slots}, slot_bytes_{slot_bytes},
+          slot_stride_{(slot_bytes + slot_alignment - 1) / slot_alignment * slot_alignment},
+          states_(num_slots, slot_state::free), filled_bytes_(num_slots, 0)
+    {
+        if (num_slots == 0 || slot_bytes == 0)
+            throw std::invalid_argument{"pinned_ring_buffer: needs at least one slot of at least one byte."};
+        data_ = static_cast<char *>(recorder_.allocate(num_slots_ * slot_stride_,
+                                                       [this](std::size_t bytes) { return backing_.allocate(bytes); }));
+        for (std::size_t slot = 0; slot < num_slots_; ++slot)
+            free_.push_back(slot);
+    }
+
+    pinned_ring_buffer(pinned_ring_buffer const &) = delete;
+    auto operator=(pinned_ring_buffer const &) -> pinned_ring_buffer & = delete;
+
+    ~pinned_ring_buffer()
+    {
+        recorder_.deallocate(data_, num_slots_ * slot_stride_,
+                             [this](void *p, std::size_t bytes) { backing_.deallocate(p, bytes); });
+    }
+
+    auto num_slots() const noexcept -> std::size_t { return num_slots_; }
+    auto slot_bytes() const noexcept -> std::size_t { return slot_bytes_; }
+
+    auto data(std::size_t slot) const -> void *
+    {
+        check_slot(slot);
+        return data_ + slot * slot_stride_;
+    }
+
+    /* Number of bytes committed to the slot */
+    auto filled_bytes(std::size_t slot) const -> std::size_t
+    {
+        check_slot(slot);
+        std::lock_guard<std::mutex> lock{mutex_};
+        return filled_bytes_[slot];
+    }
+
+    /* Producer side, nullopt once closed (or on timeout / when full) */
+    auto acquire_write() -> std::optional<std::size_t> { return acquire(true, true, std::nullopt); }
+
+    auto try_acquire_write() -> std::optional<std::size_t> { return acquire(true, false, std::nullopt); }
+
+    template <typename Rep, typename Period>
+    auto acquire_write_for(std::chrono::duration<Rep, Period> timeout) -> std::optional<std::size_t>
+    {
+        return acquire(true, true, clock::now() + std::chrono::duration_cast<clock::duration>(timeout));
+    }
+
+    /* Hands the first nbytes of the slot over to the consumers */
+    auto commit(std::size_t slot, std::size_t nbytes) -> void
+    {
+        if (nbytes > slot_bytes_)
+            throw std::invalid_argument{"pinned_ring_buffer: committed more bytes than the slot holds."};
+        {
+            std::lock_guard<std::mutex> lock{mutex_};
+            transition(slot, slot_state::writing, slot_state::filled);
+            filled_bytes_[slot] = nbytes;
+            filled_.push_back(slot);
+            ++stats_.committed;
+            stats_.filled = filled_.size();
+            stats_.max_filled = std::max(stats_.max_filled, stats_.filled);
+        }
+        readable_.notify_one();
+    }
+
+    /* Consumer side, nullopt once closed and drained (or on timeout / when
+     * empty) */
+    auto acquire_read() -> std::optional<std::size_t> { return acquire(false, true, std::nullopt); }
+
+    auto try_acquire_read() -> std::optional<std::size_t> { return acquire(false, false, std::nullopt); }
+
+    template <typename Rep, typename Period>
+    auto acquire_read_for(std::chrono::duration<Rep, Period> timeout) -> std::optional<std::size_t>
+    {
+        return acquire(false, true, clock::now() + std::chrono::duration_cast<clock::duration>(timeout));
+    }
+
+    /* Returns a slot read by a consumer to the producers */
+    auto release(std::size_t slot) -> void
+    {
+        {
+            std::lock_guard<std::mutex> lock{mutex_};
+            transition(slot, slot_state::reading, slot_state::free);
+            filled_bytes_[slot] = 0;
+            free_.push_back(slot);
+            ++stats_.released;
+        }
+        writable_.notify_one();
+    }
+
+    /* Wakes up everybody waiting, producers get no more slots */
+    auto close() -> void
+    {
+        {
+            std::lock_guard<std::mutex> lock{mutex_};
+            closed_ = true;
+        }
+        writable_.notify_all();
+        readable_.notify_all();
+    }
+
+    auto closed() const -> bool
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        return closed_;
+    }
+
+    auto stats() const -> ring_stats
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        return stats_;
+    }
+
+  private:
+    enum class slot_state {
+        free,
+        writing,
+        filled,
+        reading
+    };
+
+    auto check_slot(std::size_t slot) const -> void
+    {
+        if (slot >= num_slots_)
+            throw std::out_of_range{"pinned_ring_buffer: slot out of range."};
+    }
+
+    auto transition(std::size_t slot, slot_state from, slot_state to) -> void
+    {
+        check_slot(slot);
+        if (states_[slot] != from)
+            throw std::logic_error{"pinned_ring_buffer: slot is not in the expected state."};
+        states_[slot] = to;
+    }
+
+    auto acquire(bool for_write, bool block, std::optional<clock::time_point> deadline) -> std::optional<std::size_t>
+    {
+        std::unique_lock<std::mutex> lock{mutex_};
+        auto &queue = for_write ? free_ : filled_;
+        auto &cv = for_write ? writable_ : readable_;
+        auto ready = [&] { return closed_ || !queue.empty(); };
+
+        if (!ready()) {
+            ++(for_write ? stats_.producer_stalls : stats_.consumer_stalls);
+            if (!block)
+                return std::nullopt;
+
+            const auto start = clock::now();
+            if (deadline)
+                cv.wait_until(lock, *deadline, ready);
+            else
+                cv.wait(lock, ready);
+            const auto waited = std::chrono::duration<double>(clock::now() - start).count();
+            (for_write ? stats_.producer_wait_seconds : stats_.consumer_wait_seconds) += waited;
+        }
+
+        // Closed rings hand out no writable slots, but can still be drained
+        if (queue.empty() || (for_write && closed_))
+            return std::nullopt;
+
+        const auto slot = queue.front();
+        queue.pop_front();
+        states_[slot] = for_write ? slot_state::writing : slot_state::reading;
+        stats_.filled = filled_.size();
+        return slot;
+    }
+
+    Backing backing_;
+    allocation_recorder recorder_;
+    std::size_t num_slots_;
+    std::size_t slot_bytes_;
+    std::size_t slot_stride_;
+    char *data_ = nullptr;
+
+    mutable std::mutex mutex_;
+    std::condition_variable writable_;
+    std::condition_variable readable_;
+    std::deque<std::size_t> free_;
+    std::deque<std::size_t> filled_;
+    std::vector<slot_state> states_;
+    std::vector<std::size_t> filled_bytes_;
+    bool closed_ = false;
+    ring_stats stats_;
+};
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,126 @@
+#ifndef THATSZUCS_PLAYGROUND_SHARED_MEMORY_H
+#define THATSZUCS_PLAYGROUND_SHARED_MEMORY_H
+
+#include "playground/memory_backing.h"
+
+#include <cstddef>
+#include <string>
+#include <utility>
+
+namespace playground {
+
+enum class shared_memory_kind {
+    memfd, // Anonymous, freed by the kernel once no process uses it
+    posix, // Named in /dev/shm, unlinked by the owner, leaked if it crashes
+};
+
+/* Shared memory segment mapped into this process. The owner creates it,
+ * other processes attach to it by its handle, a path they can open while the
+ * owner is alive. The mappings outlive the owner, so workers may finish
+ * writing after it exited. Move-only, unmapped on destruction. */
+class shared_segment {
+  public:
+    static auto create(std::size_t bytes, shared_memory_kind kind = shared_memory_kind::memfd) -> shared_segment;
+    static auto attach(std::string const &handle) -> shared_segment;
+
+    shared_segment(shared_segment &&other) noexcept { swap(other); }
+    auto operator=(shared_segment &&other) noexcept -> shared_segment &
+    {
+        auto tmp = std::move(other);
+        swap(tmp);
+        return *this;
+    }
+    ~shared_segment();
+
+    auto data() const noexcept -> void * { return data_; }
+    auto size() const noexcept -> std::size_t { return size_; }
+    auto handle() const noexcept -> std::string const & { return handle_; }
+    auto is_owner() const noexcept -> bool { return owner_; }
+
+    /* Removes the name of a posix segment, attaching is impossible after */
+    auto unlink() -> void;
+
+  private:
+    shared_segment() = default;
+
+    auto swap(shared_segment &other) noexcept -> void
+    {
+        std::swap(fd_, other.fd_);
+        std::swap(data_, other.data_);
+        std::swap(size_, other.size_);
+        std::swap(handle_, other.handle_);
+        std::swap(posix_name_, other.posix_name_);
+        std::swap(owner_, other.owner_);
+    }
+
+    int fd_ = -1;
+    void *data_ = nullptr;
+    std::size_t size_ = 0;
+    std::string handle_;
+    std::string posix_name_; // Until unlinked
+    bool owner_ = false;
+};
+
+/* Shared segment page-locked by its owner with Backing, so worker processes
+ * write batches straight into the memory the owner copies to the device.
+ * Attached segments are not page-locked, pinning is per process. */
+template <typename Backing = cuda_host_backing>
+class shared_pinned_buffer {
+  public:
+    static auto create(std::size_t bytes, shared_memory_kind kind = shared_memory_kind::memfd, Backing backing = {})
+        -> shared_pinned_buffer
+    {
+        auto buffer = shared_pinned_buffer{shared_segment::create(bytes, kind), backing};
+        buffer.backing_.host_register(buffer.data(), buffer.size());
+        buffer.pinned_ = true;
+        return buffer;
+    }
+
+    static auto attach(std::string const &handle) -> shared_pinned_buffer
+    {
+        return shared_pinned_buffer{shared_segment::attach(handle), Backing{}};
+    }
+
+    shared_pinned_buffer(shared_pinned_buffer &&other) noexcept
+        : segment_{std::move(other.segment_)}, backing_{std::move(other.backing_)},
+          pinned_{std::exchange(other.pinned_, false)}
+    {
+    }
+
+    auto operator=(shared_pinned_buffer &&) -> shared_pinned_buffer & = delete;
+
+    ~shared_pinned_buffer()
+    {
+        if (pinned_)
+            backing_.host_unregister(data(), size());
+    }
+
+    auto data() const noexcept -> void * { return segment_.data(); }
+    auto size() const noexcept -> std::size_t { return segment_.size(); }
+    auto handle() const noexcept -> std::string const & { return segment_.handle(); }
+    auto is_owner() const noexcept -> bool { return segment_.is_owner(); }
+    auto is_pinned() const noexcept -> bool { return pinned_; }
+    auto segment() noexcept -> shared_segment & { return segment_; }
+
+  private:
+    shared_pinned_buffer(shared_segment segment, Backing backing)
+        : segment_{std::move(segment)}, backing_{std::move(backing)}
+    {
+    }
+
+    shared_segment segment_;
+    Backing backing_;
+    bool pinned_ = false;
+};
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
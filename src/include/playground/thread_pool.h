@@ -0,0 +1,107 @@
+#ifndef THATSZUCS_PLAYGROUND_THREAD_POOL_H
+#define THATSZUCS_PLAYGROUND_THREAD_POOL_H
+
+#include <algorithm>
+#include <condition_variable>
+#include <cstddef>
+#include <exception>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace playground {
+
+/* Fixed set of worker threads for data parallel loops over buffers */
+class thread_pool {
+  public:
+    /* num_threads counts the calling thread too, 0 means one per hardware
+     * thread */
+    explicit thread_pool(std::size_t num_threads = 0);
+    ~thread_pool();
+
+    thread_pool(thread_pool const &) = delete;
+    auto operator=(thread_pool const &) -> thread_pool & = delete;
+
+    auto num_threads() const noexcept -> std::size_t { return workers_.size() + 1; }
+
+    /* Calls fn(i) for every i in [0, num_tasks) and waits for all of them.
+     * Task i always runs on thread i % num_threads(), thread 0 being the
+     * caller, so repeated runs map the same task to the same thread. The first
+     * exception thrown by a task is rethrown here. When the pool is already
+     * busy (a concurrent or nested run) the tasks run on the calling thread. */
+    auto run(std::size_t num_tasks, std::function<void(std::size_t)> const &fn) -> void;
+
+  private:
+    auto worker_loop(std::size_t thread_index) -> void;
+    auto run_tasks(std::size_t thread_index) -> void;
+
+    std::vector<std::thread> workers_;
+    std::mutex run_mutex_;
+    std::mutex mutex_;
+    std::condition_variable start_cv_;
+    std::condition_variable done_cv_;
+    std::function<void(std::size_t)> const *task_ = nullptr;
+    std::size_t num_tasks_ = 0;
+    std::size_t generation_ = 0;
+    std::size_t pending_ = 0;
+    std::exception_ptr error_;
+    bool stop_ = false;
+};
+
+/* The pool used by the parallel algorithms of the library */
+auto default_thread_pool() -> std::shared_ptr<thread_pool>;
+
+/* Resizes the default pool, 0 means one thread per hardware thread */
+auto set_num_threads(std::size_t num_threads) -> void;
+auto get_num_threads() -> std::size_t;
+
+/* Default of the minimum number of bytes worth handing to a separate thread */
+constexpr std::size_t parallel_grain_bytes = std::size_t{1} << 20;
+
+/* Minimum number of bytes the copies and fills hand to a separate thread, 0
+ * restores parallel_grain_bytes */
+auto set_parallel_grain(std::size_t bytes) -> void;
+auto get_parallel_grain() -> std::size_t;
+
+/* Splits [0, count) into contiguous chunks, one per thread of the default
+ * pool, and calls fn(begin, end) for each of them. Chunk boundaries are
+ * multiples of grain and do not depend on anything but count, grain and the
+ * number of threads, so passes over the same buffer touch each page from the
+ * same thread. */
+template <typename Fn>
+auto parallel_for(std::size_t count, std::size_t grain, Fn &&fn) -> void
+{
+    if (count == 0)
+        return;
+    grain = std::max<std::size_t>(grain, 1);
+
+    auto pool = default_thread_pool();
+    const auto num_grains = (count + grain - 1) / grain;
+    const auto num_chunks = std::min(pool->num_threads(), num_grains);
+    if (num_chunks == 1) {
+        fn(std::size_t{0}, count);
+        return;
+    }
+
+    const auto grains_per_chunk = num_grains / num_chunks;
+    const auto remainder = num_grains % num_chunks;
+    pool->run(num_chunks, [&](std::size_t chunk) {
+        const auto first_grain = chunk * grains_per_chunk + std::min(chunk, remainder);
+        const auto last_grain = first_grain + grains_per_chunk + (chunk < remainder ? 1 : 0);
+        fn(first_grain * grain, std::min(last_grain * grain, count));
+    });
+}
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
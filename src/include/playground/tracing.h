@@ -0,0 +1,96 @@
+#ifndef THATSZUCS_PLAYGROUND_TRACING_H
+#define THATSZUCS_PLAYGROUND_TRACING_H
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+namespace playground {
+
+/* Timed operation, e.g. an allocation or a copy. The strings are literals
+ * or interned, see intern_trace_name(). */
+struct trace_event {
+    char const *name;
+    char const *category; // Kind of memory for allocations, e.g. "pinned"
+    char const *tag;      // allocation_tag of allocations, nullptr when none
+    std::size_t bytes;
+    std::uint64_t begin_ns; // Since start_tracing()
+    std::uint64_t end_ns;
+    std::uint64_t thread; // Thread id of the OS
+};
+
+namespace detail {
+
+inline std::atomic<bool> tracing_on{false};
+
+} // namespace detail
+
+/* Whether trace_scope records, all it costs while tracing is off */
+inline auto tracing_enabled() noexcept -> bool
+{
+    return detail::tracing_on.load(std::memory_order_relaxed);
+}
+
+/* Starts a new trace, dropping the events of the previous one. Each thread
+ * records into a buffer of its own without locking, events beyond
+ * max_events_per_thread are dropped and counted. */
+auto start_tracing(std::size_t max_events_per_thread = std::size_t{1} << 16) -> void;
+
+/* Scopes already begun still record when they end */
+auto stop_tracing() -> void;
+
+/* Events of the current (or last) trace ordered by begin, best collected
+ * after stop_tracing() */
+auto collect_trace() -> std::vector<trace_event>;
+
+/* Events of the current (or last) trace that did not fit */
+auto dropped_trace_events() -> std::size_t;
+
+/* Copy of name living until the end of the process, for names that are not
+ * literals. Meant for a few distinct names, e.g. tags. */
+auto intern_trace_name(std::string const &name) -> char const *;
+
+/* Records the time from its construction to its destruction as an event, and
+ * as an NVTX range when built with CUDA, while tracing is on */
+class trace_scope {
+  public:
+    trace_scope(char const *name, char const *category, std::size_t bytes = 0, char const *tag = nullptr) noexcept
+        : name_{name}, category_{category}, tag_{tag}, bytes_{bytes}
+    {
+        if (tracing_enabled())
+            begin();
+    }
+
+    ~trace_scope()
+    {
+        if (begin_ns_)
+            end();
+    }
+
+    trace_scope(trace_scope const &) = delete;
+    auto operator=(trace_scope const &) -> trace_scope & = delete;
+
+  private:
+    auto begin() noexcept -> void;
+    auto end() noexcept -> void;
+
+    char const *name_;
+    char const *category_;
+    char const *tag_;
+    std::size_t bytes_;
+    std::uint64_t begin_ns_ = 0; // Of the steady clock, 0 when not recording
+};
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,197 @@
+#ifndef THATSZUCS_PLAYGROUND_TRANSFER_ENGINE_H
+#define THATSZUCS_PLAYGROUND_TRANSFER_ENGINE_H
+
+#include "cuda_runtime.h"
+
+#include <cstddef>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <utility>
+#include <vector>
+
+namespace playground {
+
+/* Marks the point of a stream up to which the enqueued work is complete */
+class transfer_event {
+  public:
+    virtual ~transfer_event() = default;
+
+    /* Non-blocking */
+    virtual auto done() -> bool = 0;
+    virtual auto wait() -> void = 0;
+};
+
+/* Where the transfer engine sends its copies. A backend has a fixed number of
+ * streams, each executing its copies in order, while copies on different
+ * streams may overlap. */
+class transfer_backend {
+  public:
+    virtual ~transfer_backend() = default;
+
+    virtual auto num_streams() const noexcept -> std::size_t = 0;
+
+    /* Enqueues a copy on stream and returns right away */
+    virtual auto copy_async(void *dst, void const *src, std::size_t bytes, std::size_t stream) -> void = 0;
+
+    /* Event that completes with everything enqueued on stream so far */
+    virtual auto record(std::size_t stream) -> std::shared_ptr<transfer_event> = 0;
+
+    virtual auto allocate_device(std::size_t bytes) -> void * = 0;
+    virtual auto deallocate_device(void *p, std::size_t bytes) -> void = 0;
+};
+
+/* cudaMemcpyAsync on non-blocking streams of the current device, completion
+ * tracked with events. Copies use cudaMemcpyDefault, so unified addressing
+ * figures out the direction. */
+class cuda_transfer_backend : public transfer_backend {
+  public:
+    explicit cuda_transfer_backend(std::size_t num_streams = 2);
+    ~cuda_transfer_backend() override;
+
+    cuda_transfer_backend(cuda_transfer_backend const &) = delete;
+    auto operator=(cuda_transfer_backend const &) -> cuda_transfer_backend & = delete;
+
+    auto num_streams() const noexcept -> std::size_t override { return streams_.size(); }
+    auto copy_async(void *dst, void const *src, std::size_t bytes, std::size_t stream) -> void override;
+    auto record(std::size_t stream) -> std::shared_ptr<transfer_event> override;
+    auto allocate_device(std::size_t bytes) -> void * override;
+    auto deallocate_device(void *p, std::size_t bytes) -> void override;
+
+    auto stream(std::size_t index) const -> cudaStream_t { return streams_.at(index); }
+
+  private:
+    std::vector<cudaStream_t> streams_;
+};
+
+/* Simulated device for testing the scheduling without a GPU: every stream is
+ * a worker thread doing the copies with memcpy, in order, and device memory
+ * is host memory. */
+class simulated_transfer_backend : public transfer_backend {
+  public:
+    explicit simulated_transfer_backend(std::size_t num_streams = 2);
+
+    /* Finishes the enqueued copies first */
+    ~simulated_transfer_backend() override;
+
+    auto num_streams() const noexcept -> std::size_t override { return streams_.size(); }
+    auto copy_async(void *dst, void const *src, std::size_t bytes, std::size_t stream) -> void override;
+    auto record(std::size_t stream) -> std::shared_ptr<transfer_event> override;
+    auto allocate_device(std::size_t bytes) -> void * override;
+    auto deallocate_device(void *p, std::size_t bytes) -> void override;
+
+  private:
+    struct worker;
+    std::vector<std::unique_ptr<worker>> streams_;
+};
+
+/* Future-like handle of a transfer, complete once the events of all streams
+ * it was split across are. Copies share the state. */
+class transfer_handle {
+  public:
+    transfer_handle() = default;
+    transfer_handle(std::vector<std::shared_ptr<transfer_event>> events, std::size_t bytes, std::size_t num_chunks)
+        : events_{std::move(events)}, bytes_{bytes}, num_chunks_{num_chunks}
+    {
+    }
+
+    auto done() const -> bool;
+    auto wait() const -> void;
+
+    auto bytes() const noexcept -> std::size_t { return bytes_; }
+    auto num_chunks() const noexcept -> std::size_t { return num_chunks_; }
+
+  private:
+    std::vector<std::shared_ptr<transfer_event>> events_;
+    std::size_t bytes_ = 0;
+    std::size_t num_chunks_ = 0;
+};
+
+/* Memory on the device of a backend, kept alive by the buffer */
+class device_buffer {
+  public:
+    device_buffer(std::shared_ptr<transfer_backend> backend, std::size_t bytes)
+        : backend_{std::move(backend)}, data_{backend_->allocate_device(bytes)}, bytes_{bytes}
+    {
+    }
+
+    ~device_buffer() { backend_->deallocate_device(data_, bytes_); }
+
+    device_buffer(device_buffer const &) = delete;
+    auto operator=(device_buffer const &) -> device_buffer & = delete;
+
+    auto data() const noexcept -> void * { return data_; }
+    auto size() const noexcept -> std::size_t { return bytes_; }
+
+  private:
+    std::shared_ptr<transfer_backend> backend_;
+    void *data_;
+    std::size_t bytes_;
+};
+
+/* Large enough to run at full link speed, small enough to overlap */
+constexpr std::size_t default_chunk_bytes = std::size_t{4} << 20;
+
+/* Issues asynchronous copies between host and device memory. Transfers are
+ * split into chunks of chunk_bytes, which go to the streams of the backend
+ * round-robin, so consecutive chunks overlap instead of waiting for each
+ * other. Transfers may overlap each other just the same, so wait for the
+ * handle of a transfer before issuing one depending on it. Source and
+ * destination must stay alive until the returned handle is done. */
+class transfer_engine {
+  public:
+    explicit transfer_engine(std::shared_ptr<transfer_backend> backend, std::size_t chunk_bytes = default_chunk_bytes);
+
+    auto backend() const noexcept -> std::shared_ptr<transfer_backend> const & { return backend_; }
+    auto chunk_bytes() const noexcept -> std::size_t { return chunk_bytes_; }
+
+    auto copy(void *dst, void const *src, std::size_t bytes) -> transfer_handle;
+
+    template <typename T, typename Alloc>
+    auto to_device(device_buffer &dst, std::vector<T, Alloc> const &src) -> transfer_handle
+    {
+        check_size(dst.size(), src.size() * sizeof(T));
+        return copy(dst.data(), src.data(), src.size() * sizeof(T));
+    }
+
+    template <typename T, typename Alloc>
+    auto to_host(std::vector<T, Alloc> &dst, device_buffer const &src) -> transfer_handle
+    {
+        check_size(src.size(), dst.size() * sizeof(T));
+        return copy(dst.data(), src.data(), dst.size() * sizeof(T));
+    }
+
+    template <typename T, typename DstAlloc, typename SrcAlloc>
+    auto copy(std::vector<T, DstAlloc> &dst, std::vector<T, SrcAlloc> const &src) -> transfer_handle
+    {
+        check_size(dst.size(), src.size());
+        return copy(dst.data(), src.data(), src.size() * sizeof(T));
+    }
+
+    /* Waits for everything issued so far */
+    auto synchronize() -> void;
+
+  private:
+    static auto check_size(std::size_t capacity, std::size_t required) -> void
+    {
+        if (capacity < required)
+            throw std::invalid_argument{"transfer_engine: a buffer is too small for the transfer."};
+    }
+
+    std::shared_ptr<transfer_backend> backend_;
+    std::size_t chunk_bytes_;
+    std::mutex mutex_;
+    std::size_t next_stream_ = 0;
+};
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
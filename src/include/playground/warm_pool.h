@@ -0,0 +1,363 @@
+#ifndef THATSZUCS_PLAYGROUND_WARM_POOL_H
+#define THATSZUCS_PLAYGROUND_WARM_POOL_H
+
+#include "playground/fill.h"
+
+#include <algorithm>
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <deque>
+#include <exception>
+#include <functional>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <optional>
+#include <stdexcept>
+#include <thread>
+#include <type_traits>
+#include <utility>
+
+namespace playground {
+
+/* Thread running jobs one after the other in submission order, so slow
+ * allocations and page faults happen off the critical path of the callers */
+class background_queue {
+  public:
+    background_queue();
+    /* Runs the jobs submitted so far, then joins the thread */
+    ~background_queue();
+
+    background_queue(background_queue const &) = delete;
+    auto operator=(background_queue const &) -> background_queue & = delete;
+
+    auto submit(std::function<void()> job) -> void;
+
+    /* Process-wide queue, never destroyed like the pools of the backings */
+    static auto instance() -> background_queue &;
+
+  private:
+    auto loop() -> void;
+
+    std::mutex mutex_;
+    std::condition_variable cv_;
+    std::deque<std::function<void()>> jobs_;
+    bool stop_ = false;
+    std::thread thread_;
+};
+
+enum class async_status {
+    pending, // Queued
+    running,
+    done,      // Finished with a value or an exception
+    cancelled, // Never delivers, a running job drops its value when finished
+};
+
+/* Future of a value computed on a background_queue. Unlike std::future it can
+ * be cancelled: pending jobs then never run, running ones free their value as
+ * soon as they finish. Copies share the state. */
+template <typename T>
+class async_result {
+  public:
+    template <typename Fn>
+    static auto run(background_queue &queue, Fn fn) -> async_result
+    {
+        auto result = async_result{};
+        queue.submit([state = result.state_, fn = std::move(fn)]() mutable {
+            {
+                std::lock_guard<std::mutex> lock{state->mutex};
+                if (state->status == async_status::cancelled)
+                    return;
+                state->status = async_status::running;
+            }
+            auto value = std::optional<T>{};
+            auto error = std::exception_ptr{};
+            try {
+                value.emplace(fn());
+            }
+            catch (...) {
+                error = std::current_exception();
+            }
+            {
+                std::lock_guard<std::mutex> lock{state->mutex};
+                if (state->status == async_status::cancelled)
+                    return; // value is freed here, outside of the lock
+                state->value = std::move(value);
+                state->error = error;
+                state->status = async_status::done;
+            }
+            state->cv.notify_all();
+        });
+        return result;
+    }
+
+    auto status() const -> async_status
+    {
+        std::lock_guard<std::mutex> lock{state_->mutex};
+        return state_->status;
+    }
+
+    /* Done or cancelled */
+    auto ready() const -> bool
+    {
+        const auto current = status();
+        return current == async_status::done || current == async_status::cancelled;
+    }
+
+    auto wait() const -> void
+    {
+        std::unique_lock<std::mutex> lock{state_->mutex};
+        state_->cv.wait(lock, [this] { return is_ready(); });
+    }
+
+    /* False on timeout */
+    template <typename Rep, typename Period>
+    auto wait_for(std::chrono::duration<Rep, Period> timeout) const -> bool
+    {
+        std::unique_lock<std::mutex> lock{state_->mutex};
+        return state_->cv.wait_for(lock, timeout, [this] { return is_ready(); });
+    }
+
+    /* Waits for the value and moves it out, rethrows the exception of the job.
+     * Throws std::logic_error once cancelled or when the value was taken. */
+    auto get() -> T
+    {
+        std::unique_lock<std::mutex> lock{state_->mutex};
+        state_->cv.wait(lock, [this] { return is_ready(); });
+        if (state_->status == async_status::cancelled)
+            throw std::logic_error{"async_result: cancelled."};
+        if (state_->error)
+            std::rethrow_exception(state_->error);
+        if (!state_->value)
+            throw std::logic_error{"async_result: the value was already taken."};
+        auto value = std::move(*state_->value);
+        state_->value.reset();
+        return value;
+    }
+
+    /* True unless the job already finished */
+    auto cancel() -> bool
+    {
+        {
+            std::lock_guard<std::mutex> lock{state_->mutex};
+            if (state_->status == async_status::done)
+                return false;
+            state_->status = async_status::cancelled;
+        }
+        state_->cv.notify_all();
+        return true;
+    }
+
+  private:
+    struct state {
+        std::mutex mutex;
+        std::condition_variable cv;
+        async_status status = async_status::pending;
+        std::optional<T> value;
+        std::exception_ptr error;
+    };
+
+    async_result() : state_{std::make_shared<state>()} {}
+
+    auto is_ready() const -> bool
+    {
+        return state_->status == async_status::done || state_->status == async_status::cancelled;
+    }
+
+    std::shared_ptr<state> state_;
+};
+
+/* Creates a vector like make_vector() on the background queue, by default with
+ * its pages faulted in */
+template <typename Vector>
+auto allocate_async(std::size_t count,
+                    fill_mode mode = fill_mode::uninitialized,
+                    typename Vector::value_type value = {},
+                    typename Vector::allocator_type const &alloc = {},
+                    background_queue &queue = background_queue::instance()) -> async_result<std::unique_ptr<Vector>>
+{
+    if (mode == fill_mode::copy)
+        throw std::invalid_argument{"allocate_async: the copy fill mode is not supported."};
+    return async_result<std::unique_ptr<Vector>>::run(
+        queue, [=] { return make_vector<Vector>(count, mode, value, nullptr, alloc); });
+}
+
+struct warm_pool_stats {
+    std::size_t hits = 0;    // Requests served by a warm vector right away
+    std::size_t waits = 0;   // Requests that waited for a vector being warmed
+    std::size_t misses = 0;  // Requests larger than every size, allocated on the spot
+    double wait_seconds = 0; // Total time requests waited
+    std::size_t warm_vectors = 0;
+    std::size_t warm_bytes = 0;
+};
+
+/* Keeps depth vectors of every reserved size allocated and faulted in
+ *
+ * A background queue refills the pool whenever a vector is taken, so the cost
+ * of allocating, page-locking and faulting in large buffers does not land on
+ * the first request after a resize. Requests get a vector of the smallest
+ * reserved size that fits them, shrunk to the requested count without
+ * reallocating. Vectors are handed out with their contents left from warming.
+ */
+template <typename Vector>
+class warm_pool {
+  public:
+    using allocator_type = typename Vector::allocator_type;
+    using value_type = typename Vector::value_type;
+
+    explicit warm_pool(std::size_t depth = 1,
+                       allocator_type alloc = {},
+                       background_queue &queue = background_queue::instance())
+        : state_{std::make_shared<state>(alloc)}, queue_{&queue}
+    {
+        if (depth == 0)
+            throw std::invalid_argument{"warm_pool: depth must be positive."};
+        state_->depth = depth;
+    }
+
+    warm_pool(warm_pool const &) = delete;
+    auto operator=(warm_pool const &) -> warm_pool & = delete;
+
+    /* Frees the warm vectors, refills still queued find the pool closed */
+    ~warm_pool()
+    {
+        auto bins = std::map<std::size_t, bin>{};
+        std::lock_guard<std::mutex> lock{state_->mutex};
+        state_->closed = true;
+        std::swap(bins, state_->bins);
+    }
+
+    /* Adds count to the reserved sizes and warms depth vectors of it. The
+     * result is the number of warm vectors of the size once they are. */
+    auto reserve(std::size_t count) -> async_result<std::size_t>
+    {
+        {
+            std::lock_guard<std::mutex> lock{state_->mutex};
+            auto &size = state_->bins[count];
+            while (size.warm.size() + size.in_flight < state_->depth)
+                refill(count, size);
+        }
+        // Runs after the refills, the queue being in order
+        return async_result<std::size_t>::run(*queue_, [state = state_, count] {
+            std::lock_guard<std::mutex> lock{state->mutex};
+            return state->closed ? std::size_t{0} : state->bins[count].warm.size();
+        });
+    }
+
+    /* A vector of count elements, warm unless count is larger than every
+     * reserved size. Waits when the vectors of the size are being warmed. */
+    auto acquire(std::size_t count) -> std::unique_ptr<Vector>
+    {
+        auto vector = take(count);
+        if (!vector)
+            vector = make_vector<Vector>(count, fill_mode::uninitialized, {}, nullptr, state_->alloc);
+        vector->resize(count);
+        return vector;
+    }
+
+    auto depth() const -> std::size_t { return state_->depth; }
+
+    auto stats() const -> warm_pool_stats
+    {
+        std::lock_guard<std::mutex> lock{state_->mutex};
+        auto result = state_->stats;
+        for (auto const &[count, size] : state_->bins) {
+            result.warm_vectors += size.warm.size();
+            result.warm_bytes += size.warm.size() * count * sizeof(value_type);
+        }
+        return result;
+    }
+
+  private:
+    struct bin {
+        std::deque<std::unique_ptr<Vector>> warm;
+        std::size_t in_flight = 0;
+    };
+
+    struct state {
+        explicit state(allocator_type alloc) : alloc{std::move(alloc)} {}
+
+        allocator_type alloc;
+        std::size_t depth = 1;
+        std::mutex mutex;
+        std::condition_variable cv;
+        std::map<std::size_t, bin> bins;
+        warm_pool_stats stats;
+        bool closed = false;
+    };
+
+    /* Queues the allocation of a vector of the size, with the mutex held */
+    auto refill(std::size_t count, bin &size) -> void
+    {
+        ++size.in_flight;
+        queue_->submit([state = state_, count] {
+            auto vector = std::unique_ptr<Vector>{};
+            try {
+                vector = make_vector<Vector>(count, fill_mode::uninitialized, {}, nullptr, state->alloc);
+            }
+            catch (std::exception const &) {
+                // Waiting requests allocate themselves and see the error
+            }
+            {
+                std::lock_guard<std::mutex> lock{state->mutex};
+                if (state->closed)
+                    return; // vector is freed here, outside of the lock
+                auto &size = state->bins[count];
+                --size.in_flight;
+                if (vector)
+                    size.warm.push_back(std::move(vector));
+            }
+            state->cv.notify_all();
+        });
+    }
+
+    /* A warm vector of the smallest reserved size fitting count, nullptr when
+     * none fits or warming failed */
+    auto take(std::size_t count) -> std::unique_ptr<Vector>
+    {
+        std::unique_lock<std::mutex> lock{state_->mutex};
+        auto it = state_->bins.lower_bound(count);
+        if (it == state_->bins.end()) {
+            ++state_->stats.misses;
+            return nullptr;
+        }
+
+        auto &size = it->second;
+        if (size.warm.empty()) {
+            ++state_->stats.waits;
+            if (size.in_flight == 0)
+                refill(it->first, size);
+            const auto start = std::chrono::steady_clock::now();
+            state_->cv.wait(lock, [&] { return !size.warm.empty() || size.in_flight == 0; });
+            const auto waited = std::chrono::steady_clock::now() - start;
+            state_->stats.wait_seconds += std::chrono::duration<double>(waited).count();
+        }
+        else
+            ++state_->stats.hits;
+
+        auto vector = std::unique_ptr<Vector>{};
+        if (!size.warm.empty()) {
+            vector = std::move(size.warm.front());
+            size.warm.pop_front();
+        }
+        while (size.warm.size() + size.in_flight < state_->depth)
+            refill(it->first, size);
+        return vector;
+    }
+
+    std::shared_ptr<state> state_;
+    background_queue *queue_;
+};
+
+} // namespace playground
+
+#endif
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,72 @@
+#include "playground/memory_backing.h"
+
+#include <sys/mman.h>
+#include <unistd.h>
+
+#include <cerrno>
+#include <cstdlib>
+#include <cstring>
+#include <new>
+
+namespace playground {
+
+auto host_backing::allocate(std::size_t bytes) -> void *
+{
+    static const auto page_size = static_cast<std::size_t>(sysconf(_SC_PAGESIZE));
+
+    void *tmp = nullptr;
+    auto error = posix_memalign(&tmp, page_size, bytes ? bytes : 1);
+    if (error != 0) {
+        throw std::runtime_error{std::strerror(error)};
+    }
+    if (bytes)
+        mlock(tmp, bytes); // Best effort, see header
+    return tmp;
+}
+
+auto host_backing::deallocate(void *p, std::size_t bytes) -> void
+{
+    if (p) {
+        if (bytes)
+            munlock(p, bytes);
+        std::free(p);
+    }
+}
+
+auto host_backing::host_register(void *p, std::size_t bytes) -> void
+{
+    if (mlock(p, bytes) != 0) {
+        throw std::runtime_error{std::strerror(errno)};
+    }
+}
+
+auto host_backing::host_unregister(void *p, std::size_t bytes) -> void
+{
+    if (munlock(p, bytes) != 0) {
+        throw std::runtime_error{std::strerror(errno)};
+    }
+}
+
+auto pageable_backing::allocate(std::size_t bytes) -> void *
+{
+    auto *p = std::malloc(bytes ? bytes : 1);
+    if (!p) {
+        throw std::bad_alloc{};
+    }
+    return p;
+}
+
+auto pageable_backing::deallocate(void *p, std::size_t) -> void
+{
+    std::free(p);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,135 @@
+#include "playground/numa.h"
+#include "playground/cuda_init.h"
+
+#include "cuda_runtime.h"
+
+#include <linux/mempolicy.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+
+#include <algorithm>
+#include <cctype>
+#include <cerrno>
+#include <cstring>
+#include <fstream>
+#include <sstream>
+#include <stdexcept>
+#include <string>
+
+namespace playground {
+
+namespace {
+
+/* Parses lists like "0", "0-1" or "0,2-3" of /sys/devices/system/node */
+auto parse_node_list(std::string const &text) -> std::vector<int>
+{
+    auto nodes = std::vector<int>{};
+    auto stream = std::istringstream{text};
+    auto range = std::string{};
+    while (std::getline(stream, range, ',')) {
+        if (range.empty() || !std::isdigit(static_cast<unsigned char>(range.front())))
+            continue;
+        const auto dash = range.find('-');
+        const auto first = std::stoi(range.substr(0, dash));
+        const auto last = dash == std::string::npos ? first : std::stoi(range.substr(dash + 1));
+        for (auto node = first; node <= last; ++node)
+            nodes.push_back(node);
+    }
+    return nodes;
+}
+
+} // namespace
+
+auto numa_policy::local_to_device(int device) -> numa_policy
+{
+    const auto node = numa_node_of_device(device);
+    return node < 0 ? numa_policy{} : numa_policy::bind(node);
+}
+
+auto numa_nodes() -> std::vector<int> const &
+{
+    static const auto nodes = [] {
+        auto file = std::ifstream{"/sys/devices/system/node/online"};
+        auto text = std::string{};
+        std::getline(file, text);
+        auto result = parse_node_list(text);
+        return result.empty() ? std::vector<int>{0} : result;
+    }();
+    return nodes;
+}
+
+auto numa_node_of_device(int device) -> int
+{
+    // Timed and recorded like any other CUDA initialization, see cuda_init.h
+    try {
+        ensure_cuda_init();
+    }
+    catch (std::runtime_error const &) {
+        return -1;
+    }
+
+    char bus_id[32] = {};
+    if (cudaDeviceGetPCIBusId(bus_id, sizeof(bus_id), device) != cudaSuccess) {
+        cudaGetLastError();
+        return -1;
+    }
+
+    // sysfs spells the PCI domain and bus in lower case
+    auto path = std::string{"/sys/bus/pci/devices/"} + bus_id + "/numa_node";
+    std::transform(path.begin(), path.end(), path.begin(),
+                   [](unsigned char c) { return static_cast<char>(std::tolower(c)); });
+    auto file = std::ifstream{path};
+    auto node = -1;
+    if (!(file >> node))
+        return -1;
+    return node; // -1 as well where the firmware does not tell
+}
+
+auto numa_node_of(void const *p) -> int
+{
+    auto node = -1;
+    if (syscall(SYS_get_mempolicy, &node, nullptr, 0, const_cast<void *>(p), MPOL_F_NODE | MPOL_F_ADDR) != 0)
+        return -1;
+    return node;
+}
+
+auto numa_bind(void *p, std::size_t bytes, numa_policy const &policy) -> void
+{
+    if (policy.mode == numa_mode::local)
+        return;
+
+    auto const &nodes = numa_nodes();
+    if (policy.mode != numa_mode::interleave && std::find(nodes.begin(), nodes.end(), policy.node) == nodes.end())
+        throw std::invalid_argument{"numa_bind: node " + std::to_string(policy.node) + " is not online."};
+
+    constexpr auto bits = 8 * sizeof(unsigned long);
+    const auto max_node = static_cast<std::size_t>(nodes.back()) + 1;
+    auto mask = std::vector<unsigned long>((max_node + bits - 1) / bits, 0);
+    auto set = [&](int node) { mask[node / bits] |= 1ul << (node % bits); };
+    if (policy.mode == numa_mode::interleave)
+        std::for_each(nodes.begin(), nodes.end(), set);
+    else
+        set(policy.node);
+
+    const int mode = policy.mode == numa_mode::bind        ? MPOL_BIND
+                     : policy.mode == numa_mode::preferred ? MPOL_PREFERRED
+                                                           : MPOL_INTERLEAVE;
+    // The kernel wants the number of bits plus one
+    if (syscall(SYS_mbind, p, bytes, mode, mask.data(), mask.size() * bits + 1, 0) != 0) {
+        const auto error = errno;
+        // No NUMA support in the kernel, or a sandbox not allowing it
+        if (error == ENOSYS || error == EPERM)
+            return;
+        throw std::runtime_error{std::string{"numa_bind: "} + std::strerror(error)};
+    }
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,81 @@
+#include "playground/pinned_budget.h"
+
+namespace playground {
+
+auto pinned_budget::instance() -> pinned_budget &
+{
+    static auto *budget = new pinned_budget{};
+    return *budget;
+}
+
+auto pinned_budget::configure(budget_options const &options) -> void
+{
+    std::lock_guard<std::mutex> lock{mutex_};
+    options_ = options;
+    // A larger budget, or another policy, may let waiting allocations through
+    ++releases_;
+    released_.notify_all();
+}
+
+auto pinned_budget::options() const -> budget_options
+{
+    std::lock_guard<std::mutex> lock{mutex_};
+    return options_;
+}
+
+auto pinned_budget::stats() const -> budget_stats
+{
+    std::lock_guard<std::mutex> lock{mutex_};
+    auto result = budget_stats{};
+    result.pinned_bytes = pinned_bytes_;
+    result.fallbacks = fallbacks_;
+    for (auto const &block : fallback_blocks_)
+        result.fallback_bytes += block.second;
+    result.waits = waits_;
+    result.failures = failures_;
+    return result;
+}
+
+auto pinned_budget::unpin(std::size_t bytes) -> void
+{
+    std::lock_guard<std::mutex> lock{mutex_};
+    pinned_bytes_ -= bytes;
+    ++releases_;
+    if (waiters_ > 0)
+        released_.notify_all();
+}
+
+auto pinned_budget::add_fallback(void const *p, std::size_t bytes) -> void
+{
+    std::lock_guard<std::mutex> lock{mutex_};
+    fallback_blocks_.emplace(p, bytes);
+    num_fallback_blocks_ = fallback_blocks_.size();
+}
+
+auto pinned_budget::remove_fallback(void const *p) -> bool
+{
+    if (num_fallback_blocks_ == 0)
+        return false;
+    std::lock_guard<std::mutex> lock{mutex_};
+    const auto removed = fallback_blocks_.erase(p) > 0;
+    num_fallback_blocks_ = fallback_blocks_.size();
+    return removed;
+}
+
+auto pinned_budget::is_fallback(void const *p) const -> bool
+{
+    if (num_fallback_blocks_ == 0)
+        return false;
+    std::lock_guard<std::mutex> lock{mutex_};
+    return fallback_blocks_.count(p) > 0;
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
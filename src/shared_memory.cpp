@@ -0,0 +1,121 @@
+#include "playground/shared_memory.h"
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include <atomic>
+#include <cerrno>
+#include <cstring>
+#include <stdexcept>
+
+namespace playground {
+
+namespace {
+
+auto system_error(char const *what) -> std::runtime_error
+{
+    return std::runtime_error{std::string{"shared_segment: "} + what + ": " + std::strerror(errno)};
+}
+
+} // namespace
+
+auto shared_segment::create(std::size_t bytes, shared_memory_kind kind) -> shared_segment
+{
+    if (bytes == 0)
+        throw std::invalid_argument{"shared_segment: needs at least one byte."};
+
+    auto segment = shared_segment{};
+    if (kind == shared_memory_kind::memfd) {
+        segment.fd_ = memfd_create("playground", MFD_CLOEXEC);
+        if (segment.fd_ < 0)
+            throw system_error("memfd_create");
+        // Other processes of the user reopen the file through the owner's fd,
+        // the inode tells it apart from files opened later with the same fd
+        struct stat status;
+        if (fstat(segment.fd_, &status) != 0)
+            throw system_error("fstat");
+        segment.handle_ = "/proc/" + std::to_string(getpid()) + "/fd/" + std::to_string(segment.fd_) + "#" +
+                          std::to_string(status.st_ino);
+    }
+    else {
+        static std::atomic<unsigned> next_segment{0};
+        segment.handle_ = "/playground-" + std::to_string(getpid()) + "-" + std::to_string(next_segment++);
+        segment.fd_ = shm_open(segment.handle_.c_str(), O_RDWR | O_CREAT | O_EXCL, 0600);
+        if (segment.fd_ < 0)
+            throw system_error("shm_open");
+        segment.posix_name_ = segment.handle_;
+    }
+    segment.owner_ = true;
+
+    if (ftruncate(segment.fd_, static_cast<off_t>(bytes)) != 0)
+        throw system_error("ftruncate");
+    segment.data_ = mmap(nullptr, bytes, PROT_READ | PROT_WRITE, MAP_SHARED, segment.fd_, 0);
+    if (segment.data_ == MAP_FAILED) {
+        segment.data_ = nullptr;
+        throw system_error("mmap");
+    }
+    segment.size_ = bytes;
+    return segment;
+}
+
+auto shared_segment::attach(std::string const &handle) -> shared_segment
+{
+    const auto is_memfd = handle.rfind("/proc/", 0) == 0;
+    const auto path = handle.substr(0, handle.find('#'));
+    auto gone = [&] { return std::runtime_error{"shared_segment: " + handle + " does not exist (any more)."}; };
+
+    auto segment = shared_segment{};
+    segment.fd_ = is_memfd ? open(path.c_str(), O_RDWR | O_CLOEXEC) : shm_open(path.c_str(), O_RDWR, 0);
+    if (segment.fd_ < 0) {
+        if (errno == ENOENT)
+            throw gone();
+        throw system_error("open");
+    }
+
+    struct stat status;
+    if (fstat(segment.fd_, &status) != 0)
+        throw system_error("fstat");
+    if (is_memfd && handle.substr(path.size()) != "#" + std::to_string(status.st_ino))
+        throw gone();
+    if (status.st_size == 0)
+        throw std::runtime_error{"shared_segment: " + handle + " is empty."};
+    segment.data_ =
+        mmap(nullptr, static_cast<std::size_t>(status.st_size), PROT_READ | PROT_WRITE, MAP_SHARED, segment.fd_, 0);
+    if (segment.data_ == MAP_FAILED) {
+        segment.data_ = nullptr;
+        throw system_error("mmap");
+    }
+    segment.size_ = static_cast<std::size_t>(status.st_size);
+    segment.handle_ = handle;
+    return segment;
+}
+
+shared_segment::~shared_segment()
+{
+    if (data_)
+        munmap(data_, size_);
+    if (fd_ >= 0)
+        close(fd_);
+    if (owner_ && !posix_name_.empty())
+        shm_unlink(posix_name_.c_str());
+}
+
+auto shared_segment::unlink() -> void
+{
+    if (owner_ && !posix_name_.empty()) {
+        shm_unlink(posix_name_.c_str());
+        posix_name_.clear();
+    }
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,147 @@
+#include "playground/thread_pool.h"
+
+#include <atomic>
+#include <utility>
+
+namespace playground {
+
+namespace {
+
+// Set while the thread executes a task, nested runs are executed inline
+thread_local bool inside_task = false;
+
+std::mutex default_pool_mutex;
+std::shared_ptr<thread_pool> default_pool;
+
+std::atomic<std::size_t> parallel_grain{parallel_grain_bytes};
+
+} // namespace
+
+thread_pool::thread_pool(std::size_t num_threads)
+{
+    if (num_threads == 0)
+        num_threads = std::max(1u, std::thread::hardware_concurrency());
+
+    workers_.reserve(num_threads - 1);
+    for (std::size_t i = 1; i < num_threads; ++i)
+        workers_.emplace_back([this, i] { worker_loop(i); });
+}
+
+thread_pool::~thread_pool()
+{
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        stop_ = true;
+    }
+    start_cv_.notify_all();
+    for (auto &worker : workers_)
+        worker.join();
+}
+
+auto thread_pool::run(std::size_t num_tasks, std::function<void(std::size_t)> const &fn) -> void
+{
+    if (num_tasks == 0)
+        return;
+
+    std::unique_lock<std::mutex> run_lock{run_mutex_, std::defer_lock};
+    if (inside_task || workers_.empty() || num_tasks == 1 || !run_lock.try_lock()) {
+        for (std::size_t i = 0; i < num_tasks; ++i)
+            fn(i);
+        return;
+    }
+
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        task_ = &fn;
+        num_tasks_ = num_tasks;
+        pending_ = workers_.size();
+        error_ = nullptr;
+        ++generation_;
+    }
+    start_cv_.notify_all();
+
+    run_tasks(0);
+
+    std::unique_lock<std::mutex> lock{mutex_};
+    done_cv_.wait(lock, [this] { return pending_ == 0; });
+    task_ = nullptr;
+    if (error_)
+        std::rethrow_exception(std::exchange(error_, nullptr));
+}
+
+auto thread_pool::worker_loop(std::size_t thread_index) -> void
+{
+    std::size_t seen_generation = 0;
+    while (true) {
+        {
+            std::unique_lock<std::mutex> lock{mutex_};
+            start_cv_.wait(lock, [&] { return stop_ || generation_ != seen_generation; });
+            if (stop_)
+                return;
+            seen_generation = generation_;
+        }
+
+        run_tasks(thread_index);
+
+        std::lock_guard<std::mutex> lock{mutex_};
+        if (--pending_ == 0)
+            done_cv_.notify_one();
+    }
+}
+
+auto thread_pool::run_tasks(std::size_t thread_index) -> void
+{
+    inside_task = true;
+    for (auto i = thread_index; i < num_tasks_; i += num_threads()) {
+        try {
+            (*task_)(i);
+        }
+        catch (...) {
+            std::lock_guard<std::mutex> lock{mutex_};
+            if (!error_)
+                error_ = std::current_exception();
+        }
+    }
+    inside_task = false;
+}
+
+auto default_thread_pool() -> std::shared_ptr<thread_pool>
+{
+    std::lock_guard<std::mutex> lock{default_pool_mutex};
+    if (!default_pool)
+        default_pool = std::make_shared<thread_pool>();
+    return default_pool;
+}
+
+auto set_num_threads(std::size_t num_threads) -> void
+{
+    auto pool = std::make_shared<thread_pool>(num_threads);
+    std::lock_guard<std::mutex> lock{default_pool_mutex};
+    default_pool.swap(pool);
+    // The old pool is destroyed here, or by the last run still using it
+}
+
+auto get_num_threads() -> std::size_t
+{
+    return default_thread_pool()->num_threads();
+}
+
+auto set_parallel_grain(std::size_t bytes) -> void
+{
+    parallel_grain = bytes ? bytes : parallel_grain_bytes;
+}
+
+auto get_parallel_grain() -> std::size_t
+{
+    return parallel_grain.load(std::memory_order_relaxed);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,191 @@
+#include "playground/tracing.h"
+
+#if __has_include(<nvtx3/nvToolsExt.h>)
+#include <nvtx3/nvToolsExt.h>
+#define PLAYGROUND_HAS_NVTX 1
+#endif
+
+#include <sys/syscall.h>
+#include <unistd.h>
+
+#include <algorithm>
+#include <chrono>
+#include <memory>
+#include <mutex>
+#include <set>
+
+namespace playground {
+
+namespace {
+
+auto now_ns() noexcept -> std::uint64_t
+{
+    const auto since_epoch = std::chrono::steady_clock::now().time_since_epoch();
+    return static_cast<std::uint64_t>(std::chrono::duration_cast<std::chrono::nanoseconds>(since_epoch).count());
+}
+
+/* Events of one thread. Only the thread writes them and publishes them by
+ * storing size, collecting reads up to size. The events are replaced for a
+ * new trace with the mutex of the registry held. */
+struct thread_buffer {
+    std::uint64_t thread = 0;
+    std::size_t trace = 0; // The events belong to, guarded by the mutex of the registry
+    std::unique_ptr<trace_event[]> events;
+    std::size_t capacity = 0;
+    std::atomic<std::size_t> size{0};
+    std::atomic<std::size_t> dropped{0};
+};
+
+class trace_registry {
+  public:
+    auto start(std::size_t max_events_per_thread) -> void
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        // Buffers of threads that exited are only held here
+        buffers_.erase(std::remove_if(buffers_.begin(), buffers_.end(),
+                                      [](auto const &buffer) { return buffer.use_count() == 1; }),
+                       buffers_.end());
+        capacity_ = max_events_per_thread;
+        origin_ns_ = now_ns();
+        trace_.fetch_add(1, std::memory_order_release);
+        detail::tracing_on.store(true);
+    }
+
+    /* The buffer of the calling thread, ready for the current trace */
+    auto local() -> thread_buffer &
+    {
+        thread_local std::shared_ptr<thread_buffer> buffer;
+        if (!buffer || buffer->trace != trace_.load(std::memory_order_acquire)) {
+            std::lock_guard<std::mutex> lock{mutex_};
+            if (!buffer) {
+                buffer = std::make_shared<thread_buffer>();
+                buffer->thread = static_cast<std::uint64_t>(syscall(SYS_gettid));
+                buffers_.push_back(buffer);
+            }
+            buffer->trace = trace_.load(std::memory_order_relaxed);
+            buffer->events = std::make_unique<trace_event[]>(capacity_);
+            buffer->capacity = capacity_;
+            buffer->size.store(0, std::memory_order_release);
+            buffer->dropped.store(0, std::memory_order_relaxed);
+        }
+        return *buffer;
+    }
+
+    auto collect() -> std::vector<trace_event>
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        auto events = std::vector<trace_event>{};
+        for (auto const &buffer : buffers_) {
+            if (buffer->trace != trace_.load(std::memory_order_relaxed))
+                continue;
+            const auto size = buffer->size.load(std::memory_order_acquire);
+            for (std::size_t i = 0; i < size; ++i) {
+                auto event = buffer->events[i];
+                // Scopes begun before the trace started count from its start
+                event.begin_ns = std::max(event.begin_ns, origin_ns_) - origin_ns_;
+                event.end_ns = std::max(event.end_ns, origin_ns_) - origin_ns_;
+                events.push_back(event);
+            }
+        }
+        std::sort(events.begin(), events.end(),
+                  [](auto const &lhs, auto const &rhs) { return lhs.begin_ns < rhs.begin_ns; });
+        return events;
+    }
+
+    auto dropped() -> std::size_t
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        auto dropped = std::size_t{0};
+        for (auto const &buffer : buffers_) {
+            if (buffer->trace == trace_.load(std::memory_order_relaxed))
+                dropped += buffer->dropped.load(std::memory_order_relaxed);
+        }
+        return dropped;
+    }
+
+    auto intern(std::string const &name) -> char const *
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        return names_.insert(name).first->c_str();
+    }
+
+  private:
+    std::mutex mutex_;
+    std::vector<std::shared_ptr<thread_buffer>> buffers_;
+    std::atomic<std::size_t> trace_{0};
+    std::size_t capacity_ = 0;
+    std::uint64_t origin_ns_ = 0;
+    std::set<std::string> names_; // Never moves its elements
+};
+
+auto registry() -> trace_registry &
+{
+    static auto *traces = new trace_registry{}; // Never destroyed, threads may record until the end
+    return *traces;
+}
+
+} // namespace
+
+auto start_tracing(std::size_t max_events_per_thread) -> void
+{
+    registry().start(max_events_per_thread);
+}
+
+auto stop_tracing() -> void
+{
+    detail::tracing_on.store(false);
+}
+
+auto collect_trace() -> std::vector<trace_event>
+{
+    return registry().collect();
+}
+
+auto dropped_trace_events() -> std::size_t
+{
+    return registry().dropped();
+}
+
+auto intern_trace_name(std::string const &name) -> char const *
+{
+    return registry().intern(name);
+}
+
+auto trace_scope::begin() noexcept -> void
+{
+#ifdef PLAYGROUND_HAS_NVTX
+    nvtxRangePushA(name_);
+#endif
+    begin_ns_ = now_ns();
+}
+
+auto trace_scope::end() noexcept -> void
+{
+    const auto end_ns = now_ns();
+#ifdef PLAYGROUND_HAS_NVTX
+    nvtxRangePop();
+#endif
+    try {
+        auto &buffer = registry().local();
+        const auto size = buffer.size.load(std::memory_order_relaxed);
+        if (size == buffer.capacity) {
+            buffer.dropped.fetch_add(1, std::memory_order_relaxed);
+            return;
+        }
+        buffer.events[size] = trace_event{name_, category_, tag_, bytes_, begin_ns_, end_ns, buffer.thread};
+        buffer.size.store(size + 1, std::memory_order_release);
+    }
+    catch (...) {
+        // Tracing never makes the traced operation fail, the event is lost
+    }
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,268 @@
+#include "playground/transfer_engine.h"
+#include "playground/cuda_init.h"
+#include "playground/tracing.h"
+
+#include <algorithm>
+#include <chrono>
+#include <condition_variable>
+#include <cstdlib>
+#include <cstring>
+#include <deque>
+#include <functional>
+#include <future>
+#include <new>
+#include <thread>
+#include <utility>
+
+namespace playground {
+
+namespace {
+
+auto check_cuda(cudaError_t error) -> void
+{
+    if (error != cudaSuccess)
+        throw std::runtime_error{cudaGetErrorString(error)};
+}
+
+class cuda_event : public transfer_event {
+  public:
+    explicit cuda_event(cudaStream_t stream)
+    {
+        check_cuda(cudaEventCreateWithFlags(&event_, cudaEventDisableTiming));
+        auto error = cudaEventRecord(event_, stream);
+        if (error != cudaSuccess) {
+            cudaEventDestroy(event_);
+            throw std::runtime_error{cudaGetErrorString(error)};
+        }
+    }
+
+    ~cuda_event() override { cudaEventDestroy(event_); }
+
+    auto done() -> bool override
+    {
+        auto error = cudaEventQuery(event_);
+        if (error == cudaErrorNotReady)
+            return false;
+        check_cuda(error);
+        return true;
+    }
+
+    auto wait() -> void override { check_cuda(cudaEventSynchronize(event_)); }
+
+  private:
+    cudaEvent_t event_;
+};
+
+class simulated_event : public transfer_event {
+  public:
+    explicit simulated_event(std::shared_future<void> future) : future_{std::move(future)} {}
+
+    auto done() -> bool override { return future_.wait_for(std::chrono::seconds{0}) == std::future_status::ready; }
+
+    auto wait() -> void override { future_.wait(); }
+
+  private:
+    std::shared_future<void> future_;
+};
+
+} // namespace
+
+cuda_transfer_backend::cuda_transfer_backend(std::size_t num_streams)
+{
+    if (num_streams == 0)
+        throw std::invalid_argument{"cuda_transfer_backend: needs at least one stream."};
+
+    ensure_cuda_init();
+    for (std::size_t i = 0; i < num_streams; ++i) {
+        cudaStream_t stream;
+        auto error = cudaStreamCreateWithFlags(&stream, cudaStreamNonBlocking);
+        if (error != cudaSuccess) {
+            for (auto created : streams_)
+                cudaStreamDestroy(created);
+            throw std::runtime_error{cudaGetErrorString(error)};
+        }
+        streams_.push_back(stream);
+    }
+}
+
+cuda_transfer_backend::~cuda_transfer_backend()
+{
+    for (auto stream : streams_) {
+        cudaStreamSynchronize(stream);
+        cudaStreamDestroy(stream);
+    }
+}
+
+auto cuda_transfer_backend::copy_async(void *dst, void const *src, std::size_t bytes, std::size_t stream) -> void
+{
+    check_cuda(cudaMemcpyAsync(dst, src, bytes, cudaMemcpyDefault, streams_.at(stream)));
+}
+
+auto cuda_transfer_backend::record(std::size_t stream) -> std::shared_ptr<transfer_event>
+{
+    return std::make_shared<cuda_event>(streams_.at(stream));
+}
+
+auto cuda_transfer_backend::allocate_device(std::size_t bytes) -> void *
+{
+    void *tmp;
+    check_cuda(cudaMalloc(&tmp, bytes));
+    return tmp;
+}
+
+auto cuda_transfer_backend::deallocate_device(void *p, std::size_t) -> void
+{
+    if (p)
+        check_cuda(cudaFree(p));
+}
+
+/* One stream of the simulated device */
+struct simulated_transfer_backend::worker {
+    worker() : thread{[this] { loop(); }} {}
+
+    ~worker()
+    {
+        {
+            std::lock_guard<std::mutex> lock{mutex};
+            stop = true;
+        }
+        cv.notify_one();
+        thread.join();
+    }
+
+    auto enqueue(std::function<void()> task) -> void
+    {
+        {
+            std::lock_guard<std::mutex> lock{mutex};
+            tasks.push_back(std::move(task));
+        }
+        cv.notify_one();
+    }
+
+    auto loop() -> void
+    {
+        for (;;) {
+            std::function<void()> task;
+            {
+                std::unique_lock<std::mutex> lock{mutex};
+                cv.wait(lock, [this] { return stop || !tasks.empty(); });
+                if (tasks.empty())
+                    return; // Stopped and drained
+                task = std::move(tasks.front());
+                tasks.pop_front();
+            }
+            task();
+        }
+    }
+
+    std::mutex mutex;
+    std::condition_variable cv;
+    std::deque<std::function<void()>> tasks;
+    bool stop = false;
+    std::thread thread; // Last, so it starts with everything else initialized
+};
+
+simulated_transfer_backend::simulated_transfer_backend(std::size_t num_streams)
+{
+    if (num_streams == 0)
+        throw std::invalid_argument{"simulated_transfer_backend: needs at least one stream."};
+
+    for (std::size_t i = 0; i < num_streams; ++i)
+        streams_.push_back(std::make_unique<worker>());
+}
+
+simulated_transfer_backend::~simulated_transfer_backend() = default;
+
+auto simulated_transfer_backend::copy_async(void *dst, void const *src, std::size_t bytes, std::size_t stream) -> void
+{
+    streams_.at(stream)->enqueue([dst, src, bytes] { std::memcpy(dst, src, bytes); });
+}
+
+auto simulated_transfer_backend::record(std::size_t stream) -> std::shared_ptr<transfer_event>
+{
+    auto promise = std::make_shared<std::promise<void>>();
+    auto event = std::make_shared<simulated_event>(promise->get_future().share());
+    streams_.at(stream)->enqueue([promise] { promise->set_value(); });
+    return event;
+}
+
+auto simulated_transfer_backend::allocate_device(std::size_t bytes) -> void *
+{
+    auto *tmp = std::malloc(bytes ? bytes : 1);
+    if (!tmp)
+        throw std::bad_alloc{};
+    return tmp;
+}
+
+auto simulated_transfer_backend::deallocate_device(void *p, std::size_t) -> void
+{
+    std::free(p);
+}
+
+auto transfer_handle::done() const -> bool
+{
+    return std::all_of(events_.begin(), events_.end(), [](auto const &event) { return event->done(); });
+}
+
+auto transfer_handle::wait() const -> void
+{
+    for (auto const &event : events_)
+        event->wait();
+}
+
+transfer_engine::transfer_engine(std::shared_ptr<transfer_backend> backend, std::size_t chunk_bytes)
+    : backend_{std::move(backend)}, chunk_bytes_{chunk_bytes}
+{
+    if (!backend_)
+        throw std::invalid_argument{"transfer_engine: needs a backend."};
+    if (chunk_bytes_ == 0)
+        throw std::invalid_argument{"transfer_engine: the chunk size must be positive."};
+}
+
+auto transfer_engine::copy(void *dst, void const *src, std::size_t bytes) -> transfer_handle
+{
+    const auto scope = trace_scope{"transfer", "transfer", bytes};
+    auto *d = static_cast<char *>(dst);
+    auto *s = static_cast<char const *>(src);
+    const auto num_streams = backend_->num_streams();
+    const auto num_chunks = (bytes + chunk_bytes_ - 1) / chunk_bytes_;
+
+    std::lock_guard<std::mutex> lock{mutex_};
+    const auto first_stream = next_stream_;
+    for (std::size_t chunk = 0; chunk < num_chunks; ++chunk) {
+        const auto offset = chunk * chunk_bytes_;
+        backend_->copy_async(d + offset, s + offset, std::min(chunk_bytes_, bytes - offset),
+                             (first_stream + chunk) % num_streams);
+    }
+
+    // An empty transfer still gets an event, so the handle orders after
+    // everything issued before on its stream
+    const auto streams_used = std::max<std::size_t>(std::min(num_chunks, num_streams), 1);
+    auto events = std::vector<std::shared_ptr<transfer_event>>{};
+    for (std::size_t i = 0; i < streams_used; ++i)
+        events.push_back(backend_->record((first_stream + i) % num_streams));
+    next_stream_ = (first_stream + std::max<std::size_t>(num_chunks, 1)) % num_streams;
+
+    return transfer_handle{std::move(events), bytes, num_chunks};
+}
+
+auto transfer_engine::synchronize() -> void
+{
+    auto events = std::vector<std::shared_ptr<transfer_event>>{};
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        for (std::size_t stream = 0; stream < backend_->num_streams(); ++stream)
+            events.push_back(backend_->record(stream));
+    }
+    transfer_handle{std::move(events), 0, 0}.wait();
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,56 @@
+#include "playground/warm_pool.h"
+
+namespace playground {
+
+background_queue::background_queue() : thread_{[this] { loop(); }} {}
+
+background_queue::~background_queue()
+{
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        stop_ = true;
+    }
+    cv_.notify_all();
+    thread_.join();
+}
+
+auto background_queue::submit(std::function<void()> job) -> void
+{
+    {
+        std::lock_guard<std::mutex> lock{mutex_};
+        jobs_.push_back(std::move(job));
+    }
+    cv_.notify_one();
+}
+
+auto background_queue::instance() -> background_queue &
+{
+    static auto *queue = new background_queue{};
+    return *queue;
+}
+
+auto background_queue::loop() -> void
+{
+    while (true) {
+        auto job = std::function<void()>{};
+        {
+            std::unique_lock<std::mutex> lock{mutex_};
+            cv_.wait(lock, [this] { return stop_ || !jobs_.empty(); });
+            if (jobs_.empty())
+                return;
+            job = std::move(jobs_.front());
+            jobs_.pop_front();
+        }
+        job();
+    }
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,186 @@
+#include "playground/allocation_stats.h"
+#include "playground/caching_pool.h"
+#include "playground/pinned_vector.h"
+
+#include <Catch2/catch.hpp>
+
+#include <thread>
+#include <vector>
+
+namespace playground {
+
+/* Pageable memory counted apart from everything else, so the tests do not
+ * see the allocations of other tests */
+class counted_backing : public pageable_backing {};
+
+inline auto operator==(counted_backing const &, counted_backing const &) -> bool
+{
+    return true;
+}
+
+inline auto operator!=(counted_backing const &, counted_backing const &) -> bool
+{
+    return false;
+}
+
+template <>
+struct backing_kind<counted_backing> {
+    static constexpr char const *name = "test";
+};
+
+template <typename T>
+using counted_vector = std::vector<T, pinned_alloc<T, counted_backing>>;
+
+TEST_CASE("Counts live and peak bytes", "[allocation_stats]")
+{
+    // Arrange
+    const auto before = memory_stats("test");
+
+    // Act
+    auto during = allocation_stats{};
+    {
+        auto a = counted_vector<char>(1000);
+        auto b = counted_vector<char>(3000);
+        during = memory_stats("test");
+    }
+    const auto after = memory_stats("test");
+
+    // Assert
+    REQUIRE(during.live_bytes == before.live_bytes + 4000);
+    REQUIRE(during.allocations == before.allocations + 2);
+    REQUIRE(after.live_bytes == before.live_bytes);
+    REQUIRE(after.peak_bytes >= before.live_bytes + 4000);
+    REQUIRE(after.frees == before.frees + 2);
+    REQUIRE(after.freed_bytes == before.freed_bytes + 4000);
+    REQUIRE(after.allocate_seconds >= before.allocate_seconds);
+}
+
+TEST_CASE("Counts allocations in power-of-two buckets", "[allocation_stats]")
+{
+    // Arrange
+    const auto before = memory_stats("test");
+
+    // Act
+    auto a = counted_vector<char>(1);
+    auto b = counted_vector<char>(1024);
+    auto c = counted_vector<char>(1025);
+    const auto after = memory_stats("test");
+
+    // Assert
+    REQUIRE(after.histogram[0] == before.histogram[0] + 1);
+    REQUIRE(after.histogram[10] == before.histogram[10] + 1);
+    REQUIRE(after.histogram[11] == before.histogram[11] + 1);
+}
+
+TEST_CASE("Resets the peak to the live bytes", "[allocation_stats]")
+{
+    // Arrange
+    {
+        auto a = counted_vector<char>(1 << 20);
+    }
+    auto b = counted_vector<char>(10);
+
+    // Act
+    reset_peak_stats();
+    const auto stats = memory_stats("test");
+
+    // Assert
+    REQUIRE(stats.peak_bytes == stats.live_bytes);
+}
+
+TEST_CASE("Attributes allocations to the current tag", "[allocation_stats]")
+{
+    // Arrange
+    auto tagged = [] {
+        auto tag = allocation_tag{"loader"};
+        REQUIRE(allocation_tag::current() == "loader");
+        return counted_vector<char>(100);
+    }();
+
+    // Act
+    auto untagged = counted_vector<char>(200);
+    const auto during = memory_stats_by_tag("test").at("loader");
+    tagged = counted_vector<char>{};
+    const auto after = memory_stats_by_tag("test").at("loader");
+
+    // Assert
+    REQUIRE(allocation_tag::current().empty());
+    REQUIRE(during.live_bytes == 100);
+    REQUIRE(after.live_bytes == 0);
+    REQUIRE(after.frees == 1);
+}
+
+TEST_CASE("Innermost tag counts", "[allocation_stats]")
+{
+    // Arrange
+    auto outer = allocation_tag{"outer"};
+
+    // Act
+    auto vec = [] {
+        auto inner = allocation_tag{"inner"};
+        return counted_vector<char>(64);
+    }();
+
+    // Assert
+    REQUIRE(allocation_tag::current() == "outer");
+    REQUIRE(memory_stats_by_tag("test").at("inner").live_bytes == 64);
+    REQUIRE(memory_stats_by_tag("test").count("outer") == 0);
+}
+
+TEST_CASE("Frees into the stats the memory was allocated from", "[allocation_stats]")
+{
+    // Arrange
+    auto tagged = [] {
+        auto tag = allocation_tag{"moved"};
+        return counted_vector<char>(500);
+    }();
+    auto untagged = counted_vector<char>(10);
+
+    // Act
+    untagged = std::move(tagged);
+    untagged.clear();
+    untagged.shrink_to_fit();
+
+    // Assert
+    REQUIRE(memory_stats_by_tag("test").at("moved").live_bytes == 0);
+}
+
+TEST_CASE("Counts pooled allocations with their kind", "[allocation_stats]")
+{
+    REQUIRE(std::string{backing_kind<pooled<counted_backing>>::name} == "test");
+    REQUIRE(std::string{backing_kind<pooled<pageable_backing>>::name} == "pageable");
+    REQUIRE(std::string{backing_kind<host_backing>::name} == "pinned");
+}
+
+TEST_CASE("Counts allocations of concurrent threads", "[allocation_stats]")
+{
+    // Arrange
+    const auto before = memory_stats("test");
+    auto threads = std::vector<std::thread>{};
+
+    // Act
+    for (auto t = 0; t < 4; ++t) {
+        threads.emplace_back([] {
+            for (auto i = 0; i < 1000; ++i)
+                auto vec = counted_vector<char>(16);
+        });
+    }
+    for (auto &thread : threads)
+        thread.join();
+    const auto after = memory_stats("test");
+
+    // Assert
+    REQUIRE(after.allocations == before.allocations + 4000);
+    REQUIRE(after.frees == before.frees + 4000);
+    REQUIRE(after.live_bytes == before.live_bytes);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,93 @@
+#include "playground/autotune.h"
+#include "playground/copy.h"
+
+#include <Catch2/catch.hpp>
+
+#include <stdexcept>
+#include <string>
+
+namespace playground {
+
+TEST_CASE("Sweeps the copy parameters and restores the ones in use", "[autotune]")
+{
+    // Arrange
+    const auto before = copy_tuning{2, std::size_t{512} << 10, std::size_t{16} << 20};
+    set_copy_tuning(before);
+    auto options = tuning_options{};
+    options.buffer_bytes = std::size_t{4} << 20;
+    options.thread_counts = {1, 2};
+    options.grains = {std::size_t{256} << 10, std::size_t{1} << 20};
+    options.alignments = {16, 4096};
+    options.repeats = 1;
+
+    // Act
+    const auto result = autotune_copies(options);
+
+    // Assert
+    const auto after = get_copy_tuning();
+    REQUIRE(after.num_threads == before.num_threads);
+    REQUIRE(after.grain_bytes == before.grain_bytes);
+    REQUIRE(after.nontemporal_threshold == before.nontemporal_threshold);
+
+    REQUIRE((result.best.num_threads == 1 || result.best.num_threads == 2));
+    REQUIRE((result.best.grain_bytes == options.grains[0] || result.best.grain_bytes == options.grains[1]));
+    REQUIRE(result.best.nontemporal_threshold <= options.buffer_bytes);
+
+    auto sweeps = 0;
+    auto alignments = 0;
+    for (auto const &trial : result.trials) {
+        REQUIRE(trial.seconds > 0.0);
+        sweeps += std::string{trial.step} == "threads";
+        alignments += std::string{trial.step} == "alignment";
+    }
+    REQUIRE(sweeps == 4);
+    REQUIRE(alignments == 2);
+}
+
+TEST_CASE("Applies a tuning", "[autotune]")
+{
+    // Arrange
+    const auto before = get_copy_tuning();
+
+    // Act
+    set_copy_tuning({3, std::size_t{2} << 20, 0});
+    const auto tuning = get_copy_tuning();
+    set_copy_tuning(before);
+
+    // Assert
+    REQUIRE(tuning.num_threads == 3);
+    REQUIRE(tuning.grain_bytes == std::size_t{2} << 20);
+    REQUIRE(tuning.nontemporal_threshold == 0);
+    REQUIRE(get_parallel_grain() == before.grain_bytes);
+}
+
+TEST_CASE("Rejects an empty sweep", "[autotune]")
+{
+    // Arrange
+    auto options = tuning_options{};
+    options.grains.clear();
+
+    // Act & Assert
+    REQUIRE_THROWS_AS(autotune_copies(options), std::invalid_argument);
+}
+
+TEST_CASE("Keys the host", "[autotune]")
+{
+    // Act
+    const auto key = host_key();
+
+    // Assert
+    REQUIRE(key.find(" threads | ") != std::string::npos);
+    REQUIRE(key.find(" GiB") != std::string::npos);
+    REQUIRE(key == host_key());
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
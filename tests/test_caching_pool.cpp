@@ -0,0 +1,221 @@
+#include "playground/caching_pool.h"
+
+#include <Catch2/catch.hpp>
+
+#include <set>
+#include <thread>
+#include <vector>
+
+namespace playground {
+
+TEST_CASE("Rounds requests up to power-of-two bins", "[caching_pool]")
+{
+    // Arrange
+    auto pool = caching_pool<host_backing>{pool_options{{}, 512, 4096}};
+
+    // Act & Assert
+    REQUIRE(pool.block_size(1) == 512);
+    REQUIRE(pool.block_size(512) == 512);
+    REQUIRE(pool.block_size(513) == 1024);
+    REQUIRE(pool.block_size(4096) == 4096);
+    REQUIRE(pool.block_size(4097) == 4097);
+}
+
+TEST_CASE("Rounds requests up to configured bins", "[caching_pool]")
+{
+    // Arrange
+    auto options = pool_options{};
+    options.bin_sizes = {1000, 3000};
+    auto pool = caching_pool<host_backing>{options};
+
+    // Act & Assert
+    REQUIRE(pool.block_size(10) == 1000);
+    REQUIRE(pool.block_size(1001) == 3000);
+    REQUIRE(pool.block_size(3001) == 3001);
+}
+
+TEST_CASE("Rejects invalid bins", "[caching_pool]")
+{
+    auto options = pool_options{};
+    options.bin_sizes = {3000, 1000};
+    REQUIRE_THROWS_AS(caching_pool<host_backing>{options}, std::invalid_argument);
+}
+
+TEST_CASE("Serves repeated allocations from the cache", "[caching_pool]")
+{
+    // Arrange
+    auto pool = caching_pool<host_backing>{};
+    auto first = pool.allocate(1000);
+    pool.deallocate(first, 1000);
+
+    // Act
+    auto second = pool.allocate(900);
+    auto stats = pool.stats();
+
+    // Assert
+    REQUIRE(second == first);
+    REQUIRE(stats.hits == 1);
+    REQUIRE(stats.misses == 1);
+    REQUIRE(stats.in_use_bytes == 1024);
+    REQUIRE(stats.cached_bytes == 0);
+    REQUIRE(stats.reserved_bytes == 1024);
+
+    pool.deallocate(second, 900);
+}
+
+TEST_CASE("Bypasses the cache for large requests", "[caching_pool]")
+{
+    // Arrange
+    auto pool = caching_pool<host_backing>{pool_options{{}, 512, 4096}};
+
+    // Act
+    auto p = pool.allocate(10000);
+    auto in_use = pool.stats().in_use_bytes;
+    pool.deallocate(p, 10000);
+    auto stats = pool.stats();
+
+    // Assert
+    REQUIRE(in_use == 10000);
+    REQUIRE(stats.cached_bytes == 0);
+    REQUIRE(stats.reserved_bytes == 0);
+    REQUIRE(stats.peak_reserved_bytes == 10000);
+}
+
+TEST_CASE("Trim releases cached blocks", "[caching_pool]")
+{
+    // Arrange
+    auto pool = caching_pool<host_backing>{};
+    auto small = pool.allocate(512);
+    auto large = pool.allocate(4096);
+    pool.deallocate(small, 512);
+    pool.deallocate(large, 4096);
+
+    // Act
+    pool.trim(1000);
+    auto trimmed = pool.stats();
+    pool.release();
+    auto released = pool.stats();
+
+    // Assert
+    REQUIRE(trimmed.cached_bytes == 512);
+    REQUIRE(trimmed.reserved_bytes == 512);
+    REQUIRE(released.cached_bytes == 0);
+    REQUIRE(released.reserved_bytes == 0);
+    REQUIRE(released.peak_reserved_bytes == 512 + 4096);
+}
+
+TEST_CASE("Does not cache above the high-water mark", "[caching_pool]")
+{
+    // Arrange
+    auto options = pool_options{};
+    options.max_cached_bytes = 1024;
+    auto pool = caching_pool<host_backing>{options};
+    auto a = pool.allocate(1024);
+    auto b = pool.allocate(1024);
+
+    // Act
+    pool.deallocate(a, 1024);
+    pool.deallocate(b, 1024);
+    auto stats = pool.stats();
+
+    // Assert
+    REQUIRE(stats.cached_bytes == 1024);
+    REQUIRE(stats.reserved_bytes == 1024);
+}
+
+TEST_CASE("Configure requires an idle pool", "[caching_pool]")
+{
+    // Arrange
+    auto pool = caching_pool<host_backing>{};
+    auto p = pool.allocate(100);
+
+    // Act & Assert
+    REQUIRE_THROWS_AS(pool.configure(pool_options{}), std::logic_error);
+    pool.deallocate(p, 100);
+    REQUIRE_NOTHROW(pool.configure(pool_options{{}, 64, 128}));
+    REQUIRE(pool.block_size(100) == 128);
+}
+
+TEST_CASE("Concurrent allocations", "[caching_pool]")
+{
+    // Arrange
+    constexpr int num_threads = 4;
+    constexpr int iters = 1000;
+    auto options = pool_options{};
+    options.num_shards = 2;
+    auto pool = caching_pool<host_backing>{options};
+
+    // Act
+    auto threads = std::vector<std::thread>{};
+    for (int t = 0; t < num_threads; ++t) {
+        threads.emplace_back([&pool, t] {
+            for (int i = 0; i < iters; ++i) {
+                const auto bytes = std::size_t{64} << ((i + t) % 6);
+                auto p = static_cast<char *>(pool.allocate(bytes));
+                p[0] = p[bytes - 1] = static_cast<char>(t);
+                pool.deallocate(p, bytes);
+            }
+        });
+    }
+    for (auto &thread : threads)
+        thread.join();
+    auto stats = pool.stats();
+
+    // Assert
+    REQUIRE(stats.in_use_bytes == 0);
+    REQUIRE(stats.reserved_bytes == stats.cached_bytes);
+    REQUIRE(stats.hits + stats.misses == num_threads * iters);
+}
+
+TEST_CASE("Reuses blocks freed by other threads", "[caching_pool]")
+{
+    // Arrange, threads started one after the other get consecutive shards
+    constexpr std::size_t block_bytes = std::size_t{1} << 20;
+    auto options = pool_options{};
+    options.num_shards = 8;
+    auto pool = caching_pool<host_backing>{options};
+
+    // Act, allocated on a new thread every time, freed on this one
+    for (int i = 0; i < 200; ++i) {
+        void *p = nullptr;
+        std::thread{[&pool, &p] { p = pool.allocate(block_bytes); }}.join();
+        pool.deallocate(p, block_bytes);
+    }
+    auto stats = pool.stats();
+
+    // Assert
+    REQUIRE(stats.misses == 1);
+    REQUIRE(stats.hits == 199);
+    REQUIRE(stats.cached_bytes == block_bytes);
+}
+
+TEST_CASE("Live blocks are distinct", "[caching_pool]")
+{
+    // Arrange
+    auto pool = caching_pool<host_backing>{};
+    auto blocks = std::vector<void *>{};
+
+    // Act
+    for (int round = 0; round < 2; ++round) {
+        for (int i = 0; i < 16; ++i)
+            blocks.push_back(pool.allocate(256));
+        auto unique = std::set<void *>(blocks.begin(), blocks.end());
+        REQUIRE(unique.size() == blocks.size());
+        for (auto p : blocks)
+            pool.deallocate(p, 256);
+        blocks.clear();
+    }
+
+    // Assert
+    REQUIRE(pool.stats().hits == 16);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
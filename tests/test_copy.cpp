@@ -0,0 +1,191 @@
+#include "playground/copy.h"
+
+#include <Catch2/catch.hpp>
+
+#include <cstdint>
+#include <numeric>
+#include <vector>
+
+namespace playground {
+
+using TileTypes = std::tuple<float, double, int8_t, uint8_t, int16_t, uint16_t, int32_t, uint32_t, int64_t, uint64_t>;
+
+// Large enough to be split between threads
+constexpr std::size_t large_bytes = 3 * parallel_grain_bytes + 17;
+
+TEST_CASE("stream_memcpy copies unaligned ranges", "[copy]")
+{
+    // Arrange
+    auto source = std::vector<uint8_t>(1000);
+    std::iota(source.begin(), source.end(), uint8_t{0});
+
+    for (std::size_t offset : {0, 1, 15, 63}) {
+        for (std::size_t bytes : {0, 1, 64, 100, 900}) {
+            auto data = std::vector<uint8_t>(1000, 0xff);
+
+            // Act
+            stream_memcpy(data.data() + offset, source.data() + 3, bytes);
+
+            // Assert
+            REQUIRE(std::equal(source.begin() + 3, source.begin() + 3 + bytes, data.begin() + offset));
+            REQUIRE(data[offset + bytes] == 0xff);
+        }
+    }
+}
+
+TEST_CASE("parallel_memcpy with and without non-temporal stores", "[copy]")
+{
+    // Arrange
+    auto source = std::vector<uint8_t>(large_bytes);
+    std::iota(source.begin(), source.end(), uint8_t{0});
+    const auto threshold = get_nontemporal_threshold();
+
+    for (std::size_t new_threshold : {std::size_t{0}, std::size_t{1}}) {
+        auto data = std::vector<uint8_t>(large_bytes);
+        set_nontemporal_threshold(new_threshold);
+
+        // Act
+        parallel_memcpy(data.data(), source.data(), large_bytes);
+
+        // Assert
+        REQUIRE(data == source);
+    }
+    set_nontemporal_threshold(threshold);
+}
+
+TEMPLATE_LIST_TEST_CASE("parallel_convert (from float)", "[copy]", TileTypes)
+{
+    // Arrange
+    auto source = std::vector<float>(large_bytes / 4);
+    for (std::size_t i = 0; i < source.size(); ++i)
+        source[i] = static_cast<float>(i % 100);
+    auto data = std::vector<TestType>(source.size());
+
+    // Act
+    parallel_convert(source.data(), source.size(), data.data());
+
+    // Assert
+    auto matches = true;
+    for (std::size_t i = 0; i < source.size(); ++i)
+        matches = matches && data[i] == static_cast<TestType>(i % 100);
+    REQUIRE(matches);
+}
+
+TEST_CASE("parallel_convert (16-bit floats)", "[copy]")
+{
+    // Arrange
+    auto source = std::vector<int32_t>{-2, 0, 1, 257};
+    auto halves = std::vector<float16>(source.size());
+    auto bfloats = std::vector<bfloat16>(source.size());
+    auto back = std::vector<int32_t>(source.size());
+
+    // Act
+    parallel_convert(source.data(), source.size(), halves.data());
+    parallel_convert(source.data(), source.size(), bfloats.data());
+    parallel_convert(bfloats.data(), bfloats.size(), back.data());
+
+    // Assert
+    REQUIRE(static_cast<float>(halves[0]) == -2.0f);
+    REQUIRE(static_cast<float>(halves[3]) == 257.0f);
+    REQUIRE(back == std::vector<int32_t>{-2, 0, 1, 256}); // 257 rounds to even
+}
+
+TEST_CASE("parallel_gather copies rows", "[copy]")
+{
+    // Arrange
+    constexpr std::size_t row_size = 3;
+    auto source = std::vector<int>(4 * row_size);
+    std::iota(source.begin(), source.end(), 0);
+    auto indices = std::vector<int64_t>{3, 0, 3};
+    auto data = std::vector<int>(indices.size() * row_size);
+
+    // Act
+    parallel_gather(source.data(), 4, indices.data(), indices.size(), row_size, data.data());
+
+    // Assert
+    REQUIRE(data == std::vector<int>{9, 10, 11, 0, 1, 2, 9, 10, 11});
+}
+
+TEST_CASE("parallel_gather checks the indices first", "[copy]")
+{
+    // Arrange
+    auto source = std::vector<int>{1, 2, 3};
+    auto indices = std::vector<int64_t>{0, 3};
+    auto data = std::vector<int>{0, 0};
+
+    // Act & Assert
+    REQUIRE_THROWS_AS(parallel_gather(source.data(), 3, indices.data(), 2, 1, data.data()), std::out_of_range);
+    REQUIRE(data == std::vector<int>{0, 0});
+    indices[1] = -1;
+    REQUIRE_THROWS_AS(parallel_gather(source.data(), 3, indices.data(), 2, 1, data.data()), std::out_of_range);
+}
+
+TEST_CASE("parallel_collate packs ragged sources", "[copy]")
+{
+    // Arrange
+    auto large = std::vector<uint8_t>(large_bytes);
+    std::iota(large.begin(), large.end(), uint8_t{0});
+    auto small = std::vector<uint8_t>{1, 2, 3};
+    auto sources =
+        std::vector<byte_span>{{small.data(), 3}, {large.data(), large_bytes}, {nullptr, 0}, {small.data(), 2}};
+    auto offsets = std::vector<std::size_t>{0, 3, 3 + large_bytes, 3 + large_bytes, 5 + large_bytes};
+    auto data = std::vector<uint8_t>(offsets.back(), 0xff);
+    const auto num_threads = get_num_threads();
+    set_num_threads(4);
+
+    // Act
+    parallel_collate(sources.data(), sources.size(), offsets.data(), data.data());
+    set_num_threads(num_threads);
+
+    // Assert
+    REQUIRE(std::equal(small.begin(), small.end(), data.begin()));
+    REQUIRE(std::equal(large.begin(), large.end(), data.begin() + 3));
+    REQUIRE(data[3 + large_bytes] == 1);
+    REQUIRE(data[4 + large_bytes] == 2);
+}
+
+TEST_CASE("parallel_collate pads slots", "[copy]")
+{
+    // Arrange
+    auto first = std::vector<float>{1, 2, 3};
+    auto second = std::vector<float>{4};
+    auto sources = std::vector<byte_span>{{first.data(), 12}, {second.data(), 4}};
+    auto offsets = std::vector<std::size_t>{0, 16, 32};
+    auto data = std::vector<float>(8);
+    const auto pad = GENERATE(0.0f, -1.5f);
+
+    // Act
+    parallel_collate(sources.data(), sources.size(), offsets.data(), data.data(), &pad, sizeof(pad));
+
+    // Assert
+    REQUIRE(data == std::vector<float>{1, 2, 3, pad, 4, pad, pad, pad});
+}
+
+TEST_CASE("parallel_collate checks the slots first", "[copy]")
+{
+    // Arrange
+    auto source = std::vector<int16_t>{1, 2, 3};
+    auto sources = std::vector<byte_span>{{source.data(), 6}};
+    auto data = std::vector<int16_t>(4, 7);
+    const int16_t pad = 0;
+
+    // Act & Assert
+    auto offsets = std::vector<std::size_t>{0, 4};
+    REQUIRE_THROWS_AS(parallel_collate(sources.data(), 1, offsets.data(), data.data()), std::invalid_argument);
+    offsets[1] = 7;
+    REQUIRE_THROWS_AS(parallel_collate(sources.data(), 1, offsets.data(), data.data(), &pad, sizeof(pad)),
+                      std::invalid_argument);
+    offsets[1] = 8;
+    REQUIRE_THROWS_AS(parallel_collate(sources.data(), 1, offsets.data(), data.data()), std::invalid_argument);
+    REQUIRE(data == std::vector<int16_t>{7, 7, 7, 7});
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
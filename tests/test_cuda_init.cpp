@@ -0,0 +1,45 @@
+#include "playground/cuda_init.h"
+#include "playground/pinned_vector.h"
+
+#include <Catch2/catch.hpp>
+
+namespace playground {
+
+TEST_CASE("Pinned allocations initialize CUDA", "[cuda_init]")
+{
+    // Act
+    auto vector = pinned_vector<int>(16);
+
+    // Assert
+    const auto stats = get_cuda_init_stats();
+    REQUIRE(cuda_initialized());
+    REQUIRE(stats.initialized);
+    REQUIRE(stats.implicit);
+    REQUIRE(stats.device >= 0);
+    REQUIRE(stats.seconds >= 0.0);
+}
+
+TEST_CASE("Initializes CUDA once", "[cuda_init]")
+{
+    // Arrange
+    cuda_init();
+    const auto first = get_cuda_init_stats();
+
+    // Act
+    cuda_init();
+
+    // Assert
+    REQUIRE(cuda_initialized());
+    REQUIRE(get_cuda_init_stats().seconds == first.seconds);
+    REQUIRE(get_cuda_init_stats().implicit == first.implicit);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,152 @@
+#include "playground/decompress.h"
+
+#include <Catch2/catch.hpp>
+
+#include <zlib.h>
+
+#include <algorithm>
+#include <cstring>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace playground {
+
+namespace {
+
+/* One zlib stream, or gzip member with window_bits 31 */
+auto compress_frame(std::string const &data, int window_bits = 15) -> std::string
+{
+    auto stream = z_stream{};
+    deflateInit2(&stream, Z_DEFAULT_COMPRESSION, Z_DEFLATED, window_bits, 8, Z_DEFAULT_STRATEGY);
+    auto frame = std::string(deflateBound(&stream, data.size()) + 32, '\0');
+    stream.next_in = reinterpret_cast<Bytef *>(const_cast<char *>(data.data()));
+    stream.avail_in = static_cast<uInt>(data.size());
+    stream.next_out = reinterpret_cast<Bytef *>(&frame[0]);
+    stream.avail_out = static_cast<uInt>(frame.size());
+    deflate(&stream, Z_FINISH);
+    frame.resize(stream.total_out);
+    deflateEnd(&stream);
+    return frame;
+}
+
+auto sample_data(std::size_t bytes, int seed) -> std::string
+{
+    auto data = std::string(bytes, '\0');
+    for (std::size_t i = 0; i < bytes; ++i)
+        data[i] = static_cast<char>((i * 7 + seed) % 13 + (i / 1000) % 5);
+    return data;
+}
+
+/* "Compresses" by copying */
+class copy_codec : public codec {
+  public:
+    auto name() const -> std::string override { return "copy"; }
+
+    auto decompress(void const *src, std::size_t src_bytes, void *dst, std::size_t dst_bytes) const
+        -> std::size_t override
+    {
+        if (src_bytes > dst_bytes)
+            throw std::runtime_error{"copy: larger than its destination."};
+        std::memcpy(dst, src, src_bytes);
+        return src_bytes;
+    }
+};
+
+} // namespace
+
+TEST_CASE("Decompresses frames of uneven sizes into their slots", "[decompress]")
+{
+    // Arrange
+    auto data = std::vector<std::string>{};
+    auto frames = std::vector<std::string>{};
+    auto offsets = std::vector<std::size_t>{0};
+    for (int i = 0; i < 17; ++i) {
+        data.push_back(sample_data(1000 + 37000 * (i % 5), i));
+        frames.push_back(compress_frame(data.back()));
+        offsets.push_back(offsets.back() + data.back().size());
+    }
+    auto spans = std::vector<byte_span>{};
+    for (auto const &frame : frames)
+        spans.push_back({frame.data(), frame.size()});
+    auto out = std::vector<char>(offsets.back());
+
+    // Act
+    parallel_decompress(*find_codec("zlib"), spans.data(), spans.size(), offsets.data(), out.data());
+
+    // Assert
+    auto expected = std::string{};
+    for (auto const &d : data)
+        expected += d;
+    REQUIRE(std::string(out.begin(), out.end()) == expected);
+}
+
+TEST_CASE("Reads the size of gzip members and decodes concatenated ones", "[decompress]")
+{
+    // Arrange
+    const auto first = sample_data(5000, 1);
+    const auto second = sample_data(3000, 2);
+    const auto frame = compress_frame(first, 31) + compress_frame(second, 31);
+    auto const gzip = find_codec("gzip");
+    auto out = std::vector<char>(first.size() + second.size());
+
+    // Act
+    const auto size = gzip->decompressed_size(frame.data(), frame.size());
+    const auto written = gzip->decompress(frame.data(), frame.size(), out.data(), out.size());
+
+    // Assert
+    REQUIRE(size == second.size()); // Of the last member
+    REQUIRE(written == out.size());
+    REQUIRE(std::string(out.begin(), out.end()) == first + second);
+    REQUIRE_FALSE(find_codec("zlib")->decompressed_size(frame.data(), frame.size()));
+}
+
+TEST_CASE("Rejects frames not filling their slots", "[decompress]")
+{
+    // Arrange
+    const auto data = sample_data(4096, 3);
+    const auto frame = compress_frame(data);
+    const auto span = byte_span{frame.data(), frame.size()};
+    const auto truncated = byte_span{frame.data(), frame.size() / 2};
+    auto out = std::vector<char>(2 * data.size());
+    const auto larger = std::vector<std::size_t>{0, data.size() + 1};
+    const auto smaller = std::vector<std::size_t>{0, data.size() - 1};
+    const auto exact = std::vector<std::size_t>{0, data.size()};
+    auto const zlib = find_codec("zlib");
+
+    // Act & Assert
+    REQUIRE_THROWS_AS(parallel_decompress(*zlib, &span, 1, larger.data(), out.data()), std::runtime_error);
+    REQUIRE_THROWS_AS(parallel_decompress(*zlib, &span, 1, smaller.data(), out.data()), std::runtime_error);
+    REQUIRE_THROWS_AS(parallel_decompress(*zlib, &truncated, 1, exact.data(), out.data()), std::runtime_error);
+    REQUIRE_THROWS_AS(parallel_decompress(*find_codec("gzip"), &span, 1, exact.data(), out.data()), std::runtime_error);
+}
+
+TEST_CASE("Registers codecs", "[decompress]")
+{
+    // Arrange
+    const auto data = std::string{"not compressed at all"};
+    const auto span = byte_span{data.data(), data.size()};
+    const auto offsets = std::vector<std::size_t>{0, data.size()};
+    auto out = std::string(data.size(), '\0');
+
+    // Act
+    register_codec(std::make_shared<copy_codec>());
+    parallel_decompress(*find_codec("copy"), &span, 1, offsets.data(), &out[0]);
+
+    // Assert
+    REQUIRE(out == data);
+    const auto names = codec_names();
+    REQUIRE(std::find(names.begin(), names.end(), "gzip") != names.end());
+    REQUIRE(std::find(names.begin(), names.end(), "copy") != names.end());
+    REQUIRE_THROWS_AS(find_codec("lzma"), std::invalid_argument);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,161 @@
+#include "playground/file_reader.h"
+#include "playground/pinned_vector.h"
+#include "playground/thread_pool.h"
+
+#include <Catch2/catch.hpp>
+
+#include <cstdio>
+#include <cstdlib>
+#include <stdexcept>
+#include <string>
+#include <unistd.h>
+#include <vector>
+
+namespace playground {
+
+/* Temporary file removed at the end of the test */
+struct temporary_file {
+    explicit temporary_file(std::vector<char> const &content)
+    {
+        char name[] = "/tmp/playground_test_XXXXXX";
+        auto fd = mkstemp(name);
+        path = name;
+        auto *file = fdopen(fd, "wb");
+        std::fwrite(content.data(), 1, content.size(), file);
+        std::fclose(file);
+    }
+
+    ~temporary_file() { std::remove(path.c_str()); }
+
+    std::string path;
+};
+
+auto test_content(std::size_t bytes) -> std::vector<char>
+{
+    auto content = std::vector<char>(bytes);
+    for (std::size_t i = 0; i < bytes; ++i)
+        content[i] = static_cast<char>(i * 7 % 251);
+    return content;
+}
+
+using pinned_bytes = std::vector<char, pinned_alloc<char, host_backing>>;
+
+TEST_CASE("file_reader reads with every method", "[file_reader]")
+{
+    // Arrange, large enough to be split between threads and io_uring blocks
+    const auto content = test_content(5 * (std::size_t{1} << 20) + 1234);
+    const auto file = temporary_file{content};
+    auto method = GENERATE(read_method::mmap, read_method::pread, read_method::direct, read_method::io_uring);
+    auto reader = file_reader{file.path, method};
+    auto data = pinned_bytes(content.size());
+
+    // Act
+    auto first = reader.read(0, data.data(), 3 << 20);
+    auto rest = reader.read(first, data.data() + first, content.size());
+
+    // Assert
+    REQUIRE(reader.size() == content.size());
+    REQUIRE(first == 3 << 20);
+    REQUIRE(rest == content.size() - first);
+    REQUIRE(std::equal(content.begin(), content.end(), data.begin()));
+}
+
+TEST_CASE("file_reader reads directly with any grain", "[file_reader]")
+{
+    // Arrange, chunks of a grain that is no multiple of the O_DIRECT alignment
+    const auto content = test_content(8 * (std::size_t{1} << 20));
+    const auto file = temporary_file{content};
+    auto reader = file_reader{file.path, read_method::direct};
+    auto data = pinned_bytes(content.size());
+    const auto grain = GENERATE(std::size_t{1000}, std::size_t{6000});
+    set_num_threads(4);
+    set_parallel_grain(grain);
+
+    // Act
+    auto bytes = reader.read(0, data.data(), content.size());
+    set_parallel_grain(0);
+    set_num_threads(0);
+
+    // Assert
+    REQUIRE(bytes == content.size());
+    REQUIRE(std::equal(content.begin(), content.end(), data.begin()));
+}
+
+TEST_CASE("file_reader reads on after a failed io_uring read", "[file_reader]")
+{
+    // Arrange, truncated after opening so that the later blocks come up short
+    const auto content = test_content(5 * (std::size_t{1} << 20));
+    const auto file = temporary_file{content};
+    auto reader = file_reader{file.path, read_method::io_uring};
+    auto data = pinned_bytes(content.size());
+    REQUIRE(truncate(file.path.c_str(), 2 * (1 << 20) + 4096) == 0);
+
+    // Act
+    REQUIRE_THROWS_AS(reader.read(0, data.data(), content.size()), std::runtime_error);
+    auto *restored = std::fopen(file.path.c_str(), "wb");
+    std::fwrite(content.data(), 1, content.size(), restored);
+    std::fclose(restored);
+    std::fill(data.begin(), data.end(), '\0');
+    auto bytes = reader.read(0, data.data(), content.size());
+
+    // Assert
+    REQUIRE(bytes == content.size());
+    REQUIRE(std::equal(content.begin(), content.end(), data.begin()));
+}
+
+TEST_CASE("file_reader handles unaligned ranges", "[file_reader]")
+{
+    // Arrange
+    const auto content = test_content(100000);
+    const auto file = temporary_file{content};
+    auto method = GENERATE(read_method::mmap, read_method::pread, read_method::direct, read_method::io_uring);
+    auto reader = file_reader{file.path, method};
+    auto data = std::vector<char>(50000);
+
+    // Act
+    auto bytes = reader.read(4097, data.data() + 3, 40000);
+
+    // Assert
+    REQUIRE(bytes == 40000);
+    REQUIRE(std::equal(content.begin() + 4097, content.begin() + 4097 + 40000, data.begin() + 3));
+}
+
+TEST_CASE("file_reader stops at the end of the file", "[file_reader]")
+{
+    // Arrange
+    const auto content = test_content(10);
+    const auto file = temporary_file{content};
+    auto reader = file_reader{file.path};
+    auto data = std::vector<char>(10);
+
+    // Act & Assert
+    REQUIRE(reader.read(5, data.data(), 10) == 5);
+    REQUIRE(reader.read(10, data.data(), 10) == 0);
+}
+
+TEST_CASE("file_reader reads empty files", "[file_reader]")
+{
+    // Arrange
+    const auto file = temporary_file{{}};
+    auto reader = file_reader{file.path, read_method::mmap};
+    char data;
+
+    // Act & Assert
+    REQUIRE(reader.size() == 0);
+    REQUIRE(reader.read(0, &data, 1) == 0);
+}
+
+TEST_CASE("file_reader reports missing files", "[file_reader]")
+{
+    REQUIRE_THROWS_AS(file_reader{"/nonexistent/playground"}, std::runtime_error);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,128 @@
+#include "playground/fill.h"
+#include "playground/pinned_vector.h"
+
+#include <Catch2/catch.hpp>
+
+#include <sys/mman.h>
+#include <unistd.h>
+
+#include <numeric>
+#include <vector>
+
+namespace playground {
+
+using TileTypes = std::tuple<float, double, int8_t, uint8_t, int16_t, uint16_t, int32_t, uint32_t, int64_t, uint64_t>;
+
+// Large enough to be split between threads
+constexpr std::size_t large_count = 3 * parallel_grain_bytes + 17;
+
+TEMPLATE_LIST_TEST_CASE("make_vector (zeros)", "[fill]", TileTypes)
+{
+    // Act
+    auto test_vector = make_vector<default_init_vector<TestType>>(large_count, fill_mode::zeros);
+
+    // Assert
+    REQUIRE(test_vector->size() == large_count);
+    REQUIRE(std::all_of(test_vector->begin(), test_vector->end(), [](TestType x) { return x == 0; }));
+}
+
+TEMPLATE_LIST_TEST_CASE("make_vector (constant)", "[fill]", TileTypes)
+{
+    // Act
+    auto test_vector = make_vector<default_init_vector<TestType, pinned_alloc<TestType, host_backing>>>(
+        large_count, fill_mode::constant, 8);
+
+    // Assert
+    REQUIRE(test_vector->size() == large_count);
+    REQUIRE(std::all_of(test_vector->begin(), test_vector->end(), [](TestType x) { return x == 8; }));
+}
+
+TEMPLATE_LIST_TEST_CASE("make_vector (iota)", "[fill]", TileTypes)
+{
+    // Arrange
+    constexpr std::size_t count = 1000;
+
+    // Act
+    auto test_vector = make_vector<default_init_vector<TestType>>(count, fill_mode::iota, 3);
+
+    // Assert
+    REQUIRE(test_vector->size() == count);
+    for (std::size_t i = 0; i < count; ++i)
+        REQUIRE((*test_vector)[i] == static_cast<TestType>(3 + static_cast<TestType>(i)));
+}
+
+TEMPLATE_LIST_TEST_CASE("make_vector (copy)", "[fill]", TileTypes)
+{
+    // Arrange
+    auto source = std::vector<TestType>(large_count);
+    for (std::size_t i = 0; i < source.size(); ++i)
+        source[i] = static_cast<TestType>(i % 100);
+
+    // Act
+    auto test_vector = make_vector<default_init_vector<TestType>>(large_count, fill_mode::copy, 0, source.data());
+
+    // Assert
+    REQUIRE(std::equal(source.begin(), source.end(), test_vector->begin(), test_vector->end()));
+}
+
+TEST_CASE("make_vector (copy without source)", "[fill]")
+{
+    REQUIRE_THROWS_AS(make_vector<default_init_vector<int>>(10, fill_mode::copy), std::invalid_argument);
+}
+
+TEST_CASE("make_vector (uninitialized)", "[fill]")
+{
+    // Act
+    auto test_vector = make_vector<default_init_vector<float>>(large_count, fill_mode::uninitialized);
+
+    // Assert
+    REQUIRE(test_vector->size() == large_count);
+}
+
+TEST_CASE("parallel_touch faults in every page whatever the grain", "[fill]")
+{
+    // Arrange, a range starting and ending just inside pages 0 and 9
+    const auto page_size = static_cast<std::size_t>(sysconf(_SC_PAGESIZE));
+    const auto bytes = 16 * page_size;
+    auto *p =
+        static_cast<unsigned char *>(mmap(nullptr, bytes, PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS, -1, 0));
+    REQUIRE(p != MAP_FAILED);
+    const auto grain = GENERATE(std::size_t{1000}, parallel_grain_bytes);
+    set_num_threads(4);
+    set_parallel_grain(grain);
+
+    // Act
+    parallel_touch(p + page_size - 100, 8 * page_size + 200);
+    set_parallel_grain(0);
+    set_num_threads(0);
+
+    // Assert
+    auto resident = std::vector<unsigned char>(bytes / page_size);
+    REQUIRE(mincore(p, bytes, resident.data()) == 0);
+    munmap(p, bytes);
+    for (std::size_t page = 0; page < resident.size(); ++page)
+        REQUIRE((resident[page] & 1) == (page <= 9 ? 1 : 0));
+}
+
+TEST_CASE("default_init_vector keeps working like a vector", "[fill]")
+{
+    // Arrange
+    auto test_vector = default_init_vector<int, pinned_alloc<int, host_backing>>{1, 2, 3};
+
+    // Act
+    test_vector.push_back(4);
+    test_vector.resize(6, 7);
+
+    // Assert
+    REQUIRE(test_vector == default_init_vector<int, pinned_alloc<int, host_backing>>{1, 2, 3, 4, 7, 7});
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
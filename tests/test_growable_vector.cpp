@@ -0,0 +1,145 @@
+#include "playground/growable_vector.h"
+
+#include <Catch2/catch.hpp>
+
+#include <cstdint>
+#include <numeric>
+#include <vector>
+
+namespace playground {
+
+/* Records the ranges registered, fails on request */
+struct recording_backing {
+    struct record {
+        std::vector<std::pair<void *, std::size_t>> registered;
+        std::size_t unregistered_bytes = 0;
+        bool fail = false;
+    };
+
+    auto host_register(void *p, std::size_t bytes) -> void
+    {
+        if (log->fail)
+            throw std::runtime_error{"recording_backing: failed."};
+        log->registered.emplace_back(p, bytes);
+    }
+    auto host_unregister(void *, std::size_t bytes) -> void { log->unregistered_bytes += bytes; }
+
+    record *log;
+};
+
+TEST_CASE("Grows without moving the elements", "[growable_vector]")
+{
+    // Arrange
+    auto log = recording_backing::record{};
+    auto vector = growable_pinned_vector<int32_t, recording_backing>{std::size_t{1} << 30, {&log}};
+    constexpr auto count = std::size_t{3} << 20;
+
+    // Act
+    vector.push_back(0);
+    auto *first = vector.data();
+    for (std::size_t i = 1; i < count; ++i)
+        vector.push_back(static_cast<int32_t>(i));
+
+    // Assert
+    REQUIRE(vector.data() == first);
+    REQUIRE(vector.size() == count);
+    REQUIRE(vector[count - 1] == static_cast<int32_t>(count - 1));
+    // 2, 2, 4 and 8 MiB
+    REQUIRE(vector.num_chunks() == 4);
+    REQUIRE(log.registered.size() == 4);
+    REQUIRE(log.registered[1].first == reinterpret_cast<char *>(first) + (std::size_t{2} << 20));
+    REQUIRE(vector.capacity() * sizeof(int32_t) == std::size_t{16} << 20);
+}
+
+TEST_CASE("Appends buffers", "[growable_vector]")
+{
+    // Arrange
+    auto vector = growable_pinned_vector<uint16_t, pageable_backing>{};
+    auto source = std::vector<uint16_t>(3 << 20);
+    std::iota(source.begin(), source.end(), uint16_t{0});
+
+    // Act
+    vector.append(source.data(), 10);
+    vector.append(source.data(), source.size());
+
+    // Assert
+    REQUIRE(vector.size() == source.size() + 10);
+    REQUIRE(std::equal(source.begin(), source.end(), vector.begin() + 10));
+    REQUIRE(vector.num_chunks() == 2);
+}
+
+TEST_CASE("Locks host memory in chunks", "[growable_vector]")
+{
+    // Arrange
+    auto vector = growable_pinned_vector<char, host_backing>{std::size_t{8} << 20};
+
+    // Act
+    vector.resize(100);
+    vector[99] = 'x';
+
+    // Assert
+    REQUIRE(vector.capacity() == std::size_t{2} << 20);
+    REQUIRE(vector.max_size() == std::size_t{8} << 20);
+    REQUIRE(vector[99] == 'x');
+}
+
+TEST_CASE("Shrinks to the chunks in use", "[growable_vector]")
+{
+    // Arrange
+    auto log = recording_backing::record{};
+    auto vector = growable_pinned_vector<char, recording_backing>{std::size_t{1} << 30, {&log}};
+    for (std::size_t mib : {1, 3, 10}) // Chunks of 2, 2 and 6 MiB
+        vector.resize(mib << 20);
+
+    // Act
+    vector.resize(std::size_t{3} << 20);
+    vector.shrink_to_fit();
+
+    // Assert
+    REQUIRE(vector.num_chunks() == 2);
+    REQUIRE(vector.capacity() == std::size_t{4} << 20);
+    REQUIRE(log.unregistered_bytes == std::size_t{6} << 20);
+    vector.clear();
+    vector.shrink_to_fit();
+    REQUIRE(vector.capacity() == 0);
+    REQUIRE(log.unregistered_bytes == std::size_t{10} << 20);
+}
+
+TEST_CASE("Failed registrations leave the vector as it was", "[growable_vector]")
+{
+    // Arrange
+    auto log = recording_backing::record{};
+    auto vector = growable_pinned_vector<char, recording_backing>{std::size_t{1} << 30, {&log}};
+    vector.resize(10);
+    log.fail = true;
+
+    // Act & Assert
+    REQUIRE_THROWS_AS(vector.resize(std::size_t{3} << 20), std::runtime_error);
+    REQUIRE(vector.size() == 10);
+    REQUIRE(vector.capacity() == std::size_t{2} << 20);
+    log.fail = false;
+    vector.resize(std::size_t{3} << 20);
+    REQUIRE(vector.num_chunks() == 2);
+}
+
+TEST_CASE("Throws beyond the reserved address space", "[growable_vector]")
+{
+    // Arrange
+    auto vector = growable_pinned_vector<int, pageable_backing>{1000};
+
+    // Act & Assert
+    REQUIRE(vector.max_size() >= 1000);
+    REQUIRE_THROWS_AS(vector.resize(vector.max_size() + 1), std::length_error);
+    vector.resize(vector.max_size());
+    REQUIRE(vector.size() == vector.max_size());
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,55 @@
+#include "playground/half.h"
+
+#include <Catch2/catch.hpp>
+
+#include <cmath>
+#include <limits>
+
+namespace playground {
+
+TEST_CASE("float16 round trip", "[half]")
+{
+    for (float value : {0.0f, -0.0f, 1.0f, -2.5f, 0.099975586f, 65504.0f, 6.1035156e-05f, 5.9604645e-08f})
+        REQUIRE(static_cast<float>(float16{value}) == value);
+}
+
+TEST_CASE("float16 bits", "[half]")
+{
+    REQUIRE(float16{1.0f}.bits == 0x3c00);
+    REQUIRE(float16{-2.0f}.bits == 0xc000);
+    REQUIRE(float16{65504.0f}.bits == 0x7bff);
+    REQUIRE(float16{1e6f}.bits == 0x7c00);               // Overflow to infinity
+    REQUIRE(float16{1e-10f}.bits == 0x0000);             // Underflow to zero
+    REQUIRE(float16{5.9604645e-08f}.bits == 0x0001);     // Smallest subnormal
+    REQUIRE(float16{1.0f + 1.0f / 2048}.bits == 0x3c00); // Tie, rounds to even
+    REQUIRE(float16{1.0f + 3.0f / 2048}.bits == 0x3c02); // Tie, rounds to even
+    REQUIRE(std::isnan(static_cast<float>(float16{std::numeric_limits<float>::quiet_NaN()})));
+    REQUIRE(std::isinf(static_cast<float>(float16{std::numeric_limits<float>::infinity()})));
+}
+
+TEST_CASE("bfloat16 round trip", "[half]")
+{
+    for (float value : {0.0f, -0.0f, 1.0f, -2.5f, 3.0e38f, 1.5f})
+        REQUIRE(static_cast<float>(bfloat16{value}) ==
+                static_cast<float>(bfloat16{static_cast<float>(bfloat16{value})}));
+    REQUIRE(static_cast<float>(bfloat16{1.5f}) == 1.5f);
+}
+
+TEST_CASE("bfloat16 bits", "[half]")
+{
+    REQUIRE(bfloat16{1.0f}.bits == 0x3f80);
+    REQUIRE(bfloat16{-2.0f}.bits == 0xc000);
+    REQUIRE(bfloat16{1.0f + 1.0f / 256}.bits == 0x3f80); // Tie, rounds to even
+    REQUIRE(bfloat16{1.0f + 3.0f / 256}.bits == 0x3f82); // Tie, rounds to even
+    REQUIRE(std::isnan(static_cast<float>(bfloat16{std::numeric_limits<float>::quiet_NaN()})));
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
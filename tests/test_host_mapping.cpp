@@ -0,0 +1,89 @@
+#include "playground/host_mapping.h"
+
+#include <Catch2/catch.hpp>
+
+#include <cstdint>
+#include <cstring>
+#include <vector>
+
+namespace playground {
+
+TEST_CASE("map_host rounds up to the page size", "[host_mapping]")
+{
+    auto pages = GENERATE(huge_pages::none, huge_pages::transparent, huge_pages::explicit_2m);
+
+    // Arrange
+    const auto bytes = std::size_t{3} << 20;
+    const auto options = mapping_options{{}, pages};
+
+    // Act
+    auto *p = static_cast<char *>(map_host(bytes, options));
+    std::memset(p, 1, bytes);
+    auto used = huge_pages_of(p);
+    unmap_host(p, bytes, options);
+
+    // Assert
+    REQUIRE(huge_page_bytes(huge_pages::explicit_2m) == std::size_t{2} << 20);
+    if (pages == huge_pages::none)
+        REQUIRE(used == huge_pages::none);
+    else
+        REQUIRE(reinterpret_cast<std::uintptr_t>(p) % (std::size_t{2} << 20) == 0);
+}
+
+TEST_CASE("map_host falls back from explicit huge pages", "[host_mapping]")
+{
+    // Arrange, test machines rarely reserve 1 GiB pages
+    const auto bytes = std::size_t{1} << 20;
+    const auto options = mapping_options{{}, huge_pages::explicit_1g};
+
+    // Act
+    auto *p = map_host(bytes, options);
+    auto used = huge_pages_of(p);
+    unmap_host(p, bytes, options);
+
+    // Assert, the address space of a whole page is reserved either way
+    REQUIRE(used != huge_pages::explicit_2m);
+    REQUIRE(huge_page_bytes(options.pages) == std::size_t{1} << 30);
+}
+
+TEST_CASE("mapped_backing uses the plain backing by default", "[host_mapping]")
+{
+    // Arrange
+    auto alloc = pinned_alloc<int, mapped_backing<pageable_backing>>{};
+    auto huge = pinned_alloc<int, mapped_backing<pageable_backing>>{
+        mapped_backing<pageable_backing>{mapping_options{{}, huge_pages::transparent}}};
+
+    // Act
+    auto vec = std::vector<int, decltype(alloc)>(1000, 1, alloc);
+    auto huge_vec = std::vector<int, decltype(huge)>(1 << 20, 2, huge);
+
+    // Assert
+    REQUIRE(alloc != huge);
+    REQUIRE(reinterpret_cast<std::uintptr_t>(huge_vec.data()) % (std::size_t{2} << 20) == 0);
+    REQUIRE(vec.back() == 1);
+    REQUIRE(huge_vec.back() == 2);
+}
+
+TEST_CASE("mapped_backing locks huge pages with the backing", "[host_mapping]")
+{
+    // Arrange
+    auto backing = mapped_backing<host_backing>{mapping_options{{}, huge_pages::transparent}};
+
+    // Act
+    auto *p = static_cast<char *>(backing.allocate(4096));
+    p[0] = 1;
+    backing.deallocate(p, 4096);
+
+    // Assert
+    REQUIRE(backing.options().pages == huge_pages::transparent);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
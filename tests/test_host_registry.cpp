@@ -0,0 +1,119 @@
+#include "playground/host_registry.h"
+
+#include <Catch2/catch.hpp>
+
+#include <cstdlib>
+#include <vector>
+
+namespace playground {
+
+/* Records the registered ranges instead of locking them */
+struct recording_backing {
+    auto host_register(void *p, std::size_t bytes) -> void
+    {
+        if (fail)
+            throw std::runtime_error{"recording_backing: failing on purpose"};
+        calls.push_back(+static_cast<long>(bytes / 4096));
+        (void)p;
+    }
+
+    auto host_unregister(void *, std::size_t bytes) -> void { calls.push_back(-static_cast<long>(bytes / 4096)); }
+
+    std::vector<long> calls; // Pages registered (+) and unregistered (-)
+    bool fail = false;
+};
+
+struct page_buffer {
+    page_buffer() { data = static_cast<char *>(std::aligned_alloc(4096, 16 * 4096)); }
+    ~page_buffer() { std::free(data); }
+
+    auto page(std::size_t i) -> char * { return data + i * 4096; }
+
+    char *data;
+};
+
+TEST_CASE("host_registry rounds ranges out to pages", "[host_registry]")
+{
+    // Arrange
+    auto buffer = page_buffer{};
+    auto registry = host_registry<recording_backing>{};
+
+    // Act
+    registry.acquire(buffer.page(1) + 10, 4096);
+    auto stats = registry.stats();
+    registry.release(buffer.page(1) + 10, 4096);
+
+    // Assert
+    REQUIRE(stats.regions == 1);
+    REQUIRE(stats.registered_bytes == 2 * 4096);
+    REQUIRE(registry.stats().regions == 0);
+}
+
+TEST_CASE("host_registry shares overlapping ranges", "[host_registry]")
+{
+    // Arrange
+    auto buffer = page_buffer{};
+    auto backing = recording_backing{};
+    auto registry = host_registry<recording_backing &>{backing};
+
+    // Act, pages [2, 5) and [4, 8), then [0, 10) covering both
+    registry.acquire(buffer.page(2), 3 * 4096);
+    registry.acquire(buffer.page(4), 4 * 4096);
+    registry.acquire(buffer.page(0), 10 * 4096);
+    auto stats = registry.stats();
+    registry.release(buffer.page(2), 3 * 4096);
+    registry.release(buffer.page(0), 10 * 4096);
+    auto remaining = registry.stats();
+    registry.release(buffer.page(4), 4 * 4096);
+
+    // Assert
+    REQUIRE(stats.registrations == 3);
+    REQUIRE(stats.registered_bytes == 10 * 4096);
+    REQUIRE(remaining.registered_bytes == 6 * 4096); // Regions are not split
+    REQUIRE(backing.calls == std::vector<long>{3, 3, 2, 2, -2, -2, -3, -3});
+}
+
+TEST_CASE("host_registry registers nothing when the backing fails", "[host_registry]")
+{
+    // Arrange
+    auto buffer = page_buffer{};
+    auto backing = recording_backing{};
+    auto registry = host_registry<recording_backing &>{backing};
+    registry.acquire(buffer.page(2), 4096);
+    backing.fail = true;
+
+    // Act & Assert
+    REQUIRE_THROWS_AS(registry.acquire(buffer.page(0), 5 * 4096), std::runtime_error);
+    REQUIRE(registry.stats().regions == 1);
+    REQUIRE_THROWS_AS(registry.release(buffer.page(0), 5 * 4096), std::logic_error);
+}
+
+TEST_CASE("pinned_view locks host memory while it lives", "[host_registry]")
+{
+    // Arrange
+    auto data = std::vector<int>(10000, 1);
+    auto &registry = host_registry<host_backing>::instance();
+    const auto before = registry.stats().registrations;
+
+    // Act
+    {
+        auto view = register_host_memory<host_backing>(data);
+        auto moved = std::move(view);
+
+        // Assert
+        REQUIRE(moved.data() == data.data());
+        REQUIRE(view.data() == nullptr);
+        REQUIRE(registry.stats().registrations == before + 1);
+    }
+    REQUIRE(registry.stats().registrations == before);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
@@ -0,0 +1,120 @@
+#include "playground/host_mapping.h"
+
+#include <Catch2/catch.hpp>
+
+#include <cstring>
+#include <vector>
+
+namespace playground {
+
+TEST_CASE("numa_nodes lists at least one node", "[numa]")
+{
+    // Act
+    auto const &nodes = numa_nodes();
+
+    // Assert
+    REQUIRE(!nodes.empty());
+    REQUIRE(nodes.front() >= 0);
+}
+
+TEST_CASE("map_host places pages by the policy", "[numa]")
+{
+    auto node = numa_nodes().front();
+    auto policy =
+        GENERATE_COPY(numa_policy{}, numa_policy::bind(node), numa_policy::preferred(node), numa_policy::interleave());
+
+    // Arrange
+    const auto bytes = std::size_t{64} * 4096;
+
+    // Act
+    auto *p = static_cast<char *>(map_host(bytes, {policy}));
+    std::memset(p, 1, bytes);
+    auto placed = numa_node_of(p);
+    unmap_host(p, bytes, {policy});
+
+    // Assert, -1 where the kernel does not tell
+    REQUIRE(placed >= -1);
+    if (policy.mode == numa_mode::bind && placed >= 0)
+        REQUIRE(placed == node);
+}
+
+TEST_CASE("map_host refuses nodes that are not online", "[numa]")
+{
+    // Arrange
+    auto missing = numa_nodes().back() + 1;
+
+    // Act & Assert
+    REQUIRE_THROWS_AS(map_host(4096, {numa_policy::bind(missing)}), std::invalid_argument);
+    REQUIRE_THROWS_AS(numa_pools<host_backing>::pool(missing), std::invalid_argument);
+}
+
+TEST_CASE("numa_policy::local_to_device falls back to local", "[numa]")
+{
+    // Act
+    auto policy = numa_policy::local_to_device(1 << 20);
+
+    // Assert
+    REQUIRE(policy == numa_policy{});
+}
+
+TEST_CASE("mapped_backing allocates usable memory", "[numa]")
+{
+    auto policy = GENERATE_COPY(numa_policy{}, numa_policy::bind(numa_nodes().front()), numa_policy::interleave());
+
+    // Arrange
+    auto alloc = pinned_alloc<int, mapped_backing<pageable_backing>>{mapped_backing<pageable_backing>{policy}};
+
+    // Act
+    auto vec = std::vector<int, decltype(alloc)>(10'000, 7, alloc);
+
+    // Assert
+    REQUIRE(vec.get_allocator().backing().policy() == policy);
+    REQUIRE(vec.front() == 7);
+    REQUIRE(vec.back() == 7);
+}
+
+TEST_CASE("mapped_backing locks its pages with the backing", "[numa]")
+{
+    // Arrange
+    auto backing = mapped_backing<host_backing>{numa_policy::bind(numa_nodes().front())};
+
+    // Act
+    auto *p = backing.allocate(4 * 4096);
+    std::memset(p, 0, 4 * 4096);
+    backing.deallocate(p, 4 * 4096);
+
+    // Assert
+    REQUIRE(backing != mapped_backing<host_backing>{});
+}
+
+TEST_CASE("numa_pinned_vector reuses the blocks of its node", "[numa]")
+{
+    // Arrange
+    auto node = numa_nodes().front();
+    auto &pool = numa_pools<host_backing>::pool(node);
+    auto alloc = pinned_alloc<char, numa_pooled<host_backing>>{numa_pooled<host_backing>{node}};
+    auto before = pool.stats();
+
+    // Act
+    {
+        auto vec = numa_pinned_vector<char, host_backing>(4096, 0, alloc);
+    }
+    {
+        auto vec = numa_pinned_vector<char, host_backing>(4096, 0, alloc);
+    }
+
+    // Assert
+    REQUIRE(&numa_pools<host_backing>::pool(node) == &pool);
+    REQUIRE(pool.stats().misses == before.misses + 1);
+    REQUIRE(pool.stats().hits == before.hits + 1);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
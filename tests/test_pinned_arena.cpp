@@ -0,0 +1,125 @@
+#include "playground/pinned_arena.h"
+#include "playground/pinned_vector.h"
+
+#include <Catch2/catch.hpp>
+
+#include <cstdint>
+#include <vector>
+
+namespace playground {
+
+TEST_CASE("Packs aligned blocks at the front", "[pinned_arena]")
+{
+    // Arrange
+    auto arena = pinned_arena<pageable_backing>{1 << 16, 64};
+
+    // Act
+    auto *first = arena.allocate(10);
+    auto *second = arena.allocate(100);
+    auto *third = arena.allocate(1, 1024);
+
+    // Assert
+    REQUIRE(reinterpret_cast<std::uintptr_t>(first) % 64 == 0);
+    REQUIRE(arena.offset_of(second) - arena.offset_of(first) == 64);
+    REQUIRE(reinterpret_cast<std::uintptr_t>(third) % 1024 == 0);
+    REQUIRE(arena.used_bytes() == arena.offset_of(third) + 1);
+    REQUIRE(arena.stats().live_bytes == 111);
+    REQUIRE(arena.stats().allocations == 3);
+}
+
+TEST_CASE("Reuses freed blocks", "[pinned_arena]")
+{
+    // Arrange
+    auto arena = pinned_arena<pageable_backing>{1 << 16, 64};
+    auto *first = arena.allocate(256);
+    auto *second = arena.allocate(256);
+    auto *third = arena.allocate(256);
+
+    // Act
+    arena.deallocate(first, 256);
+    arena.deallocate(second, 256);
+    auto *merged = arena.allocate(512);
+
+    // Assert
+    REQUIRE(merged == first);
+    REQUIRE(arena.used_bytes() == arena.offset_of(third) + 256);
+}
+
+TEST_CASE("Freeing the last blocks lowers the top", "[pinned_arena]")
+{
+    // Arrange
+    auto arena = pinned_arena<pageable_backing>{1 << 16, 64};
+    auto *first = arena.allocate(100);
+    auto *second = arena.allocate(100);
+    auto *third = arena.allocate(100);
+
+    // Act
+    arena.deallocate(second, 100);
+    arena.deallocate(third, 100);
+
+    // Assert
+    REQUIRE(arena.used_bytes() == arena.offset_of(first) + 100);
+    REQUIRE(arena.allocate(100) == second);
+}
+
+TEST_CASE("Throws when full", "[pinned_arena]")
+{
+    // Arrange
+    auto arena = pinned_arena<pageable_backing>{4096, 64};
+    arena.allocate(4000);
+
+    // Act, Assert
+    REQUIRE_THROWS_AS(arena.allocate(128), std::bad_alloc);
+    REQUIRE(arena.allocate(64) != nullptr);
+}
+
+TEST_CASE("Resets every block at once", "[pinned_arena]")
+{
+    // Arrange
+    auto arena = pinned_arena<pageable_backing>{4096, 64};
+    auto *first = arena.allocate(2000);
+    arena.allocate(2000);
+
+    // Act
+    arena.reset();
+
+    // Assert
+    REQUIRE(arena.used_bytes() == 0);
+    REQUIRE(arena.generation() == 1);
+    REQUIRE(arena.stats().live_bytes == 0);
+    REQUIRE(arena.allocate(4000) == first);
+}
+
+TEST_CASE("Backs vectors", "[pinned_arena]")
+{
+    // Arrange
+    auto arena = pinned_arena<pageable_backing>{1 << 16};
+    auto alloc = pinned_alloc<int32_t, arena_backing<pageable_backing>>{arena_backing<pageable_backing>{arena}};
+
+    // Act
+    auto labels = std::vector<int32_t, decltype(alloc)>(100, 1, alloc);
+    auto masks = std::vector<int32_t, decltype(alloc)>(100, 2, alloc);
+
+    // Assert
+    REQUIRE(arena.offset_of(labels.data()) == 0);
+    REQUIRE(arena.offset_of(masks.data()) == 512);
+    REQUIRE(masks[99] == 2);
+    REQUIRE(arena.stats().live_bytes == 800);
+}
+
+TEST_CASE("Rejects alignments other than powers of two", "[pinned_arena]")
+{
+    REQUIRE_THROWS_AS(pinned_arena<pageable_backing>(4096, 48), std::invalid_argument);
+    auto arena = pinned_arena<pageable_backing>{4096};
+    REQUIRE_THROWS_AS(arena.allocate(8, 3), std::invalid_argument);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
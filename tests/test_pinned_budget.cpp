@@ -0,0 +1,187 @@
+#include "playground/host_mapping.h"
+#include "playground/pinned_budget.h"
+
+#include <Catch2/catch.hpp>
+
+#include <chrono>
+#include <future>
+#include <stdexcept>
+#include <thread>
+
+namespace playground {
+
+/* Restores the unlimited budget when a test is done */
+class budget_guard {
+  public:
+    explicit budget_guard(budget_options const &options) { pinned_budget::instance().configure(options); }
+    ~budget_guard() { pinned_budget::instance().configure({}); }
+};
+
+/* Backing whose page-locking always fails, as cudaMallocHost does when the
+ * driver runs out of pinned memory */
+class exhausted_backing {
+  public:
+    auto allocate(std::size_t) -> void * { throw std::runtime_error{"out of memory"}; }
+    auto deallocate(void *, std::size_t) -> void {}
+};
+
+inline auto operator==(exhausted_backing const &, exhausted_backing const &) -> bool
+{
+    return true;
+}
+
+/* Backing rejecting its arguments, which no policy should take for a lack of
+ * pinned memory */
+class rejecting_backing {
+  public:
+    auto allocate(std::size_t) -> void * { throw std::invalid_argument{"unsupported"}; }
+    auto deallocate(void *, std::size_t) -> void {}
+};
+
+inline auto operator==(rejecting_backing const &, rejecting_backing const &) -> bool
+{
+    return true;
+}
+
+TEST_CASE("Pins without limit by default", "[pinned_budget]")
+{
+    // Arrange
+    const auto before = pinned_budget::instance().stats();
+
+    // Act
+    auto vec = budgeted_pinned_vector<int, host_backing>(1000);
+    const auto during = pinned_budget::instance().stats();
+
+    // Assert
+    REQUIRE(is_pinned(vec.data()));
+    REQUIRE(during.pinned_bytes == before.pinned_bytes + 4000);
+    vec = {};
+    vec.shrink_to_fit();
+    REQUIRE(pinned_budget::instance().stats().pinned_bytes == before.pinned_bytes);
+}
+
+TEST_CASE("Throws beyond the budget", "[pinned_budget]")
+{
+    // Arrange
+    auto guard = budget_guard{{1000, budget_policy::fail}};
+    const auto failures = pinned_budget::instance().stats().failures;
+
+    // Act & Assert
+    REQUIRE_THROWS_AS((budgeted_pinned_vector<char, host_backing>(1001)), std::runtime_error);
+    REQUIRE(pinned_budget::instance().stats().failures == failures + 1);
+    REQUIRE_NOTHROW((budgeted_pinned_vector<char, host_backing>(1000)));
+}
+
+TEST_CASE("Falls back to pageable memory beyond the budget", "[pinned_budget]")
+{
+    // Arrange
+    auto guard = budget_guard{{1000, budget_policy::pageable}};
+    auto pinned = budgeted_pinned_vector<char, host_backing>(600);
+
+    // Act
+    auto pageable = budgeted_pinned_vector<char, host_backing>(600, 'x');
+    const auto stats = pinned_budget::instance().stats();
+
+    // Assert
+    REQUIRE(is_pinned(pinned.data()));
+    REQUIRE_FALSE(is_pinned(pageable.data()));
+    REQUIRE(pageable[599] == 'x');
+    REQUIRE(stats.pinned_bytes == 600);
+    REQUIRE(stats.fallback_bytes == 600);
+    pageable = {};
+    pageable.shrink_to_fit();
+    REQUIRE(pinned_budget::instance().stats().fallback_bytes == 0);
+}
+
+TEST_CASE("Falls back to pageable memory when the backing fails", "[pinned_budget]")
+{
+    // Arrange
+    auto guard = budget_guard{{0, budget_policy::pageable}};
+
+    // Act
+    auto vec = std::vector<int, pinned_alloc<int, budgeted<exhausted_backing>>>(10, 7);
+
+    // Assert
+    REQUIRE_FALSE(is_pinned(vec.data()));
+    REQUIRE(vec[9] == 7);
+    REQUIRE(pinned_budget::instance().stats().pinned_bytes == 0);
+}
+
+TEST_CASE("Rethrows failures of the backing", "[pinned_budget]")
+{
+    auto policy = GENERATE(budget_policy::fail, budget_policy::block);
+    auto guard = budget_guard{{0, policy}};
+    REQUIRE_THROWS_AS((std::vector<int, pinned_alloc<int, budgeted<exhausted_backing>>>(10)), std::runtime_error);
+}
+
+TEST_CASE("Returns the bytes of backings throwing anything else", "[pinned_budget]")
+{
+    // Arrange
+    auto policy = GENERATE(budget_policy::fail, budget_policy::block, budget_policy::pageable);
+    auto guard = budget_guard{{1000, policy}};
+
+    // Act & Assert
+    REQUIRE_THROWS_AS((std::vector<char, pinned_alloc<char, budgeted<rejecting_backing>>>(100)), std::invalid_argument);
+    REQUIRE(pinned_budget::instance().stats().pinned_bytes == 0);
+}
+
+TEST_CASE("Blocks until pinned memory is released", "[pinned_budget]")
+{
+    // Arrange
+    auto guard = budget_guard{{1000, budget_policy::block}};
+    auto first = std::make_unique<budgeted_pinned_vector<char, host_backing>>(800);
+    const auto waits = pinned_budget::instance().stats().waits;
+
+    // Act
+    auto second = std::async(std::launch::async, [] { return budgeted_pinned_vector<char, host_backing>(800); });
+    const auto blocked = second.wait_for(std::chrono::milliseconds{50}) == std::future_status::timeout;
+    first.reset();
+    auto vec = second.get();
+
+    // Assert
+    REQUIRE(blocked);
+    REQUIRE(is_pinned(vec.data()));
+    REQUIRE(pinned_budget::instance().stats().waits > waits);
+}
+
+TEST_CASE("Throws after blocking for the timeout", "[pinned_budget]")
+{
+    // Arrange
+    auto guard = budget_guard{{1000, budget_policy::block, std::chrono::milliseconds{20}}};
+    auto first = budgeted_pinned_vector<char, host_backing>(800);
+
+    // Act & Assert
+    REQUIRE_THROWS_AS((budgeted_pinned_vector<char, host_backing>(800)), std::runtime_error);
+}
+
+TEST_CASE("Does not block for allocations larger than the budget", "[pinned_budget]")
+{
+    auto guard = budget_guard{{1000, budget_policy::block}};
+    REQUIRE_THROWS_AS((budgeted_pinned_vector<char, host_backing>(1001)), std::runtime_error);
+}
+
+TEST_CASE("Leaves mapped memory pageable beyond the budget", "[pinned_budget]")
+{
+    // Arrange
+    auto guard = budget_guard{{4096, budget_policy::pageable}};
+    const auto options = mapping_options{{}, huge_pages::transparent};
+
+    // Act
+    using backing = mapped_backing<budgeted<host_backing>>;
+    auto vec = mapped_vector<char, budgeted<host_backing>>(1 << 20, 'y', pinned_alloc<char, backing>{backing{options}});
+
+    // Assert
+    REQUIRE_FALSE(is_pinned(vec.data()));
+    REQUIRE(vec.back() == 'y');
+    REQUIRE(pinned_budget::instance().stats().fallback_bytes >= (1 << 20));
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
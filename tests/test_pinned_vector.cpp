@@ -1,3 +1,4 @@
+#include "playground/caching_pool.h"
 #include "playground/pinned_vector.h"
 
 #include <Catch2/catch.hpp>
@@ -55,6 +56,95 @@ TEMPLATE_LIST_TEST_CASE("push_back", "[pinned_vector]", TileTypes)
         REQUIRE(test_vector[i] == i);
 }
 
+TEMPLATE_LIST_TEST_CASE("push_back (host backing)", "[pinned_vector]", TileTypes)
+{
+    // Arrange
+    constexpr int expected_size = 17;
+    auto test_vector = std::vector<TestType, pinned_alloc<TestType, host_backing>>();
+
+    // Act
+    for (int i = 0; i < expected_size; ++i)
+        test_vector.push_back(i);
+
+    // Assert
+    REQUIRE(test_vector.size() == expected_size);
+    REQUIRE(test_vector.capacity() >= expected_size);
+    for (int i = 0; i < test_vector.size(); ++i)
+        REQUIRE(test_vector[i] == i);
+}
+
+TEMPLATE_LIST_TEST_CASE("push_back (pooled host backing)", "[pinned_vector]", TileTypes)
+{
+    // Arrange
+    constexpr int expected_size = 17;
+    auto test_vector = pooled_pinned_vector<TestType, host_backing>();
+
+    // Act
+    for (int i = 0; i < expected_size; ++i)
+        test_vector.push_back(i);
+
+    // Assert
+    REQUIRE(test_vector.size() == expected_size);
+    REQUIRE(test_vector.capacity() >= expected_size);
+    for (int i = 0; i < test_vector.size(); ++i)
+        REQUIRE(test_vector[i] == i);
+}
+
+TEST_CASE("Pooled vectors reuse memory", "[pinned_vector]")
+{
+    // Arrange
+    auto &pool = caching_pool<host_backing>::instance();
+    const auto *first_data = pooled_pinned_vector<float, host_backing>(1000).data();
+    const auto hits = pool.stats().hits;
+
+    // Act
+    auto test_vector = pooled_pinned_vector<float, host_backing>(1000);
+
+    // Assert
+    REQUIRE(test_vector.data() == first_data);
+    REQUIRE(pool.stats().hits == hits + 1);
+}
+
+TEST_CASE("Allocates with cudaHostAlloc flags", "[pinned_vector]")
+{
+    // Arrange
+    auto flags = host_alloc_flags{};
+    flags.portable = GENERATE(false, true);
+    flags.mapped = GENERATE(false, true);
+    flags.write_combined = GENERATE(false, true);
+    auto alloc = pinned_alloc<int, cuda_host_alloc_backing>{cuda_host_alloc_backing{flags}};
+
+    // Act
+    auto test_vector = host_alloc_vector<int>(100, 7, alloc);
+
+    // Assert
+    REQUIRE(test_vector.get_allocator().backing().flags() == flags);
+    REQUIRE(test_vector[99] == 7);
+}
+
+TEST_CASE("Maps mapped memory into the device address space", "[pinned_vector]")
+{
+    // Arrange
+    auto mapped = cuda_host_alloc_backing{{false, true, false}};
+    auto unmapped = cuda_host_alloc_backing{{true, false, false}};
+    auto p = mapped.allocate(64);
+    auto q = unmapped.allocate(64);
+
+    // Act & Assert
+    REQUIRE(mapped.device_pointer(p) != nullptr);
+    REQUIRE_THROWS_AS(unmapped.device_pointer(q), std::logic_error);
+    REQUIRE(mapped != unmapped);
+    mapped.deallocate(p, 64);
+    unmapped.deallocate(q, 64);
+}
+
+TEST_CASE("Cannot register write-combined memory", "[pinned_vector]")
+{
+    auto backing = cuda_host_alloc_backing{{false, false, true}};
+    auto data = std::vector<char>(4096);
+    REQUIRE_THROWS_AS(backing.host_register(data.data(), data.size()), std::invalid_argument);
+}
+
 } // namespace playground
 
 /*
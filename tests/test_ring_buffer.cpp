@@ -0,0 +1,164 @@
+#include "playground/ring_buffer.h"
+
+#include <Catch2/catch.hpp>
+
+#include <chrono>
+#include <cstring>
+#include <thread>
+#include <vector>
+
+namespace playground {
+
+using namespace std::chrono_literals;
+
+TEST_CASE("Slots cycle through producer and consumer", "[ring_buffer]")
+{
+    // Arrange
+    auto ring = pinned_ring_buffer<host_backing>{2, 100};
+
+    // Act
+    auto write_slot = ring.acquire_write();
+    std::memset(ring.data(*write_slot), 7, 10);
+    ring.commit(*write_slot, 10);
+    auto read_slot = ring.acquire_read();
+
+    // Assert
+    REQUIRE(read_slot == write_slot);
+    REQUIRE(ring.filled_bytes(*read_slot) == 10);
+    REQUIRE(static_cast<char *>(ring.data(*read_slot))[9] == 7);
+    ring.release(*read_slot);
+    REQUIRE(ring.stats().committed == 1);
+    REQUIRE(ring.stats().released == 1);
+}
+
+TEST_CASE("Slots are aligned and do not overlap", "[ring_buffer]")
+{
+    // Arrange
+    auto ring = pinned_ring_buffer<host_backing>{3, 300};
+
+    // Act
+    auto first = reinterpret_cast<std::uintptr_t>(ring.data(0));
+    auto second = reinterpret_cast<std::uintptr_t>(ring.data(1));
+
+    // Assert
+    REQUIRE(first % ring.slot_alignment == 0);
+    REQUIRE(second % ring.slot_alignment == 0);
+    REQUIRE(second - first >= 300);
+    REQUIRE_THROWS_AS(ring.data(3), std::out_of_range);
+}
+
+TEST_CASE("Non-blocking acquisition reports backpressure", "[ring_buffer]")
+{
+    // Arrange
+    auto ring = pinned_ring_buffer<host_backing>{1, 16};
+
+    // Act
+    auto empty_read = ring.try_acquire_read();
+    auto slot = ring.try_acquire_write();
+    auto full_write = ring.try_acquire_write();
+    auto timed_write = ring.acquire_write_for(1ms);
+    auto stats = ring.stats();
+
+    // Assert
+    REQUIRE_FALSE(empty_read);
+    REQUIRE(slot);
+    REQUIRE_FALSE(full_write);
+    REQUIRE_FALSE(timed_write);
+    REQUIRE(stats.consumer_stalls == 1);
+    REQUIRE(stats.producer_stalls == 2);
+    REQUIRE(stats.producer_wait_seconds > 0.0);
+}
+
+TEST_CASE("Rejects slots in the wrong state", "[ring_buffer]")
+{
+    // Arrange
+    auto ring = pinned_ring_buffer<host_backing>{2, 16};
+    auto slot = *ring.acquire_write();
+
+    // Act & Assert
+    REQUIRE_THROWS_AS(ring.release(slot), std::logic_error);
+    REQUIRE_THROWS_AS(ring.commit(slot, 17), std::invalid_argument);
+    ring.commit(slot, 16);
+    REQUIRE_THROWS_AS(ring.commit(slot, 16), std::logic_error);
+}
+
+TEST_CASE("Close drains the committed slots", "[ring_buffer]")
+{
+    // Arrange
+    auto ring = pinned_ring_buffer<host_backing>{2, 16};
+    ring.commit(*ring.acquire_write(), 1);
+
+    // Act
+    ring.close();
+    auto write_slot = ring.acquire_write();
+    auto first_read = ring.acquire_read();
+    auto second_read = ring.acquire_read();
+
+    // Assert
+    REQUIRE_FALSE(write_slot);
+    REQUIRE(first_read);
+    REQUIRE_FALSE(second_read);
+}
+
+TEST_CASE("Close wakes up blocked consumers", "[ring_buffer]")
+{
+    // Arrange
+    auto ring = pinned_ring_buffer<host_backing>{2, 16};
+    auto result = std::optional<std::size_t>{0};
+
+    // Act
+    auto consumer = std::thread{[&] { result = ring.acquire_read(); }};
+    std::this_thread::sleep_for(10ms);
+    ring.close();
+    consumer.join();
+
+    // Assert
+    REQUIRE_FALSE(result);
+}
+
+TEST_CASE("Streams between producer and consumer threads", "[ring_buffer]")
+{
+    // Arrange
+    constexpr int num_batches = 200;
+    auto ring = pinned_ring_buffer<host_backing>{3, sizeof(int)};
+    auto received = std::vector<int>{};
+
+    // Act
+    auto producer = std::thread{[&] {
+        for (int i = 0; i < num_batches; ++i) {
+            auto slot = *ring.acquire_write();
+            std::memcpy(ring.data(slot), &i, sizeof(i));
+            ring.commit(slot, sizeof(i));
+        }
+        ring.close();
+    }};
+    auto consumer = std::thread{[&] {
+        while (auto slot = ring.acquire_read()) {
+            int value;
+            std::memcpy(&value, ring.data(*slot), sizeof(value));
+            received.push_back(value);
+            ring.release(*slot);
+        }
+    }};
+    producer.join();
+    consumer.join();
+    auto stats = ring.stats();
+
+    // Assert
+    REQUIRE(received.size() == num_batches);
+    for (int i = 0; i < num_batches; ++i)
+        REQUIRE(received[i] == i);
+    REQUIRE(stats.committed == num_batches);
+    REQUIRE(stats.released == num_batches);
+    REQUIRE(stats.max_filled <= 3);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
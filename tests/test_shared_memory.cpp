@@ -0,0 +1,107 @@
+#include "playground/shared_memory.h"
+
+#include <Catch2/catch.hpp>
+
+#include <sys/wait.h>
+#include <unistd.h>
+
+#include <cstring>
+
+namespace playground {
+
+TEST_CASE("Attached segments share the memory", "[shared_memory]")
+{
+    // Arrange
+    auto kind = GENERATE(shared_memory_kind::memfd, shared_memory_kind::posix);
+    auto owner = shared_segment::create(4096, kind);
+
+    // Act
+    auto attached = shared_segment::attach(owner.handle());
+    std::memset(attached.data(), 7, attached.size());
+
+    // Assert
+    REQUIRE(owner.is_owner());
+    REQUIRE_FALSE(attached.is_owner());
+    REQUIRE(attached.size() == 4096);
+    REQUIRE(static_cast<char *>(owner.data())[4095] == 7);
+}
+
+TEST_CASE("Other processes write into the segment", "[shared_memory]")
+{
+    // Arrange
+    auto kind = GENERATE(shared_memory_kind::memfd, shared_memory_kind::posix);
+    auto owner = shared_pinned_buffer<host_backing>::create(1 << 16, kind);
+
+    // Act
+    const auto pid = fork();
+    if (pid == 0) {
+        auto worker = shared_pinned_buffer<host_backing>::attach(owner.handle());
+        std::memset(worker.data(), 3, worker.size());
+        _exit(worker.is_pinned() ? 1 : 0);
+    }
+    auto status = 0;
+    waitpid(pid, &status, 0);
+
+    // Assert
+    REQUIRE(owner.is_pinned());
+    REQUIRE(WIFEXITED(status));
+    REQUIRE(WEXITSTATUS(status) == 0);
+    REQUIRE(static_cast<char *>(owner.data())[0] == 3);
+    REQUIRE(static_cast<char *>(owner.data())[(1 << 16) - 1] == 3);
+}
+
+TEST_CASE("Segments outlive their owner in attached processes", "[shared_memory]")
+{
+    // Arrange
+    auto owner = std::make_unique<shared_segment>(shared_segment::create(4096));
+    auto attached = shared_segment::attach(owner->handle());
+    const auto handle = owner->handle();
+
+    // Act
+    owner.reset();
+    std::memset(attached.data(), 1, attached.size());
+
+    // Assert
+    REQUIRE(static_cast<char *>(attached.data())[0] == 1);
+    REQUIRE_THROWS_AS(shared_segment::attach(handle), std::runtime_error);
+}
+
+TEST_CASE("Handles do not attach to files reusing the descriptor", "[shared_memory]")
+{
+    // Arrange
+    auto handle = shared_segment::create(4096).handle();
+
+    // Act
+    auto other = shared_segment::create(8192);
+
+    // Assert
+    REQUIRE(other.handle() != handle);
+    REQUIRE_THROWS_AS(shared_segment::attach(handle), std::runtime_error);
+}
+
+TEST_CASE("Unlinked segments cannot be attached", "[shared_memory]")
+{
+    // Arrange
+    auto owner = shared_segment::create(4096, shared_memory_kind::posix);
+
+    // Act
+    owner.unlink();
+
+    // Assert
+    REQUIRE_THROWS_AS(shared_segment::attach(owner.handle()), std::runtime_error);
+}
+
+TEST_CASE("Rejects empty segments", "[shared_memory]")
+{
+    REQUIRE_THROWS_AS(shared_segment::create(0), std::invalid_argument);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
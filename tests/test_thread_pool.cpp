@@ -0,0 +1,101 @@
+#include "playground/thread_pool.h"
+
+#include <Catch2/catch.hpp>
+
+#include <atomic>
+#include <map>
+#include <stdexcept>
+#include <thread>
+#include <vector>
+
+namespace playground {
+
+TEST_CASE("Runs every task once", "[thread_pool]")
+{
+    // Arrange
+    auto pool = thread_pool{4};
+    auto counts = std::vector<std::atomic<int>>(100);
+
+    // Act
+    pool.run(counts.size(), [&counts](std::size_t i) { ++counts[i]; });
+
+    // Assert
+    REQUIRE(pool.num_threads() == 4);
+    for (auto &count : counts)
+        REQUIRE(count == 1);
+}
+
+TEST_CASE("Maps tasks to the same threads", "[thread_pool]")
+{
+    // Arrange
+    auto pool = thread_pool{3};
+    auto first = std::vector<std::thread::id>(9);
+    auto second = std::vector<std::thread::id>(9);
+
+    // Act
+    pool.run(first.size(), [&first](std::size_t i) { first[i] = std::this_thread::get_id(); });
+    pool.run(second.size(), [&second](std::size_t i) { second[i] = std::this_thread::get_id(); });
+
+    // Assert
+    REQUIRE(first == second);
+    REQUIRE(first[0] == std::this_thread::get_id());
+}
+
+TEST_CASE("Rethrows exceptions of tasks", "[thread_pool]")
+{
+    // Arrange
+    auto pool = thread_pool{2};
+
+    // Act & Assert
+    REQUIRE_THROWS_AS(pool.run(4,
+                               [](std::size_t i) {
+                                   if (i == 3)
+                                       throw std::runtime_error{"task failed"};
+                               }),
+                      std::runtime_error);
+    REQUIRE_NOTHROW(pool.run(4, [](std::size_t) {}));
+}
+
+TEST_CASE("Runs nested tasks inline", "[thread_pool]")
+{
+    // Arrange
+    auto pool = thread_pool{2};
+    std::atomic<int> count{0};
+
+    // Act
+    pool.run(2, [&](std::size_t) { pool.run(3, [&](std::size_t) { ++count; }); });
+
+    // Assert
+    REQUIRE(count == 6);
+}
+
+TEST_CASE("parallel_for covers the range", "[thread_pool]")
+{
+    // Arrange
+    set_num_threads(3);
+    auto hits = std::vector<int>(1000);
+    std::atomic<bool> aligned{true};
+
+    // Act
+    parallel_for(hits.size(), 64, [&](std::size_t begin, std::size_t end) {
+        aligned = aligned && begin % 64 == 0;
+        for (auto i = begin; i < end; ++i)
+            ++hits[i];
+    });
+
+    // Assert
+    REQUIRE(get_num_threads() == 3);
+    REQUIRE(aligned);
+    REQUIRE(std::all_of(hits.begin(), hits.end(), [](int x) { return x == 1; }));
+    set_num_threads(0);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
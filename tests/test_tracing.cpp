@@ -0,0 +1,141 @@
+#include "playground/fill.h"
+#include "playground/pinned_vector.h"
+#include "playground/tracing.h"
+
+#include <Catch2/catch.hpp>
+
+#include <algorithm>
+#include <cstring>
+#include <thread>
+
+namespace playground {
+
+namespace {
+
+auto count_named(std::vector<trace_event> const &events, char const *name) -> std::size_t
+{
+    return static_cast<std::size_t>(std::count_if(
+        events.begin(), events.end(), [name](auto const &event) { return std::strcmp(event.name, name) == 0; }));
+}
+
+} // namespace
+
+TEST_CASE("Records nothing while tracing is off", "[tracing]")
+{
+    // Arrange
+    start_tracing();
+    stop_tracing();
+
+    // Act
+    {
+        const auto scope = trace_scope{"work", "test"};
+    }
+
+    // Assert
+    REQUIRE_FALSE(tracing_enabled());
+    REQUIRE(collect_trace().empty());
+}
+
+TEST_CASE("Records allocations, fills and copies", "[tracing]")
+{
+    // Arrange
+    using vector = default_init_vector<int, pinned_alloc<int, pageable_backing>>;
+    auto target = std::vector<int>(1000);
+    start_tracing();
+
+    // Act
+    {
+        const auto tag = allocation_tag{"loader"};
+        auto source = make_vector<vector>(1000, fill_mode::iota);
+        parallel_memcpy(target.data(), source->data(), 1000 * sizeof(int));
+    }
+    stop_tracing();
+    const auto events = collect_trace();
+
+    // Assert
+    REQUIRE(count_named(events, "allocate") == 1);
+    REQUIRE(count_named(events, "iota") == 1);
+    REQUIRE(count_named(events, "memcpy") == 1);
+    REQUIRE(count_named(events, "free") == 1);
+    auto const &allocate = events.front();
+    REQUIRE(std::strcmp(allocate.name, "allocate") == 0);
+    REQUIRE(std::strcmp(allocate.category, "pageable") == 0);
+    REQUIRE(std::strcmp(allocate.tag, "loader") == 0);
+    REQUIRE(allocate.bytes == 4000);
+    REQUIRE(allocate.begin_ns <= allocate.end_ns);
+    REQUIRE(std::is_sorted(events.begin(), events.end(),
+                           [](auto const &lhs, auto const &rhs) { return lhs.begin_ns < rhs.begin_ns; }));
+}
+
+TEST_CASE("Keeps the events of every thread", "[tracing]")
+{
+    // Arrange
+    start_tracing();
+
+    // Act
+    auto threads = std::vector<std::thread>{};
+    for (int i = 0; i < 4; ++i) {
+        threads.emplace_back([] {
+            for (int j = 0; j < 10; ++j)
+                const auto scope = trace_scope{"work", "test", 1};
+        });
+    }
+    for (auto &thread : threads)
+        thread.join();
+    stop_tracing();
+    const auto events = collect_trace();
+
+    // Assert
+    REQUIRE(events.size() == 40);
+    auto ids = std::vector<std::uint64_t>{};
+    for (auto const &event : events)
+        ids.push_back(event.thread);
+    std::sort(ids.begin(), ids.end());
+    REQUIRE(std::unique(ids.begin(), ids.end()) - ids.begin() == 4);
+}
+
+TEST_CASE("Drops events beyond the buffer of a thread", "[tracing]")
+{
+    // Arrange
+    start_tracing(8);
+
+    // Act
+    for (int i = 0; i < 10; ++i)
+        const auto scope = trace_scope{"work", "test"};
+    stop_tracing();
+
+    // Assert
+    REQUIRE(collect_trace().size() == 8);
+    REQUIRE(dropped_trace_events() == 2);
+}
+
+TEST_CASE("Starting a trace drops the previous one", "[tracing]")
+{
+    // Arrange
+    start_tracing();
+    {
+        const auto scope = trace_scope{"first", "test"};
+    }
+
+    // Act
+    start_tracing();
+    {
+        const auto scope = trace_scope{"second", "test"};
+    }
+    stop_tracing();
+    const auto events = collect_trace();
+
+    // Assert
+    REQUIRE(events.size() == 1);
+    REQUIRE(std::strcmp(events[0].name, "second") == 0);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
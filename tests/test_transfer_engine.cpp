@@ -0,0 +1,149 @@
+#include "playground/pinned_vector.h"
+#include "playground/transfer_engine.h"
+
+#include <Catch2/catch.hpp>
+
+#include <numeric>
+#include <utility>
+#include <vector>
+
+namespace playground {
+
+using host_vector = std::vector<int, pinned_alloc<int, host_backing>>;
+
+/* Records the calls instead of copying, to check the scheduling */
+class recording_backend : public simulated_transfer_backend {
+  public:
+    using simulated_transfer_backend::simulated_transfer_backend;
+
+    auto copy_async(void *dst, void const *src, std::size_t bytes, std::size_t stream) -> void override
+    {
+        copies.emplace_back(stream, bytes);
+        simulated_transfer_backend::copy_async(dst, src, bytes, stream);
+    }
+
+    auto record(std::size_t stream) -> std::shared_ptr<transfer_event> override
+    {
+        events.push_back(stream);
+        return simulated_transfer_backend::record(stream);
+    }
+
+    std::vector<std::pair<std::size_t, std::size_t>> copies;
+    std::vector<std::size_t> events;
+};
+
+TEST_CASE("Transfers round trip through the device", "[transfer_engine]")
+{
+    // Arrange
+    auto engine = transfer_engine{std::make_shared<simulated_transfer_backend>(3), 1000};
+    auto source = host_vector(10000);
+    std::iota(source.begin(), source.end(), 0);
+    auto result = host_vector(source.size());
+    auto device = device_buffer{engine.backend(), source.size() * sizeof(int)};
+
+    // Act
+    engine.to_device(device, source).wait();
+    auto handle = engine.to_host(result, device);
+    handle.wait();
+
+    // Assert
+    REQUIRE(handle.done());
+    REQUIRE(handle.bytes() == source.size() * sizeof(int));
+    REQUIRE(handle.num_chunks() == 40);
+    REQUIRE(result == source);
+}
+
+TEST_CASE("Chunks are spread over the streams round-robin", "[transfer_engine]")
+{
+    // Arrange
+    auto backend = std::make_shared<recording_backend>(2);
+    auto engine = transfer_engine{backend, 100};
+    auto source = std::vector<char>(250);
+    auto result = std::vector<char>(250);
+
+    // Act
+    engine.copy(result.data(), source.data(), 250).wait();
+    engine.copy(result.data(), source.data(), 50).wait();
+
+    // Assert
+    using copy = std::pair<std::size_t, std::size_t>;
+    REQUIRE(backend->copies == std::vector<copy>{{0, 100}, {1, 100}, {0, 50}, {1, 50}});
+    REQUIRE(backend->events == std::vector<std::size_t>{0, 1, 1});
+}
+
+TEST_CASE("Empty transfers complete", "[transfer_engine]")
+{
+    // Arrange
+    auto engine = transfer_engine{std::make_shared<simulated_transfer_backend>()};
+
+    // Act
+    auto handle = engine.copy(nullptr, nullptr, 0);
+    handle.wait();
+
+    // Assert
+    REQUIRE(handle.done());
+    REQUIRE(handle.num_chunks() == 0);
+}
+
+TEST_CASE("Many transfers in flight", "[transfer_engine]")
+{
+    // Arrange
+    auto engine = transfer_engine{std::make_shared<simulated_transfer_backend>(4), 4096};
+    auto sources = std::vector<host_vector>{};
+    auto results = std::vector<host_vector>{};
+    for (int i = 0; i < 16; ++i) {
+        sources.emplace_back(5000, i);
+        results.emplace_back(5000, -1);
+    }
+
+    // Act
+    for (int i = 0; i < 16; ++i)
+        engine.copy(results[i], sources[i]);
+    engine.synchronize();
+
+    // Assert
+    REQUIRE(results == sources);
+}
+
+TEST_CASE("Transfers check their arguments", "[transfer_engine]")
+{
+    // Arrange
+    auto backend = std::make_shared<simulated_transfer_backend>();
+    auto engine = transfer_engine{backend};
+    auto source = host_vector(10);
+    auto result = host_vector(9);
+    auto device = device_buffer{backend, 9 * sizeof(int)};
+
+    // Act & Assert
+    REQUIRE_THROWS_AS(engine.copy(result, source), std::invalid_argument);
+    REQUIRE_THROWS_AS(engine.to_device(device, source), std::invalid_argument);
+    REQUIRE_THROWS_AS(transfer_engine(backend, 0), std::invalid_argument);
+    REQUIRE_THROWS_AS(transfer_engine(nullptr), std::invalid_argument);
+    REQUIRE_THROWS_AS(simulated_transfer_backend(0), std::invalid_argument);
+}
+
+TEST_CASE("Destroying the simulated device finishes its copies", "[transfer_engine]")
+{
+    // Arrange
+    auto source = host_vector(100000, 7);
+    auto result = host_vector(source.size());
+
+    // Act
+    {
+        auto engine = transfer_engine{std::make_shared<simulated_transfer_backend>(2), 4096};
+        engine.copy(result, source);
+    }
+
+    // Assert
+    REQUIRE(result == source);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */
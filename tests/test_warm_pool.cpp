@@ -0,0 +1,153 @@
+#include "playground/warm_pool.h"
+
+#include "playground/pinned_vector.h"
+
+#include <Catch2/catch.hpp>
+
+#include <future>
+#include <thread>
+
+namespace playground {
+
+using test_vector = default_init_vector<int, pinned_alloc<int, host_backing>>;
+
+/* Holds the queue until opened, so jobs queued behind it stay pending */
+struct gate {
+    explicit gate(background_queue &queue)
+    {
+        queue.submit([opened = promise.get_future().share()] { opened.wait(); });
+    }
+    auto open() -> void { promise.set_value(); }
+
+    std::promise<void> promise;
+};
+
+TEST_CASE("Allocates vectors in the background", "[warm_pool]")
+{
+    // Arrange
+    auto pending = allocate_async<test_vector>(1000, fill_mode::iota, 5);
+
+    // Act
+    auto vector = pending.get();
+
+    // Assert
+    REQUIRE(pending.status() == async_status::done);
+    REQUIRE(vector->size() == 1000);
+    REQUIRE((*vector)[999] == 1004);
+    REQUIRE_THROWS_AS(pending.get(), std::logic_error);
+}
+
+TEST_CASE("Cancelled allocations never run", "[warm_pool]")
+{
+    // Arrange
+    auto queue = background_queue{};
+    auto closed = gate{queue};
+    auto pending = allocate_async<test_vector>(1000, fill_mode::zeros, 0, {}, queue);
+
+    // Act
+    auto cancelled = pending.cancel();
+    closed.open();
+
+    // Assert
+    REQUIRE(cancelled);
+    REQUIRE(pending.ready());
+    REQUIRE(pending.status() == async_status::cancelled);
+    REQUIRE_THROWS_AS(pending.get(), std::logic_error);
+}
+
+TEST_CASE("Finished jobs cannot be cancelled", "[warm_pool]")
+{
+    // Arrange
+    auto pending = allocate_async<test_vector>(10);
+    pending.wait();
+
+    // Act & Assert
+    REQUIRE_FALSE(pending.cancel());
+    REQUIRE(pending.get()->size() == 10);
+}
+
+TEST_CASE("Rethrows the exceptions of jobs", "[warm_pool]")
+{
+    // Arrange
+    auto pending =
+        async_result<int>::run(background_queue::instance(), []() -> int { throw std::runtime_error{"failed"}; });
+
+    // Act & Assert
+    REQUIRE(pending.wait_for(std::chrono::seconds{10}));
+    REQUIRE_THROWS_AS(pending.get(), std::runtime_error);
+    REQUIRE_THROWS_AS(allocate_async<test_vector>(10, fill_mode::copy), std::invalid_argument);
+}
+
+TEST_CASE("Serves requests from warm vectors", "[warm_pool]")
+{
+    // Arrange
+    auto pool = warm_pool<test_vector>{2};
+    REQUIRE(pool.reserve(1000).get() == 2);
+    REQUIRE(pool.reserve(4000).get() == 2);
+
+    // Act
+    auto vector = pool.acquire(900);
+    auto stats = pool.stats();
+
+    // Assert
+    REQUIRE(vector->size() == 900);
+    REQUIRE(vector->capacity() == 1000);
+    REQUIRE(stats.hits == 1);
+    REQUIRE(stats.waits == 0);
+    REQUIRE(pool.reserve(1000).get() == 2);
+    REQUIRE(pool.stats().warm_vectors == 4);
+    REQUIRE(pool.stats().warm_bytes == 2 * 5000 * sizeof(int));
+}
+
+TEST_CASE("Counts requests waiting for warm vectors", "[warm_pool]")
+{
+    // Arrange
+    auto queue = background_queue{};
+    auto pool = warm_pool<test_vector>{1, {}, queue};
+    pool.reserve(100).wait();
+    auto closed = gate{queue};
+    auto first = pool.acquire(100); // Refilled behind the gate
+
+    // Act
+    auto waiting = std::async(std::launch::async, [&] { return pool.acquire(100); });
+    while (pool.stats().waits == 0)
+        std::this_thread::yield();
+    closed.open();
+    auto second = waiting.get();
+
+    // Assert
+    REQUIRE(second->size() == 100);
+    REQUIRE(pool.stats().hits == 1);
+    REQUIRE(pool.stats().waits == 1);
+    REQUIRE(pool.stats().wait_seconds > 0);
+}
+
+TEST_CASE("Allocates requests larger than every size on the spot", "[warm_pool]")
+{
+    // Arrange
+    auto pool = warm_pool<test_vector>{};
+    pool.reserve(100).wait();
+
+    // Act
+    auto vector = pool.acquire(101);
+
+    // Assert
+    REQUIRE(vector->size() == 101);
+    REQUIRE(pool.stats().misses == 1);
+    REQUIRE(pool.stats().warm_vectors == 1);
+}
+
+TEST_CASE("Rejects pools without depth", "[warm_pool]")
+{
+    REQUIRE_THROWS_AS(warm_pool<test_vector>{0}, std::invalid_argument);
+}
+
+} // namespace playground
+
+/*
+ *  This code is part of the playground project.
+ *  Copyright (c) 2024 ThatSzucs
+ *
+ *  Distributed under the MIT license. See accompanying license file
+ *  or copy at https://opensource.org/licenses/MIT.
+ */